@@ -17,11 +17,13 @@ from app.core.database_url import normalize_async_database_url
 from app.models.user import User
 from app.models.category import Category
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup
 from app.models.budget import Budget
 from app.models.goal import Goal
 from app.models.recurring_transaction import RecurringTransaction
 from app.models.rate_limit_whitelist import RateLimitWhitelist
 from app.models.trusted_ip import TrustedIP
+from app.models.scheduled_job_run import ScheduledJobRun
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,111 @@
+"""add_transaction_daily_rollups
+
+Revision ID: c1d2e3f4a5b6
+Revises: 20260106_whitelist
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d2e3f4a5b6'
+down_revision: Union[str, None] = '20260106_whitelist'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('transaction_daily_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('type', postgresql.ENUM('INCOME', 'EXPENSE', name='transactiontype', create_type=False), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'type', 'category_id')
+    )
+
+    # Statement-level triggers keep the rollup in sync with every write to transactions
+    op.execute("""
+        CREATE OR REPLACE FUNCTION transaction_daily_rollup_apply() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO transaction_daily_rollups AS r
+                    (user_id, day, type, category_id, total_amount, transaction_count)
+                SELECT user_id, date, type, COALESCE(category_id, 0), SUM(amount), COUNT(*)
+                FROM new_rows
+                GROUP BY user_id, date, type, COALESCE(category_id, 0)
+                ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+                SET total_amount = r.total_amount + EXCLUDED.total_amount,
+                    transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO transaction_daily_rollups AS r
+                    (user_id, day, type, category_id, total_amount, transaction_count)
+                SELECT user_id, date, type, COALESCE(category_id, 0), -SUM(amount), -COUNT(*)
+                FROM old_rows
+                GROUP BY user_id, date, type, COALESCE(category_id, 0)
+                ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+                SET total_amount = r.total_amount + EXCLUDED.total_amount,
+                    transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+            ELSE
+                INSERT INTO transaction_daily_rollups AS r
+                    (user_id, day, type, category_id, total_amount, transaction_count)
+                SELECT user_id, day, type, category_id, SUM(amount), SUM(delta_count)
+                FROM (
+                    SELECT user_id, date AS day, type, COALESCE(category_id, 0) AS category_id,
+                           amount, 1 AS delta_count
+                    FROM new_rows
+                    UNION ALL
+                    SELECT user_id, date, type, COALESCE(category_id, 0), -amount, -1
+                    FROM old_rows
+                ) AS delta
+                GROUP BY user_id, day, type, category_id
+                HAVING SUM(amount) <> 0 OR SUM(delta_count) <> 0
+                ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+                SET total_amount = r.total_amount + EXCLUDED.total_amount,
+                    transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_transactions_rollup_insert
+        AFTER INSERT ON transactions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_transactions_rollup_update
+        AFTER UPDATE ON transactions
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_transactions_rollup_delete
+        AFTER DELETE ON transactions
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """)
+
+    # Backfill existing history
+    op.execute("""
+        INSERT INTO transaction_daily_rollups
+            (user_id, day, type, category_id, total_amount, transaction_count)
+        SELECT user_id, date, type, COALESCE(category_id, 0), SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, date, type, COALESCE(category_id, 0)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_delete ON transactions")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_update ON transactions")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_insert ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS transaction_daily_rollup_apply()")
+    op.drop_table('transaction_daily_rollups')
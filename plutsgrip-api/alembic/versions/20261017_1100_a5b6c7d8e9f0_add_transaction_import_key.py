@@ -0,0 +1,43 @@
+"""add_transaction_import_key
+
+Revision ID: a5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5b6c7d8e9f0'
+down_revision: Union[str, None] = 'f4a5b6c7d8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('import_key', sa.String(length=32), nullable=True))
+    # OFX rows imported so far carry their FITID in the notes; give them the
+    # key statement_import_key builds from it
+    op.execute(
+        r"""
+        UPDATE transactions
+        SET import_key = md5('fitid|' || btrim(substring(notes from '\[FITID ([^]]+)\]')))
+        WHERE notes ~ '\[FITID [^]]+\]'
+        """
+    )
+    op.create_index(
+        'ix_transactions_user_id_import_key',
+        'transactions',
+        ['user_id', 'import_key'],
+        unique=False,
+        postgresql_where=sa.text('import_key IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_import_key', table_name='transactions')
+    op.drop_column('transactions', 'import_key')
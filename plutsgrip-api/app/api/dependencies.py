@@ -1,13 +1,21 @@
 """
 Common API dependencies for authentication and database
 """
+import hashlib
+import ipaddress
+from datetime import date
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.data_version import get_data_version
 from app.core.database import get_db
-from app.core.security import decode_token, is_token_blacklisted
-from app.models.user import User
+from app.core.metrics import metrics
+from app.core.principal import AuthenticatedUser, cache_principal, get_cached_principal
+from app.core.security import decode_token_cached
+from app.core.token_bucket import classify_route, user_rate_limiter
+from app.core.token_revocation import is_token_revoked
+from app.core.trusted_networks import is_trusted_ip
 from app.repositories.user_repository import UserRepository
 
 # HTTP Bearer token authentication
@@ -17,36 +25,40 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Dependency to get current authenticated user from JWT token
 
+    Resolves a column-only principal, served from the per-worker principal
+    cache when possible so most requests do not touch the database. Token
+    verification is cached too; revocation is checked on every call.
+
     Args:
         credentials: HTTP Bearer credentials
         db: Database session
 
     Returns:
-        Current user object
+        Current user principal
 
     Raises:
-        HTTPException: If token is invalid, blacklisted, or user not found
+        HTTPException: If token is invalid, revoked, or user not found
     """
     token = credentials.credentials
 
-    # Check if token is blacklisted
-    if is_token_blacklisted(token):
+    payload = decode_token_cached(token)
+
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked",
+            detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(token)
-
-    if not payload:
+    # Check if token has been revoked (logout)
+    if await is_token_revoked(token, payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
@@ -58,9 +70,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(int(user_id))
+    user = get_cached_principal(int(user_id))
+
+    if user is None:
+        # Cache miss - load only the columns auth needs
+        user_repo = UserRepository(db)
+        user = await user_repo.get_principal(int(user_id))
+        if user is not None:
+            cache_principal(user)
 
     if not user:
         raise HTTPException(
@@ -75,7 +92,7 @@ async def get_current_user(
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[AuthenticatedUser]:
     """
     Dependency to get current user if authenticated, None otherwise
 
@@ -86,7 +103,7 @@ async def get_optional_current_user(
         db: Database session
 
     Returns:
-        Current user object or None
+        Current user principal or None
     """
     if not credentials:
         return None
@@ -95,3 +112,151 @@ async def get_optional_current_user(
         return await get_current_user(credentials, db)
     except HTTPException:
         return None
+
+
+# Headers set by rate_limit_user; endpoints returning their own Response copy them over
+RATE_LIMIT_HEADERS = ("RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy")
+
+
+async def rate_limit_user(
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> None:
+    """
+    Router dependency applying the per-user token bucket of the route class
+
+    Every worker shares the buckets when the sqlite backend is configured.
+    Clients from trusted networks are not limited.
+
+    Args:
+        request: Incoming request
+        response: Response whose RateLimit-* headers are populated
+        current_user: Authenticated user
+
+    Raises:
+        HTTPException: 429 with RateLimit-* and Retry-After headers when the bucket is empty
+    """
+    if not user_rate_limiter.enabled:
+        return
+    if request.client and is_trusted_ip(request.client.host):
+        return
+
+    route = request.scope.get("route")
+    route_class = classify_route(request.method, getattr(route, "path", request.url.path))
+    result = user_rate_limiter.hit(current_user.id, route_class)
+
+    if not result.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=result.headers(),
+        )
+    response.headers.update(result.headers())
+
+
+async def require_trusted_network(request: Request) -> None:
+    """
+    Dependency restricting an endpoint to trusted networks and loopback
+
+    Uses the connecting address, never X-Forwarded-For, which clients can set.
+
+    Args:
+        request: Incoming request
+
+    Raises:
+        HTTPException: 403 if the client is not on a trusted network
+    """
+    host = request.client.host if request.client else None
+    if host:
+        try:
+            if ipaddress.ip_address(host).is_loopback:
+                return
+        except ValueError:
+            pass
+        if is_trusted_ip(host):
+            return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+class NotModified(Exception):
+    """
+    Raised by conditional GET dependencies when the client copy is current
+
+    Handled globally by returning an empty 304 response, so the endpoint,
+    its services and response serialization never run.
+    """
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def _if_none_match_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def build_user_etag(user_id: int, request: Request) -> str:
+    """
+    Build a strong ETag for a user-scoped GET request
+
+    Derived from the user's data version, the path and the normalized query
+    string. The current date is included because several responses (report
+    defaults, goal progress) depend on it.
+
+    Args:
+        user_id: User ID
+        request: Incoming request
+
+    Returns:
+        Quoted ETag value
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    source = f"{user_id}:{get_data_version(user_id)}:{date.today()}:{request.url.path}?{query}"
+    return f'"{hashlib.sha1(source.encode()).hexdigest()}"'
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> None:
+    """
+    Router dependency implementing ETag / If-None-Match for user-scoped GETs
+
+    Sets the ETag on the response, or raises NotModified when the client
+    already holds the current representation. Non-GET requests pass through.
+    Only registered when the cache backend is shared by all workers, since
+    the ETag depends on the per-user data version.
+
+    Args:
+        request: Incoming request
+        response: Response whose headers are populated
+        current_user: Authenticated user
+
+    Raises:
+        NotModified: If If-None-Match matches the current ETag
+    """
+    if request.method != "GET":
+        return
+
+    etag = build_user_etag(current_user.id, request)
+    if _if_none_match_matches(request.headers.get("if-none-match"), etag):
+        request.state.etag_result = "not-modified"
+        metrics.increment("etag.not_modified")
+        raise NotModified(etag)
+
+    request.state.etag_result = "issued"
+    metrics.increment("etag.issued")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
@@ -12,8 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.rate_limiter import limiter
 from app.api.dependencies import get_current_user
-from app.core.security import blacklist_token
-from app.models.user import User
+from app.core.security import decode_token_cached, forget_decoded_token
+from app.core.token_revocation import revoke_token
+from app.core.principal import AuthenticatedUser
 from app.schemas.user import (
     UserRegisterRequest,
     UserLoginRequest,
@@ -117,19 +118,20 @@ async def refresh_token(
 @router.post("/logout")
 async def logout(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
-    Logout user by blacklisting their access token
+    Logout user by revoking their access token
 
-    This endpoint invalidates the current access token by adding it to a blacklist.
+    This endpoint invalidates the current access token by recording its token
+    ID in the revocation store until the token expires. The store is shared
+    by all workers when TOKEN_REVOCATION_BACKEND is sqlite or database.
     The client should also remove the token from local storage.
-
-    Note: This implementation uses an in-memory blacklist suitable for single-instance
-    deployments. For production with multiple instances, consider using Redis.
     """
     token = credentials.credentials
-    blacklist_token(token)
+    # get_current_user already verified the token, so decoding succeeds
+    await revoke_token(token, decode_token_cached(token))
+    forget_decoded_token(token)
 
     return {
         "message": "Successfully logged out",
@@ -138,7 +140,7 @@ async def logout(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_user)):
     """
     Get current authenticated user information
 
@@ -2,6 +2,7 @@
 Endpoints de Orçamento
 
 GET /api/budgets - Listar orçamentos
+GET /api/budgets/status - Status de todos os orçamentos
 POST /api/budgets - Criar novo orçamento
 GET /api/budgets/:id - Obter orçamento específico
 PUT /api/budgets/:id - Atualizar orçamento
@@ -10,22 +11,27 @@ GET /api/budgets/:id/status - Obter status do orçamento
 """
 from typing import Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.fast_json import JSONListSerializer
 from app.api.dependencies import get_current_user
-from app.models.user import User
-from app.schemas.budget import BudgetCreateRequest, BudgetUpdateRequest, BudgetResponse
+from app.core.principal import AuthenticatedUser
+from app.schemas.budget import BudgetCreateRequest, BudgetUpdateRequest, BudgetResponse, BudgetStatusResponse
 from app.services.budget_service import BudgetService
 
 router = APIRouter(prefix="/budgets", tags=["Orçamentos"])
 
+budget_list_serializer = JSONListSerializer(list[BudgetResponse])
+budget_status_serializer = JSONListSerializer(list[BudgetStatusResponse])
+
 
 @router.get("", response_model=list[BudgetResponse])
 async def list_budgets(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -37,13 +43,13 @@ async def list_budgets(
     """
     service = BudgetService(db)
     budgets = await service.get_user_budgets(current_user.id, skip, limit)
-    return budgets
+    return budget_list_serializer.render(budgets, response)
 
 
 @router.post("", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
 async def create_budget(
     budget_data: BudgetCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -66,10 +72,32 @@ async def create_budget(
     return budget
 
 
+@router.get("/status", response_model=list[BudgetStatusResponse])
+async def list_budgets_status(
+    response: Response,
+    history: int = Query(0, ge=0, le=36, description="Períodos anteriores a incluir por orçamento"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Obtém o status de todos os orçamentos no período atual de cada um
+
+    O período (mensal, trimestral ou anual) é contado a partir da data de
+    início do orçamento. Todos os orçamentos são calculados em uma única
+    consulta.
+
+    Parâmetros:
+    - history: Número de períodos anteriores em ``history`` (padrão: 0, máx: 36)
+    """
+    service = BudgetService(db)
+    statuses = await service.get_budgets_status(current_user.id, history)
+    return budget_status_serializer.render(statuses, response)
+
+
 @router.get("/{budget_id}", response_model=BudgetResponse)
 async def get_budget(
     budget_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Obtém um orçamento específico"""
@@ -87,7 +115,7 @@ async def get_budget(
 async def update_budget(
     budget_id: int,
     budget_data: BudgetUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Atualiza um orçamento"""
@@ -105,7 +133,7 @@ async def update_budget(
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_budget(
     budget_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Deleta um orçamento"""
@@ -118,18 +146,19 @@ async def delete_budget(
         )
 
 
-@router.get("/{budget_id}/status")
+@router.get("/{budget_id}/status", response_model=BudgetStatusResponse)
 async def get_budget_status(
     budget_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Obtém status do orçamento (gasto atual vs limite)
+    Obtém status do orçamento (gasto no período atual vs limite)
 
     Retorna:
     - budget_amount: Valor orçado
-    - spent_amount: Valor gasto
+    - period_start / period_end: Período atual
+    - spent_amount: Valor gasto no período
     - remaining_amount: Valor restante
     - percentage_used: Percentual utilizado
     - is_exceeded: Se excedeu o orçamento
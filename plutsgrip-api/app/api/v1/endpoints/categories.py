@@ -3,14 +3,16 @@ Category endpoints.
 """
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.core.database import get_db
+from app.core.fast_json import JSONListSerializer
+from app.core.principal import AuthenticatedUser
 from app.models.category import Category, TransactionType
-from app.models.user import User
+from app.repositories.category_repository import CategoryRepository
 from app.schemas.category import (
     CategoryCreate,
     CategoryListResponse,
@@ -21,11 +23,14 @@ from app.services.category_service import CategoryService
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
+category_list_serializer = JSONListSerializer(CategoryListResponse)
+
 
 @router.get("", response_model=CategoryListResponse)
 async def list_categories(
+    response: Response,
     type: Optional[TransactionType] = Query(None, description="Filter by type"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -42,14 +47,15 @@ async def list_categories(
 
     result = await db.execute(
         select(Category)
+        .options(*CategoryRepository.read_options)
         .where(and_(*conditions))
         .order_by(Category.type, Category.name)
     )
     categories = result.scalars().all()
 
-    return CategoryListResponse(
-        categories=[CategoryResponse.model_validate(category) for category in categories],
-        total=len(categories),
+    return category_list_serializer.render(
+        {"categories": categories, "total": len(categories)},
+        response,
     )
 
 
@@ -74,7 +80,7 @@ async def get_category(
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: CategoryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new personal category for the current user."""
@@ -93,7 +99,7 @@ async def create_category(
 async def update_category(
     category_id: int,
     category_data: CategoryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a personal category owned by the current user."""
@@ -120,7 +126,7 @@ async def update_category(
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a personal category owned by the current user."""
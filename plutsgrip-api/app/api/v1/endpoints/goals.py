@@ -11,18 +11,21 @@ POST /api/goals/:id/complete - Marcar como concluída
 GET /api/goals/summary - Resumo de progresso
 """
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from pydantic import BaseModel, Field
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.fast_json import JSONListSerializer
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import AuthenticatedUser
 from app.schemas.goal import GoalCreateRequest, GoalUpdateRequest, GoalResponse
 from app.services.goal_service import GoalService
 
 router = APIRouter(prefix="/goals", tags=["Metas"])
 
+goal_list_serializer = JSONListSerializer(list[GoalResponse])
+
 
 class AddProgressRequest(BaseModel):
     """Requisição para adicionar progresso"""
@@ -31,10 +34,11 @@ class AddProgressRequest(BaseModel):
 
 @router.get("", response_model=list[GoalResponse])
 async def list_goals(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_completed: Optional[bool] = Query(None, description="Filtrar por status"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -47,13 +51,13 @@ async def list_goals(
     """
     service = GoalService(db)
     goals = await service.get_user_goals(current_user.id, skip, limit, is_completed)
-    return goals
+    return goal_list_serializer.render(goals, response)
 
 
 @router.post("", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 async def create_goal(
     goal_data: GoalCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -83,7 +87,7 @@ async def create_goal(
 @router.get("/{goal_id}", response_model=GoalResponse)
 async def get_goal(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Obtém uma meta específica"""
@@ -101,7 +105,7 @@ async def get_goal(
 async def update_goal(
     goal_id: int,
     goal_data: GoalUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Atualiza uma meta"""
@@ -119,7 +123,7 @@ async def update_goal(
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_goal(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Deleta uma meta"""
@@ -136,7 +140,7 @@ async def delete_goal(
 async def add_progress(
     goal_id: int,
     progress_data: AddProgressRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -158,7 +162,7 @@ async def add_progress(
 @router.post("/{goal_id}/complete", response_model=GoalResponse)
 async def complete_goal(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Marca uma meta como concluída"""
@@ -174,7 +178,7 @@ async def complete_goal(
 
 @router.get("/summary/progress")
 async def get_goals_summary(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
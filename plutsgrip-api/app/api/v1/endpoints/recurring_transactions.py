@@ -3,32 +3,40 @@ Endpoints de Transações Recorrentes
 
 GET /api/recurring-transactions - Listar transações recorrentes
 POST /api/recurring-transactions - Criar transação recorrente
+GET /api/recurring-transactions/calendar - Calendário de fluxo de caixa projetado
 GET /api/recurring-transactions/:id - Obter transação recorrente
 PUT /api/recurring-transactions/:id - Atualizar transação recorrente
 DELETE /api/recurring-transactions/:id - Deletar transação recorrente
 """
+from datetime import date, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.fast_json import JSONListSerializer
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import AuthenticatedUser
 from app.schemas.recurring_transaction import (
     RecurringTransactionCreateRequest,
     RecurringTransactionUpdateRequest,
-    RecurringTransactionResponse
+    RecurringTransactionResponse,
+    CashflowCalendarResponse
 )
 from app.services.recurring_transaction_service import RecurringTransactionService
 
 router = APIRouter(prefix="/recurring-transactions", tags=["Transações Recorrentes"])
 
+recurring_list_serializer = JSONListSerializer(list[RecurringTransactionResponse])
+
 
 @router.get("", response_model=list[RecurringTransactionResponse])
 async def list_recurring_transactions(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = Query(None, description="Filtrar por status"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -43,13 +51,13 @@ async def list_recurring_transactions(
     transactions = await service.get_user_recurring_transactions(
         current_user.id, skip, limit, is_active
     )
-    return transactions
+    return recurring_list_serializer.render(transactions, response)
 
 
 @router.post("", response_model=RecurringTransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_recurring_transaction(
     trans_data: RecurringTransactionCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -82,10 +90,44 @@ async def create_recurring_transaction(
     return transaction
 
 
+@router.get("/calendar", response_model=CashflowCalendarResponse)
+async def get_cashflow_calendar(
+    start_date: Optional[date] = Query(None, description="Início do período (padrão: hoje)"),
+    end_date: Optional[date] = Query(None, description="Fim do período (padrão: início + 90 dias)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Projeta o fluxo de caixa das transações recorrentes ativas
+
+    Retorna, para cada dia do período com ocorrências ainda não geradas,
+    as entradas, saídas, o saldo do dia e o saldo acumulado.
+
+    Parâmetros:
+    - start_date: Início do período (padrão: hoje)
+    - end_date: Fim do período (padrão: início + 90 dias; máx: RECURRING_CALENDAR_MAX_DAYS)
+    """
+    start_date = start_date or date.today()
+    end_date = end_date or start_date + timedelta(days=90)
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end_date deve ser igual ou posterior a start_date"
+        )
+    if (end_date - start_date).days >= settings.RECURRING_CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"O período não pode passar de {settings.RECURRING_CALENDAR_MAX_DAYS} dias"
+        )
+
+    service = RecurringTransactionService(db)
+    return await service.get_cashflow_calendar(current_user.id, start_date, end_date)
+
+
 @router.get("/{recurring_id}", response_model=RecurringTransactionResponse)
 async def get_recurring_transaction(
     recurring_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Obtém uma transação recorrente específica"""
@@ -103,7 +145,7 @@ async def get_recurring_transaction(
 async def update_recurring_transaction(
     recurring_id: int,
     trans_data: RecurringTransactionUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Atualiza uma transação recorrente"""
@@ -123,7 +165,7 @@ async def update_recurring_transaction(
 @router.delete("/{recurring_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_recurring_transaction(
     recurring_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Deleta uma transação recorrente"""
@@ -9,9 +9,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.core.database import get_db
+from app.core.principal import AuthenticatedUser
 from app.models.category import TransactionType
-from app.models.user import User
-from app.schemas.report import DashboardResponse, FinancialSummaryResponse
+from app.schemas.report import (
+    DashboardResponse,
+    FinancialSummaryResponse,
+    ForecastResponse,
+    TrendGranularity,
+    TrendsResponse,
+)
 from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -19,7 +25,7 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 
 @router.get("/dashboard", response_model=DashboardResponse)
 async def get_dashboard(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Return dashboard summary statistics."""
@@ -32,7 +38,7 @@ async def get_dashboard(
 async def get_financial_summary(
     start_date: Optional[date] = Query(None, description="Report start date"),
     end_date: Optional[date] = Query(None, description="Report end date"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Return detailed financial summary for a date range."""
@@ -50,7 +56,7 @@ async def get_category_breakdown(
     type: str = Query(..., description="Transaction type: INCOME or EXPENSE"),
     start_date: Optional[date] = Query(None, description="Report start date"),
     end_date: Optional[date] = Query(None, description="Report end date"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Return totals grouped by category for the requested transaction type."""
@@ -72,27 +78,52 @@ async def get_category_breakdown(
     return breakdown
 
 
-@router.get("/trends")
+@router.get("/trends", response_model=TrendsResponse)
 async def get_monthly_trends(
     months: int = Query(6, description="Number of months to include", ge=1, le=24),
-    current_user: User = Depends(get_current_user),
+    granularity: TrendGranularity = Query(
+        TrendGranularity.MONTH, description="Bucket size: week, month, quarter or year"
+    ),
+    periods: Optional[int] = Query(
+        None, description="Number of buckets to include (overrides months)", ge=1, le=104
+    ),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Return monthly income, expense, and balance trends."""
+    """Return income, expense, and balance trends per calendar period."""
     report_service = ReportService(db)
     trends = await report_service.get_monthly_trends(
         user_id=current_user.id,
-        months=months,
+        months=periods or months,
+        granularity=granularity,
     )
     return trends
 
 
 @router.get("/patterns")
 async def get_spending_patterns(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Return spending patterns for the current user."""
     report_service = ReportService(db)
     patterns = await report_service.get_spending_patterns(current_user.id)
     return patterns
+
+
+@router.get("/forecast", response_model=ForecastResponse)
+async def get_balance_forecast(
+    days: int = Query(90, description="Number of days to project, starting tomorrow", ge=1, le=365),
+    history_days: int = Query(
+        180, description="Days of history used to estimate non-recurring movements", ge=28, le=730
+    ),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return the projected daily balance from recurring schedules and spending history."""
+    report_service = ReportService(db)
+    return await report_service.get_balance_forecast(
+        user_id=current_user.id,
+        days=days,
+        history_days=history_days,
+    )
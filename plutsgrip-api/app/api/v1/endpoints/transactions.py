@@ -1,86 +1,302 @@
 """
 Transaction endpoints
 GET /api/transactions - List all transactions with filters
+GET /api/transactions/export - Stream all transactions as CSV or NDJSON
 GET /api/transactions/:id - Get specific transaction
 POST /api/transactions - Create new transaction
+POST /api/transactions/bulk - Create many transactions at once
+POST /api/transactions/import - Import a CSV or OFX bank statement
 PUT /api/transactions/:id - Update transaction
 DELETE /api/transactions/:id - Delete transaction
 """
+import json
 from datetime import date
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.fast_json import JSONListSerializer
+from app.core.pagination import decode_date_id_cursor, encode_date_id_cursor
+from app.api.dependencies import RATE_LIMIT_HEADERS, get_current_user
+from app.core.principal import AuthenticatedUser
 from app.schemas.transaction import (
+    TransactionBulkCreateRequest,
+    TransactionBulkCreateResponse,
     TransactionCreateRequest,
     TransactionUpdateRequest,
     TransactionResponse,
-    TransactionListResponse
+    TransactionListResponse,
+    StatementImportResponse
 )
+from app.services.statement_import import (
+    SUPPORTED_FORMATS,
+    StatementImportOptions,
+    StatementImportService,
+    StatementRowError,
+)
+from app.services.transaction_export import EXPORT_FORMATS, TransactionExportService
 from app.services.transaction_service import TransactionService
 from app.models.category import TransactionType
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+transaction_list_serializer = JSONListSerializer(TransactionListResponse)
+
+
+def _parse_transaction_type(type: Optional[str]) -> Optional[TransactionType]:
+    """Convert the type query string to TransactionType (unknown values mean no filter)"""
+    if not type:
+        return None
+    try:
+        return TransactionType(type.upper())
+    except (ValueError, AttributeError):
+        return None
+
 
 @router.get("", response_model=TransactionListResponse)
 async def list_transactions(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; replaces page"),
+    include_total: bool = Query(True, description="Include the total count of matching transactions"),
     type: Optional[str] = Query(None, description="Filter by type (income/expense)"),
     category: Optional[int] = Query(None, description="Filter by category ID"),
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all transactions for current user with optional filters and pagination
+
+    Supports page/page_size pagination and keyset pagination: every page
+    returns a next_cursor (when more rows exist) that can be passed back as
+    cursor to fetch the following page in constant time.
     """
     transaction_service = TransactionService(db)
 
+    after = None
+    if cursor:
+        try:
+            after = decode_date_id_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
     skip = (page - 1) * page_size
 
-    # Convert string type to TransactionType enum
-    transaction_type = None
-    if type:
-        try:
-            transaction_type = TransactionType(type.lower())
-        except (ValueError, AttributeError):
-            transaction_type = None
+    transaction_type = _parse_transaction_type(type)
 
+    # Fetch one extra row to know whether another page exists
     transactions = await transaction_service.get_user_transactions(
         user_id=current_user.id,
         skip=skip,
-        limit=page_size,
+        limit=page_size + 1,
         transaction_type=transaction_type,
         category_id=category,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        after=after
+    )
+
+    next_cursor = None
+    if len(transactions) > page_size:
+        transactions = transactions[:page_size]
+        last = transactions[-1]
+        next_cursor = encode_date_id_cursor(last.date, last.id)
+
+    total = None
+    if include_total:
+        total = await transaction_service.count_user_transactions(
+            user_id=current_user.id,
+            transaction_type=transaction_type,
+            category_id=category,
+            start_date=start_date,
+            end_date=end_date
+        )
+
+    return transaction_list_serializer.render(
+        {
+            "transactions": transactions,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+        },
+        response,
     )
 
-    total = await transaction_service.count_user_transactions(
+
+@router.get("/export")
+async def export_transactions(
+    response: Response,
+    format: str = Query("csv", description="Export format (csv or ndjson)"),
+    type: Optional[str] = Query(None, description="Filter by type (income/expense)"),
+    category: Optional[int] = Query(None, description="Filter by category ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export all matching transactions as CSV or NDJSON
+
+    Accepts the same filters as the list endpoint. Rows are streamed from a
+    server-side cursor as they are fetched, so the export has no size limit.
+    """
+    export_format = format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format; use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    media_type, extension = EXPORT_FORMATS[export_format]
+
+    chunks = TransactionExportService(db).stream(
         user_id=current_user.id,
-        transaction_type=transaction_type,
+        export_format=export_format,
+        transaction_type=_parse_transaction_type(type),
         category_id=category,
         start_date=start_date,
         end_date=end_date
     )
 
-    return TransactionListResponse(
-        transactions=[TransactionResponse.model_validate(t) for t in transactions],
-        total=total,
-        page=page,
-        page_size=page_size
+    # Keep the conditional GET and rate limit headers set by the router dependencies
+    headers = {
+        name: response.headers[name]
+        for name in ("ETag", "Cache-Control", *RATE_LIMIT_HEADERS)
+        if name in response.headers
+    }
+    headers["Content-Disposition"] = f'attachment; filename="transactions-{date.today()}.{extension}"'
+
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+@router.post("/bulk", response_model=TransactionBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_transactions_bulk(
+    request: TransactionBulkCreateRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many transactions in one request
+
+    Valid items are inserted in a single database transaction; invalid items
+    are reported by index. With atomic=true any invalid item rejects the
+    whole batch with 422.
+    """
+    transaction_service = TransactionService(db)
+
+    result = await transaction_service.create_transactions_bulk(
+        user_id=current_user.id,
+        items=request.items,
+        atomic=request.atomic
+    )
+
+    return TransactionBulkCreateResponse(**result)
+
+
+# Bytes read from the (spooled) upload per step of the import pipeline
+IMPORT_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an uploaded file in fixed-size chunks"""
+    while True:
+        chunk = await file.read(IMPORT_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+@router.post("/import", response_model=StatementImportResponse)
+async def import_statement(
+    response: Response,
+    file: UploadFile = File(..., description="CSV or OFX statement"),
+    format: Optional[str] = Query(None, description="csv or ofx; detected from the file name when omitted"),
+    delimiter: str = Query(",", min_length=1, max_length=1, description="CSV field delimiter"),
+    decimal_comma: bool = Query(False, description="CSV amounts use a decimal comma (1.234,56)"),
+    date_format: Optional[str] = Query(None, description="strptime format of CSV dates, e.g. %d/%m/%Y"),
+    encoding: str = Query("utf-8", description="File text encoding"),
+    dry_run: bool = Query(False, description="Validate and count without inserting"),
+    stream_progress: bool = Query(False, description="Stream NDJSON progress after each batch"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a bank statement into transactions
+
+    The file is parsed incrementally and inserted in batches, so memory use
+    does not depend on its size. CSV needs date, description and amount
+    columns (English or Portuguese headers) and may carry type, category
+    (name or ID), currency and notes. Negative amounts become expenses.
+    Rows imported before (same FITID for OFX, otherwise same date, amount,
+    type and description as in the file) are skipped, as are transactions
+    entered by hand or imported before import keys existed that have the
+    same date, amount and description. This makes re-importing an
+    overlapping statement safe.
+    """
+    statement_format = (format or "").lower()
+    if not statement_format:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        statement_format = {"qfx": "ofx"}.get(extension, extension)
+    if statement_format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported statement format; use one of: {', '.join(SUPPORTED_FORMATS)}"
+        )
+
+    try:
+        "".encode(encoding)
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown encoding: {encoding}"
+        )
+
+    options = StatementImportOptions(
+        format=statement_format,
+        delimiter=delimiter,
+        decimal_comma=decimal_comma,
+        date_format=date_format,
+        encoding=encoding,
+        dry_run=dry_run,
     )
+    progress_reports = StatementImportService(db).run(current_user.id, _read_upload(file), options)
+
+    if stream_progress:
+        async def ndjson() -> AsyncIterator[str]:
+            try:
+                async for progress in progress_reports:
+                    yield json.dumps({**progress.as_dict(), "dry_run": dry_run}) + "\n"
+            except StatementRowError as exc:
+                yield json.dumps({"error": str(exc), "done": True}) + "\n"
+
+        headers = {name: response.headers[name] for name in RATE_LIMIT_HEADERS if name in response.headers}
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers=headers)
+
+    try:
+        async for progress in progress_reports:
+            pass
+    except StatementRowError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc)
+        )
+
+    summary = progress.as_dict()
+    summary.pop("done")
+    return StatementImportResponse(**summary, dry_run=dry_run)
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -104,7 +320,7 @@ async def get_transaction(
 @router.post("", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new transaction"""
@@ -122,7 +338,7 @@ async def create_transaction(
 async def update_transaction(
     transaction_id: int,
     transaction_data: TransactionUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a transaction"""
@@ -146,7 +362,7 @@ async def update_transaction(
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(
     transaction_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a transaction"""
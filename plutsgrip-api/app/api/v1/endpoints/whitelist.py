@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import AuthenticatedUser
 from app.schemas.whitelist import (
     WhitelistCreateRequest,
     WhitelistResponse,
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/admin/whitelist", tags=["Admin - Whitelist"])
 
 @router.get("", response_model=WhitelistListResponse)
 async def list_whitelist(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -43,7 +43,7 @@ async def list_whitelist(
 @router.post("", response_model=WhitelistResponse, status_code=status.HTTP_201_CREATED)
 async def add_to_whitelist(
     whitelist_data: WhitelistCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -74,7 +74,7 @@ async def add_to_whitelist(
 @router.delete("/{whitelist_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_from_whitelist(
     whitelist_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
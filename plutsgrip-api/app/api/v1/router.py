@@ -1,7 +1,9 @@
 """
 API v1 router - Aggregates all endpoint routers
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from app.api.dependencies import conditional_get, rate_limit_user
+from app.core.cache_backends import shared_cache
 from app.api.v1.endpoints import (
     auth,
     transactions,
@@ -16,12 +18,21 @@ from app.api.v1.endpoints import (
 # Create main API v1 router
 api_router = APIRouter(prefix="/api")
 
+# User-scoped routers are rate limited per user and route class, and
+# answer GETs conditionally (ETag / If-None-Match). ETags come from the
+# per-user data version, so they are only issued when every worker shares
+# it: with a per-worker backend, a write handled by one worker would leave
+# the others answering 304 with stale data.
+user_scoped = [Depends(rate_limit_user)]
+if shared_cache.shared:
+    user_scoped.append(Depends(conditional_get))
+
 # Include all endpoint routers
 api_router.include_router(auth.router)
-api_router.include_router(transactions.router)
-api_router.include_router(categories.router)
-api_router.include_router(reports.router)
-api_router.include_router(budgets.router)
-api_router.include_router(goals.router)
-api_router.include_router(recurring_transactions.router)
+api_router.include_router(transactions.router, dependencies=user_scoped)
+api_router.include_router(categories.router, dependencies=user_scoped)
+api_router.include_router(reports.router, dependencies=user_scoped)
+api_router.include_router(budgets.router, dependencies=user_scoped)
+api_router.include_router(goals.router, dependencies=user_scoped)
+api_router.include_router(recurring_transactions.router, dependencies=user_scoped)
 api_router.include_router(whitelist.router)
@@ -0,0 +1,119 @@
+"""
+In-process caching primitives
+Bounded LRU cache with per-entry time-to-live
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[ValueType]):
+    """
+    Bounded LRU cache whose entries expire after a time-to-live
+
+    The cache lives in the worker process; it is not shared between
+    gunicorn workers. Operations are O(1) and safe to call from the
+    event loop without awaiting.
+
+    Type Parameters:
+        ValueType: Type of the cached values
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+            ttl_seconds: Default lifetime of an entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, ValueType]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: ValueType, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Optional lifetime overriding the cache default
+        """
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a key if present"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,355 @@
+"""
+Pluggable key-value cache backends
+Used for data that should be shared between gunicorn workers on the same host
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class CacheBackend(ABC):
+    """
+    Interface for cache backends
+
+    Backends store arbitrary picklable values with a time-to-live, plus
+    integer counters that never expire. Counters are created on first use
+    with a time-based seed, so a counter that was lost (evicted, file
+    removed, process restarted) never comes back with a value it already had.
+    Implementations must never raise on cache failures; they behave as a miss.
+    """
+
+    name: str = "abstract"
+    # Whether every worker sees the same values and counters
+    shared: bool = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None when missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Get a counter, creating it with a fresh seed when missing"""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment a counter and return the new value"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values and counters"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics"""
+
+
+def open_sqlite_connection(path: str, busy_timeout_ms: int) -> sqlite3.Connection:
+    """
+    Open a SQLite connection tuned for many processes sharing one file
+
+    WAL journaling lets readers proceed while one process writes; the busy
+    timeout bounds how long a writer waits for the lock. The connection is
+    in autocommit mode and may be used from any thread (callers serialize
+    access with their own lock).
+
+    Args:
+        path: Database file, created with its directory when missing
+        busy_timeout_ms: Lock wait limit in milliseconds
+
+    Returns:
+        Open connection
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(
+        path,
+        timeout=busy_timeout_ms / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _counter_seed() -> int:
+    return time.time_ns()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process backend built on TTLCache
+
+    Fast, but each gunicorn worker has its own copy: writes handled by one
+    worker only invalidate that worker's entries.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self._values: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl_seconds=0)
+        self._counters: TTLCache[int] = TTLCache(maxsize=maxsize, ttl_seconds=float("inf"))
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._values.get(key)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._values.set(key, value, ttl_seconds=ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self._values.pop(key)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                value = _counter_seed()
+                self._counters.set(key, value)
+            return value
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key)
+            value = _counter_seed() if value is None else value + 1
+            self._counters.set(key, value)
+            return value
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._counters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self._values.stats(), "counters": len(self._counters)}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Host-local backend stored in a SQLite file shared by all workers
+
+    Uses WAL mode so readers never block the single writer. Entries carry a
+    wall-clock expiry and a last-access time used for LRU pruning once the
+    table grows past maxsize. Each process opens its own connection lazily
+    (after gunicorn forks).
+    """
+
+    name = "sqlite"
+    shared = True
+
+    # Prune at most once per this many writes to keep set() cheap
+    PRUNE_INTERVAL = 64
+    # Minimum seconds between last-access updates for the same entry
+    TOUCH_INTERVAL = 1.0
+
+    def __init__(self, path: str, maxsize: int, busy_timeout_ms: int = 200):
+        self.path = path
+        self.maxsize = maxsize
+        self.busy_timeout_ms = busy_timeout_ms
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = open_sqlite_connection(self.path, self.busy_timeout_ms)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _failed(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning(f"SQLite cache {operation} failed: {exc}")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    self.misses += 1
+                    return None
+                if row[2] < now - self.TOUCH_INTERVAL:
+                    connection.execute(
+                        "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.PickleError, EOFError) as exc:
+            self._failed("get", exc)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0 or self.maxsize <= 0:
+            return
+        now = time.time()
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, now + ttl_seconds, now),
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                    self._writes_since_prune = 0
+                    self._prune(connection, now)
+        except (sqlite3.Error, pickle.PickleError) as exc:
+            self._failed("set", exc)
+
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        (size,) = connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        overflow = size - self.maxsize
+        if overflow > 0:
+            connection.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+
+    def delete(self, key: str) -> None:
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            self._failed("delete", exc)
+
+    def get_counter(self, key: str) -> int:
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT INTO cache_counters (key, value) VALUES (?, ?) ON CONFLICT(key) DO NOTHING",
+                    (key, _counter_seed()),
+                )
+                (value,) = connection.execute(
+                    "SELECT value FROM cache_counters WHERE key = ?", (key,)
+                ).fetchone()
+                return value
+        except sqlite3.Error as exc:
+            self._failed("get_counter", exc)
+            # A fresh seed never matches a cached version, so readers fall through to the database
+            return _counter_seed()
+
+    def incr(self, key: str) -> int:
+        try:
+            with self._lock:
+                (value,) = self._connect().execute(
+                    "INSERT INTO cache_counters (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = value + 1 RETURNING value",
+                    (key, _counter_seed()),
+                ).fetchone()
+                return value
+        except sqlite3.Error as exc:
+            self._failed("incr", exc)
+            return _counter_seed()
+
+    def clear(self) -> None:
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute("DELETE FROM cache_entries")
+                connection.execute("DELETE FROM cache_counters")
+        except sqlite3.Error as exc:
+            self._failed("clear", exc)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        size = None
+        try:
+            with self._lock:
+                (size,) = self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        except sqlite3.Error as exc:
+            self._failed("stats", exc)
+
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "size": size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_cache_backend(kind: str, maxsize: int, sqlite_path: Optional[str] = None) -> CacheBackend:
+    """
+    Create a cache backend by name
+
+    Args:
+        kind: "memory" (per worker) or "sqlite" (shared by workers on the host)
+        maxsize: Maximum number of cached values
+        sqlite_path: Database file used by the sqlite backend
+
+    Returns:
+        Cache backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    kind = kind.lower()
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=maxsize)
+    if kind == "sqlite":
+        return SQLiteCacheBackend(path=sqlite_path or settings.CACHE_SQLITE_PATH, maxsize=maxsize)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+# Backend shared by the report cache and the per-user data version
+shared_cache: CacheBackend = build_cache_backend(
+    settings.CACHE_BACKEND,
+    maxsize=settings.CACHE_MAX_ENTRIES,
+    sqlite_path=settings.CACHE_SQLITE_PATH,
+)
@@ -0,0 +1,213 @@
+"""
+Cross-worker change notifications
+Background refresher driven by PostgreSQL LISTEN/NOTIFY with a polling fallback
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import log_error, log_info
+from app.core.metrics import metrics
+
+
+async def notify_change(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """
+    Queue a change notification in the session's transaction
+
+    PostgreSQL delivers NOTIFY only when the transaction commits, so call
+    this before ``commit()``: listeners never reload ahead of the data, and
+    a rolled back write notifies nobody.
+
+    Args:
+        session: Session holding the write
+        channel: Notification channel
+        payload: Optional payload (informational)
+    """
+    await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+class BackgroundRefresher:
+    """
+    Keeps per-worker in-memory state in sync with the database
+
+    Each worker holds one dedicated LISTEN connection. A notification wakes
+    the refresher, which waits ``debounce_seconds`` to coalesce bursts and
+    calls ``reload``, so writes made by any worker reach every worker well
+    within a second. Every ``refresh_seconds`` the state is reloaded anyway
+    (time-based expiry, missed notifications).
+
+    When LISTEN is unavailable (connection refused, not PostgreSQL) the
+    refresher polls ``fingerprint`` every ``poll_seconds`` instead and only
+    reloads when it changes, retrying LISTEN every ``refresh_seconds``.
+    Nothing here runs on the request path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        channel: str,
+        reload: Callable[[], Awaitable[Any]],
+        fingerprint: Optional[Callable[[], Awaitable[Any]]] = None,
+        connect_args: Optional[Callable[[], Dict[str, Any]]] = None,
+        poll_seconds: float = 1.0,
+        refresh_seconds: float = 60.0,
+        debounce_seconds: float = 0.05,
+    ):
+        """
+        Initialize refresher (nothing runs until start())
+
+        Args:
+            name: Name used in logs and metrics
+            channel: PostgreSQL notification channel
+            reload: Coroutine function rebuilding the in-memory state
+            fingerprint: Coroutine function returning a cheap change marker for polling
+            connect_args: Returns asyncpg.connect() keyword arguments; None disables LISTEN
+            poll_seconds: Fingerprint polling interval without LISTEN
+            refresh_seconds: Unconditional reload interval
+            debounce_seconds: Delay used to coalesce bursts of notifications
+        """
+        self.name = name
+        self.channel = channel
+        self._reload = reload
+        self._fingerprint = fingerprint
+        self._connect_args = connect_args
+        self.poll_seconds = poll_seconds
+        self.refresh_seconds = refresh_seconds
+        self.debounce_seconds = debounce_seconds
+
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._connection: Any = None
+        self._next_listen_attempt = 0.0
+        self._last_fingerprint: Any = None
+        self._last_reload = 0.0
+        self.notifications = 0
+        self.reloads = 0
+        self.errors = 0
+
+    @property
+    def listening(self) -> bool:
+        """Whether a LISTEN connection is open"""
+        return self._connection is not None and not self._connection.is_closed()
+
+    def notify(self, *args: Any) -> None:
+        """Wake the refresher (asyncpg listener callback signature)"""
+        self.notifications += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Load the current state, then keep it fresh in a background task"""
+        self._wakeup = asyncio.Event()
+        await self.reload()
+        self._task = asyncio.create_task(self._run(), name=f"{self.name}-refresher")
+
+    async def stop(self) -> None:
+        """Stop the task and close the LISTEN connection"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close_listener()
+
+    async def reload(self) -> bool:
+        """
+        Reload the state now
+
+        Returns:
+            True on success; failures are logged and retried on the next wakeup
+        """
+        try:
+            if self._fingerprint is not None:
+                self._last_fingerprint = await self._fingerprint()
+            await self._reload()
+        except Exception as e:
+            self.errors += 1
+            log_error(f"{self.name} refresh failed: {e}")
+            return False
+        self._last_reload = time.monotonic()
+        self.reloads += 1
+        metrics.increment(f"{self.name}.reloads")
+        return True
+
+    async def _open_listener(self) -> None:
+        if self._connect_args is None or time.monotonic() < self._next_listen_attempt:
+            return
+        self._next_listen_attempt = time.monotonic() + self.refresh_seconds
+        connection = None
+        try:
+            import asyncpg
+
+            connection = await asyncpg.connect(**self._connect_args())
+            await connection.add_listener(self.channel, self.notify)
+            connection.add_termination_listener(self.notify)
+        except Exception as e:
+            if connection is not None:
+                connection.terminate()
+            self.errors += 1
+            log_error(f"{self.name}: LISTEN {self.channel} unavailable, polling every {self.poll_seconds}s: {e}")
+            return
+        self._connection = connection
+        log_info(f"{self.name}: listening for changes on {self.channel}")
+        # Changes made while no listener was open were not notified
+        await self.reload()
+
+    async def _close_listener(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            try:
+                await connection.close(timeout=2)
+            except Exception:
+                connection.terminate()
+
+    async def _changed(self) -> bool:
+        if self._fingerprint is None:
+            return False
+        try:
+            return await self._fingerprint() != self._last_fingerprint
+        except Exception as e:
+            self.errors += 1
+            log_error(f"{self.name} change check failed: {e}")
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            if not self.listening:
+                await self._close_listener()
+                await self._open_listener()
+
+            timeout = self.refresh_seconds if self.listening else self.poll_seconds
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            if self._wakeup.is_set():
+                await asyncio.sleep(self.debounce_seconds)
+                self._wakeup.clear()
+                if self.listening:
+                    await self.reload()
+                    continue
+                # Woken by a dropped connection: fall through to polling
+
+            if time.monotonic() - self._last_reload >= self.refresh_seconds or (
+                not self.listening and await self._changed()
+            ):
+                await self.reload()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get refresher mode and counters"""
+        return {
+            "mode": "listen" if self.listening else "poll",
+            "channel": self.channel,
+            "notifications": self.notifications,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "seconds_since_reload": round(time.monotonic() - self._last_reload, 3) if self._last_reload else None,
+        }
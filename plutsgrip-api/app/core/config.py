@@ -29,8 +29,30 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
 
+    # Read-only sessions for GET/HEAD requests (separate pool, autocommit, no BEGIN/COMMIT)
+    DB_READ_ONLY_GETS: bool = True
+    DB_READ_POOL_SIZE: int = 5
+    DB_READ_MAX_OVERFLOW: int = 2  # per worker, on top of DB_READ_POOL_SIZE
+    DB_READ_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the timeout
+    DB_ROUND_TRIP_HEADER: bool = False  # send X-DB-Round-Trips on every response
+
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100000  # counters kept per worker before evicting the oldest
+    TRUSTED_NETWORKS_REFRESH_SECONDS: int = 60  # background reload of whitelisted IPs/ranges
+    TRUSTED_NETWORKS_LISTEN: bool = True  # reload on PostgreSQL NOTIFY from any worker
+    TRUSTED_NETWORKS_POLL_SECONDS: float = 1.0  # change check interval when LISTEN is unavailable
+
+    # Per-user token buckets by route class ("<burst>/<period>", refilled evenly)
+    # sqlite is shared by workers on the host; memory is per worker, so each
+    # worker would allow the full limit (single-worker and development setups only)
+    USER_RATE_LIMIT_BACKEND: str = "sqlite"
+    USER_RATE_LIMIT_SQLITE_PATH: str = "/tmp/plutusgrip-ratelimit.sqlite3"
+    USER_RATE_LIMIT_READ: str = "300/minute"
+    USER_RATE_LIMIT_WRITE: str = "60/minute"
+    USER_RATE_LIMIT_REPORTS: str = "60/minute"
+    USER_RATE_LIMIT_EXPORT: str = "10/minute"
+    USER_RATE_LIMIT_BULK: str = "10/minute"
 
     # Security
     SECRET_KEY: str = Field(..., min_length=32)
@@ -38,6 +60,24 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Authenticated principal cache (per worker)
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Verified JWT claims cache (per worker; entries never outlive the token)
+    TOKEN_DECODE_CACHE_SIZE: int = 10000
+    TOKEN_DECODE_CACHE_TTL_SECONDS: int = 300
+
+    # Shared cache backend ("memory" per worker, "sqlite" shared by workers on the host)
+    CACHE_BACKEND: str = "sqlite"
+    CACHE_SQLITE_PATH: str = "/tmp/plutusgrip-cache.sqlite3"
+    CACHE_MAX_ENTRIES: int = 20000
+
+    # Report result cache (invalidated by the per-user data version; only
+    # used with a shared CACHE_BACKEND)
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_TTL_SECONDS: int = 300
+
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     ALLOWED_METHODS: str = "GET,POST,PUT,DELETE,OPTIONS"
@@ -49,10 +89,51 @@ class Settings(BaseSettings):
     LOG_MAX_BYTES: int = 10485760  # 10MB
     LOG_BACKUP_COUNT: int = 5
 
+    # Token revocation store: sqlite (workers on one host), database (all hosts)
+    # or memory (per worker: single-worker and development setups only)
+    TOKEN_REVOCATION_BACKEND: str = "sqlite"
+    TOKEN_REVOCATION_SQLITE_PATH: str = "/tmp/plutusgrip-revocations.sqlite3"
+
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread or process
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # List endpoints render JSON through precompiled TypeAdapters (one validation pass)
+    FAST_JSON_RESPONSES: bool = True
+
+    # Bulk transaction creation
+    TRANSACTION_BULK_MAX_ITEMS: int = 10000
+
+    # Statement import (rows per INSERT batch and commit)
+    STATEMENT_IMPORT_BATCH_SIZE: int = 1000
+
+    # Recurring transaction materializer (templates per batch/commit, concurrent
+    # workers partitioned by user, occurrences generated per template and run)
+    RECURRING_BATCH_SIZE: int = 5000
+    RECURRING_WORKERS: int = 4
+    RECURRING_MAX_CATCH_UP: int = 366
+    RECURRING_CALENDAR_MAX_DAYS: int = 1830  # longest cash flow calendar period (about 5 years)
+
+    # In-process scheduler: one worker is elected leader through a PostgreSQL
+    # advisory lock and runs the jobs; schedules are cron expressions in UTC
+    # (an empty expression disables the job)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LOCK_KEY: int = 7_301_152_001
+    SCHEDULER_ELECTION_SECONDS: float = 15.0  # election retry / leader health check interval
+    SCHEDULER_JITTER_SECONDS: float = 30.0  # random delay added to each run
+    SCHEDULER_HISTORY_DAYS: int = 30
+    SCHEDULER_RECURRING_CRON: str = "10 * * * *"
+    SCHEDULER_WHITELIST_EXPIRY_CRON: str = "*/5 * * * *"
+    SCHEDULER_ROLLUP_COMPACTION_CRON: str = "30 3 * * *"
+    SCHEDULER_HISTORY_PRUNE_CRON: str = "45 3 * * *"
+    SCHEDULER_CACHE_WARM_CRON: str = "5 0 * * *"  # only with a shared CACHE_BACKEND
+    SCHEDULER_CACHE_WARM_USERS: int = 500
+
     @property
     def allowed_origins_list(self) -> List[str]:
         """Convert comma-separated ALLOWED_ORIGINS to list"""
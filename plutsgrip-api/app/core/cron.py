@@ -0,0 +1,118 @@
+"""
+Cron expressions for scheduled jobs
+Standard five-field syntax evaluated in UTC
+"""
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+# Shorthands accepted in place of the five fields
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+}
+
+# (name, minimum, maximum) of each field, in order
+FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+
+def _parse_field(value: str, name: str, minimum: int, maximum: int) -> FrozenSet[int]:
+    """Expand one field (``*``, ``5``, ``1-5``, ``*/15``, ``0-30/10``, ``1,15``) into its values"""
+    values = set()
+    for part in value.split(","):
+        body, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if body == "*":
+            start, end = minimum, maximum
+        elif "-" in body:
+            start_text, end_text = body.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(body)
+            end = maximum if step_text else start
+        if step < 1 or start < minimum or end > maximum or start > end:
+            raise ValueError(f"Invalid cron {name} field: {value!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    Parsed cron expression
+
+    Fields are minute, hour, day of month, month and day of week (0 or 7 is
+    Sunday). As in cron, when both day fields are restricted a day matches
+    if either of them does.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse an expression
+
+        Args:
+            expression: Five fields or an alias such as ``@hourly``
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"Cron expression must have {len(FIELDS)} fields: {expression!r}")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(value, name, minimum, maximum)
+            for value, (name, minimum, maximum) in zip(fields, FIELDS)
+        )
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first matching minute strictly after ``moment``
+
+        Args:
+            moment: Reference time (naive UTC)
+
+        Returns:
+            Next run time
+
+        Raises:
+            ValueError: If nothing matches within five years (e.g. ``0 0 30 2 *``)
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        horizon = candidate.year + 5
+
+        while candidate.year <= horizon:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
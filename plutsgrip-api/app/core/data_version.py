@@ -0,0 +1,41 @@
+"""
+Per-user data version
+Monotonic counter bumped after every committed write to a user's data
+"""
+from app.core.cache_backends import shared_cache
+
+
+def _version_key(user_id: int) -> str:
+    return f"data_version:{user_id}"
+
+
+def get_data_version(user_id: int) -> int:
+    """
+    Get the current data version of a user
+
+    Anything derived from the user's data (report results, ETags) can be
+    keyed by this value: it changes whenever the data changes.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Current version
+    """
+    return shared_cache.get_counter(_version_key(user_id))
+
+
+def bump_data_version(user_id: int) -> int:
+    """
+    Advance the data version of a user
+
+    Call after the write is committed, never before: a reader that sees the
+    new version must also see the new data.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        New version
+    """
+    return shared_cache.incr(_version_key(user_id))
@@ -3,10 +3,12 @@ Database configuration and session management
 Uses SQLAlchemy 2.0 async engine
 """
 from typing import AsyncGenerator
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
 from app.core.database_url import normalize_async_database_url
+from app.core.round_trips import instrument_round_trips
 
 # Convert a standard PostgreSQL URL into an asyncpg-compatible DSN.
 DATABASE_URL = normalize_async_database_url(settings.DATABASE_URL)
@@ -32,19 +34,89 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+
+def _read_server_settings() -> dict:
+    """Session parameters sent in the startup packet of every read connection"""
+    server_settings = {"default_transaction_read_only": "on"}
+    if settings.DB_READ_STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(settings.DB_READ_STATEMENT_TIMEOUT_MS)
+    return server_settings
+
+
+def create_read_engine(url: str, **kwargs):
+    """
+    Create the engine used for read-only sessions
+
+    Connections are read only and carry the statement timeout from the
+    moment they are opened, and run in autocommit, so a request costs its
+    statements only: no BEGIN, no COMMIT and no per-request SET LOCAL. Each
+    statement sees its own snapshot. Code that needs a transaction (a
+    server-side cursor) opens one explicitly, see
+    TransactionRepository.stream_export_rows.
+    """
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        execution_options={"isolation_level": "AUTOCOMMIT"},
+        connect_args={"server_settings": _read_server_settings()},
+        **kwargs,
+    )
+
+
+# Read-only engine for GET/HEAD requests
+read_engine = create_read_engine(DATABASE_URL)
+
+ReadOnlySessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+instrument_round_trips(engine)
+instrument_round_trips(read_engine)
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
 # Base class for declarative models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only async database sessions
+
+    The session never commits. Any write fails with "cannot execute ... in
+    a read-only transaction".
+    """
+    async with ReadOnlySessionLocal() as session:
+        yield session
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database sessions
 
+    GET and HEAD requests get a read-only session (see get_read_db) unless
+    DB_READ_ONLY_GETS is off; other methods get a session that commits
+    after the handler and rolls back on error.
+
     Usage in FastAPI endpoints:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
             ...
     """
+    if settings.DB_READ_ONLY_GETS and request.method in READ_ONLY_METHODS:
+        async with ReadOnlySessionLocal() as session:
+            yield session
+        return
+
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -68,6 +140,7 @@ async def init_db() -> None:
 async def close_db() -> None:
     """Close database connections"""
     await engine.dispose()
+    await read_engine.dispose()
 
 
 async def remove_default_categories() -> None:
@@ -0,0 +1,70 @@
+"""
+Fast-path JSON serialization for list endpoints
+Response payloads are validated once by a precompiled TypeAdapter and encoded by pydantic-core
+"""
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class JSONListSerializer:
+    """
+    Renders list endpoint payloads straight to JSON bytes
+
+    The default FastAPI path validates every ORM object into a response
+    model in a Python loop, dumps the result back to Python objects, validates
+    them again against ``response_model`` and finally encodes them with
+    ``json.dumps``. Here the validator and serializer are built once at
+    import, the payload (ORM objects or rows, read through their attributes)
+    is validated in a single pass and encoded to JSON in pydantic-core.
+    Endpoints keep ``response_model`` for the OpenAPI schema.
+    """
+
+    def __init__(self, schema: Any, enabled: Optional[bool] = None):
+        """
+        Initialize serializer
+
+        Args:
+            schema: Response type (e.g. ``list[BudgetResponse]`` or a list envelope model)
+            enabled: Whether the fast path is used (defaults to FAST_JSON_RESPONSES)
+        """
+        self.adapter = TypeAdapter(schema)
+        self.enabled = settings.FAST_JSON_RESPONSES if enabled is None else enabled
+
+    def dump_json(self, content: Any) -> bytes:
+        """
+        Validate and encode a payload
+
+        Args:
+            content: Value matching the schema; models may be given as ORM objects or dicts
+
+        Returns:
+            UTF-8 JSON document
+        """
+        return self.adapter.dump_json(self.adapter.validate_python(content, from_attributes=True))
+
+    def render(self, content: Any, response: Response) -> Any:
+        """
+        Build the endpoint's return value
+
+        Args:
+            content: Payload matching the schema
+            response: Response injected into the endpoint; headers set on it
+                by dependencies (ETag, RateLimit-*) are carried over
+
+        Returns:
+            Rendered response, or ``content`` unchanged for FastAPI to
+            serialize when the fast path is disabled
+        """
+        if not self.enabled:
+            return content
+
+        rendered = Response(content=self.dump_json(content), media_type="application/json")
+        # FastAPI only merges dependency headers into responses it builds itself
+        rendered.headers.raw.extend(response.headers.raw)
+        metrics.increment("fast_json.responses")
+        return rendered
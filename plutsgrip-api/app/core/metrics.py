@@ -0,0 +1,78 @@
+"""
+Lightweight in-process metrics registry
+Counters and gauge callbacks exposed through the /metrics endpoint
+"""
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """
+    Registry of named counters and gauges
+
+    Counters are plain integers incremented from request code. Gauges are
+    callbacks evaluated when a snapshot is taken, which lets components such
+    as caches report their own statistics without pushing updates. Values are
+    per worker process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter
+
+        Args:
+            name: Dotted counter name (e.g. "report_cache.hits")
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def register_gauge(self, name: str, callback: Callable[[], Any]) -> None:
+        """
+        Register a gauge callback, replacing any previous one with the same name
+
+        Args:
+            name: Gauge name
+            callback: Zero-argument callable returning a JSON-serializable value
+        """
+        with self._lock:
+            self._gauges[name] = callback
+
+    def get_counter(self, name: str) -> int:
+        """Get the current value of a counter"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all counters and evaluated gauges
+
+        Returns:
+            Dictionary with "counters" and "gauges"
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        evaluated = {}
+        for name, callback in gauges.items():
+            try:
+                evaluated[name] = callback()
+            except Exception as exc:  # A broken gauge must not break the endpoint
+                evaluated[name] = {"error": str(exc)}
+
+        return {"counters": counters, "gauges": evaluated}
+
+    def reset(self) -> None:
+        """Reset all counters (gauges stay registered)"""
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = MetricsRegistry()
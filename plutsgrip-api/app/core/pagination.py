@@ -0,0 +1,43 @@
+"""
+Opaque cursor encoding for keyset pagination
+"""
+import base64
+import json
+from datetime import date
+from typing import Tuple
+
+
+def encode_date_id_cursor(last_date: date, last_id: int) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor
+
+    Args:
+        last_date: Date of the last row returned
+        last_id: ID of the last row returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"d": last_date.isoformat(), "i": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_date_id_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Decode a cursor produced by encode_date_id_cursor
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        Tuple of (date, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(payload["d"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
@@ -0,0 +1,177 @@
+"""
+Password hashing off the event loop
+Runs bcrypt in a bounded thread or process pool so logins never block other requests
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import get_password_hash, verify_password
+
+ResultType = TypeVar("ResultType")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+    """
+    Bounded executor for password hashing and verification
+
+    At most ``max_workers`` hashes run at once; up to ``max_pending`` more
+    wait in the queue, and further calls fail fast with PasswordHasherBusy
+    instead of piling up behind a login storm. bcrypt releases the GIL while
+    hashing, so the thread pool already runs hashes in parallel; the process
+    pool is available for hosts where that is not enough.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 2, max_pending: int = 64):
+        """
+        Initialize hasher (the pool itself is created on first use)
+
+        Args:
+            kind: "thread" or "process"
+            max_workers: Concurrent hashing operations
+            max_pending: Operations allowed to wait for a worker
+
+        Raises:
+            ValueError: If the executor kind is unknown
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._peak_queued = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    async def _run(self, operation: str, func: Callable[..., ResultType], *args: Any) -> ResultType:
+        with self._lock:
+            if self._active + self._queued >= self.max_workers + self.max_pending:
+                metrics.increment("password_hash.rejected")
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        submitted = time.perf_counter()
+        started: Optional[float] = None
+        abandoned = False
+
+        def tracked() -> Optional[ResultType]:
+            # Runs in the worker: the call leaves the queue when a worker picks it up
+            nonlocal started
+            with self._lock:
+                if abandoned:
+                    return None
+                self._queued -= 1
+                self._active += 1
+                started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            if self.kind == "process":
+                # Queue position cannot be observed inside a child process,
+                # so process calls count as active from submission
+                with self._lock:
+                    self._queued -= 1
+                    self._active += 1
+                    started = submitted
+                result = await loop.run_in_executor(self._get_executor(), func, *args)
+            else:
+                result = await loop.run_in_executor(self._get_executor(), tracked)
+        finally:
+            with self._lock:
+                if self.kind == "process":
+                    self._active -= 1
+                elif started is None:
+                    # Cancelled while queued: the worker will skip the call
+                    abandoned = True
+                    self._queued -= 1
+
+        finished = time.perf_counter()
+        metrics.increment(f"password_hash.{operation}")
+        metrics.increment("password_hash.wait_us", int(((started or finished) - submitted) * 1_000_000))
+        metrics.increment("password_hash.run_us", int((finished - (started or submitted)) * 1_000_000))
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password without blocking the event loop
+
+        Args:
+            plain_password: Plain text password
+            hashed_password: Hashed password from database
+
+        Returns:
+            True if password matches, False otherwise
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password without blocking the event loop
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            Hashed password string
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run("hash", get_password_hash, password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool configuration and current queue depth"""
+        with self._lock:
+            return {
+                "executor": self.kind,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool; it is recreated on the next call"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+metrics.register_gauge("password_hasher", password_hasher.stats)
@@ -0,0 +1,70 @@
+"""
+Authenticated principal resolution
+Lightweight user snapshot used by the auth dependency, cached per worker
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """
+    Column-only snapshot of the authenticated user
+
+    Carries exactly the fields exposed by UserResponse so that
+    endpoints never need the full ORM entity (and its relationships).
+    """
+
+    id: int
+    name: str
+    email: str
+    currency: str
+    timezone: str
+    created_at: datetime
+    updated_at: datetime
+
+
+# Per-worker cache of principals keyed by user id. Invalidation is local to the
+# worker, so the TTL bounds how long other workers may serve a stale snapshot.
+principal_cache: TTLCache[AuthenticatedUser] = TTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("principal_cache", principal_cache.stats)
+
+
+def get_cached_principal(user_id: int) -> Optional[AuthenticatedUser]:
+    """
+    Get a cached principal
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Cached principal or None on miss
+    """
+    return principal_cache.get(user_id)
+
+
+def cache_principal(principal: AuthenticatedUser) -> None:
+    """
+    Store a principal in the cache
+
+    Args:
+        principal: Principal loaded from the database
+    """
+    principal_cache.set(principal.id, principal)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Drop a cached principal (call after updating or deleting the user)
+
+    Args:
+        user_id: User ID
+    """
+    principal_cache.pop(user_id)
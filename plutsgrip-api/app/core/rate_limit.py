@@ -2,9 +2,7 @@
 Configuração customizada de rate limiting com suporte a IPs confiáveis
 """
 from fastapi import Request
-from sqlalchemy import select
-from app.core.database import AsyncSessionLocal
-from app.models.trusted_ip import TrustedIP
+from app.core.trusted_networks import is_trusted_ip
 
 
 async def get_remote_address_with_whitelist(request: Request) -> str:
@@ -14,6 +12,9 @@ async def get_remote_address_with_whitelist(request: Request) -> str:
 
     Se o IP estiver na whitelist, retorna "trusted_ip" que não será limitado.
     Caso contrário, retorna o endereço IP normal para aplicar rate limiting.
+
+    A verificação usa o índice de redes confiáveis em memória (IPs e faixas
+    CIDR de trusted_ips e rate_limit_whitelists), sem acesso ao banco.
     """
     # Tenta obter o IP real através de headers de proxy
     forwarded = request.headers.get("X-Forwarded-For")
@@ -22,23 +23,9 @@ async def get_remote_address_with_whitelist(request: Request) -> str:
     else:
         client_ip = request.client.host if request.client else "unknown"
 
-    # Verificar se o IP está na whitelist
-    try:
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(TrustedIP).where(
-                    TrustedIP.ip_address == client_ip,
-                    TrustedIP.is_active == True
-                )
-            )
-            trusted_ip = result.scalar_one_or_none()
-
-            if trusted_ip:
-                # IP confiável - retorna identificador especial que não será limitado
-                return f"trusted_ip_{client_ip}"
-    except Exception as e:
-        # Em caso de erro na consulta, continua com o IP normal
-        pass
+    if is_trusted_ip(client_ip):
+        # IP confiável - retorna identificador especial que não será limitado
+        return f"trusted_ip_{client_ip}"
 
     # IP não confiável - retorna IP normal para rate limiting
     return client_ip
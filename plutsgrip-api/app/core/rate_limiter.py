@@ -2,68 +2,120 @@
 Rate Limiter Configuration
 Custom rate limiter that respects IP whitelist
 """
-from typing import Optional, Set
-from datetime import datetime
+import sys
+from typing import Any, Dict, Optional
 from fastapi import Request
+from limits.storage import MemoryStorage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from app.core.metrics import metrics
+from app.core.trusted_networks import is_trusted_ip
 
 
-# In-memory whitelist cache (synced from database)
-_whitelist_cache: Set[str] = set()
-_whitelist_last_sync: Optional[datetime] = None
-_whitelist_sync_interval = 60  # seconds
+def get_rate_limit_key(request: Request) -> str:
+    """
+    Key function for rate limiting: the client IP
+
+    Whitelisted clients never reach this function; WhitelistAwareLimiter
+    skips them before any counter is looked up.
+    """
+    return get_remote_address(request)
 
 
-def get_whitelist_cache() -> Set[str]:
-    """Get the current whitelist cache"""
-    return _whitelist_cache
+def is_ip_whitelisted(ip: str) -> bool:
+    """Check if an IP is covered by a trusted network (in-memory, no database access)"""
+    return is_trusted_ip(ip)
 
 
-def update_whitelist_cache(ips: Set[str]) -> None:
-    """Update the whitelist cache"""
-    global _whitelist_cache, _whitelist_last_sync
-    _whitelist_cache = ips
-    _whitelist_last_sync = datetime.utcnow()
+class BoundedMemoryStorage(MemoryStorage):
+    """
+    In-memory limits storage with a cap on the number of counters
 
+    The stock MemoryStorage only forgets a key when its window expires, so a
+    flood of distinct clients grows it without bound (and its expiry sweep
+    walks every key). Once ``max_keys`` counters exist, the oldest windows
+    are evicted first: they are the closest to resetting anyway, so an
+    evicted client at worst gets a fresh window early.
+    """
 
-def cache_needs_refresh() -> bool:
-    """Check if cache needs to be refreshed"""
-    if _whitelist_last_sync is None:
-        return True
-    elapsed = (datetime.utcnow() - _whitelist_last_sync).total_seconds()
-    return elapsed > _whitelist_sync_interval
+    STORAGE_SCHEME = ["bounded-memory"]
 
+    def __init__(self, uri: Optional[str] = None, max_keys: int = 100000, **options: Any):
+        super().__init__(uri, **options)
+        self.max_keys = int(max_keys)
+        self.evictions = 0
 
-def get_rate_limit_key(request: Request) -> str:
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        if key not in self.storage:
+            self._evict_for_new_key()
+        return super().incr(key, expiry, amount)
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if key not in self.events:
+            self._evict_for_new_key()
+        return super().acquire_entry(key, limit, expiry, amount)
+
+    def _evict_for_new_key(self) -> None:
+        # Dicts keep insertion order, so the first keys are the oldest windows
+        while len(self.expirations) >= self.max_keys:
+            oldest = next(iter(self.expirations))
+            self.clear(oldest)
+            self.evictions += 1
+        while len(self.events) >= self.max_keys:
+            self.clear(next(iter(self.events)))
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counter count, eviction count and an estimate of the memory held"""
+        keys = list(self.storage) + list(self.events)
+        approx_bytes = (
+            sys.getsizeof(self.storage)
+            + sys.getsizeof(self.expirations)
+            + sys.getsizeof(self.events)
+            + sys.getsizeof(self.locks)
+            + sum(sys.getsizeof(key) for key in keys)
+        )
+        return {
+            "keys": len(self.storage),
+            "moving_window_keys": len(self.events),
+            "locks": len(self.locks),
+            "max_keys": self.max_keys,
+            "evictions": self.evictions,
+            "approx_bytes": approx_bytes,
+        }
+
+
+class WhitelistAwareLimiter(Limiter):
     """
-    Custom key function for rate limiting
-    
-    Returns a special key for whitelisted IPs that effectively
-    exempts them from rate limiting by giving them their own bucket.
-    
-    For whitelisted IPs, returns "whitelist:{ip}" which won't be rate limited
-    because each IP gets its own counter that resets.
-    
-    For non-whitelisted IPs, returns the normal IP-based key.
+    slowapi Limiter that lets whitelisted clients through untouched
+
+    The check happens before slowapi evaluates any limit, so whitelisted
+    traffic creates no counters and costs one trusted network lookup.
     """
-    ip = get_remote_address(request)
-    
-    # Check if IP is in whitelist cache
-    if ip in _whitelist_cache:
-        # Return a unique key per request to effectively bypass rate limits
-        # Using timestamp ensures each request gets a fresh counter
-        return f"whitelist_exempt_{ip}_{datetime.utcnow().timestamp()}"
-    
-    return ip
 
+    def _check_request_limit(self, request: Request, endpoint_func, in_middleware: bool = True) -> None:
+        if self.enabled and is_ip_whitelisted(get_remote_address(request)):
+            # slowapi reads this when injecting rate limit headers
+            request.state.view_rate_limit = None
+            metrics.increment("rate_limit.whitelist_exempt")
+            return
+        super()._check_request_limit(request, endpoint_func, in_middleware)
 
-def is_ip_whitelisted(ip: str) -> bool:
-    """Check if an IP is in the whitelist cache"""
-    return ip in _whitelist_cache
+    def stats(self) -> Dict[str, Any]:
+        """Get storage statistics for the metrics endpoint"""
+        storage = self._storage
+        if isinstance(storage, BoundedMemoryStorage):
+            return storage.stats()
+        return {"storage": type(storage).__name__}
 
 
 from app.core.config import settings
 
-# Create the limiter with custom key function
-limiter = Limiter(key_func=get_rate_limit_key, enabled=settings.RATE_LIMIT_ENABLED)
+# Create the limiter with custom key function and a bounded counter store
+limiter = WhitelistAwareLimiter(
+    key_func=get_rate_limit_key,
+    enabled=settings.RATE_LIMIT_ENABLED,
+    storage_uri="bounded-memory://",
+    storage_options={"max_keys": settings.RATE_LIMIT_MAX_KEYS},
+)
+metrics.register_gauge("rate_limiter", limiter.stats)
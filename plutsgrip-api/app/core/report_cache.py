@@ -0,0 +1,148 @@
+"""
+Report result cache
+Caches computed reports per (user, data version, report, parameters)
+"""
+import functools
+import hashlib
+import inspect
+import json
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.core.cache_backends import CacheBackend, shared_cache
+from app.core.config import settings
+from app.core.data_version import get_data_version
+from app.core.metrics import metrics
+
+ResultType = TypeVar("ResultType")
+
+
+class ReportCache:
+    """
+    Cache of report results invalidated by the per-user data version
+
+    The key embeds the user's current data version, so a committed write
+    (which bumps the version) makes every cached report of that user
+    unreachable at once; stale entries then age out via LRU/TTL. The current
+    date is part of the key because reports default their period to today.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, enabled: bool = True):
+        """
+        Initialize cache
+
+        Args:
+            backend: Storage backend
+            ttl_seconds: Lifetime of cached reports
+            enabled: When False every lookup computes the report
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    @staticmethod
+    def make_key(user_id: int, version: int, report: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key of a report
+
+        Args:
+            user_id: User ID
+            version: User data version
+            report: Report name
+            params: Report parameters
+
+        Returns:
+            Cache key
+        """
+        encoded = json.dumps(
+            {"params": params or {}, "today": date.today()},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha1(encoded.encode()).hexdigest()
+        return f"report:{user_id}:{version}:{report}:{digest}"
+
+    async def get_or_compute(
+        self,
+        user_id: int,
+        report: str,
+        params: Optional[Dict[str, Any]],
+        compute: Callable[[], Awaitable[ResultType]],
+    ) -> ResultType:
+        """
+        Return a cached report or compute and store it
+
+        Args:
+            user_id: User ID
+            report: Report name
+            params: Report parameters
+            compute: Coroutine function producing the report on a miss
+
+        Returns:
+            Report result
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = self.make_key(user_id, get_data_version(user_id), report, params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            metrics.increment("report_cache.hits")
+            return cached
+
+        metrics.increment("report_cache.misses")
+        result = await compute()
+        self.backend.set(key, result, self.ttl_seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics plus hit/miss counters of this worker"""
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": metrics.get_counter("report_cache.hits"),
+            "misses": metrics.get_counter("report_cache.misses"),
+            "backend": self.backend.stats(),
+        }
+
+
+# Keys carry the data version, so a per-worker backend would let the other
+# workers serve stale reports after a write: cache only when it is shared
+report_cache = ReportCache(
+    shared_cache,
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS,
+    enabled=settings.REPORT_CACHE_ENABLED and shared_cache.shared,
+)
+metrics.register_gauge("report_cache", report_cache.stats)
+
+
+def cached_report(name: str):
+    """
+    Decorator caching an async service method that takes a ``user_id`` argument
+
+    The remaining bound arguments (with defaults applied) become the cache
+    parameters, so each distinct call shape gets its own entry.
+
+    Args:
+        name: Report name used in the cache key
+
+    Returns:
+        Method decorator
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("self")
+            user_id = params.pop("user_id")
+            return await report_cache.get_or_compute(
+                user_id, name, params, lambda: method(self, *args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Per-request database round trip counting
+Engine events feed a counter held in a context variable for the current request
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class RoundTripCounter:
+    """Round trips sent to the database by the code running in one context"""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+_current_counter: ContextVar[Optional[RoundTripCounter]] = ContextVar("db_round_trips", default=None)
+
+
+@contextmanager
+def count_round_trips() -> Iterator[RoundTripCounter]:
+    """
+    Count the round trips of instrumented engines inside the block
+
+    The counter is visible to tasks started inside the block (they copy the
+    context), so it also sees what dependencies and route handlers send.
+
+    Usage:
+        with count_round_trips() as counter:
+            await session.execute(select(User))
+        print(counter.count)
+    """
+    counter = RoundTripCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def _add(amount: int = 1) -> None:
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += amount
+
+
+def _is_autocommit(conn) -> bool:
+    return conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+
+def instrument_round_trips(engine: Union[AsyncEngine, Engine]) -> None:
+    """
+    Install the round trip listeners on an engine
+
+    Counted as one round trip each:
+    - every statement sent through a cursor (SELECT, INSERT ... RETURNING, ...)
+    - BEGIN, COMMIT and ROLLBACK, unless the connection runs in AUTOCOMMIT
+      (the driver then sends none of them)
+    - the pre-ping of a pooled connection on checkout (fresh connections
+      are not pinged)
+
+    Opening a new connection is not counted; it only happens when the pool
+    grows or recycles a connection.
+
+    Args:
+        engine: Engine (sync or async) to instrument
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _statement(conn, cursor, statement, parameters, context, executemany):
+        _add()
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(conn):
+        if not _is_autocommit(conn):
+            _add()
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        if not _is_autocommit(conn):
+            _add()
+
+    @event.listens_for(sync_engine, "rollback")
+    def _rollback(conn):
+        if not _is_autocommit(conn):
+            _add()
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        connection_record.info["round_trips_fresh"] = True
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info.pop("round_trips_fresh", False):
+            return
+        if sync_engine.pool._pre_ping:
+            _add()
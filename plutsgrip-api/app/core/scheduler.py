@@ -0,0 +1,364 @@
+"""
+In-process job scheduler
+Runs registered jobs on cron schedules in a single worker elected through a PostgreSQL advisory lock
+"""
+import asyncio
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.cron import CronSchedule
+from app.core.logging import log_error, log_info, log_warning
+from app.core.metrics import metrics
+
+JobFunction = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class JobRun:
+    """Outcome of one job execution, handed to the run recorder"""
+
+    job_name: str
+    instance: str
+    started_at: datetime
+    finished_at: datetime
+    status: str
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> int:
+        return int((self.finished_at - self.started_at).total_seconds() * 1000)
+
+
+@dataclass
+class Job:
+    """A registered job and its per-worker run state"""
+
+    name: str
+    schedule: CronSchedule
+    func: JobFunction
+    jitter_seconds: float = 0.0
+    timeout_seconds: Optional[float] = None
+    next_run_at: Optional[datetime] = None
+    task: Optional["asyncio.Task[None]"] = field(default=None, repr=False)
+    runs: int = 0
+    failures: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[int] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class AdvisoryLockElection:
+    """
+    Leader election through a session-level PostgreSQL advisory lock
+
+    Every worker keeps one dedicated connection and periodically tries
+    ``pg_try_advisory_lock``; the worker that gets it is the leader for as
+    long as that connection lives. PostgreSQL releases the lock when the
+    leader's session ends, so a crashed or stopped leader is replaced on
+    the next attempt of another worker. TCP keepalives on the connection
+    make the server notice a leader host that vanished without closing it.
+    """
+
+    # Server-side keepalives: a silent peer is dropped after about a minute
+    KEEPALIVE_SETTINGS = {
+        "tcp_keepalives_idle": "30",
+        "tcp_keepalives_interval": "10",
+        "tcp_keepalives_count": "3",
+    }
+
+    def __init__(self, connect_args: Callable[[], Dict[str, Any]], key: int, timeout_seconds: float = 5.0):
+        """
+        Initialize election (no connection is opened until acquire())
+
+        Args:
+            connect_args: Returns asyncpg.connect() keyword arguments
+            key: Advisory lock key shared by every worker of the application
+            timeout_seconds: Timeout of each lock or health query
+        """
+        self._connect_args = connect_args
+        self.key = key
+        self.timeout_seconds = timeout_seconds
+        self._connection: Any = None
+        self.held = False
+
+    async def _connect(self) -> Any:
+        if self._connection is None or self._connection.is_closed():
+            import asyncpg
+
+            args = dict(self._connect_args())
+            args["server_settings"] = {**args.get("server_settings", {}), **self.KEEPALIVE_SETTINGS}
+            self._connection = await asyncpg.connect(**args)
+        return self._connection
+
+    async def acquire(self) -> bool:
+        """
+        Try to take the lock without waiting
+
+        Returns:
+            True if this worker is now the leader
+        """
+        try:
+            connection = await self._connect()
+            self.held = bool(
+                await connection.fetchval("SELECT pg_try_advisory_lock($1)", self.key, timeout=self.timeout_seconds)
+            )
+        except Exception as e:
+            log_error(f"Scheduler lock attempt failed: {e}")
+            await self.release()
+        return self.held
+
+    async def check(self) -> bool:
+        """
+        Confirm the leader still holds the lock (its session is alive)
+
+        Returns:
+            False when the connection was lost, which also lost the lock
+        """
+        if not self.held:
+            return False
+        try:
+            await self._connection.fetchval("SELECT 1", timeout=self.timeout_seconds)
+            return True
+        except Exception as e:
+            log_error(f"Scheduler lock connection lost: {e}")
+            await self.release()
+            return False
+
+    async def release(self) -> None:
+        """Give up the lock by closing the session"""
+        self.held = False
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            try:
+                await connection.close(timeout=2)
+            except Exception:
+                connection.terminate()
+
+
+class Scheduler:
+    """
+    Cron-style scheduler that runs jobs in exactly one worker
+
+    Every worker runs the scheduler loop, but only the elected leader runs
+    jobs; the others retry the election every ``election_seconds`` and take
+    over when the leader goes away. A new leader resumes each job from its
+    last recorded run, so a run missed during the failover happens right
+    away (once). Each run gets a random delay of up to the job's jitter so
+    jobs sharing a schedule do not hit the database at the same instant. A
+    job never overlaps itself: a slot that comes up while the previous run
+    is still going is skipped.
+    """
+
+    def __init__(
+        self,
+        election: Any,
+        record_run: Optional[Callable[[JobRun], Awaitable[None]]] = None,
+        load_last_runs: Optional[Callable[[], Awaitable[Dict[str, datetime]]]] = None,
+        election_seconds: float = 15.0,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        """
+        Initialize scheduler (nothing runs until start())
+
+        Args:
+            election: Leader election with acquire(), check(), release() and ``held``
+            record_run: Coroutine function persisting each finished run
+            load_last_runs: Coroutine function returning the last start time of each job
+            election_seconds: Interval of election attempts and leader health checks
+            clock: Current UTC time (naive)
+        """
+        self.election = election
+        self._record_run = record_run
+        self._load_last_runs = load_last_runs
+        self.election_seconds = election_seconds
+        self._clock = clock
+        self.instance = f"{socket.gethostname()}:{os.getpid()}"
+        self.jobs: Dict[str, Job] = {}
+        self.leader_since: Optional[datetime] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return bool(self.election.held)
+
+    def register(
+        self,
+        name: str,
+        cron: str,
+        func: JobFunction,
+        jitter_seconds: float = 0.0,
+        timeout_seconds: Optional[float] = None,
+    ) -> Job:
+        """
+        Register a job
+
+        Args:
+            name: Unique job name (used in history and metrics)
+            cron: Cron expression in UTC (see CronSchedule)
+            func: Coroutine function to run; its return value is recorded as the result
+            jitter_seconds: Maximum random delay added to each run
+            timeout_seconds: Cancel runs lasting longer than this
+
+        Returns:
+            The registered job
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job already registered: {name}")
+        job = Job(name, CronSchedule(cron), func, jitter_seconds, timeout_seconds)
+        self.jobs[name] = job
+        return job
+
+    async def start(self) -> None:
+        """Start the election and scheduling loop in a background task"""
+        self._task = asyncio.create_task(self._run(), name="scheduler")
+
+    async def stop(self) -> None:
+        """Stop the loop, cancel running jobs and release leadership"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._cancel_running_jobs()
+        await self.election.release()
+        self.leader_since = None
+
+    async def tick(self) -> float:
+        """
+        Run one iteration: update leadership and launch due jobs
+
+        Returns:
+            Seconds to wait before the next iteration
+        """
+        await self._update_leadership()
+        now = self._clock()
+        if not self.is_leader:
+            return self.election_seconds
+
+        for job in self.jobs.values():
+            if job.next_run_at is not None and job.next_run_at <= now:
+                if job.running:
+                    metrics.increment(f"scheduler.{job.name}.skipped")
+                else:
+                    job.task = asyncio.create_task(self._execute(job), name=f"job-{job.name}")
+                job.next_run_at = self._next_run(job, now)
+
+        upcoming = min((job.next_run_at for job in self.jobs.values() if job.next_run_at), default=None)
+        if upcoming is None:
+            return self.election_seconds
+        return max(0.0, min(self.election_seconds, (upcoming - now).total_seconds()))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delay = await self.tick()
+            except Exception as e:
+                log_error(f"Scheduler iteration failed: {e}")
+                delay = self.election_seconds
+            await asyncio.sleep(delay)
+
+    async def _update_leadership(self) -> None:
+        if self.is_leader:
+            if not await self.election.check():
+                log_warning(f"Scheduler leadership lost by {self.instance}")
+                metrics.increment("scheduler.leadership_lost")
+                self.leader_since = None
+                await self._cancel_running_jobs()
+            return
+
+        if await self.election.acquire():
+            self.leader_since = self._clock()
+            metrics.increment("scheduler.elections")
+            log_info(f"Scheduler leader elected: {self.instance}")
+            await self._resume_jobs()
+
+    async def _resume_jobs(self) -> None:
+        """Plan each job from its last recorded run (or from now when there is none)"""
+        last_runs: Dict[str, datetime] = {}
+        if self._load_last_runs is not None:
+            try:
+                last_runs = await self._load_last_runs()
+            except Exception as e:
+                log_error(f"Scheduler could not load run history: {e}")
+
+        now = self._clock()
+        for job in self.jobs.values():
+            last = last_runs.get(job.name)
+            job.next_run_at = job.schedule.next_after(last) if last else self._next_run(job, now)
+
+    def _next_run(self, job: Job, now: datetime) -> datetime:
+        jitter = random.uniform(0, job.jitter_seconds) if job.jitter_seconds else 0.0
+        return job.schedule.next_after(now) + timedelta(seconds=jitter)
+
+    async def _execute(self, job: Job) -> None:
+        started_at = self._clock()
+        started = time.perf_counter()
+        job.last_started_at = started_at
+        status, result, error = "success", None, None
+        try:
+            outcome = await asyncio.wait_for(job.func(), job.timeout_seconds)
+            result = None if outcome is None else str(outcome)[:500]
+        except asyncio.CancelledError:
+            job.last_status = "cancelled"
+            raise
+        except Exception as e:
+            status, error = "failed", f"{type(e).__name__}: {e}"[:2000]
+            job.failures += 1
+            metrics.increment(f"scheduler.{job.name}.failures")
+            log_error(f"Scheduled job {job.name} failed: {error}")
+
+        job.runs += 1
+        job.last_duration_ms = int((time.perf_counter() - started) * 1000)
+        job.last_status, job.last_error = status, error
+        metrics.increment(f"scheduler.{job.name}.runs")
+        log_info(f"Scheduled job {job.name} finished in {job.last_duration_ms}ms: {status} {result or ''}".rstrip())
+
+        if self._record_run is not None:
+            run = JobRun(job.name, self.instance, started_at, self._clock(), status, result, error)
+            try:
+                await self._record_run(run)
+            except Exception as e:
+                log_error(f"Could not record run of {job.name}: {e}")
+
+    async def _cancel_running_jobs(self) -> None:
+        tasks = [job.task for job in self.jobs.values() if job.running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.next_run_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get role and per-job state of this worker"""
+        return {
+            "role": "leader" if self.is_leader else "follower",
+            "instance": self.instance,
+            "leader_since": self.leader_since.isoformat() if self.leader_since else None,
+            "jobs": {
+                job.name: {
+                    "schedule": job.schedule.expression,
+                    "next_run_at": job.next_run_at.isoformat() if job.next_run_at else None,
+                    "running": job.running,
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_started_at": job.last_started_at.isoformat() if job.last_started_at else None,
+                    "last_duration_ms": job.last_duration_ms,
+                    "last_status": job.last_status,
+                    "last_error": job.last_error,
+                }
+                for job in self.jobs.values()
+            },
+        }
@@ -2,11 +2,15 @@
 Security utilities for authentication and authorization
 Includes password hashing and JWT token management
 """
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import metrics
 
 # Password hashing context using bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -57,7 +61,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
     return encoded_jwt
@@ -76,7 +80,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
     return encoded_jwt
@@ -99,53 +103,66 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_user_id_from_token(token: str) -> Optional[str]:
+# Per-worker cache of verified claims keyed by the exact encoded token. An
+# entry never outlives the token's exp, and revocation is checked separately
+# on every request, so a hit only skips the signature check and JSON parsing.
+token_decode_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.TOKEN_DECODE_CACHE_SIZE,
+    ttl_seconds=settings.TOKEN_DECODE_CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("token_decode_cache", token_decode_cache.stats)
+
+
+def decode_token_cached(token: str) -> Optional[Dict[str, Any]]:
     """
-    Extract user ID from JWT token
+    Decode and verify a JWT token, reusing earlier verifications
+
+    Only successfully verified tokens are cached, so garbage tokens cannot
+    push valid entries out.
 
     Args:
         token: JWT token string
 
     Returns:
-        User ID string or None if invalid
+        Decoded token payload (a copy the caller may modify) or None if invalid
     """
-    payload = decode_token(token)
-    if payload:
-        return payload.get("sub")
-    return None
+    payload = token_decode_cache.get(token)
+    if payload is not None:
+        return dict(payload)
 
+    payload = decode_token(token)
+    if payload is None:
+        return None
 
-# Token Blacklist (In-Memory)
-# Note: This is a simple in-memory solution suitable for single-instance deployments
-# For production with multiple instances, consider Redis or database-backed solution
-_token_blacklist: set = set()
+    ttl = settings.TOKEN_DECODE_CACHE_TTL_SECONDS
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        ttl = min(ttl, expires_at - time.time())
+    token_decode_cache.set(token, dict(payload), ttl_seconds=ttl)
+    return payload
 
 
-def blacklist_token(token: str) -> None:
+def forget_decoded_token(token: str) -> None:
     """
-    Add a token to the blacklist
+    Drop a token from the decode cache (e.g. after logout)
 
     Args:
-        token: JWT token to blacklist
+        token: JWT token string
     """
-    _token_blacklist.add(token)
+    token_decode_cache.pop(token)
 
 
-def is_token_blacklisted(token: str) -> bool:
+def get_user_id_from_token(token: str) -> Optional[str]:
     """
-    Check if a token is blacklisted
+    Extract user ID from JWT token
 
     Args:
-        token: JWT token to check
+        token: JWT token string
 
     Returns:
-        True if token is blacklisted, False otherwise
-    """
-    return token in _token_blacklist
-
-
-def clear_blacklist() -> None:
-    """
-    Clear all blacklisted tokens (useful for testing)
+        User ID string or None if invalid
     """
-    _token_blacklist.clear()
+    payload = decode_token(token)
+    if payload:
+        return payload.get("sub")
+    return None
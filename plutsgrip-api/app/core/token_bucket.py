@@ -0,0 +1,347 @@
+"""
+Per-user token bucket rate limiting
+Buckets keyed by user and route class, stored per worker or in a SQLite file shared by workers
+"""
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.cache_backends import open_sqlite_connection
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    """
+    Token bucket holding ``capacity`` tokens, refilled evenly over ``period_seconds``
+
+    "60/minute" allows a burst of 60 requests and then one request per second.
+    """
+
+    capacity: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "BucketLimit":
+        """
+        Parse a "<capacity>/<period>" spec such as "60/minute" or "10/15minutes"
+
+        Raises:
+            ValueError: If the spec is malformed
+        """
+        match = _SPEC.match(spec)
+        if not match or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+        multiplier = int(match.group(2) or 1)
+        return cls(capacity=int(match.group(1)), period_seconds=float(multiplier * _PERIODS[match.group(3)]))
+
+    @property
+    def interval(self) -> float:
+        """Seconds needed to refill one token"""
+        return self.period_seconds / self.capacity
+
+    @property
+    def policy(self) -> str:
+        """RateLimit-Policy header value"""
+        return f"{self.capacity};w={int(self.period_seconds)}"
+
+
+@dataclass(frozen=True)
+class BucketResult:
+    """Outcome of taking a token from a bucket"""
+
+    allowed: bool
+    limit: BucketLimit
+    remaining: int
+    reset_seconds: float
+    retry_after_seconds: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        """RateLimit-* response headers (IETF draft "RateLimit header fields for HTTP")"""
+        headers = {
+            "RateLimit-Limit": str(self.limit.capacity),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+            "RateLimit-Policy": self.limit.policy,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after_seconds)))
+        return headers
+
+
+def _result(limit: BucketLimit, allowed: bool, tat: float, now: float) -> BucketResult:
+    """
+    Build a result from a bucket's theoretical arrival time (GCRA)
+
+    The bucket is stored as a single timestamp: the time at which it would
+    be full again. It is empty when that time is ``period_seconds`` ahead.
+    """
+    backlog = max(0.0, tat - now)
+    remaining = int((limit.period_seconds - backlog) / limit.interval + 1e-9)
+    retry_after = 0.0 if allowed else backlog + limit.interval - limit.period_seconds
+    return BucketResult(allowed, limit, max(0, remaining), backlog, retry_after)
+
+
+class TokenBucketBackend(ABC):
+    """
+    Interface for token bucket storage
+
+    Buckets use GCRA (the generic cell rate algorithm), which behaves exactly
+    like a token bucket but stores one float per key and updates it with a
+    single compare-and-set, so shared backends need one round trip per
+    request. A bucket whose timestamp is in the past is full and can be
+    dropped, which keeps storage proportional to recently active clients.
+    """
+
+    name: str = "abstract"
+
+    @abstractmethod
+    def take(self, key: str, limit: BucketLimit) -> BucketResult:
+        """Take one token from a bucket"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all buckets"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics"""
+
+
+class MemoryTokenBucketBackend(TokenBucketBackend):
+    """
+    Per-process backend: each worker enforces its own copy of every limit
+
+    Keys are kept in update order; full buckets are dropped from the front
+    and the oldest keys are evicted beyond ``max_keys``.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key: str, limit: BucketLimit) -> BucketResult:
+        now = time.time()
+        with self._lock:
+            tat = self._tats.pop(key, now)
+            new_tat = max(tat, now) + limit.interval
+            allowed = new_tat - now <= limit.period_seconds
+            if allowed:
+                tat = new_tat
+            if tat > now:
+                self._tats[key] = tat
+            self._prune(now)
+        return _result(limit, allowed, tat, now)
+
+    def _prune(self, now: float) -> None:
+        while self._tats:
+            oldest, tat = next(iter(self._tats.items()))
+            if tat > now and len(self._tats) <= self.max_keys:
+                return
+            del self._tats[oldest]
+            if tat > now:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "buckets": len(self._tats), "evictions": self.evictions}
+
+
+class SQLiteTokenBucketBackend(TokenBucketBackend):
+    """
+    Host-local backend shared by all workers through a SQLite file
+
+    Each request is one UPSERT ... RETURNING on a WITHOUT ROWID table, which
+    SQLite executes atomically, so concurrent workers never double-spend a
+    token. Full buckets are deleted every PRUNE_INTERVAL requests. Like the
+    cache backends, storage errors never fail the request: the limiter
+    fails open and counts the error.
+    """
+
+    name = "sqlite"
+
+    PRUNE_INTERVAL = 1024
+
+    _TAKE = (
+        "INSERT INTO token_buckets (key, tat, allowed) VALUES (:key, :now + :interval, 1) "
+        "ON CONFLICT(key) DO UPDATE SET "
+        "allowed = (max(tat, :now) + :interval - :now <= :period), "
+        "tat = CASE WHEN max(tat, :now) + :interval - :now <= :period "
+        "THEN max(tat, :now) + :interval ELSE tat END "
+        "RETURNING tat, allowed"
+    )
+
+    def __init__(self, path: str, busy_timeout_ms: int = 200):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._takes_since_prune = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = open_sqlite_connection(self.path, self.busy_timeout_ms)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets ("
+            "key TEXT PRIMARY KEY, tat REAL NOT NULL, allowed INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def take(self, key: str, limit: BucketLimit) -> BucketResult:
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                tat, allowed = connection.execute(
+                    self._TAKE,
+                    {"key": key, "now": now, "interval": limit.interval, "period": limit.period_seconds},
+                ).fetchone()
+                self._takes_since_prune += 1
+                if self._takes_since_prune >= self.PRUNE_INTERVAL:
+                    self._takes_since_prune = 0
+                    connection.execute("DELETE FROM token_buckets WHERE tat <= ?", (now,))
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"SQLite rate limit check failed: {exc}")
+            return BucketResult(True, limit, limit.capacity, 0.0)
+        return _result(limit, bool(allowed), tat, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM token_buckets")
+
+    def stats(self) -> Dict[str, Any]:
+        buckets = None
+        try:
+            with self._lock:
+                (buckets,) = self._connect().execute("SELECT COUNT(*) FROM token_buckets").fetchone()
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning(f"SQLite rate limit stats failed: {exc}")
+        return {"backend": self.name, "path": self.path, "buckets": buckets, "errors": self.errors}
+
+
+def build_token_bucket_backend(kind: str, sqlite_path: Optional[str] = None) -> TokenBucketBackend:
+    """
+    Create a token bucket backend by name
+
+    Args:
+        kind: "memory" (per worker) or "sqlite" (shared by workers on the host)
+        sqlite_path: Database file used by the sqlite backend
+
+    Returns:
+        Token bucket backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    kind = kind.lower()
+    if kind == "memory":
+        return MemoryTokenBucketBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if kind == "sqlite":
+        return SQLiteTokenBucketBackend(path=sqlite_path or settings.USER_RATE_LIMIT_SQLITE_PATH)
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+def classify_route(method: str, path: str) -> str:
+    """
+    Map a request to its route class
+
+    Args:
+        method: HTTP method
+        path: Route path template (e.g. "/api/reports/trends")
+
+    Returns:
+        "export", "bulk", "reports", "write" or "read"
+    """
+    if path.endswith("/transactions/export"):
+        return "export"
+    if path.endswith("/transactions/import") or path.endswith("/transactions/bulk"):
+        return "bulk"
+    if "/reports" in path:
+        return "reports"
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return "write"
+    return "read"
+
+
+class UserRateLimiter:
+    """Applies the configured bucket of each route class to each user"""
+
+    def __init__(self, backend: TokenBucketBackend, limits: Dict[str, BucketLimit], enabled: bool = True):
+        """
+        Initialize limiter
+
+        Args:
+            backend: Bucket storage
+            limits: Bucket per route class (must include "read")
+            enabled: Whether limits are enforced
+        """
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+
+    def hit(self, user_id: int, route_class: str) -> BucketResult:
+        """
+        Take a token from the user's bucket for a route class
+
+        Args:
+            user_id: Authenticated user ID
+            route_class: Route class from classify_route
+
+        Returns:
+            Bucket result (check ``allowed``)
+        """
+        limit = self.limits.get(route_class) or self.limits["read"]
+        result = self.backend.take(f"{route_class}:{user_id}", limit)
+        metrics.increment(f"user_rate_limit.{'allowed' if result.allowed else 'rejected'}.{route_class}")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get configuration and backend statistics"""
+        return {
+            "enabled": self.enabled,
+            "limits": {name: limit.policy for name, limit in self.limits.items()},
+            **self.backend.stats(),
+        }
+
+
+user_rate_limiter = UserRateLimiter(
+    backend=build_token_bucket_backend(
+        settings.USER_RATE_LIMIT_BACKEND,
+        sqlite_path=settings.USER_RATE_LIMIT_SQLITE_PATH,
+    ),
+    limits={
+        "read": BucketLimit.parse(settings.USER_RATE_LIMIT_READ),
+        "write": BucketLimit.parse(settings.USER_RATE_LIMIT_WRITE),
+        "reports": BucketLimit.parse(settings.USER_RATE_LIMIT_REPORTS),
+        "export": BucketLimit.parse(settings.USER_RATE_LIMIT_EXPORT),
+        "bulk": BucketLimit.parse(settings.USER_RATE_LIMIT_BULK),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
+metrics.register_gauge("user_rate_limiter", user_rate_limiter.stats)
@@ -0,0 +1,364 @@
+"""
+JWT revocation store
+Tracks revoked token IDs (jti) until the tokens would have expired anyway
+"""
+import hashlib
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.cache_backends import open_sqlite_connection
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models.revoked_token import RevokedToken
+
+
+def get_token_id(token: str, payload: Dict[str, Any]) -> str:
+    """
+    Get the revocation key of a decoded token
+
+    Tokens carry a random ``jti`` claim; tokens issued before the claim was
+    introduced are keyed by a digest of the token itself.
+
+    Args:
+        token: Encoded JWT
+        payload: Verified claims of the token
+
+    Returns:
+        Token ID (at most 64 characters)
+    """
+    jti = payload.get("jti")
+    if isinstance(jti, str) and 0 < len(jti) <= 64:
+        return jti
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RevocationBackend(ABC):
+    """
+    Interface for token revocation backends
+
+    A revocation only has to outlive the token: once ``expires_at`` has
+    passed, signature verification rejects the token on its own, so every
+    backend forgets entries at expiry and stays proportional to the number
+    of live revoked tokens.
+    """
+
+    name: str = "abstract"
+
+    @abstractmethod
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        """Revoke a token until its expiry (Unix timestamp)"""
+
+    @abstractmethod
+    async def is_revoked(self, token_id: str) -> bool:
+        """Check whether a token is revoked"""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Drop entries whose token has expired and return how many were removed"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all entries"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics"""
+
+
+class MemoryRevocationBackend(RevocationBackend):
+    """
+    Per-process backend: a dict for O(1) checks plus an expiry timing wheel
+
+    Entries are grouped into buckets of BUCKET_SECONDS by expiry; a small
+    heap orders the bucket keys, so expired entries are dropped a whole
+    bucket at a time without scanning live entries. Only suitable for a
+    single worker process.
+    """
+
+    name = "memory"
+
+    BUCKET_SECONDS = 60
+
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}
+        self._buckets: Dict[int, List[str]] = {}
+        self._bucket_heap: List[int] = []
+        self._lock = threading.Lock()
+        self.purged = 0
+
+    def revoke_sync(self, token_id: str, expires_at: float) -> None:
+        """Synchronous revoke (used by async revoke and by benchmarks)"""
+        with self._lock:
+            self._purge(time.time())
+            previous = self._expiry.get(token_id)
+            if previous is not None and previous >= expires_at:
+                return
+            self._expiry[token_id] = expires_at
+            bucket = int(expires_at // self.BUCKET_SECONDS)
+            entries = self._buckets.get(bucket)
+            if entries is None:
+                entries = self._buckets[bucket] = []
+                heapq.heappush(self._bucket_heap, bucket)
+            entries.append(token_id)
+
+    def is_revoked_sync(self, token_id: str) -> bool:
+        """Synchronous check (used by async is_revoked and by benchmarks)"""
+        expires_at = self._expiry.get(token_id)
+        return expires_at is not None and expires_at > time.time()
+
+    def _purge(self, now: float) -> int:
+        removed = 0
+        current_bucket = int(now // self.BUCKET_SECONDS)
+        while self._bucket_heap and self._bucket_heap[0] < current_bucket:
+            bucket = heapq.heappop(self._bucket_heap)
+            for token_id in self._buckets.pop(bucket):
+                expires_at = self._expiry.get(token_id)
+                # A later revoke of the same ID may have moved it to another bucket
+                if expires_at is not None and expires_at <= now:
+                    del self._expiry[token_id]
+                    removed += 1
+        self.purged += removed
+        return removed
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        self.revoke_sync(token_id, expires_at)
+
+    async def is_revoked(self, token_id: str) -> bool:
+        return self.is_revoked_sync(token_id)
+
+    async def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(time.time())
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+            self._buckets.clear()
+            self._bucket_heap.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "revoked": len(self._expiry),
+            "buckets": len(self._buckets),
+            "purged": self.purged,
+        }
+
+
+class SQLiteRevocationBackend(RevocationBackend):
+    """
+    Host-local backend shared by all workers through a SQLite file
+
+    Checks are a primary-key lookup on a WITHOUT ROWID table; expired rows
+    are deleted through the expires_at index every PURGE_INTERVAL revokes.
+    Unlike the cache backends, errors are not swallowed: a revocation that
+    cannot be checked must not be treated as "not revoked".
+    """
+
+    name = "sqlite"
+
+    PURGE_INTERVAL = 256
+
+    def __init__(self, path: str, busy_timeout_ms: int = 1000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._revokes_since_purge = 0
+        self.purged = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = open_sqlite_connection(self.path, self.busy_timeout_ms)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+            "jti TEXT PRIMARY KEY, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)"
+        )
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def revoke_sync(self, token_id: str, expires_at: float) -> None:
+        """Synchronous revoke (used by async revoke and by benchmarks)"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT INTO revoked_tokens (jti, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(jti) DO UPDATE SET expires_at = MAX(expires_at, excluded.expires_at)",
+                (token_id, expires_at),
+            )
+            self._revokes_since_purge += 1
+            if self._revokes_since_purge >= self.PURGE_INTERVAL:
+                self._revokes_since_purge = 0
+                self._purge(connection)
+
+    def is_revoked_sync(self, token_id: str) -> bool:
+        """Synchronous check (used by async is_revoked and by benchmarks)"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM revoked_tokens WHERE jti = ? AND expires_at > ?",
+                (token_id, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def _purge(self, connection: sqlite3.Connection) -> int:
+        removed = connection.execute(
+            "DELETE FROM revoked_tokens WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        self.purged += removed
+        return removed
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        self.revoke_sync(token_id, expires_at)
+
+    async def is_revoked(self, token_id: str) -> bool:
+        return self.is_revoked_sync(token_id)
+
+    async def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(self._connect())
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM revoked_tokens")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (revoked,) = self._connect().execute("SELECT COUNT(*) FROM revoked_tokens").fetchone()
+        return {"backend": self.name, "path": self.path, "revoked": revoked, "purged": self.purged}
+
+
+class DatabaseRevocationBackend(RevocationBackend):
+    """
+    Backend stored in the revoked_tokens PostgreSQL table
+
+    Shared by every worker on every host. Each check is one primary-key
+    lookup on its own short session; prefer the sqlite backend when all
+    workers run on one host.
+    """
+
+    name = "database"
+
+    PURGE_INTERVAL = 256
+
+    def __init__(self):
+        self._revokes_since_purge = 0
+        self.purged = 0
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        expiry = datetime.utcfromtimestamp(expires_at)
+        statement = insert(RevokedToken).values(jti=token_id, expires_at=expiry)
+        statement = statement.on_conflict_do_update(
+            index_elements=[RevokedToken.jti],
+            set_={"expires_at": statement.excluded.expires_at},
+        )
+        async with AsyncSessionLocal() as session:
+            await session.execute(statement)
+            await session.commit()
+
+        self._revokes_since_purge += 1
+        if self._revokes_since_purge >= self.PURGE_INTERVAL:
+            self._revokes_since_purge = 0
+            await self.purge_expired()
+
+    async def is_revoked(self, token_id: str) -> bool:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(RevokedToken.jti).where(
+                    RevokedToken.jti == token_id,
+                    RevokedToken.expires_at > datetime.utcnow(),
+                )
+            )
+            return result.first() is not None
+
+    async def purge_expired(self) -> int:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+        removed = result.rowcount or 0
+        self.purged += removed
+        return removed
+
+    async def clear(self) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(RevokedToken))
+            await session.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "purged": self.purged}
+
+
+def build_revocation_backend(kind: str, sqlite_path: Optional[str] = None) -> RevocationBackend:
+    """
+    Create a revocation backend by name
+
+    Args:
+        kind: "memory" (per worker), "sqlite" (workers on one host) or "database" (all hosts)
+        sqlite_path: Database file used by the sqlite backend
+
+    Returns:
+        Revocation backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    kind = kind.lower()
+    if kind == "memory":
+        return MemoryRevocationBackend()
+    if kind == "sqlite":
+        return SQLiteRevocationBackend(path=sqlite_path or settings.TOKEN_REVOCATION_SQLITE_PATH)
+    if kind == "database":
+        return DatabaseRevocationBackend()
+    raise ValueError(f"Unknown token revocation backend: {kind}")
+
+
+token_revocation: RevocationBackend = build_revocation_backend(
+    settings.TOKEN_REVOCATION_BACKEND,
+    sqlite_path=settings.TOKEN_REVOCATION_SQLITE_PATH,
+)
+metrics.register_gauge("token_revocation", token_revocation.stats)
+
+
+async def revoke_token(token: str, payload: Dict[str, Any]) -> None:
+    """
+    Revoke a decoded token until it expires
+
+    Args:
+        token: Encoded JWT
+        payload: Verified claims of the token
+    """
+    expires_at = float(payload.get("exp") or time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+    await token_revocation.revoke(get_token_id(token, payload), expires_at)
+    metrics.increment("token_revocation.revoked")
+
+
+async def is_token_revoked(token: str, payload: Dict[str, Any]) -> bool:
+    """
+    Check whether a decoded token has been revoked
+
+    Args:
+        token: Encoded JWT
+        payload: Verified claims of the token
+
+    Returns:
+        True if the token is revoked
+    """
+    return await token_revocation.is_revoked(get_token_id(token, payload))
@@ -0,0 +1,186 @@
+"""
+Trusted network index
+In-memory IPv4/IPv6 CIDR matcher used to exempt trusted clients from rate limiting
+"""
+import ipaddress
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# (ip_address or CIDR, optional expiry as naive UTC datetime)
+TrustedEntry = Tuple[str, Optional[datetime]]
+
+
+def parse_network(value: str) -> IPNetwork:
+    """
+    Parse an IP address or CIDR range into a network
+
+    Host bits are ignored ("10.0.0.5/8" is 10.0.0.0/8) and a plain address
+    becomes a single-host network. IPv4-mapped IPv6 ranges are converted to
+    IPv4 so they match the addresses clients actually present.
+
+    Args:
+        value: Address or CIDR string
+
+    Returns:
+        Parsed network
+
+    Raises:
+        ValueError: If the value is not an address or CIDR range
+    """
+    network = ipaddress.ip_network(value.strip(), strict=False)
+    if isinstance(network, ipaddress.IPv6Network) and network.network_address.ipv4_mapped and network.prefixlen >= 96:
+        mapped = network.network_address.ipv4_mapped
+        network = ipaddress.IPv4Network((mapped, network.prefixlen - 96), strict=False)
+    return network
+
+
+class TrustedNetworkIndex:
+    """
+    Immutable prefix index of trusted networks
+
+    Networks are grouped by (IP version, prefix length) into hash maps keyed
+    by the network prefix as an integer. A lookup shifts the address once per
+    prefix length in use and probes the map, so its cost depends on the
+    number of distinct prefix lengths (usually a handful), not on the number
+    of networks. Instances are never modified: a reload builds a new index
+    and swaps the reference, so readers need no locking.
+    """
+
+    def __init__(self, entries: Iterable[TrustedEntry] = ()):
+        """
+        Build the index
+
+        Invalid entries are logged and skipped so one bad row cannot disable
+        the whole whitelist.
+
+        Args:
+            entries: Trusted addresses/ranges with optional expiry
+        """
+        # version -> [(prefixlen, {prefix: expires_at timestamp or None})], longest prefix first
+        self._tables: Dict[int, List[Tuple[int, Dict[int, Optional[float]]]]] = {4: [], 6: []}
+        tables: Dict[Tuple[int, int], Dict[int, Optional[float]]] = {}
+        self.size = 0
+        self.skipped = 0
+
+        for value, expires_at in entries:
+            try:
+                network = parse_network(value)
+            except ValueError:
+                self.skipped += 1
+                logger.warning(f"Ignoring invalid trusted network: {value!r}")
+                continue
+
+            expiry = None
+            if expires_at is not None:
+                if expires_at.tzinfo is None:
+                    # Stored expiries are naive UTC
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                expiry = expires_at.timestamp()
+
+            bits = network.max_prefixlen
+            prefix = int(network.network_address) >> (bits - network.prefixlen)
+            table = tables.setdefault((network.version, network.prefixlen), {})
+            # The same network listed twice: keep the longest-lived entry
+            if prefix in table and (table[prefix] is None or (expiry is not None and table[prefix] >= expiry)):
+                continue
+            if prefix not in table:
+                self.size += 1
+            table[prefix] = expiry
+
+        for (version, prefixlen), table in sorted(tables.items(), key=lambda item: -item[0][1]):
+            self._tables[version].append((prefixlen, table))
+        self.loaded_at = time.time()
+
+    def contains(self, ip: str) -> bool:
+        """
+        Check whether an address belongs to a trusted network
+
+        Args:
+            ip: Client address (unparseable values such as "testclient" are untrusted)
+
+        Returns:
+            True if a live entry covers the address
+        """
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        tables = self._tables[address.version]
+        if not tables:
+            return False
+
+        value = int(address)
+        bits = address.max_prefixlen
+        now = None
+        for prefixlen, table in tables:
+            expiry = table.get(value >> (bits - prefixlen), False)
+            if expiry is False:
+                continue
+            if expiry is None:
+                return True
+            now = now or time.time()
+            if expiry > now:
+                return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and shape"""
+        return {
+            "networks": self.size,
+            "skipped": self.skipped,
+            "prefix_lengths": {
+                f"ipv{version}": [prefixlen for prefixlen, _ in tables]
+                for version, tables in self._tables.items()
+            },
+            "loaded_at": self.loaded_at,
+        }
+
+
+# Current index; replaced wholesale by set_trusted_networks
+_index = TrustedNetworkIndex()
+
+
+def get_trusted_networks() -> TrustedNetworkIndex:
+    """Get the current trusted network index"""
+    return _index
+
+
+def set_trusted_networks(entries: Iterable[TrustedEntry]) -> TrustedNetworkIndex:
+    """
+    Build a new index and make it current
+
+    Args:
+        entries: Trusted addresses/ranges with optional expiry
+
+    Returns:
+        The new index
+    """
+    global _index
+    _index = TrustedNetworkIndex(entries)
+    metrics.increment("trusted_networks.reloads")
+    return _index
+
+
+def is_trusted_ip(ip: str) -> bool:
+    """
+    Check an address against the current index (no database access)
+
+    Args:
+        ip: Client address
+
+    Returns:
+        True if the address is trusted
+    """
+    return _index.contains(ip)
+
+
+metrics.register_gauge("trusted_networks", lambda: _index.stats())
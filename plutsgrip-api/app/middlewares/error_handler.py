@@ -1,12 +1,14 @@
 """
 Global error handler middleware
 """
-from fastapi import Request, status
+from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.logging import logger
 from app.core.config import settings
+from app.api.dependencies import NotModified
+from app.core.password_hashing import PasswordHasherBusy
 
 
 def _add_cors_headers(response: JSONResponse, request: Request) -> JSONResponse:
@@ -58,6 +60,28 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return _add_cors_headers(response, request)
 
 
+async def not_modified_handler(request: Request, exc: NotModified):
+    """Handle conditional GETs whose ETag still matches"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Handle logins/registrations rejected because the hashing queue is full"""
+    logger.warning(f"Password hashing overloaded: {request.method} {request.url.path}")
+    response = JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "error": "Service Unavailable",
+            "message": "Too many authentication requests, please retry shortly"
+        },
+        headers={"Retry-After": "1"}
+    )
+    return _add_cors_headers(response, request)
+
+
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle database errors"""
     logger.error(f"Database error: {str(exc)}")
@@ -0,0 +1,47 @@
+"""
+Database round trip instrumentation middleware
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+from app.core.round_trips import count_round_trips
+
+ROUND_TRIPS_HEADER = b"x-db-round-trips"
+
+
+class RoundTripMiddleware:
+    """
+    Counts the database round trips of every HTTP request
+
+    With ``header`` on, the count so far is sent in the ``X-DB-Round-Trips``
+    response header. Dependencies with ``yield`` finish after the response
+    is sent, so the header does not include a closing COMMIT; the full
+    count, taken once the request is done, goes to the
+    ``db.round_trips.<read|write>`` and ``db.requests.<read|write>``
+    counters (GET/HEAD are reads), whose ratio is the mean per request.
+    """
+
+    def __init__(self, app: ASGIApp, header: bool = False):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        kind = "read" if scope["method"] in ("GET", "HEAD") else "write"
+
+        with count_round_trips() as counter:
+            async def send_with_count(message: Message) -> None:
+                if self.header and message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((ROUND_TRIPS_HEADER, str(counter.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_count)
+            finally:
+                metrics.increment(f"db.requests.{kind}")
+                metrics.increment(f"db.round_trips.{kind}", counter.count)
@@ -4,20 +4,26 @@ Models package initialization
 from app.models.user import User
 from app.models.category import Category, TransactionType
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup
 from app.models.budget import Budget, BudgetPeriod
 from app.models.goal import Goal
 from app.models.recurring_transaction import RecurringTransaction, RecurrenceFrequency
 from app.models.trusted_ip import TrustedIP
+from app.models.revoked_token import RevokedToken
+from app.models.scheduled_job_run import ScheduledJobRun
 
 __all__ = [
     "User",
     "Category",
     "TransactionType",
     "Transaction",
+    "TransactionDailyRollup",
     "Budget",
     "BudgetPeriod",
     "Goal",
     "RecurringTransaction",
     "RecurrenceFrequency",
-    "TrustedIP"
+    "TrustedIP",
+    "RevokedToken",
+    "ScheduledJobRun"
 ]
@@ -1,7 +1,7 @@
 """
 Modelo de Transações Recorrentes
 """
-from sqlalchemy import Column, String, Numeric, Integer, ForeignKey, Enum, DateTime, Text, Date, Boolean
+from sqlalchemy import Column, String, Numeric, Integer, ForeignKey, Enum, DateTime, Text, Date, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import BaseModel
@@ -43,6 +43,11 @@ class RecurringTransaction(Base, BaseModel):
 
     __tablename__ = "recurring_transactions"
 
+    __table_args__ = (
+        # Fila de materialização: apenas recorrências ativas, pela próxima execução
+        Index('ix_recurring_transactions_due', 'next_execution_date', postgresql_where=text('is_active')),
+    )
+
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     description = Column(String(255), nullable=False)
     amount = Column(Numeric(precision=10, scale=2), nullable=False)
@@ -0,0 +1,26 @@
+"""
+Revoked token model used by the database token revocation backend
+"""
+from sqlalchemy import Column, DateTime, String
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """
+    Revoked JWT, identified by its token ID (jti)
+
+    Rows are only needed until the token would have expired on its own;
+    expired rows are purged periodically.
+
+    Attributes:
+        jti: Token ID claim (or a digest of the token for tokens issued without one)
+        expires_at: Expiry of the revoked token (UTC)
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, expires_at={self.expires_at})>"
@@ -0,0 +1,42 @@
+"""
+Scheduled job run history
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from app.core.database import Base
+
+
+class ScheduledJobRun(Base):
+    """
+    One execution of a scheduled job, written by the leader that ran it
+
+    Attributes:
+        id: Unique identifier
+        job_name: Registered job name
+        instance: Host and process of the leader (``host:pid``)
+        started_at: Start time (UTC)
+        finished_at: End time (UTC)
+        duration_ms: Wall-clock duration in milliseconds
+        status: ``success`` or ``failed``
+        result: Short description of the outcome (e.g. rows affected)
+        error: Error message of a failed run
+    """
+
+    __tablename__ = "scheduled_job_runs"
+
+    __table_args__ = (
+        Index('ix_scheduled_job_runs_job_name_started_at', 'job_name', 'started_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_name = Column(String(100), nullable=False)
+    instance = Column(String(255), nullable=False)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<ScheduledJobRun(job_name={self.job_name}, status={self.status}, started_at={self.started_at})>"
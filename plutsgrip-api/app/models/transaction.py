@@ -1,7 +1,7 @@
 """
 Transaction model for financial transactions
 """
-from sqlalchemy import Column, String, Numeric, Date, Integer, ForeignKey, Enum, Text, Boolean, DateTime, CheckConstraint, Index
+from sqlalchemy import Column, String, Numeric, Date, Integer, ForeignKey, Enum, Text, Boolean, DateTime, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import BaseModel
@@ -25,6 +25,7 @@ class Transaction(Base, BaseModel):
         is_recurring: Flag indicating if this transaction is recurring
         recurring_transaction_id: Foreign key to recurring transaction template
         category_id: Foreign key to transaction category
+        import_key: Identity of the statement row it was imported from (duplicate detection)
         deleted_at: Soft delete timestamp
         created_at: Creation timestamp
         updated_at: Last update timestamp
@@ -40,6 +41,10 @@ class Transaction(Base, BaseModel):
         Index('ix_transactions_user_id_type', 'user_id', 'type'),
         Index('ix_transactions_user_id_category_id', 'user_id', 'category_id'),
         Index('ix_transactions_recurring_transaction_id', 'recurring_transaction_id'),
+        Index(
+            'ix_transactions_user_id_import_key', 'user_id', 'import_key',
+            postgresql_where=text('import_key IS NOT NULL'),
+        ),
     )
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -55,6 +60,7 @@ class Transaction(Base, BaseModel):
     # recurring_transaction_id = Column(Integer, ForeignKey("recurring_transactions.id", ondelete="SET NULL"), nullable=True)
     recurring_transaction_id = Column(Integer, nullable=True)  # Temporary: no FK constraint
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    import_key = Column(String(32), nullable=True)
     deleted_at = Column(DateTime, nullable=True)
 
     # Relationships
@@ -0,0 +1,121 @@
+"""
+Daily transaction rollup model used by reports
+"""
+from sqlalchemy import Column, Integer, Numeric, Date, Enum, DDL, event
+from app.core.database import Base
+from app.models.category import TransactionType
+
+
+# Rollup key value used for transactions without a category
+UNCATEGORIZED_ID = 0
+
+
+class TransactionDailyRollup(Base):
+    """
+    Per-user daily aggregate of transactions
+
+    One row per (user, day, type, category) holding the sum and count of the
+    matching transactions. Rows are maintained inside the writing transaction
+    by statement-level triggers on ``transactions`` (see ROLLUP_TRIGGER_DDL),
+    so every write path - services, the recurring executor, bulk inserts -
+    keeps the rollup consistent without extra round trips.
+
+    Attributes:
+        user_id: Owner of the aggregated transactions (no FK so user deletes
+            can cascade through transactions without ordering issues)
+        day: Transaction date
+        type: Transaction type (income or expense)
+        category_id: Category ID, or UNCATEGORIZED_ID for transactions without one
+        total_amount: Sum of transaction amounts
+        transaction_count: Number of transactions
+    """
+
+    __tablename__ = "transaction_daily_rollups"
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=UNCATEGORIZED_ID)
+    total_amount = Column(Numeric(precision=16, scale=2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<TransactionDailyRollup(user_id={self.user_id}, day={self.day}, type={self.type}, "
+            f"category_id={self.category_id}, total_amount={self.total_amount})>"
+        )
+
+
+ROLLUP_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION transaction_daily_rollup_apply() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO transaction_daily_rollups AS r
+            (user_id, day, type, category_id, total_amount, transaction_count)
+        SELECT user_id, date, type, COALESCE(category_id, 0), SUM(amount), COUNT(*)
+        FROM new_rows
+        GROUP BY user_id, date, type, COALESCE(category_id, 0)
+        ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO transaction_daily_rollups AS r
+            (user_id, day, type, category_id, total_amount, transaction_count)
+        SELECT user_id, date, type, COALESCE(category_id, 0), -SUM(amount), -COUNT(*)
+        FROM old_rows
+        GROUP BY user_id, date, type, COALESCE(category_id, 0)
+        ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+    ELSE
+        INSERT INTO transaction_daily_rollups AS r
+            (user_id, day, type, category_id, total_amount, transaction_count)
+        SELECT user_id, day, type, category_id, SUM(amount), SUM(delta_count)
+        FROM (
+            SELECT user_id, date AS day, type, COALESCE(category_id, 0) AS category_id,
+                   amount, 1 AS delta_count
+            FROM new_rows
+            UNION ALL
+            SELECT user_id, date, type, COALESCE(category_id, 0), -amount, -1
+            FROM old_rows
+        ) AS delta
+        GROUP BY user_id, day, type, category_id
+        HAVING SUM(amount) <> 0 OR SUM(delta_count) <> 0
+        ON CONFLICT (user_id, day, type, category_id) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ROLLUP_TRIGGER_DDL = [
+    ROLLUP_FUNCTION_SQL,
+    "DROP TRIGGER IF EXISTS trg_transactions_rollup_insert ON transactions",
+    """
+    CREATE TRIGGER trg_transactions_rollup_insert
+    AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """,
+    "DROP TRIGGER IF EXISTS trg_transactions_rollup_update ON transactions",
+    """
+    CREATE TRIGGER trg_transactions_rollup_update
+    AFTER UPDATE ON transactions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """,
+    "DROP TRIGGER IF EXISTS trg_transactions_rollup_delete ON transactions",
+    """
+    CREATE TRIGGER trg_transactions_rollup_delete
+    AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transaction_daily_rollup_apply()
+    """,
+]
+
+# Install the triggers whenever the schema is created through metadata
+# (tests, init_db); Alembic installs them in its own migration.
+for _statement in ROLLUP_TRIGGER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -12,7 +12,7 @@ class TrustedIP(Base, BaseModel):
 
     Atributos:
         id: Identificador único
-        ip_address: Endereço IP (IPv4 ou IPv6)
+        ip_address: Endereço IP ou faixa CIDR (IPv4 ou IPv6)
         description: Descrição/razão para confiar neste IP
         is_active: Se o IP está ativo na whitelist
         created_at: Timestamp de criação
@@ -21,7 +21,7 @@ class TrustedIP(Base, BaseModel):
 
     __tablename__ = "trusted_ips"
 
-    ip_address = Column(String(45), nullable=False, unique=True, index=True)  # IPv6 max: 39 chars
+    ip_address = Column(String(45), nullable=False, unique=True, index=True)  # IPv6 max: 39 chars (43 com /prefixo)
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
 
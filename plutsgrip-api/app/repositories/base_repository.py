@@ -1,9 +1,10 @@
 """
 Base repository with common CRUD operations
 """
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Any, Generic, TypeVar, Type, Optional, List, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import Select, select, update, delete
+from sqlalchemy.orm.interfaces import LoaderOption
 from app.core.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -17,6 +18,16 @@ class BaseRepository(Generic[ModelType]):
         ModelType: The SQLAlchemy model class
     """
 
+    # Loader options for entity reads (get_by_id, lists, get_owned); subclasses
+    # restrict them to the columns and relationships their responses need
+    read_options: Sequence[LoaderOption] = ()
+
+    # Loader options for rows returned by update_owned; RETURNING rows cannot
+    # be joined, so relationships needed there are loaded with selectinload
+    # (one more statement each). Repositories that must stay at one statement
+    # override update_owned with an UPDATE ... RETURNING CTE (transactions).
+    owned_load_options: Sequence[LoaderOption] = ()
+
     def __init__(self, model: Type[ModelType], db: AsyncSession):
         """
         Initialize repository
@@ -28,14 +39,18 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
 
+    def _select(self) -> Select:
+        """SELECT of the model with the repository's read options applied"""
+        return select(self.model).options(*self.read_options)
+
     async def get_by_id(self, id: int) -> Optional[ModelType]:
         """Get a single record by ID"""
-        result = await self.db.execute(select(self.model).where(self.model.id == id))
+        result = await self.db.execute(self._select().where(self.model.id == id))
         return result.scalars().first()
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination"""
-        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        result = await self.db.execute(self._select().offset(skip).limit(limit))
         return list(result.scalars().all())
 
     async def create(self, obj_in: dict) -> ModelType:
@@ -61,6 +76,68 @@ class BaseRepository(Generic[ModelType]):
         await self.db.flush()
         return result.rowcount > 0
 
+    async def get_owned(self, id: int, owner_id: int) -> Optional[ModelType]:
+        """Get a record by ID only if it belongs to the owner"""
+        result = await self.db.execute(
+            self._select().where(self.model.id == id, self.model.user_id == owner_id)
+        )
+        return result.scalars().first()
+
+    async def update_owned(
+        self, id: int, owner_id: int, values: dict[str, Any], *conditions: Any
+    ) -> Optional[ModelType]:
+        """
+        Update a record owned by a user in a single round trip
+
+        Runs ``UPDATE ... WHERE id = :id AND user_id = :owner RETURNING *``,
+        so the ownership check, the write and the reload are one statement,
+        plus one per selectinload in owned_load_options.
+        Values may be SQL expressions (e.g. ``Goal.current_amount + 10``),
+        which makes read-modify-write updates atomic.
+
+        Args:
+            id: Record ID
+            owner_id: ID of the user the record must belong to
+            values: Columns to set
+            conditions: Extra conditions the row must also satisfy
+
+        Returns:
+            Updated record, or None if it does not exist, belongs to someone
+            else or fails a condition
+        """
+        if not values:
+            return await self.get_owned(id, owner_id)
+
+        statement = (
+            update(self.model)
+            .where(self.model.id == id, self.model.user_id == owner_id, *conditions)
+            .values(**values)
+            .returning(self.model)
+        )
+        result = await self.db.execute(
+            select(self.model)
+            .from_statement(statement)
+            .options(*self.owned_load_options)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    async def delete_owned(self, id: int, owner_id: int) -> bool:
+        """
+        Delete a record owned by a user in a single round trip
+
+        Args:
+            id: Record ID
+            owner_id: ID of the user the record must belong to
+
+        Returns:
+            True if a record was deleted
+        """
+        result = await self.db.execute(
+            delete(self.model).where(self.model.id == id, self.model.user_id == owner_id)
+        )
+        return result.rowcount > 0
+
     async def count(self) -> int:
         """Count total records"""
         from sqlalchemy import func
@@ -1,54 +1,53 @@
 """
 Repositório de Orçamento para operações com banco de dados
 """
+from datetime import date
 from typing import List, Optional
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Integer, Row, and_, case, cast, extract, func, literal, select
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.budget import Budget
+from app.models.budget import Budget, BudgetPeriod
+from app.models.category import TransactionType
+from app.models.transaction_rollup import TransactionDailyRollup
 from app.repositories.base_repository import BaseRepository
 
+# Duração de cada período de orçamento em meses
+PERIOD_MONTHS = {
+    BudgetPeriod.MONTHLY: 1,
+    BudgetPeriod.QUARTERLY: 3,
+    BudgetPeriod.YEARLY: 12,
+}
+
 
 class BudgetRepository(BaseRepository[Budget]):
     """Repositório para operações do modelo Budget"""
 
+    # As respostas não incluem relacionamentos: o usuário e a categoria
+    # nunca são carregados junto com o registro
+    read_options = (raiseload("*"),)
+
     def __init__(self, db: AsyncSession):
         super().__init__(Budget, db)
 
     async def create(self, obj_in: dict) -> Budget:
         """
-        Create a new budget with relationships loaded
+        Create a new budget and reload it
 
-        Overrides base class to ensure relationships are loaded with selectinload
-        to avoid greenlet issues in async context when Pydantic validates the response
+        Overrides base class so the returned object is fully loaded before
+        Pydantic validates the response (no lazy loads in async context)
 
         Args:
             obj_in: Dictionary with budget data
 
         Returns:
-            Budget object with all relationships loaded
+            Budget object
         """
         # Create the budget using base method (insert + flush)
         budget = await super().create(obj_in)
 
-        # Reload with relationships using get_by_id which has selectinload
+        # Reload through get_by_id so the row matches what reads return
         return await self.get_by_id(budget.id)
 
-    async def get_by_id(self, id: int) -> Optional[Budget]:
-        """
-        Get a single budget by ID with relationships loaded
-
-        Overrides base class to ensure relationships are loaded with selectinload
-        to avoid greenlet issues in async context
-        """
-        query = select(Budget).options(
-            selectinload(Budget.category),
-            selectinload(Budget.user)
-        ).where(Budget.id == id)
-
-        result = await self.db.execute(query)
-        return result.scalars().first()
-
     async def get_by_user_id(
         self,
         user_id: int,
@@ -56,7 +55,7 @@ class BudgetRepository(BaseRepository[Budget]):
         limit: int = 100
     ) -> List[Budget]:
         """
-        Obtém orçamentos de um usuário específico com relacionamentos carregados
+        Obtém orçamentos de um usuário específico
 
         Args:
             user_id: ID do usuário
@@ -64,12 +63,9 @@ class BudgetRepository(BaseRepository[Budget]):
             limit: Limite máximo de registros
 
         Returns:
-            Lista de orçamentos com relacionamentos carregados
+            Lista de orçamentos
         """
-        query = select(Budget).options(
-            selectinload(Budget.category),
-            selectinload(Budget.user)
-        ).where(Budget.user_id == user_id).offset(skip).limit(limit)
+        query = self._select().where(Budget.user_id == user_id).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
@@ -79,7 +75,7 @@ class BudgetRepository(BaseRepository[Budget]):
         category_id: int
     ) -> Optional[Budget]:
         """
-        Obtém orçamento de um usuário para uma categoria específica com relacionamentos carregados
+        Obtém orçamento de um usuário para uma categoria específica
 
         Args:
             user_id: ID do usuário
@@ -88,10 +84,7 @@ class BudgetRepository(BaseRepository[Budget]):
         Returns:
             Orçamento ou None
         """
-        query = select(Budget).options(
-            selectinload(Budget.category),
-            selectinload(Budget.user)
-        ).where(
+        query = self._select().where(
             and_(
                 Budget.user_id == user_id,
                 Budget.category_id == category_id
@@ -100,6 +93,127 @@ class BudgetRepository(BaseRepository[Budget]):
         result = await self.db.execute(query)
         return result.scalars().first()
 
+    async def get_period_spending(
+        self,
+        user_id: int,
+        today: date,
+        history_periods: int = 0,
+        budget_id: Optional[int] = None,
+    ) -> List[Row]:
+        """
+        Obtém o gasto de cada orçamento por período, em uma única consulta
+
+        Os períodos são ancorados na data de início do orçamento: o k-ésimo
+        vai de ``start_date + k * meses_do_período`` (inclusive) até o início
+        do seguinte (exclusive), com a aritmética de meses do PostgreSQL
+        (31/01 + 1 mês = 28 ou 29/02). O período atual é o que contém
+        ``today`` (o primeiro, se o orçamento ainda não começou). Cada
+        orçamento é expandido em ``generate_series`` para o período atual e
+        os ``history_periods`` anteriores e o gasto vem do rollup diário
+        (despesas da categoria), agrupado por orçamento e período.
+
+        Args:
+            user_id: ID do usuário
+            today: Data de referência
+            history_periods: Períodos anteriores ao atual a incluir
+            budget_id: Restringe a um orçamento (opcional)
+
+        Returns:
+            Linhas (budget_id, category_id, amount, period, period_index,
+            period_start, next_period_start, spent), ordenadas por orçamento e período
+        """
+        start = cast(Budget.start_date, Date)
+        step = case(
+            *((Budget.period == period, months) for period, months in PERIOD_MONTHS.items()),
+        )
+        start_index = cast(extract("year", start), Integer) * 12 + cast(extract("month", start), Integer) - 1
+        today_index = today.year * 12 + today.month - 1
+
+        # Índice do período que contém o mês de hoje (divisão inteira; negativo vira 0 adiante)
+        conditions = [Budget.user_id == user_id]
+        if budget_id is not None:
+            conditions.append(Budget.id == budget_id)
+        budgets = (
+            select(
+                Budget.id.label("budget_id"),
+                Budget.category_id,
+                Budget.amount,
+                Budget.period,
+                start.label("start_day"),
+                step.label("step"),
+                ((today_index - start_index) // step).label("month_index"),
+            )
+            .where(*conditions)
+            .cte("budget_periods")
+        )
+
+        def shift(months):
+            return cast(budgets.c.start_day + func.make_interval(0, months), Date)
+
+        # Volta um período quando o dia de hoje ainda não chegou ao início do período do mês
+        current = func.greatest(
+            budgets.c.month_index
+            - case((shift(budgets.c.month_index * budgets.c.step) > today, 1), else_=0),
+            0,
+        )
+        current_budgets = select(budgets, current.label("current_index")).cte("current_periods")
+
+        period_index = (
+            func.generate_series(
+                func.greatest(current_budgets.c.current_index - history_periods, 0),
+                current_budgets.c.current_index,
+            )
+            .table_valued("period_index")
+            .render_derived(name="periods")
+            .lateral()
+        )
+        period_start = cast(
+            current_budgets.c.start_day + func.make_interval(0, period_index.c.period_index * current_budgets.c.step),
+            Date,
+        )
+        next_period_start = cast(
+            current_budgets.c.start_day
+            + func.make_interval(0, (period_index.c.period_index + 1) * current_budgets.c.step),
+            Date,
+        )
+
+        query = (
+            select(
+                current_budgets.c.budget_id,
+                current_budgets.c.category_id,
+                current_budgets.c.amount,
+                current_budgets.c.period,
+                period_index.c.period_index,
+                period_start.label("period_start"),
+                next_period_start.label("next_period_start"),
+                func.coalesce(func.sum(TransactionDailyRollup.total_amount), 0).label("spent"),
+            )
+            .select_from(current_budgets)
+            .join(period_index, literal(True))
+            .outerjoin(
+                TransactionDailyRollup,
+                and_(
+                    TransactionDailyRollup.user_id == user_id,
+                    TransactionDailyRollup.category_id == current_budgets.c.category_id,
+                    TransactionDailyRollup.type == TransactionType.EXPENSE,
+                    TransactionDailyRollup.day >= period_start,
+                    TransactionDailyRollup.day < next_period_start,
+                ),
+            )
+            .group_by(
+                current_budgets.c.budget_id,
+                current_budgets.c.category_id,
+                current_budgets.c.amount,
+                current_budgets.c.period,
+                current_budgets.c.start_day,
+                current_budgets.c.step,
+                period_index.c.period_index,
+            )
+            .order_by(current_budgets.c.budget_id, period_index.c.period_index)
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
     async def count_by_user(self, user_id: int) -> int:
         """Conta orçamentos para um usuário específico"""
         from sqlalchemy import func
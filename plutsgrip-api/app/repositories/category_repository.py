@@ -1,27 +1,42 @@
 """
 Category repository for database operations
 """
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Select, select
+from sqlalchemy.orm import load_only, raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.category import Category, TransactionType
 from app.repositories.base_repository import BaseRepository
 
+# Columns exposed by CategoryResponse (also used where a category is embedded)
+CATEGORY_READ_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.type,
+    Category.color,
+    Category.icon,
+    Category.is_default,
+    Category.user_id,
+    Category.created_at,
+    Category.updated_at,
+)
+
 
 class CategoryRepository(BaseRepository[Category]):
     """Repository for Category model operations"""
 
+    # Categories are read without their owner or their transaction, budget
+    # and recurring collections (all selectin by default)
+    read_options = (load_only(*CATEGORY_READ_COLUMNS, raiseload=True), raiseload("*"))
+
     def __init__(self, db: AsyncSession):
         super().__init__(Category, db)
 
     async def get_by_id(self, id: int) -> Optional[Category]:
         """
-        Get a single category by ID with relationships loaded
+        Get a single non-deleted category by ID
         """
-        query = select(Category).options(
-            selectinload(Category.user)
-        ).where(
+        query = self._select().where(
             Category.id == id,
             Category.deleted_at.is_(None)
         )
@@ -31,24 +46,22 @@ class CategoryRepository(BaseRepository[Category]):
 
     async def get_by_type(self, transaction_type: TransactionType) -> List[Category]:
         """
-        Get categories by transaction type with relationships loaded
+        Get categories by transaction type
 
         Args:
             transaction_type: Type of transaction (income or expense)
 
         Returns:
-            List of categories with relationships loaded
+            List of categories
         """
         result = await self.db.execute(
-            select(Category).options(
-                selectinload(Category.user)
-            ).where(Category.type == transaction_type)
+            self._select().where(Category.type == transaction_type)
         )
         return list(result.scalars().all())
 
     async def get_by_name(self, name: str) -> Optional[Category]:
         """
-        Get category by name with relationships loaded
+        Get category by name
 
         Args:
             name: Category name
@@ -57,12 +70,84 @@ class CategoryRepository(BaseRepository[Category]):
             Category object or None
         """
         result = await self.db.execute(
-            select(Category).options(
-                selectinload(Category.user)
-            ).where(Category.name == name)
+            self._select().where(Category.name == name)
         )
         return result.scalars().first()
 
+    async def get_assignable_types(
+        self,
+        user_id: int,
+        category_ids: Iterable[int],
+    ) -> Dict[int, TransactionType]:
+        """
+        Resolve many category IDs a user may assign to transactions in one query
+
+        Only the user's own, non-deleted, non-default categories qualify
+        (the same rule TransactionService applies to a single category).
+
+        Args:
+            user_id: User ID
+            category_ids: Category IDs to check
+
+        Returns:
+            Mapping of valid category ID to its transaction type
+        """
+        ids = set(category_ids)
+        if not ids:
+            return {}
+
+        result = await self.db.execute(
+            select(Category.id, Category.type).where(
+                Category.id.in_(ids),
+                Category.user_id == user_id,
+                Category.deleted_at.is_(None),
+                Category.is_default.is_(False),
+            )
+        )
+        return {category_id: category_type for category_id, category_type in result.all()}
+
+    def assignable_ids(self, user_id: int) -> Select:
+        """
+        Subquery of the category IDs a user may assign to transactions
+
+        Same rule as get_assignable_types, for use inside other statements.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            SELECT of category IDs
+        """
+        return select(Category.id).where(
+            Category.user_id == user_id,
+            Category.deleted_at.is_(None),
+            Category.is_default.is_(False),
+        )
+
+    async def get_assignable_for_user(self, user_id: int) -> List[Tuple[int, str, TransactionType]]:
+        """
+        List the categories a user may assign to transactions
+
+        Same rule as get_assignable_types, returning only the columns needed
+        to match categories by name.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of (id, name, type) ordered by ID
+        """
+        result = await self.db.execute(
+            select(Category.id, Category.name, Category.type)
+            .where(
+                Category.user_id == user_id,
+                Category.deleted_at.is_(None),
+                Category.is_default.is_(False),
+            )
+            .order_by(Category.id)
+        )
+        return [tuple(row) for row in result.all()]
+
     # TODO: Implement additional category-specific queries
     # Examples:
     # - search_categories(search_term)
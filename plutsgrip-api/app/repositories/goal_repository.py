@@ -3,7 +3,7 @@ Repositório de Metas para operações com banco de dados
 """
 from typing import List, Optional
 from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.goal import Goal
 from app.repositories.base_repository import BaseRepository
@@ -12,23 +12,13 @@ from app.repositories.base_repository import BaseRepository
 class GoalRepository(BaseRepository[Goal]):
     """Repositório para operações do modelo Goal"""
 
+    # As respostas não incluem relacionamentos: o usuário nunca é
+    # carregado junto com a meta
+    read_options = (raiseload("*"),)
+
     def __init__(self, db: AsyncSession):
         super().__init__(Goal, db)
 
-    async def get_by_id(self, id: int) -> Optional[Goal]:
-        """
-        Get a single goal by ID with relationships loaded
-
-        Overrides base class to ensure relationships are loaded with selectinload
-        to avoid greenlet issues in async context
-        """
-        query = select(Goal).options(
-            selectinload(Goal.user)
-        ).where(Goal.id == id)
-
-        result = await self.db.execute(query)
-        return result.scalars().first()
-
     async def get_by_user_id(
         self,
         user_id: int,
@@ -37,7 +27,7 @@ class GoalRepository(BaseRepository[Goal]):
         is_completed: Optional[bool] = None
     ) -> List[Goal]:
         """
-        Obtém metas de um usuário com relacionamentos carregados
+        Obtém metas de um usuário
 
         Args:
             user_id: ID do usuário
@@ -46,11 +36,9 @@ class GoalRepository(BaseRepository[Goal]):
             is_completed: Filtrar por status (opcional)
 
         Returns:
-            Lista de metas com relacionamentos carregados
+            Lista de metas
         """
-        query = select(Goal).options(
-            selectinload(Goal.user)
-        ).where(Goal.user_id == user_id)
+        query = self._select().where(Goal.user_id == user_id)
 
         if is_completed is not None:
             query = query.where(Goal.is_completed == is_completed)
@@ -65,18 +53,16 @@ class GoalRepository(BaseRepository[Goal]):
         priority: str
     ) -> List[Goal]:
         """
-        Obtém metas de um usuário por prioridade com relacionamentos carregados
+        Obtém metas de um usuário por prioridade
 
         Args:
             user_id: ID do usuário
             priority: Prioridade (low, medium, high)
 
         Returns:
-            Lista de metas com relacionamentos carregados
+            Lista de metas
         """
-        query = select(Goal).options(
-            selectinload(Goal.user)
-        ).where(
+        query = self._select().where(
             and_(
                 Goal.user_id == user_id,
                 Goal.priority == priority
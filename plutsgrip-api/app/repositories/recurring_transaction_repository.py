@@ -1,55 +1,49 @@
 """
 Repositório de Transações Recorrentes para operações com banco de dados
 """
-from typing import List, Optional
-from datetime import date
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from typing import List, Optional, Sequence
+from datetime import date, datetime
+from sqlalchemy import Boolean, Date, Integer, Row, and_, case, column, func, insert, literal, or_, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
 from app.repositories.base_repository import BaseRepository
 
+# Prefixo das notas das transações geradas automaticamente
+AUTOMATIC_NOTE = "[Automática]"
+
 
 class RecurringTransactionRepository(BaseRepository[RecurringTransaction]):
     """Repositório para operações do modelo RecurringTransaction"""
 
+    # As respostas não incluem relacionamentos: o usuário e a categoria
+    # nunca são carregados junto com o registro
+    read_options = (raiseload("*"),)
+
     def __init__(self, db: AsyncSession):
         super().__init__(RecurringTransaction, db)
 
     async def create(self, obj_in: dict) -> RecurringTransaction:
         """
-        Create a new recurring transaction with relationships loaded
+        Create a new recurring transaction and reload it
 
-        Overrides base class to ensure relationships are loaded with selectinload
-        to avoid greenlet issues in async context when Pydantic validates the response
+        Overrides base class so the returned object is fully loaded before
+        Pydantic validates the response (no lazy loads in async context)
 
         Args:
             obj_in: Dictionary with recurring transaction data
 
         Returns:
-            RecurringTransaction object with all relationships loaded
+            RecurringTransaction object
         """
         # Create the recurring transaction using base method (insert + flush)
         recurring_transaction = await super().create(obj_in)
 
-        # Reload with relationships using get_by_id which has selectinload
+        # Reload through get_by_id so the row matches what reads return
         return await self.get_by_id(recurring_transaction.id)
 
-    async def get_by_id(self, id: int) -> Optional[RecurringTransaction]:
-        """
-        Get a single recurring transaction by ID with relationships loaded
-
-        Overrides base class to ensure relationships are loaded with selectinload
-        to avoid greenlet issues in async context
-        """
-        query = select(RecurringTransaction).options(
-            selectinload(RecurringTransaction.category),
-            selectinload(RecurringTransaction.user)
-        ).where(RecurringTransaction.id == id)
-
-        result = await self.db.execute(query)
-        return result.scalars().first()
-
     async def get_by_user_id(
         self,
         user_id: int,
@@ -58,7 +52,7 @@ class RecurringTransactionRepository(BaseRepository[RecurringTransaction]):
         is_active: Optional[bool] = None
     ) -> List[RecurringTransaction]:
         """
-        Obtém transações recorrentes de um usuário com relacionamentos carregados
+        Obtém transações recorrentes de um usuário
 
         Args:
             user_id: ID do usuário
@@ -67,12 +61,9 @@ class RecurringTransactionRepository(BaseRepository[RecurringTransaction]):
             is_active: Filtrar por status (opcional)
 
         Returns:
-            Lista de transações recorrentes com relacionamentos carregados
+            Lista de transações recorrentes
         """
-        query = select(RecurringTransaction).options(
-            selectinload(RecurringTransaction.category),
-            selectinload(RecurringTransaction.user)
-        ).where(RecurringTransaction.user_id == user_id)
+        query = self._select().where(RecurringTransaction.user_id == user_id)
 
         if is_active is not None:
             query = query.where(RecurringTransaction.is_active == is_active)
@@ -83,18 +74,15 @@ class RecurringTransactionRepository(BaseRepository[RecurringTransaction]):
 
     async def get_due_for_execution(self, current_date: date) -> List[RecurringTransaction]:
         """
-        Obtém transações recorrentes que devem ser executadas hoje com relacionamentos carregados
+        Obtém transações recorrentes que devem ser executadas hoje
 
         Args:
             current_date: Data atual
 
         Returns:
-            Lista de transações vencidas para execução com relacionamentos carregados
+            Lista de transações vencidas para execução
         """
-        query = select(RecurringTransaction).options(
-            selectinload(RecurringTransaction.category),
-            selectinload(RecurringTransaction.user)
-        ).where(
+        query = self._select().where(
             and_(
                 RecurringTransaction.is_active == True,
                 RecurringTransaction.next_execution_date <= current_date
@@ -104,6 +92,198 @@ class RecurringTransactionRepository(BaseRepository[RecurringTransaction]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def lock_due_batch(
+        self,
+        current_date: date,
+        limit: int,
+        worker_index: int = 0,
+        worker_count: int = 1,
+    ) -> List[Row]:
+        """
+        Bloqueia um lote de recorrências vencidas para materialização
+
+        Usa ``FOR UPDATE SKIP LOCKED``: linhas já bloqueadas por outro
+        worker são puladas em vez de esperadas, então vários workers podem
+        consumir a fila ao mesmo tempo sem gerar ocorrências em dobro. Com
+        ``worker_count`` > 1 cada worker fica com os usuários em que
+        ``user_id % worker_count == worker_index``, de modo que as
+        transações (e os rollups) de um usuário são escritos por um único
+        worker. Os bloqueios duram até o commit do lote.
+
+        Args:
+            current_date: Data de referência
+            limit: Tamanho máximo do lote
+            worker_index: Partição deste worker (0 a worker_count - 1)
+            worker_count: Número total de partições
+
+        Returns:
+            Linhas (id, user_id, frequency, start_date, end_date, next_execution_date)
+        """
+        query = (
+            select(
+                RecurringTransaction.id,
+                RecurringTransaction.user_id,
+                RecurringTransaction.frequency,
+                RecurringTransaction.start_date,
+                RecurringTransaction.end_date,
+                RecurringTransaction.next_execution_date,
+            )
+            .where(
+                RecurringTransaction.is_active == true(),
+                RecurringTransaction.next_execution_date <= current_date,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if worker_count > 1:
+            query = query.where(RecurringTransaction.user_id % worker_count == worker_index)
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def insert_occurrences(
+        self,
+        template_ids: Sequence[int],
+        occurrence_dates: Sequence[date],
+        created_at: datetime,
+    ) -> int:
+        """
+        Insere as transações de várias ocorrências em um único INSERT ... SELECT
+
+        Apenas os pares (recorrência, data) são enviados, como dois arrays
+        desaninhados com ``unnest``; descrição, valor, categoria etc. são
+        copiados da recorrência dentro do banco.
+
+        Args:
+            template_ids: Recorrência de cada ocorrência
+            occurrence_dates: Data de cada ocorrência
+            created_at: Timestamp de criação das transações
+
+        Returns:
+            Número de transações inseridas
+        """
+        if not template_ids:
+            return 0
+
+        occurrences = (
+            func.unnest(
+                literal(list(template_ids), ARRAY(Integer)),
+                literal(list(occurrence_dates), ARRAY(Date)),
+            )
+            .table_valued(column("template_id", Integer), column("occurrence_date", Date))
+            .render_derived(name="occurrences")
+        )
+        notes = case(
+            (RecurringTransaction.notes.is_(None), AUTOMATIC_NOTE),
+            else_=AUTOMATIC_NOTE + " " + RecurringTransaction.notes,
+        )
+        source = select(
+            RecurringTransaction.user_id,
+            RecurringTransaction.description,
+            RecurringTransaction.amount,
+            RecurringTransaction.currency,
+            occurrences.c.occurrence_date,
+            RecurringTransaction.type,
+            RecurringTransaction.category_id,
+            notes,
+            true(),
+            RecurringTransaction.id,
+            literal(created_at),
+            literal(created_at),
+        ).join_from(occurrences, RecurringTransaction, RecurringTransaction.id == occurrences.c.template_id)
+
+        result = await self.db.execute(
+            insert(Transaction).from_select(
+                [
+                    "user_id", "description", "amount", "currency", "date", "type", "category_id",
+                    "notes", "is_recurring", "recurring_transaction_id", "created_at", "updated_at",
+                ],
+                source,
+                include_defaults=False,
+            )
+        )
+        return result.rowcount or 0
+
+    async def advance_schedules(
+        self,
+        template_ids: Sequence[int],
+        next_dates: Sequence[date],
+        active_flags: Sequence[bool],
+        updated_at: datetime,
+    ) -> int:
+        """
+        Atualiza a próxima execução (e o status) de várias recorrências em um único UPDATE ... FROM
+
+        Args:
+            template_ids: IDs das recorrências
+            next_dates: Nova próxima execução de cada recorrência
+            active_flags: Se cada recorrência segue ativa
+            updated_at: Timestamp de atualização
+
+        Returns:
+            Número de recorrências atualizadas
+        """
+        if not template_ids:
+            return 0
+
+        schedules = (
+            func.unnest(
+                literal(list(template_ids), ARRAY(Integer)),
+                literal(list(next_dates), ARRAY(Date)),
+                literal(list(active_flags), ARRAY(Boolean)),
+            )
+            .table_valued(column("id", Integer), column("next_date", Date), column("is_active", Boolean))
+            .render_derived(name="schedules")
+        )
+        result = await self.db.execute(
+            update(RecurringTransaction)
+            .where(RecurringTransaction.id == schedules.c.id)
+            .values(
+                next_execution_date=schedules.c.next_date,
+                is_active=schedules.c.is_active,
+                updated_at=updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    async def get_projection_rows(self, user_id: int, start_date: date, end_date: date) -> List[Row]:
+        """
+        Obtém as recorrências ativas com ocorrências possíveis no período
+
+        Só as colunas usadas na projeção são lidas.
+
+        Args:
+            user_id: ID do usuário
+            start_date: Início do período
+            end_date: Fim do período
+
+        Returns:
+            Linhas (id, description, amount, type, category_id, frequency,
+            start_date, end_date, next_execution_date)
+        """
+        result = await self.db.execute(
+            select(
+                RecurringTransaction.id,
+                RecurringTransaction.description,
+                RecurringTransaction.amount,
+                RecurringTransaction.type,
+                RecurringTransaction.category_id,
+                RecurringTransaction.frequency,
+                RecurringTransaction.start_date,
+                RecurringTransaction.end_date,
+                RecurringTransaction.next_execution_date,
+            )
+            .where(
+                RecurringTransaction.user_id == user_id,
+                RecurringTransaction.is_active == true(),
+                RecurringTransaction.next_execution_date <= end_date,
+                or_(RecurringTransaction.end_date.is_(None), RecurringTransaction.end_date >= start_date),
+            )
+            .order_by(RecurringTransaction.id)
+        )
+        return list(result.all())
+
     async def count_by_user(self, user_id: int) -> int:
         """Conta transações recorrentes para um usuário"""
         from sqlalchemy import func
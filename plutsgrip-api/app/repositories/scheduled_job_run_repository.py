@@ -0,0 +1,77 @@
+"""
+Scheduled job run repository
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.scheduled_job_run import ScheduledJobRun
+
+
+class ScheduledJobRunRepository:
+    """Repository for the scheduled job run history"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(
+        self,
+        job_name: str,
+        instance: str,
+        started_at: datetime,
+        finished_at: datetime,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> ScheduledJobRun:
+        """
+        Add a run to the history (the caller commits)
+
+        Args:
+            job_name: Registered job name
+            instance: Host and process that ran the job
+            started_at: Start time (UTC)
+            finished_at: End time (UTC)
+            status: ``success`` or ``failed``
+            result: Outcome description
+            error: Error message
+
+        Returns:
+            The new run
+        """
+        run = ScheduledJobRun(
+            job_name=job_name,
+            instance=instance,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_ms=int((finished_at - started_at).total_seconds() * 1000),
+            status=status,
+            result=result,
+            error=error,
+        )
+        self.db.add(run)
+        await self.db.flush()
+        return run
+
+    async def get_latest(self, job_name: Optional[str] = None, limit: int = 50) -> List[ScheduledJobRun]:
+        """Get the most recent runs, optionally of one job"""
+        query = select(ScheduledJobRun).order_by(ScheduledJobRun.started_at.desc()).limit(limit)
+        if job_name is not None:
+            query = query.where(ScheduledJobRun.job_name == job_name)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete runs started before ``cutoff`` (the caller commits)"""
+        result = await self.db.execute(delete(ScheduledJobRun).where(ScheduledJobRun.started_at < cutoff))
+        return result.rowcount or 0
+
+    async def get_last_started(self) -> Dict[str, datetime]:
+        """Get the start time of the most recent run of each job"""
+        result = await self.db.execute(
+            select(ScheduledJobRun.job_name, func.max(ScheduledJobRun.started_at))
+            .group_by(ScheduledJobRun.job_name)
+        )
+        return {job_name: started_at for job_name, started_at in result.all()}
@@ -2,23 +2,120 @@
 Transaction repository for database operations
 """
 from datetime import date
-from typing import List, Optional
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, Select, and_, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, contains_eager, joinedload, load_only, raiseload
 
-from app.models.category import TransactionType
+from app.models.category import Category, TransactionType
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import UNCATEGORIZED_ID
 from app.repositories.base_repository import BaseRepository
+from app.repositories.category_repository import CATEGORY_READ_COLUMNS
+
+# Columns exposed by TransactionResponse
+TRANSACTION_READ_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.date,
+    Transaction.type,
+    Transaction.category_id,
+    Transaction.notes,
+    Transaction.tags,
+    Transaction.is_recurring,
+    Transaction.recurring_transaction_id,
+    Transaction.created_at,
+    Transaction.updated_at,
+)
 
 
 class TransactionRepository(BaseRepository[Transaction]):
     """Repository for Transaction model operations"""
 
+    # Responses embed the category, fetched in the same SELECT through a LEFT
+    # JOIN; the owning user and the category's collections are never loaded
+    read_options = (
+        load_only(*TRANSACTION_READ_COLUMNS, raiseload=True),
+        joinedload(Transaction.category).options(
+            load_only(*CATEGORY_READ_COLUMNS, raiseload=True),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    )
+
     def __init__(self, db: AsyncSession):
         super().__init__(Transaction, db)
 
+    async def update_owned(
+        self, id: int, owner_id: int, values: dict[str, Any], *conditions: Any
+    ) -> Optional[Transaction]:
+        """
+        Update a transaction owned by a user and reload it with its category
+
+        Runs ``WITH updated AS (UPDATE ... RETURNING *) SELECT ... FROM updated
+        LEFT JOIN categories``, so the ownership check, the write and the
+        reload with the embedded category are one statement.
+
+        Args:
+            id: Transaction ID
+            owner_id: ID of the user the transaction must belong to
+            values: Columns to set (values may be SQL expressions)
+            conditions: Extra conditions the row must also satisfy
+
+        Returns:
+            Updated transaction, or None if it does not exist, belongs to
+            someone else or fails a condition
+        """
+        if not values:
+            return await self.get_owned(id, owner_id)
+
+        updated = (
+            update(Transaction)
+            .where(Transaction.id == id, Transaction.user_id == owner_id, *conditions)
+            .values(**values)
+            .returning(*Transaction.__table__.c)
+            .cte("updated")
+        )
+        updated_transaction = aliased(Transaction, updated)
+        result = await self.db.execute(
+            select(updated_transaction)
+            .outerjoin(updated_transaction.category)
+            .options(
+                contains_eager(updated_transaction.category).options(raiseload("*")),
+                raiseload("*"),
+            )
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    def _apply_filters(
+        query: Select,
+        transaction_type: Optional[TransactionType] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Select:
+        """Apply the optional list filters shared by the list and count queries"""
+        if transaction_type:
+            query = query.where(Transaction.type == transaction_type)
+
+        if category_id:
+            query = query.where(Transaction.category_id == category_id)
+
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+
+        return query
+
     async def get_by_user_id(
         self,
         user_id: int,
@@ -28,33 +125,102 @@ class TransactionRepository(BaseRepository[Transaction]):
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        after: Optional[Tuple[date, int]] = None,
     ) -> List[Transaction]:
         """
         Get transactions for a specific user with optional filters
-        """
-        query = (
-            select(Transaction)
-            .options(selectinload(Transaction.category), selectinload(Transaction.user))
-            .where(Transaction.user_id == user_id)
-        )
 
-        if transaction_type:
-            query = query.where(Transaction.type == transaction_type)
+        Rows are ordered by (date, id) descending so the order is stable for
+        rows sharing a date. When ``after`` is given the page starts right
+        after that (date, id) key (keyset pagination) and ``skip`` is ignored;
+        the lookup is an index range scan on ix_transactions_user_id_date, so
+        its cost does not grow with the page depth.
 
-        if category_id:
-            query = query.where(Transaction.category_id == category_id)
+        Args:
+            user_id: User ID
+            skip: Offset for page/page_size pagination
+            limit: Maximum number of rows
+            transaction_type: Optional type filter
+            category_id: Optional category filter
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date
+            after: Optional (date, id) of the last row of the previous page
 
-        if start_date:
-            query = query.where(Transaction.date >= start_date)
+        Returns:
+            List of transactions
+        """
+        query = self._select().where(Transaction.user_id == user_id)
+        query = self._apply_filters(query, transaction_type, category_id, start_date, end_date)
 
-        if end_date:
-            query = query.where(Transaction.date <= end_date)
+        if after is not None:
+            query = query.where(tuple_(Transaction.date, Transaction.id) < tuple_(*after))
+        elif skip:
+            query = query.offset(skip)
 
-        query = query.order_by(Transaction.date.desc()).offset(skip).limit(limit)
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit)
 
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def stream_export_rows(
+        self,
+        user_id: int,
+        transaction_type: Optional[TransactionType] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream a user's transactions as plain rows through a server-side cursor
+
+        Rows are fetched ``batch_size`` at a time and never turned into ORM
+        entities, so memory stays flat regardless of the history size. The
+        rows are read on a connection of their own, in a transaction, which is
+        held until the iterator is exhausted.
+
+        Args:
+            user_id: User ID
+            transaction_type: Optional type filter
+            category_id: Optional category filter
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Batches of rows ordered by (date, id) descending
+        """
+        query = (
+            select(
+                Transaction.id,
+                Transaction.date,
+                Transaction.description,
+                Transaction.amount,
+                Transaction.currency,
+                Transaction.type,
+                Transaction.category_id,
+                Category.name.label("category"),
+                Transaction.notes,
+                Transaction.tags,
+                Transaction.is_recurring,
+                Transaction.created_at,
+            )
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(Transaction.user_id == user_id)
+        )
+        query = self._apply_filters(query, transaction_type, category_id, start_date, end_date)
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+        # Server-side cursors need a transaction, which read sessions
+        # (autocommit) do not open: stream from a dedicated connection in a
+        # REPEATABLE READ transaction, which also gives the whole export one snapshot
+        async with self.db.bind.connect() as connection:
+            connection = await connection.execution_options(isolation_level="REPEATABLE READ")
+            async with connection.begin():
+                result = await connection.stream(query.execution_options(yield_per=batch_size))
+                async for partition in result.partitions():
+                    yield partition
+
     async def get_by_date_range(
         self,
         user_id: int,
@@ -65,8 +231,7 @@ class TransactionRepository(BaseRepository[Transaction]):
         Get transactions within a date range
         """
         query = (
-            select(Transaction)
-            .options(selectinload(Transaction.category), selectinload(Transaction.user))
+            self._select()
             .where(
                 and_(
                     Transaction.user_id == user_id,
@@ -82,23 +247,33 @@ class TransactionRepository(BaseRepository[Transaction]):
 
     async def create(self, obj_in: dict) -> Transaction:
         """
-        Create a new transaction with relationships loaded
+        Create a new transaction and reload it with its category
         """
         transaction = await super().create(obj_in)
         return await self.get_by_id(transaction.id)
 
-    async def get_by_id(self, id: int) -> Optional[Transaction]:
+    async def bulk_create(self, rows: List[dict]) -> List[int]:
         """
-        Get a single transaction by ID with relationships loaded
+        Insert many transactions with multi-row INSERT ... RETURNING
+
+        SQLAlchemy batches the rows into as few statements as the driver's
+        parameter limit allows, so the statement-level rollup triggers fire
+        once per batch rather than once per row.
+
+        Args:
+            rows: Column values for each transaction
+
+        Returns:
+            IDs of the inserted transactions, in the order of ``rows``
         """
-        query = (
-            select(Transaction)
-            .options(selectinload(Transaction.category), selectinload(Transaction.user))
-            .where(Transaction.id == id)
-        )
+        if not rows:
+            return []
 
-        result = await self.db.execute(query)
-        return result.scalars().first()
+        result = await self.db.execute(
+            insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.scalars().all())
 
     async def count_by_user(
         self,
@@ -110,18 +285,142 @@ class TransactionRepository(BaseRepository[Transaction]):
     ) -> int:
         """Count transactions for a specific user with optional filters"""
         query = select(func.count(Transaction.id)).where(Transaction.user_id == user_id)
+        query = self._apply_filters(query, transaction_type, category_id, start_date, end_date)
 
-        if transaction_type:
-            query = query.where(Transaction.type == transaction_type)
+        result = await self.db.execute(query)
+        return result.scalar() or 0
 
-        if category_id:
-            query = query.where(Transaction.category_id == category_id)
+    async def get_max_id(self, user_id: int) -> int:
+        """Get the highest transaction ID of a user (0 when the user has none)"""
+        result = await self.db.execute(
+            select(func.max(Transaction.id)).where(Transaction.user_id == user_id)
+        )
+        return result.scalar() or 0
 
-        if start_date:
-            query = query.where(Transaction.date >= start_date)
+    async def count_existing_by_import_key(
+        self,
+        user_id: int,
+        import_keys: Iterable[str],
+        max_id: int,
+    ) -> Dict[str, int]:
+        """
+        Count a user's imported transactions by statement import key
 
-        if end_date:
-            query = query.where(Transaction.date <= end_date)
+        Args:
+            user_id: User ID
+            import_keys: Keys to look up
+            max_id: Only rows with an ID up to this value are counted
 
-        result = await self.db.execute(query)
-        return result.scalar() or 0
+        Returns:
+            Mapping of key to number of matching rows (keys without matches are omitted)
+        """
+        import_keys = list(set(import_keys))
+        if not import_keys:
+            return {}
+
+        result = await self.db.execute(
+            select(Transaction.import_key, func.count(Transaction.id))
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.id <= max_id,
+                Transaction.import_key.in_(import_keys),
+            )
+            .group_by(Transaction.import_key)
+        )
+        return dict(result.all())
+
+    async def count_existing_by_key(
+        self,
+        user_id: int,
+        keys: Iterable[Tuple[date, Decimal, str]],
+        max_id: int,
+    ) -> Dict[Tuple[date, Decimal, str], int]:
+        """
+        Count a user's transactions without an import key matching (date, amount, description) keys
+
+        The type is left out: it follows the category, which may have changed
+        since the transaction was created. One query per call; the candidate
+        rows are narrowed by the (user_id, date) index and matched with a
+        row-value IN list.
+
+        Args:
+            user_id: User ID
+            keys: Keys to look up
+            max_id: Only rows with an ID up to this value are counted
+
+        Returns:
+            Mapping of key to number of matching rows (keys without matches are omitted)
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        key_columns = (Transaction.date, Transaction.amount, Transaction.description)
+        result = await self.db.execute(
+            select(*key_columns, func.count(Transaction.id))
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.id <= max_id,
+                Transaction.import_key.is_(None),
+                Transaction.date.in_({key[0] for key in keys}),
+                tuple_(*key_columns).in_(keys),
+            )
+            .group_by(*key_columns)
+        )
+        return {
+            (row_date, amount, description): count
+            for row_date, amount, description, count in result.all()
+        }
+
+    async def get_recently_active_user_ids(self, since: date, limit: int) -> List[int]:
+        """
+        Get users with transactions dated on or after ``since``
+
+        Args:
+            since: Earliest transaction date considered
+            limit: Maximum number of users, most recent activity first
+
+        Returns:
+            User IDs
+        """
+        result = await self.db.execute(
+            select(Transaction.user_id)
+            .where(Transaction.date >= since)
+            .group_by(Transaction.user_id)
+            .order_by(func.max(Transaction.date).desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_recurring_daily_totals(self, user_id: int, start_date: date, end_date: date) -> List[Row]:
+        """
+        Get daily totals of the transactions generated by recurring templates
+
+        Aggregated in the database; keyed like the daily rollup so the two
+        can be combined.
+
+        Args:
+            user_id: User ID
+            start_date: Inclusive start date
+            end_date: Inclusive end date
+
+        Returns:
+            Rows of (day, type, category_id, total), with UNCATEGORIZED_ID for no category
+        """
+        category_id = func.coalesce(Transaction.category_id, UNCATEGORIZED_ID).label("category_id")
+        result = await self.db.execute(
+            select(
+                Transaction.date.label("day"),
+                Transaction.type,
+                category_id,
+                func.sum(Transaction.amount).label("total"),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.date >= start_date,
+                Transaction.date <= end_date,
+                Transaction.recurring_transaction_id.isnot(None),
+            )
+            .group_by(Transaction.date, Transaction.type, category_id)
+        )
+        return list(result.all())
@@ -0,0 +1,292 @@
+"""
+Transaction rollup repository for report aggregations
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, and_, cast, delete, func, insert, literal_column, select, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category, TransactionType
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup, UNCATEGORIZED_ID
+
+
+# date_trunc units accepted by get_period_totals
+PERIOD_UNITS = frozenset({"week", "month", "quarter", "year"})
+
+
+class TransactionRollupRepository:
+    """
+    Repository for reading and rebuilding the daily transaction rollup
+
+    Reads are O(days in range) for a user instead of O(transactions).
+    Writes happen through the database triggers on ``transactions``.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _range_conditions(
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> list:
+        conditions = [TransactionDailyRollup.user_id == user_id]
+        if start_date:
+            conditions.append(TransactionDailyRollup.day >= start_date)
+        if end_date:
+            conditions.append(TransactionDailyRollup.day <= end_date)
+        return conditions
+
+    async def get_totals_by_type(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[TransactionType, Tuple[Decimal, int]]:
+        """
+        Get total amount and count per transaction type
+
+        Args:
+            user_id: User ID
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date
+
+        Returns:
+            Mapping of type to (total amount, transaction count); missing types default to zero
+        """
+        result = await self.db.execute(
+            select(
+                TransactionDailyRollup.type,
+                func.sum(TransactionDailyRollup.total_amount),
+                func.sum(TransactionDailyRollup.transaction_count),
+            )
+            .where(and_(*self._range_conditions(user_id, start_date, end_date)))
+            .group_by(TransactionDailyRollup.type)
+        )
+
+        totals = {transaction_type: (Decimal("0.00"), 0) for transaction_type in TransactionType}
+        for transaction_type, total, count in result.all():
+            totals[transaction_type] = (total or Decimal("0.00"), int(count or 0))
+        return totals
+
+    async def get_totals_by_category(
+        self,
+        user_id: int,
+        transaction_type: TransactionType,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> List[Row]:
+        """
+        Get totals grouped by category, largest first
+
+        Transactions without a category are not included.
+
+        Args:
+            user_id: User ID
+            transaction_type: Transaction type
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date
+            limit: Optional maximum number of categories
+
+        Returns:
+            Rows of (category_id, category_name, total, count)
+        """
+        total = func.sum(TransactionDailyRollup.total_amount)
+        query = (
+            select(
+                Category.id,
+                Category.name,
+                total.label("total"),
+                func.sum(TransactionDailyRollup.transaction_count).label("count"),
+            )
+            .join(Category, Category.id == TransactionDailyRollup.category_id)
+            .where(
+                and_(
+                    *self._range_conditions(user_id, start_date, end_date),
+                    TransactionDailyRollup.type == transaction_type,
+                    TransactionDailyRollup.category_id != UNCATEGORIZED_ID,
+                )
+            )
+            .group_by(Category.id, Category.name)
+            .having(func.sum(TransactionDailyRollup.transaction_count) > 0)
+            .order_by(total.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def get_daily_totals(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> List[Row]:
+        """
+        Get totals grouped by day and type
+
+        Args:
+            user_id: User ID
+            start_date: Inclusive start date
+            end_date: Inclusive end date
+
+        Returns:
+            Rows of (day, type, total) for days with activity, ordered by day
+        """
+        result = await self.db.execute(
+            select(
+                TransactionDailyRollup.day,
+                TransactionDailyRollup.type,
+                func.sum(TransactionDailyRollup.total_amount).label("total"),
+            )
+            .where(and_(*self._range_conditions(user_id, start_date, end_date)))
+            .group_by(TransactionDailyRollup.day, TransactionDailyRollup.type)
+            .having(func.sum(TransactionDailyRollup.transaction_count) > 0)
+            .order_by(TransactionDailyRollup.day)
+        )
+        return list(result.all())
+
+    async def get_daily_category_totals(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> List[Row]:
+        """
+        Get the rollup rows of a date range with their category names
+
+        Args:
+            user_id: User ID
+            start_date: Inclusive start date
+            end_date: Inclusive end date
+
+        Returns:
+            Rows of (day, type, category_id, category_name, total); category_id is
+            UNCATEGORIZED_ID (and the name None) for transactions without a category
+        """
+        result = await self.db.execute(
+            select(
+                TransactionDailyRollup.day,
+                TransactionDailyRollup.type,
+                TransactionDailyRollup.category_id,
+                Category.name.label("category_name"),
+                TransactionDailyRollup.total_amount.label("total"),
+            )
+            .outerjoin(Category, Category.id == TransactionDailyRollup.category_id)
+            .where(
+                and_(
+                    *self._range_conditions(user_id, start_date, end_date),
+                    TransactionDailyRollup.transaction_count > 0,
+                )
+            )
+        )
+        return list(result.all())
+
+    async def get_period_totals(
+        self,
+        user_id: int,
+        unit: str,
+        start_date: date,
+        end_date: date,
+    ) -> List[Row]:
+        """
+        Get totals grouped by calendar period and type in a single query
+
+        Args:
+            user_id: User ID
+            unit: PostgreSQL date_trunc unit (week, month, quarter, year)
+            start_date: Inclusive start date
+            end_date: Inclusive end date
+
+        Returns:
+            Rows of (period_start, type, total) for periods with activity
+        """
+        if unit not in PERIOD_UNITS:
+            raise ValueError(f"Unsupported period unit: {unit}")
+
+        # The unit is inlined (not bound) so the SELECT and GROUP BY expressions match
+        period = cast(
+            func.date_trunc(literal_column(f"'{unit}'"), TransactionDailyRollup.day), Date
+        ).label("period_start")
+        result = await self.db.execute(
+            select(
+                period,
+                TransactionDailyRollup.type,
+                func.sum(TransactionDailyRollup.total_amount).label("total"),
+            )
+            .where(and_(*self._range_conditions(user_id, start_date, end_date)))
+            .group_by(period, TransactionDailyRollup.type)
+        )
+        return list(result.all())
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute rollup rows from the transactions table
+
+        Blocks concurrent writes to transactions for the duration of the
+        surrounding database transaction so the rebuilt rows cannot miss a
+        trigger update. The caller is responsible for committing.
+
+        Args:
+            user_id: Optional user ID; rebuilds every user when omitted
+
+        Returns:
+            Number of rollup rows written
+        """
+        await self.db.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+
+        delete_query = delete(TransactionDailyRollup)
+        source = select(
+            Transaction.user_id,
+            Transaction.date,
+            Transaction.type,
+            func.coalesce(Transaction.category_id, UNCATEGORIZED_ID),
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+        )
+        if user_id is not None:
+            delete_query = delete_query.where(TransactionDailyRollup.user_id == user_id)
+            source = source.where(Transaction.user_id == user_id)
+
+        source = source.group_by(
+            Transaction.user_id,
+            Transaction.date,
+            Transaction.type,
+            func.coalesce(Transaction.category_id, UNCATEGORIZED_ID),
+        )
+
+        await self.db.execute(delete_query)
+        result = await self.db.execute(
+            insert(TransactionDailyRollup).from_select(
+                ["user_id", "day", "type", "category_id", "total_amount", "transaction_count"],
+                source,
+            )
+        )
+        return result.rowcount or 0
+
+    async def delete_empty(self) -> int:
+        """
+        Delete rollup rows whose transactions were all deleted or moved
+
+        Deletes and updates leave rows behind with a zero count and total
+        (the triggers only add deltas). Concurrent trigger updates are safe:
+        a row that gained transactions in the meantime no longer matches
+        and is kept. The caller is responsible for committing.
+
+        Returns:
+            Number of rows deleted
+        """
+        result = await self.db.execute(
+            delete(TransactionDailyRollup).where(
+                TransactionDailyRollup.transaction_count == 0,
+                TransactionDailyRollup.total_amount == 0,
+            )
+        )
+        return result.rowcount or 0
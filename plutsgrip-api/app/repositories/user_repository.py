@@ -4,6 +4,7 @@ User repository for database operations
 from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.principal import AuthenticatedUser, invalidate_principal
 from app.models.user import User
 from app.repositories.base_repository import BaseRepository
 
@@ -40,5 +41,52 @@ class UserRepository(BaseRepository[User]):
         user = await self.get_by_email(email)
         return user is not None
 
+    async def get_principal(self, user_id: int) -> Optional[AuthenticatedUser]:
+        """
+        Load the authenticated principal for a user
+
+        Selects only the columns needed by authentication, so no relationship
+        loaders run regardless of how much data the user owns.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            AuthenticatedUser snapshot or None if not found or soft-deleted
+        """
+        result = await self.db.execute(
+            select(
+                User.id,
+                User.name,
+                User.email,
+                User.currency,
+                User.timezone,
+                User.created_at,
+                User.updated_at,
+            ).where(User.id == user_id, User.deleted_at.is_(None))
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return AuthenticatedUser(**row._mapping)
+
+    async def update(self, id: int, obj_in: dict) -> Optional[User]:
+        """Update a user and drop its cached principal"""
+        result = await super().update(id, obj_in)
+        invalidate_principal(id)
+        return result
+
+    async def delete(self, id: int) -> bool:
+        """Delete a user and drop its cached principal"""
+        result = await super().delete(id)
+        invalidate_principal(id)
+        return result
+
+    async def soft_delete(self, id: int) -> bool:
+        """Soft delete a user and drop its cached principal"""
+        result = await super().soft_delete(id)
+        invalidate_principal(id)
+        return result
+
     # TODO: Implement additional user-specific queries as needed
     # Example: get_active_users(), search_users_by_name(), etc.
@@ -3,7 +3,7 @@ Schemas de Orçamento para validação de requisições/respostas
 """
 from datetime import datetime, date as DateType
 from decimal import Decimal
-from typing import Optional, Any
+from typing import List, Optional, Any
 from pydantic import BaseModel, Field, ConfigDict, field_serializer
 from app.models.budget import BudgetPeriod
 
@@ -51,3 +51,24 @@ class BudgetResponse(BaseModel):
         if hasattr(value, 'value'):
             return value.value
         return str(value)
+
+
+class BudgetPeriodUsage(BaseModel):
+    """Gasto de um orçamento em um período"""
+    period_start: DateType
+    period_end: DateType
+    spent_amount: float
+    percentage_used: float
+    is_exceeded: bool
+
+
+class BudgetStatusResponse(BudgetPeriodUsage):
+    """Schema para status de orçamento no período atual"""
+    budget_id: int
+    category_id: int
+    period: str
+    budget_amount: float
+    remaining_amount: float
+    history: List[BudgetPeriodUsage] = Field(
+        default_factory=list, description="Períodos anteriores, do mais antigo ao mais recente"
+    )
@@ -3,7 +3,7 @@ Schemas de Transações Recorrentes para validação de requisições/respostas
 """
 from datetime import datetime, date as DateType
 from decimal import Decimal
-from typing import Optional, Any
+from typing import List, Optional, Any
 from pydantic import BaseModel, Field, ConfigDict, field_serializer, field_validator
 from app.models.category import TransactionType
 
@@ -84,3 +84,33 @@ class RecurringTransactionResponse(BaseModel):
         if hasattr(value, 'value'):
             return value.value
         return str(value)
+
+
+class CashflowCalendarOccurrence(BaseModel):
+    """Ocorrência projetada de uma transação recorrente"""
+    recurring_transaction_id: int
+    description: str
+    amount: float
+    type: str
+    category_id: Optional[int]
+
+
+class CashflowCalendarDay(BaseModel):
+    """Dia do calendário de fluxo de caixa"""
+    date: DateType
+    income: float
+    expense: float
+    net: float
+    balance: float = Field(..., description="Saldo acumulado das ocorrências desde o início do período")
+    occurrences: List[CashflowCalendarOccurrence]
+
+
+class CashflowCalendarResponse(BaseModel):
+    """Schema para o calendário de fluxo de caixa das recorrências"""
+    start_date: DateType
+    end_date: DateType
+    total_income: float
+    total_expense: float
+    net: float
+    occurrence_count: int
+    days: List[CashflowCalendarDay] = Field(..., description="Apenas os dias com ocorrências, em ordem")
@@ -2,10 +2,19 @@
 Report schemas for dashboard and financial summaries
 """
 from datetime import date
+from enum import Enum
 from typing import Optional, Dict, List
 from pydantic import BaseModel, Field
 
 
+class TrendGranularity(str, Enum):
+    """Granularity of trend buckets (values match PostgreSQL date_trunc units)"""
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
 class DashboardResponse(BaseModel):
     """Schema for dashboard summary response"""
     total_income: float
@@ -48,3 +57,58 @@ class ReportFilters(BaseModel):
     """Schema for report filter parameters"""
     start_date: Optional[date] = Field(None, description="Start date for report period")
     end_date: Optional[date] = Field(None, description="End date for report period")
+
+
+class TrendPoint(BaseModel):
+    """Schema for a single trend bucket"""
+    period: str
+    period_start: date
+    month: str = Field(..., description="Legacy alias of period kept for existing clients")
+    value: float
+
+
+class TrendsResponse(BaseModel):
+    """Schema for income, expense and balance trends"""
+    granularity: TrendGranularity
+    income: List[TrendPoint]
+    expense: List[TrendPoint]
+    balance: List[TrendPoint]
+
+
+class ForecastCategory(BaseModel):
+    """Projected non-recurring total of one category"""
+    category_id: Optional[int]
+    category_name: Optional[str]
+    type: str
+    projected_total: float
+
+
+class ForecastDay(BaseModel):
+    """Projected movements and balance of one day"""
+    date: date
+    recurring_income: float
+    recurring_expense: float
+    estimated_income: float
+    estimated_expense: float
+    net: float
+    balance: float
+    balance_low: float = Field(..., description="Lower bound of the 80% balance range")
+    balance_high: float = Field(..., description="Upper bound of the 80% balance range")
+
+
+class ForecastResponse(BaseModel):
+    """Schema for balance forecast response"""
+    start_date: date
+    end_date: date
+    history_days: int
+    opening_balance: float
+    ending_balance: float
+    lowest_balance: float
+    lowest_balance_date: date
+    first_negative_date: Optional[date] = Field(None, description="First day the projected balance is below zero")
+    projected_income: float
+    projected_expense: float
+    recurring_income: float
+    recurring_expense: float
+    categories: List[ForecastCategory]
+    daily: List[ForecastDay]
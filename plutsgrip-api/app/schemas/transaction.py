@@ -4,8 +4,9 @@ Transaction schemas for request/response validation
 from datetime import datetime
 from datetime import date as DateType
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel, Field, ConfigDict, field_serializer, field_validator
+from app.core.config import settings
 from app.models.category import TransactionType
 from app.schemas.category import CategoryResponse
 
@@ -85,6 +86,43 @@ class TransactionResponse(BaseModel):
 class TransactionListResponse(BaseModel):
     """Schema for transaction list response"""
     transactions: list[TransactionResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = None
+
+
+class TransactionBulkCreateRequest(BaseModel):
+    """Schema for bulk transaction creation request"""
+    items: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.TRANSACTION_BULK_MAX_ITEMS,
+        description="Transactions in the same format as POST /transactions; each is validated individually",
+    )
+    atomic: bool = Field(False, description="Reject the whole batch if any item is invalid")
+
+
+class BulkItemError(BaseModel):
+    """Schema for an item rejected by a bulk operation"""
+    index: int
+    errors: list[str]
+
+
+class TransactionBulkCreateResponse(BaseModel):
+    """Schema for bulk transaction creation response"""
+    created: int
+    failed: int
+    ids: list[int]
+    errors: list[BulkItemError]
+
+
+class StatementImportResponse(BaseModel):
+    """Schema for statement import summary"""
+    rows_read: int
+    inserted: int
+    duplicates: int
+    failed: int
+    batches: int
+    dry_run: bool
+    errors: list[str]
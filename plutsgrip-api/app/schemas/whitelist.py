@@ -3,15 +3,28 @@ Whitelist schemas for request/response validation
 """
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, ConfigDict, Field, IPvAnyAddress
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from app.core.trusted_networks import parse_network
 
 
 class WhitelistCreateRequest(BaseModel):
     """Schema for adding IP to whitelist"""
-    ip_address: str = Field(..., description="IP address to whitelist")
+    ip_address: str = Field(..., max_length=45, description="IP address or CIDR range to whitelist")
     description: Optional[str] = Field(None, description="Reason for whitelisting")
     expires_at: Optional[datetime] = Field(None, description="Optional expiration datetime")
 
+    @field_validator("ip_address")
+    @classmethod
+    def validate_ip_address(cls, v: str) -> str:
+        """Validate and normalize an address ("10.0.0.1") or range ("10.0.0.0/8")"""
+        try:
+            network = parse_network(v)
+        except ValueError:
+            raise ValueError("Must be an IPv4/IPv6 address or CIDR range")
+        if "/" not in v:
+            return str(network.network_address)
+        return str(network)
+
 
 class WhitelistResponse(BaseModel):
     """Schema for whitelist entry response"""
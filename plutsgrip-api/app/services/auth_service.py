@@ -3,13 +3,13 @@ Authentication service for user registration and login
 """
 from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.password_hashing import password_hasher
 from app.core.security import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     create_refresh_token,
-    decode_token
+    decode_token_cached
 )
+from app.core.token_revocation import is_token_revoked
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserRegisterRequest, UserLoginRequest
@@ -40,7 +40,7 @@ class AuthService:
             raise ValueError("Email already registered")
 
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
 
         # Create user
         user_dict = {
@@ -69,7 +69,7 @@ class AuthService:
         if not user:
             return None
 
-        if not verify_password(login_data.password, user.hashed_password):
+        if not await password_hasher.verify(login_data.password, user.hashed_password):
             return None
 
         return user
@@ -99,7 +99,7 @@ class AuthService:
         Returns:
             New access token if refresh token is valid, None otherwise
         """
-        payload = decode_token(refresh_token)
+        payload = decode_token_cached(refresh_token)
 
         if not payload:
             return None
@@ -108,6 +108,9 @@ class AuthService:
         if payload.get("type") != "refresh":
             return None
 
+        if await is_token_revoked(refresh_token, payload):
+            return None
+
         user_id = payload.get("sub")
         if not user_id:
             return None
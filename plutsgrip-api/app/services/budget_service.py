@@ -1,14 +1,14 @@
 """
 Serviço de Orçamento com lógica de negócios
 """
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Sequence
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from app.core.data_version import bump_data_version
+from app.core.report_cache import cached_report
 from app.models.budget import Budget, BudgetPeriod
-from app.models.transaction import Transaction
-from app.models.category import TransactionType
 from app.repositories.budget_repository import BudgetRepository
 
 
@@ -41,7 +41,7 @@ class BudgetService:
             Orçamento criado
         """
         # Convert period string to enum
-        period_enum = BudgetPeriod(period.lower()) if isinstance(period, str) else period
+        period_enum = BudgetPeriod(period.upper()) if isinstance(period, str) else period
         
         budget_data = {
             "user_id": user_id,
@@ -52,6 +52,7 @@ class BudgetService:
         }
         budget = await self.repo.create(budget_data)
         await self.db.commit()
+        bump_data_version(user_id)
         return budget
 
     async def get_budget(self, budget_id: int, user_id: int) -> Optional[Budget]:
@@ -76,28 +77,27 @@ class BudgetService:
         user_id: int,
         **kwargs
     ) -> Optional[Budget]:
-        """Atualiza um orçamento"""
-        budget = await self.get_budget(budget_id, user_id)
-        if not budget:
+        """Atualiza um orçamento (verificação de dono e escrita em um único UPDATE ... RETURNING)"""
+        updated = await self.repo.update_owned(budget_id, user_id, kwargs)
+        if not updated:
             return None
 
-        updated = await self.repo.update(budget_id, kwargs)
         await self.db.commit()
+        bump_data_version(user_id)
         return updated
 
     async def delete_budget(self, budget_id: int, user_id: int) -> bool:
-        """Deleta um orçamento"""
-        budget = await self.get_budget(budget_id, user_id)
-        if not budget:
+        """Deleta um orçamento (verificação de dono no próprio DELETE)"""
+        if not await self.repo.delete_owned(budget_id, user_id):
             return False
 
-        await self.repo.delete(budget_id)
         await self.db.commit()
+        bump_data_version(user_id)
         return True
 
     async def get_budget_status(self, budget_id: int, user_id: int) -> Optional[dict]:
         """
-        Obtém status do orçamento (gasto atual vs limite)
+        Obtém status do orçamento no período atual (gasto vs limite)
 
         Args:
             budget_id: ID do orçamento
@@ -106,31 +106,61 @@ class BudgetService:
         Returns:
             Dicionário com informações de status ou None
         """
-        budget = await self.get_budget(budget_id, user_id)
-        if not budget:
+        rows = await self.repo.get_period_spending(user_id, date.today(), budget_id=budget_id)
+        if not rows:
             return None
+        return self._build_statuses(rows)[0]
 
-        # Calcula gasto total na categoria
-        spent_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.category_id == budget.category_id,
-                    Transaction.type == TransactionType.EXPENSE
-                )
-            )
-        )
-        spent = spent_result.scalar() or Decimal("0.00")
-
-        remaining = budget.amount - spent
-        percentage_used = float(spent / budget.amount * 100) if budget.amount > 0 else 0
+    @cached_report("budget_status")
+    async def get_budgets_status(self, user_id: int, history_periods: int = 0) -> List[dict]:
+        """
+        Obtém o status de todos os orçamentos do usuário em uma única consulta
+
+        Cada orçamento é avaliado no seu período atual (mensal, trimestral
+        ou anual, contado a partir da data de início) e, opcionalmente, nos
+        ``history_periods`` períodos anteriores.
+
+        Args:
+            user_id: ID do usuário
+            history_periods: Períodos anteriores incluídos em ``history``
 
+        Returns:
+            Lista com o status de cada orçamento
+        """
+        rows = await self.repo.get_period_spending(user_id, date.today(), history_periods)
+        return self._build_statuses(rows)
+
+    @staticmethod
+    def _period_usage(row: Row) -> dict:
+        spent = row.spent or Decimal("0.00")
+        percentage_used = float(spent / row.amount * 100) if row.amount > 0 else 0
         return {
-            "budget_id": budget.id,
-            "category_id": budget.category_id,
-            "budget_amount": float(budget.amount),
+            "period_start": row.period_start.isoformat(),
+            "period_end": (row.next_period_start - timedelta(days=1)).isoformat(),
             "spent_amount": float(spent),
-            "remaining_amount": float(remaining),
             "percentage_used": min(percentage_used, 100),
-            "is_exceeded": spent > budget.amount
+            "is_exceeded": spent > row.amount,
         }
+
+    def _build_statuses(self, rows: Sequence[Row]) -> List[dict]:
+        """Agrupa as linhas (orçamento, período) em um status por orçamento, com o período atual por último"""
+        statuses: List[dict] = []
+        history: List[dict] = []
+        for index, row in enumerate(rows):
+            usage = self._period_usage(row)
+            if index + 1 < len(rows) and rows[index + 1].budget_id == row.budget_id:
+                history.append(usage)
+                continue
+
+            spent = row.spent or Decimal("0.00")
+            statuses.append({
+                "budget_id": row.budget_id,
+                "category_id": row.category_id,
+                "period": row.period.value,
+                "budget_amount": float(row.amount),
+                "remaining_amount": float(row.amount - spent),
+                **usage,
+                "history": history,
+            })
+            history = []
+        return statuses
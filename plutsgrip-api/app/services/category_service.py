@@ -3,6 +3,7 @@ Category service for business logic
 """
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.data_version import bump_data_version
 from app.models.category import Category, TransactionType
 from app.repositories.category_repository import CategoryRepository
 
@@ -88,7 +89,10 @@ class CategoryService:
             "icon": icon,
             "is_default": False
         }
-        return await self.category_repo.create(category_data)
+        category = await self.category_repo.create(category_data)
+        await self.db.commit()
+        bump_data_version(user_id)
+        return category
 
     async def update_category(
         self,
@@ -107,6 +111,8 @@ class CategoryService:
         """
         updated = await self.category_repo.update(category_id, kwargs)
         await self.db.commit()
+        if updated is not None and updated.user_id is not None:
+            bump_data_version(updated.user_id)
         return updated
 
     async def delete_category(self, category_id: int) -> bool:
@@ -119,4 +125,10 @@ class CategoryService:
         Returns:
             True if deleted successfully
         """
-        return await self.category_repo.soft_delete(category_id)
+        # Served from the identity map when the caller already loaded the category
+        category = await self.db.get(Category, category_id)
+        deleted = await self.category_repo.soft_delete(category_id)
+        await self.db.commit()
+        if deleted and category is not None and category.user_id is not None:
+            bump_data_version(category.user_id)
+        return deleted
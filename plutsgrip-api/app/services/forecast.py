@@ -0,0 +1,169 @@
+"""
+Modelo de previsão de saldo
+
+O saldo diário projetado soma duas partes:
+- recorrências: as ocorrências ainda não geradas das recorrências ativas,
+  expandidas com ``expand_occurrences``
+- gastos e receitas avulsos: para cada (tipo, categoria), a média por dia da
+  semana do histórico, já sem as transações geradas por recorrências (que
+  a primeira parte projeta explicitamente)
+
+A faixa ``balance_low``/``balance_high`` é um intervalo de 80% que supõe
+dias independentes, com a variância do saldo avulso de cada dia da semana.
+Tudo é calculado com arrays NumPy sobre dados já agregados por dia, então
+o custo depende do número de dias e categorias, não de transações.
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.models.category import TransactionType
+from app.services.recurrence import expand_occurrences
+
+# Quantil normal de um intervalo bilateral de 80%
+_BAND_Z = 1.2816
+
+
+def _cents(amount: Any) -> int:
+    return int(round(amount * 100))
+
+
+def build_forecast(
+    today: date,
+    days: int,
+    history_days: int,
+    opening_balance: Any,
+    history_rows: Sequence[Any],
+    recurring_history_rows: Sequence[Any],
+    templates: Sequence[Any],
+) -> Dict[str, Any]:
+    """
+    Projeta o saldo diário de ``today + 1`` a ``today + days``
+
+    Função pura e síncrona (pode rodar em uma thread).
+
+    Args:
+        today: Data de referência (o saldo inicial é o do fim deste dia)
+        days: Número de dias projetados
+        history_days: Dias de histórico do modelo (terminando em ``today``)
+        opening_balance: Saldo atual
+        history_rows: Totais diários (day, type, category_id, category_name, total)
+        recurring_history_rows: Totais diários das transações geradas por
+            recorrências (day, type, category_id, total), descontados do histórico
+        templates: Recorrências ativas (id, amount, type, frequency,
+            start_date, end_date, next_execution_date)
+
+    Returns:
+        Resumo da previsão, projeção por categoria e série diária
+    """
+    history_start = today - timedelta(days=history_days - 1)
+    first_day = today + timedelta(days=1)
+    last_day = today + timedelta(days=days)
+
+    # Histórico avulso em uma matriz (tipo/categoria x dia), em centavos
+    keys: Dict[tuple, int] = {}
+    names: Dict[int, Optional[str]] = {}
+    for row in history_rows:
+        names.setdefault(row.category_id, row.category_name)
+        keys.setdefault((row.type, row.category_id), len(keys))
+    for row in recurring_history_rows:
+        keys.setdefault((row.type, row.category_id), len(keys))
+
+    history = np.zeros((len(keys), history_days))
+    for rows, sign in ((history_rows, 1), (recurring_history_rows, -1)):
+        if rows:
+            np.add.at(
+                history,
+                (
+                    np.array([keys[(row.type, row.category_id)] for row in rows], dtype=np.int64),
+                    np.array([(row.day - history_start).days for row in rows], dtype=np.int64),
+                ),
+                sign * np.array([_cents(row.total) for row in rows], dtype=np.float64),
+            )
+    signs = np.array([1.0 if key_type == TransactionType.INCOME else -1.0 for key_type, _ in keys])
+
+    # Médias e variâncias por dia da semana
+    history_weekdays = (history_start.weekday() + np.arange(history_days)) % 7
+    weekday_matrix = np.eye(7)[history_weekdays]
+    weekday_counts = np.maximum(weekday_matrix.sum(axis=0), 1)
+    averages = (history @ weekday_matrix) / weekday_counts
+    history_net = signs @ history
+    net_mean = (history_net @ weekday_matrix) / weekday_counts
+    net_variance = np.maximum((history_net ** 2 @ weekday_matrix) / weekday_counts - net_mean ** 2, 0)
+
+    forecast_days = np.arange(np.datetime64(first_day, "D"), np.datetime64(last_day, "D") + 1)
+    forecast_weekdays = (first_day.weekday() + np.arange(days)) % 7
+    income_keys = signs > 0
+    estimated_income = averages[income_keys].sum(axis=0)[forecast_weekdays]
+    estimated_expense = averages[~income_keys].sum(axis=0)[forecast_weekdays]
+    projected_by_key = averages @ np.bincount(forecast_weekdays, minlength=7)
+
+    # Ocorrências das recorrências no período
+    positions, occurrence_days = expand_occurrences(
+        [row.start_date for row in templates],
+        [row.frequency for row in templates],
+        [row.end_date for row in templates],
+        first_day,
+        last_day,
+        from_dates=[row.next_execution_date for row in templates],
+        sort=False,
+    )
+    offsets = (occurrence_days - forecast_days[0]).astype(np.int64)
+    amounts = np.array([_cents(row.amount) for row in templates], dtype=np.float64)[positions]
+    is_income = np.array([row.type == TransactionType.INCOME for row in templates], dtype=bool)[positions]
+    recurring_income = np.bincount(offsets, weights=np.where(is_income, amounts, 0), minlength=days)
+    recurring_expense = np.bincount(offsets, weights=np.where(is_income, 0, amounts), minlength=days)
+
+    net = recurring_income - recurring_expense + estimated_income - estimated_expense
+    balance = _cents(opening_balance) + np.cumsum(net)
+    spread = _BAND_Z * np.sqrt(np.cumsum(net_variance[forecast_weekdays]))
+    lowest = int(np.argmin(balance))
+    negative = np.flatnonzero(balance < 0)
+
+    def money(values: np.ndarray) -> List[float]:
+        return np.round(values / 100, 2).tolist()
+
+    categories = [
+        {
+            "category_id": category_id or None,
+            "category_name": names.get(category_id),
+            "type": key_type.value,
+            "projected_total": round(float(projected_by_key[index]) / 100, 2),
+        }
+        for (key_type, category_id), index in keys.items()
+        if projected_by_key[index] > 0.5
+    ]
+    categories.sort(key=lambda entry: entry["projected_total"], reverse=True)
+
+    series = {
+        "recurring_income": money(recurring_income),
+        "recurring_expense": money(recurring_expense),
+        "estimated_income": money(estimated_income),
+        "estimated_expense": money(estimated_expense),
+        "net": money(net),
+        "balance": money(balance),
+        "balance_low": money(balance - spread),
+        "balance_high": money(balance + spread),
+    }
+    daily = [
+        {"date": day.isoformat(), **{name: values[index] for name, values in series.items()}}
+        for index, day in enumerate(forecast_days.astype(object))
+    ]
+
+    return {
+        "start_date": first_day.isoformat(),
+        "end_date": last_day.isoformat(),
+        "history_days": history_days,
+        "opening_balance": round(float(opening_balance), 2),
+        "ending_balance": daily[-1]["balance"],
+        "lowest_balance": daily[lowest]["balance"],
+        "lowest_balance_date": daily[lowest]["date"],
+        "first_negative_date": daily[negative[0]]["date"] if len(negative) else None,
+        "projected_income": round(float(recurring_income.sum() + estimated_income.sum()) / 100, 2),
+        "projected_expense": round(float(recurring_expense.sum() + estimated_expense.sum()) / 100, 2),
+        "recurring_income": round(float(recurring_income.sum()) / 100, 2),
+        "recurring_expense": round(float(recurring_expense.sum()) / 100, 2),
+        "categories": categories,
+        "daily": daily,
+    }
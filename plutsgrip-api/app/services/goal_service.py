@@ -5,6 +5,7 @@ from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.data_version import bump_data_version
 from app.models.goal import Goal
 from app.repositories.goal_repository import GoalRepository
 
@@ -55,6 +56,7 @@ class GoalService:
         }
         goal = await self.repo.create(goal_data)
         await self.db.commit()
+        bump_data_version(user_id)
         return goal
 
     async def get_goal(self, goal_id: int, user_id: int) -> Optional[Goal]:
@@ -88,13 +90,13 @@ class GoalService:
         user_id: int,
         **kwargs
     ) -> Optional[Goal]:
-        """Atualiza uma meta"""
-        goal = await self.get_goal(goal_id, user_id)
-        if not goal:
+        """Atualiza uma meta (verificação de dono e escrita em um único UPDATE ... RETURNING)"""
+        updated = await self.repo.update_owned(goal_id, user_id, kwargs)
+        if not updated:
             return None
 
-        updated = await self.repo.update(goal_id, kwargs)
         await self.db.commit()
+        bump_data_version(user_id)
         return updated
 
     async def add_progress(
@@ -113,42 +115,43 @@ class GoalService:
 
         Returns:
             Meta atualizada ou None
-        """
-        goal = await self.get_goal(goal_id, user_id)
-        if not goal:
-            return None
-
-        new_amount = goal.current_amount + amount
-        is_completed = new_amount >= goal.target_amount
 
-        updated = await self.repo.update(
+        A soma é feita no próprio UPDATE, então progressos simultâneos
+        não se sobrescrevem.
+        """
+        new_amount = Goal.current_amount + amount
+        updated = await self.repo.update_owned(
             goal_id,
+            user_id,
             {
                 "current_amount": new_amount,
-                "is_completed": is_completed
+                "is_completed": new_amount >= Goal.target_amount
             }
         )
+        if not updated:
+            return None
+
         await self.db.commit()
+        bump_data_version(user_id)
         return updated
 
     async def mark_as_completed(self, goal_id: int, user_id: int) -> Optional[Goal]:
         """Marca uma meta como concluída"""
-        goal = await self.get_goal(goal_id, user_id)
-        if not goal:
+        updated = await self.repo.update_owned(goal_id, user_id, {"is_completed": True})
+        if not updated:
             return None
 
-        updated = await self.repo.update(goal_id, {"is_completed": True})
         await self.db.commit()
+        bump_data_version(user_id)
         return updated
 
     async def delete_goal(self, goal_id: int, user_id: int) -> bool:
-        """Deleta uma meta"""
-        goal = await self.get_goal(goal_id, user_id)
-        if not goal:
+        """Deleta uma meta (verificação de dono no próprio DELETE)"""
+        if not await self.repo.delete_owned(goal_id, user_id):
             return False
 
-        await self.repo.delete(goal_id)
         await self.db.commit()
+        bump_data_version(user_id)
         return True
 
     async def get_goal_progress_summary(self, user_id: int) -> dict:
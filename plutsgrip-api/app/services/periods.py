@@ -0,0 +1,93 @@
+"""
+Aritmética de períodos de calendário para relatórios
+
+Os períodos seguem o calendário real (semanas ISO iniciando na segunda-feira,
+meses, trimestres e anos civis), com os mesmos limites de ``date_trunc`` do
+PostgreSQL, de modo que os buckets calculados aqui coincidem com os
+retornados pelo banco.
+"""
+from datetime import date, timedelta
+from typing import List
+
+from app.schemas.report import TrendGranularity
+
+
+# Quantidade de meses por bucket nas granularidades baseadas em mês
+_MONTH_SPAN = {
+    TrendGranularity.MONTH: 1,
+    TrendGranularity.QUARTER: 3,
+    TrendGranularity.YEAR: 12,
+}
+
+
+def period_start(day: date, granularity: TrendGranularity) -> date:
+    """
+    Retorna o primeiro dia do período que contém a data
+
+    Args:
+        day: Data de referência
+        granularity: Granularidade do período
+
+    Returns:
+        Data inicial do período
+    """
+    if granularity == TrendGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    span = _MONTH_SPAN[granularity]
+    month = ((day.month - 1) // span) * span + 1
+    return date(day.year, month, 1)
+
+
+def shift_period(start: date, granularity: TrendGranularity, count: int) -> date:
+    """
+    Desloca o início de um período em ``count`` períodos (negativo volta no tempo)
+
+    Args:
+        start: Data inicial de um período
+        granularity: Granularidade do período
+        count: Número de períodos a deslocar
+
+    Returns:
+        Data inicial do período deslocado
+    """
+    if granularity == TrendGranularity.WEEK:
+        return start + timedelta(weeks=count)
+    months = start.year * 12 + (start.month - 1) + count * _MONTH_SPAN[granularity]
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def period_label(start: date, granularity: TrendGranularity) -> str:
+    """
+    Retorna o rótulo de exibição de um período
+
+    Args:
+        start: Data inicial do período
+        granularity: Granularidade do período
+
+    Returns:
+        Rótulo como ``2026-W03``, ``Jan/2026``, ``Q1/2026`` ou ``2026``
+    """
+    if granularity == TrendGranularity.WEEK:
+        iso_year, iso_week, _ = start.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if granularity == TrendGranularity.MONTH:
+        return start.strftime("%b/%Y")
+    if granularity == TrendGranularity.QUARTER:
+        return f"Q{(start.month - 1) // 3 + 1}/{start.year}"
+    return str(start.year)
+
+
+def recent_periods(end_date: date, granularity: TrendGranularity, count: int) -> List[date]:
+    """
+    Lista as datas iniciais dos ``count`` períodos terminando no período de ``end_date``
+
+    Args:
+        end_date: Data contida no último período
+        granularity: Granularidade do período
+        count: Número de períodos
+
+    Returns:
+        Datas iniciais em ordem cronológica
+    """
+    last = period_start(end_date, granularity)
+    return [shift_period(last, granularity, offset) for offset in range(1 - count, 1)]
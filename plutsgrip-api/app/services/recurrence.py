@@ -0,0 +1,276 @@
+"""
+Aritmética de recorrência das transações recorrentes
+
+A k-ésima ocorrência de uma recorrência é sempre calculada a partir da data
+de início (``start_date + k * passo``), nunca da ocorrência anterior. Assim
+uma recorrência mensal iniciada em 31/01 cai em 29/02, 31/03, 30/04... sem
+"escorregar" para o dia 28/29 depois do primeiro mês curto.
+
+``expand_occurrences`` aplica a mesma regra a muitas recorrências de uma vez,
+com arrays NumPy em vez de um laço por ocorrência.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.models.recurring_transaction import RecurrenceFrequency
+
+
+# Passo de cada frequência em (meses, dias)
+FREQUENCY_STEPS = {
+    RecurrenceFrequency.DAILY: (0, 1),
+    RecurrenceFrequency.WEEKLY: (0, 7),
+    RecurrenceFrequency.BIWEEKLY: (0, 14),
+    RecurrenceFrequency.MONTHLY: (1, 0),
+    RecurrenceFrequency.QUARTERLY: (3, 0),
+    RecurrenceFrequency.YEARLY: (12, 0),
+}
+
+
+class CatchUpPlan(NamedTuple):
+    """Ocorrências vencidas de uma recorrência e seu novo estado"""
+
+    occurrences: List[date]
+    next_execution_date: date
+    is_active: bool
+
+
+def to_frequency(frequency: Union[RecurrenceFrequency, str]) -> RecurrenceFrequency:
+    """Converte uma frequência em texto (qualquer caixa) para o enum"""
+    if isinstance(frequency, RecurrenceFrequency):
+        return frequency
+    return RecurrenceFrequency(frequency.upper())
+
+
+def add_months(day: date, months: int) -> date:
+    """
+    Soma meses a uma data, limitando o dia ao último dia do mês de destino
+
+    Args:
+        day: Data de referência
+        months: Número de meses (negativo volta no tempo)
+
+    Returns:
+        Data deslocada
+    """
+    index = day.year * 12 + (day.month - 1) + months
+    year, month = divmod(index, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_date(start_date: date, frequency: Union[RecurrenceFrequency, str], index: int) -> date:
+    """
+    Retorna a data da ocorrência de número ``index`` (0 é a data de início)
+
+    Args:
+        start_date: Data de início da recorrência
+        frequency: Frequência
+        index: Número da ocorrência
+
+    Returns:
+        Data da ocorrência
+    """
+    months, days = FREQUENCY_STEPS[to_frequency(frequency)]
+    if months:
+        return add_months(start_date, index * months)
+    return start_date + timedelta(days=index * days)
+
+
+def first_index_on_or_after(start_date: date, frequency: Union[RecurrenceFrequency, str], day: date) -> int:
+    """Número da primeira ocorrência (a partir de 0) na data ``day`` ou depois dela"""
+    frequency = to_frequency(frequency)
+    months, days = FREQUENCY_STEPS[frequency]
+    if months:
+        index = ((day.year - start_date.year) * 12 + day.month - start_date.month) // months
+        if occurrence_date(start_date, frequency, index) < day:
+            index += 1
+    else:
+        index = -((start_date - day).days // days)  # divisão com arredondamento para cima
+    return max(index, 0)
+
+
+def last_index_on_or_before(start_date: date, frequency: Union[RecurrenceFrequency, str], day: date) -> int:
+    """Número da última ocorrência na data ``day`` ou antes dela (-1 se nenhuma)"""
+    frequency = to_frequency(frequency)
+    months, days = FREQUENCY_STEPS[frequency]
+    if months:
+        index = ((day.year - start_date.year) * 12 + day.month - start_date.month) // months
+        if occurrence_date(start_date, frequency, index) > day:
+            index -= 1
+    else:
+        index = (day - start_date).days // days
+    return max(index, -1)
+
+
+def plan_catch_up(
+    start_date: date,
+    frequency: Union[RecurrenceFrequency, str],
+    next_execution_date: date,
+    end_date: Optional[date],
+    today: date,
+    max_occurrences: int,
+) -> CatchUpPlan:
+    """
+    Calcula as ocorrências vencidas de uma recorrência, incluindo períodos perdidos
+
+    Todas as ocorrências de ``next_execution_date`` até ``today`` (ou até
+    ``end_date``, se anterior) são geradas, no máximo ``max_occurrences``
+    por chamada; o restante fica para a próxima execução, pois a nova
+    ``next_execution_date`` continua vencida.
+
+    Args:
+        start_date: Data de início
+        frequency: Frequência
+        next_execution_date: Próxima execução registrada
+        end_date: Data de término (opcional)
+        today: Data de referência
+        max_occurrences: Limite de ocorrências geradas por chamada
+
+    Returns:
+        Datas a materializar, próxima execução e se a recorrência segue ativa
+    """
+    frequency = to_frequency(frequency)
+    until = min(today, end_date) if end_date else today
+    first = first_index_on_or_after(start_date, frequency, next_execution_date)
+    last = min(last_index_on_or_before(start_date, frequency, until), first + max_occurrences - 1)
+
+    occurrences = [occurrence_date(start_date, frequency, index) for index in range(first, last + 1)]
+    next_date = occurrence_date(start_date, frequency, max(first, last + 1))
+    return CatchUpPlan(occurrences, next_date, end_date is None or next_date <= end_date)
+
+
+def plan_batch(
+    rows: List[Tuple[int, RecurrenceFrequency, date, Optional[date], date]],
+    today: date,
+    max_occurrences: int,
+) -> Tuple[List[int], List[date], List[int], List[date], List[bool]]:
+    """
+    Planeja um lote de recorrências em arrays paralelos, prontos para ``unnest``
+
+    Args:
+        rows: Tuplas (id, frequency, start_date, end_date, next_execution_date)
+        today: Data de referência
+        max_occurrences: Limite de ocorrências por recorrência
+
+    Returns:
+        (recorrência de cada ocorrência, datas das ocorrências,
+        ids das recorrências, novas próximas execuções, flags de ativa)
+    """
+    occurrence_templates: List[int] = []
+    occurrence_dates: List[date] = []
+    template_ids: List[int] = []
+    next_dates: List[date] = []
+    active_flags: List[bool] = []
+
+    for template_id, frequency, start_date, end_date, next_execution_date in rows:
+        plan = plan_catch_up(start_date, frequency, next_execution_date, end_date, today, max_occurrences)
+        occurrence_templates.extend([template_id] * len(plan.occurrences))
+        occurrence_dates.extend(plan.occurrences)
+        template_ids.append(template_id)
+        next_dates.append(plan.next_execution_date)
+        active_flags.append(plan.is_active)
+
+    return occurrence_templates, occurrence_dates, template_ids, next_dates, active_flags
+
+
+def _month_occurrences(start_months: np.ndarray, day_index: np.ndarray, month_offsets: np.ndarray) -> np.ndarray:
+    """Datas a ``month_offsets`` meses do início, limitando o dia ao fim do mês (versão vetorizada de add_months)"""
+    months = start_months + month_offsets
+    first_days = months.astype("datetime64[D]")
+    lengths = ((months + 1).astype("datetime64[D]") - first_days).astype(np.int64)
+    return first_days + np.minimum(day_index, lengths - 1)
+
+
+def expand_occurrences(
+    start_dates: Sequence[date],
+    frequencies: Sequence[Union[RecurrenceFrequency, str]],
+    end_dates: Sequence[Optional[date]],
+    window_start: date,
+    window_end: date,
+    from_dates: Optional[Sequence[date]] = None,
+    sort: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gera todas as ocorrências de várias recorrências dentro de um período
+
+    Os limites de cada recorrência (primeira e última ocorrência dentro do
+    período) são calculados em forma fechada e as datas são geradas de uma
+    vez com ``np.repeat``; o custo é proporcional ao número de ocorrências,
+    sem laço Python por recorrência ou por data. As datas seguem as mesmas
+    regras de ``occurrence_date``.
+
+    Args:
+        start_dates: Data de início de cada recorrência
+        frequencies: Frequência de cada recorrência
+        end_dates: Data de término de cada recorrência (None se não houver)
+        window_start: Início do período (inclusivo)
+        window_end: Fim do período (inclusivo)
+        from_dates: Primeira data considerada de cada recorrência
+            (ex.: next_execution_date, para projetar só o que ainda não foi gerado)
+        sort: Ordenar por data; sem ordenação as ocorrências saem agrupadas
+            por recorrência (suficiente para agregações com ``np.bincount``)
+
+    Returns:
+        (posição da recorrência em ``start_dates``, data da ocorrência),
+        ordenados por data e, no mesmo dia, pela posição
+    """
+    count = len(start_dates)
+    starts = np.array(start_dates, dtype="datetime64[D]").reshape(count)
+    steps = np.array([FREQUENCY_STEPS[to_frequency(f)] for f in frequencies], dtype=np.int64).reshape(count, 2)
+    step_months, step_days = steps[:, 0], steps[:, 1]
+
+    lower = np.maximum(starts, np.datetime64(window_start, "D"))
+    if from_dates is not None:
+        lower = np.maximum(lower, np.array(from_dates, dtype="datetime64[D]").reshape(count))
+    ends = np.array(end_dates, dtype="datetime64[D]").reshape(count)
+    upper = np.full(count, np.datetime64(window_end, "D"))
+    upper = np.where(np.isnat(ends), upper, np.minimum(upper, ends))
+
+    # Frequências em dias: índices por divisão inteira
+    by_days = step_days > 0
+    days = np.where(by_days, step_days, 1)
+    first = -(-(lower - starts).astype(np.int64) // days)
+    last = (upper - starts).astype(np.int64) // days
+
+    # Frequências em meses: índice pelo mês, corrigido quando o dia cai fora do limite
+    by_months = ~by_days
+    start_months = starts.astype("datetime64[M]")
+    day_index = (starts - start_months.astype("datetime64[D]")).astype(np.int64)
+    if by_months.any():
+        months = np.where(by_months, step_months, 1)
+        month_first = -(-(lower.astype("datetime64[M]") - start_months).astype(np.int64) // months)
+        month_first += _month_occurrences(start_months, day_index, month_first * months) < lower
+        month_last = (upper.astype("datetime64[M]") - start_months).astype(np.int64) // months
+        month_last -= _month_occurrences(start_months, day_index, month_last * months) > upper
+        first = np.where(by_months, month_first, first)
+        last = np.where(by_months, month_last, last)
+
+    first = np.maximum(first, 0)
+    counts = np.maximum(last - first + 1, 0)
+    total = int(counts.sum())
+
+    positions = np.repeat(np.arange(count), counts)
+    indexes = first[positions] + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    dates = np.empty(total, dtype="datetime64[D]")
+
+    day_rows = by_days[positions]
+    rows = positions[day_rows]
+    dates[day_rows] = starts[rows] + indexes[day_rows] * step_days[rows]
+    rows = positions[~day_rows]
+    dates[~day_rows] = _month_occurrences(
+        start_months[rows], day_index[rows], indexes[~day_rows] * step_months[rows]
+    )
+
+    if not sort:
+        return positions, dates
+
+    # Ordenação estável pelo dia (as posições já saem em ordem crescente); com
+    # deslocamentos de 16 bits o NumPy usa radix sort, linear no total
+    offsets = (dates - np.datetime64(window_start, "D")).astype(np.int64)
+    if total and offsets.max() < 2 ** 16:
+        offsets = offsets.astype(np.uint16)
+    order = np.argsort(offsets, kind="stable")
+    return positions[order], dates[order]
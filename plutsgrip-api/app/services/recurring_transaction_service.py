@@ -1,14 +1,23 @@
 """
 Serviço de Transações Recorrentes com lógica de negócios
 """
-from typing import List, Optional
-from datetime import date, datetime, timedelta
+import asyncio
+import time
+from typing import List, Optional, Union
+from datetime import date, datetime
 from decimal import Decimal
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.data_version import bump_data_version
+from app.core.database import AsyncSessionLocal
+from app.core.logging import log_info
+from app.core.metrics import metrics
+from app.core.report_cache import cached_report
 from app.models.recurring_transaction import RecurringTransaction, RecurrenceFrequency
-from app.models.transaction import Transaction
 from app.models.category import TransactionType
 from app.repositories.recurring_transaction_repository import RecurringTransactionRepository
+from app.services.recurrence import expand_occurrences, occurrence_date, plan_batch, to_frequency
 
 
 class RecurringTransactionService:
@@ -50,10 +59,10 @@ class RecurringTransactionService:
             Transação recorrente criada
         """
         # Convert strings to enums
-        type_enum = TransactionType(type.lower()) if isinstance(type, str) else type
-        frequency_enum = RecurrenceFrequency(frequency.lower()) if isinstance(frequency, str) else frequency
+        type_enum = TransactionType(type.upper()) if isinstance(type, str) else type
+        frequency_enum = to_frequency(frequency)
         
-        next_execution_date = self._calculate_next_execution(start_date, frequency_enum.value)
+        next_execution_date = self._calculate_next_execution(start_date, frequency_enum)
 
         recurring_data = {
             "user_id": user_id,
@@ -70,6 +79,7 @@ class RecurringTransactionService:
         }
         recurring = await self.repo.create(recurring_data)
         await self.db.commit()
+        bump_data_version(user_id)
         return recurring
 
     async def get_recurring_transaction(
@@ -99,98 +109,206 @@ class RecurringTransactionService:
         user_id: int,
         **kwargs
     ) -> Optional[RecurringTransaction]:
-        """Atualiza uma transação recorrente"""
-        recurring = await self.get_recurring_transaction(recurring_id, user_id)
-        if not recurring:
+        """Atualiza uma transação recorrente (verificação de dono e escrita em um único UPDATE ... RETURNING)"""
+        updated = await self.repo.update_owned(recurring_id, user_id, kwargs)
+        if not updated:
             return None
 
-        updated = await self.repo.update(recurring_id, kwargs)
         await self.db.commit()
+        bump_data_version(user_id)
         return updated
 
     async def delete_recurring_transaction(self, recurring_id: int, user_id: int) -> bool:
-        """Deleta uma transação recorrente"""
-        recurring = await self.get_recurring_transaction(recurring_id, user_id)
-        if not recurring:
+        """Deleta uma transação recorrente (verificação de dono no próprio DELETE)"""
+        if not await self.repo.delete_owned(recurring_id, user_id):
             return False
 
-        await self.repo.delete(recurring_id)
         await self.db.commit()
+        bump_data_version(user_id)
         return True
 
-    async def execute_due_recurring_transactions(self) -> int:
+    @cached_report("recurring_calendar")
+    async def get_cashflow_calendar(self, user_id: int, start_date: date, end_date: date) -> dict:
         """
-        Executa transações recorrentes vencidas
+        Projeta o fluxo de caixa das recorrências ativas em um período
+
+        Considera apenas as ocorrências ainda não geradas (a partir de
+        ``next_execution_date`` de cada recorrência), que são expandidas de
+        uma vez com ``expand_occurrences``. Os totais são somados em
+        centavos inteiros, sem erro de arredondamento.
+
+        Args:
+            user_id: ID do usuário
+            start_date: Início do período
+            end_date: Fim do período
+
+        Returns:
+            Totais do período e, para cada dia com ocorrências, entradas,
+            saídas, saldo do dia, saldo acumulado e as ocorrências
+        """
+        rows = await self.repo.get_projection_rows(user_id, start_date, end_date)
+        positions, dates = expand_occurrences(
+            [row.start_date for row in rows],
+            [row.frequency for row in rows],
+            [row.end_date for row in rows],
+            start_date,
+            end_date,
+            from_dates=[row.next_execution_date for row in rows],
+        )
+
+        cents = np.array([int(row.amount * 100) for row in rows], dtype=np.int64)[positions]
+        is_income = np.array([row.type == TransactionType.INCOME for row in rows], dtype=bool)[positions]
+        days = []
+        total_income = total_expense = 0
+
+        if len(dates):
+            day_starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+            income = np.add.reduceat(np.where(is_income, cents, 0), day_starts)
+            expense = np.add.reduceat(np.where(is_income, 0, cents), day_starts)
+            balance = np.cumsum(income - expense)
+            total_income, total_expense = int(income.sum()), int(expense.sum())
+
+            bounds = day_starts.tolist() + [len(dates)]
+            for day, (first, last) in enumerate(zip(bounds, bounds[1:])):
+                occurrences = []
+                for position in positions[first:last].tolist():
+                    row = rows[position]
+                    occurrences.append({
+                        "recurring_transaction_id": row.id,
+                        "description": row.description,
+                        "amount": float(row.amount),
+                        "type": row.type.value,
+                        "category_id": row.category_id,
+                    })
+                days.append({
+                    "date": dates[first].astype(object).isoformat(),
+                    "income": int(income[day]) / 100,
+                    "expense": int(expense[day]) / 100,
+                    "net": int(income[day] - expense[day]) / 100,
+                    "balance": int(balance[day]) / 100,
+                    "occurrences": occurrences,
+                })
+
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "total_income": total_income / 100,
+            "total_expense": total_expense / 100,
+            "net": (total_income - total_expense) / 100,
+            "occurrence_count": int(len(dates)),
+            "days": days,
+        }
+
+    async def execute_due_recurring_transactions(
+        self,
+        today: Optional[date] = None,
+        batch_size: Optional[int] = None,
+        worker_index: int = 0,
+        worker_count: int = 1,
+        max_catch_up: Optional[int] = None,
+    ) -> int:
+        """
+        Executa transações recorrentes vencidas, em lotes e em conjunto
         Deve ser chamado por um job/scheduler
 
+        Cada lote custa três comandos e um commit, qualquer que seja o
+        tamanho: bloqueia até ``batch_size`` recorrências vencidas
+        (``FOR UPDATE SKIP LOCKED``), insere todas as ocorrências
+        pendentes -- inclusive as de períodos perdidos, na data de cada
+        ocorrência -- em um único INSERT ... SELECT e avança
+        ``next_execution_date`` (desativando as que passaram de
+        ``end_date``) em um único UPDATE. Repete até não haver mais
+        recorrências vencidas na partição do worker.
+
+        Args:
+            today: Data de referência (padrão: hoje)
+            batch_size: Recorrências por lote (padrão: RECURRING_BATCH_SIZE)
+            worker_index: Partição de usuários deste worker
+            worker_count: Número de partições (workers concorrentes)
+            max_catch_up: Ocorrências por recorrência e lote (padrão: RECURRING_MAX_CATCH_UP)
+
         Returns:
             Número de transações criadas
         """
-        today = date.today()
-        due_transactions = await self.repo.get_due_for_execution(today)
+        today = today or date.today()
+        batch_size = batch_size or settings.RECURRING_BATCH_SIZE
+        max_catch_up = max_catch_up or settings.RECURRING_MAX_CATCH_UP
         created_count = 0
 
-        for recurring in due_transactions:
-            # Verifica se deve parar (end_date passou)
-            if recurring.end_date and today > recurring.end_date:
-                await self.repo.update(recurring.id, {"is_active": False})
-                continue
-
-            # Cria transação normal a partir da recorrente
-            transaction_data = {
-                "user_id": recurring.user_id,
-                "description": recurring.description,
-                "amount": recurring.amount,
-                "currency": recurring.currency,
-                "date": today,
-                "type": recurring.type,
-                "category_id": recurring.category_id,
-                "notes": f"[Automática] {recurring.notes}" if recurring.notes else "[Automática]",
-                "is_recurring": True,
-                "recurring_transaction_id": recurring.id
-            }
-
-            transaction = Transaction(**transaction_data)
-            self.db.add(transaction)
-
-            # Atualiza próxima data de execução
-            next_date = self._calculate_next_execution(
-                recurring.next_execution_date,
-                recurring.frequency
+        while True:
+            rows = await self.repo.lock_due_batch(today, batch_size, worker_index, worker_count)
+            if not rows:
+                break
+
+            occurrence_templates, occurrence_dates, template_ids, next_dates, active_flags = plan_batch(
+                [(row.id, row.frequency, row.start_date, row.end_date, row.next_execution_date) for row in rows],
+                today,
+                max_catch_up,
             )
-            await self.repo.update(recurring.id, {"next_execution_date": next_date})
+            now = datetime.utcnow()
+            created = await self.repo.insert_occurrences(occurrence_templates, occurrence_dates, now)
+            await self.repo.advance_schedules(template_ids, next_dates, active_flags, now)
+            await self.db.commit()
 
-            created_count += 1
+            for user_id in {row.user_id for row in rows}:
+                bump_data_version(user_id)
+            metrics.increment("recurring.templates_processed", len(rows))
+            metrics.increment("recurring.transactions_created", created)
+            created_count += created
 
-        await self.db.commit()
         return created_count
 
-    def _calculate_next_execution(self, current_date: date, frequency: str) -> date:
+    def _calculate_next_execution(self, current_date: date, frequency: Union[RecurrenceFrequency, str]) -> date:
         """
         Calcula a próxima data de execução baseado na frequência
 
         Args:
             current_date: Data atual
-            frequency: Frequência
+            frequency: Frequência (enum ou texto)
 
         Returns:
             Próxima data de execução
         """
-        if frequency == RecurrenceFrequency.DAILY.value:
-            return current_date + timedelta(days=1)
-        elif frequency == RecurrenceFrequency.WEEKLY.value:
-            return current_date + timedelta(weeks=1)
-        elif frequency == RecurrenceFrequency.BIWEEKLY.value:
-            return current_date + timedelta(weeks=2)
-        elif frequency == RecurrenceFrequency.MONTHLY.value:
-            # Avança um mês mantendo o dia
-            next_date = current_date.replace(month=current_date.month + 1)
-            if next_date.month == 1:  # Se passou de dezembro
-                next_date = next_date.replace(year=next_date.year + 1)
-            return next_date
-        elif frequency == RecurrenceFrequency.QUARTERLY.value:
-            return current_date + timedelta(days=91)  # Aproximadamente 3 meses
-        elif frequency == RecurrenceFrequency.YEARLY.value:
-            return current_date.replace(year=current_date.year + 1)
-        else:
-            return current_date + timedelta(days=1)  # Padrão: diário
+        return occurrence_date(current_date, frequency, 1)
+
+
+async def materialize_due_recurring_transactions(
+    today: Optional[date] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Materializa as recorrências vencidas com vários workers concorrentes
+
+    Cada worker usa sua própria sessão (e conexão) e processa os usuários
+    de uma partição (``user_id % workers``). Como os lotes são bloqueados
+    com SKIP LOCKED, executar esta função em mais de um processo ao mesmo
+    tempo não gera ocorrências em dobro.
+
+    Args:
+        today: Data de referência (padrão: hoje)
+        workers: Número de workers (padrão: RECURRING_WORKERS)
+        batch_size: Recorrências por lote (padrão: RECURRING_BATCH_SIZE)
+
+    Returns:
+        Número de transações criadas
+    """
+    today = today or date.today()
+    workers = max(1, workers or settings.RECURRING_WORKERS)
+
+    async def run_worker(worker_index: int) -> int:
+        async with AsyncSessionLocal() as session:
+            return await RecurringTransactionService(session).execute_due_recurring_transactions(
+                today=today,
+                batch_size=batch_size,
+                worker_index=worker_index,
+                worker_count=workers,
+            )
+
+    started = time.perf_counter()
+    created = sum(await asyncio.gather(*(run_worker(index) for index in range(workers))))
+    log_info(
+        f"Recurring transactions materialized: {created} transactions, "
+        f"{workers} workers, {time.perf_counter() - started:.2f}s"
+    )
+    return created
@@ -1,23 +1,36 @@
 """
 Serviço de relatórios para dashboard e resumos financeiros
 """
+import asyncio
 from typing import Optional, Dict, List
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
 from app.repositories.transaction_repository import TransactionRepository
-from app.models.transaction import Transaction
-from app.models.category import TransactionType, Category
+from app.repositories.recurring_transaction_repository import RecurringTransactionRepository
+from app.repositories.transaction_rollup_repository import TransactionRollupRepository
+from app.core.report_cache import cached_report
+from app.models.category import TransactionType
+from app.schemas.report import TrendGranularity
+from app.services.forecast import build_forecast
+from app.services.periods import period_label, recent_periods
 
 
 class ReportService:
-    """Serviço para gerar relatórios e estatísticas"""
+    """
+    Serviço para gerar relatórios e estatísticas
+
+    Todas as agregações leem a tabela de rollup diário
+    (transaction_daily_rollups), de modo que o custo depende do número
+    de dias no período e não do número de transações.
+    """
 
     def __init__(self, db: AsyncSession):
         self.db = db
         self.transaction_repo = TransactionRepository(db)
+        self.rollup_repo = TransactionRollupRepository(db)
 
+    @cached_report("dashboard")
     async def get_dashboard_summary(self, user_id: int) -> dict:
         """
         Obtém resumo do dashboard com totais e contagens
@@ -28,48 +41,9 @@ class ReportService:
         Returns:
             Dicionário com dados do dashboard
         """
-        # Consulta para renda total
-        income_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.INCOME
-                )
-            )
-        )
-        total_income = income_result.scalar() or Decimal("0.00")
-
-        # Consulta para despesa total
-        expense_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE
-                )
-            )
-        )
-        total_expense = expense_result.scalar() or Decimal("0.00")
-
-        # Consulta para contagem de transações por tipo
-        income_count_result = await self.db.execute(
-            select(func.count(Transaction.id)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.INCOME
-                )
-            )
-        )
-        income_count = income_count_result.scalar() or 0
-
-        expense_count_result = await self.db.execute(
-            select(func.count(Transaction.id)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE
-                )
-            )
-        )
-        expense_count = expense_count_result.scalar() or 0
+        totals = await self.rollup_repo.get_totals_by_type(user_id)
+        total_income, income_count = totals[TransactionType.INCOME]
+        total_expense, expense_count = totals[TransactionType.EXPENSE]
 
         return {
             "total_income": float(total_income),
@@ -80,6 +54,7 @@ class ReportService:
             "expense_count": expense_count
         }
 
+    @cached_report("summary")
     async def get_financial_summary(
         self,
         user_id: int,
@@ -102,43 +77,11 @@ class ReportService:
         if not end_date:
             end_date = datetime.now().date()
 
-        # Renda total no período
-        income_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.INCOME,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            )
-        )
-        total_income = income_result.scalar() or Decimal("0.00")
-
-        # Despesa total no período
-        expense_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            )
-        )
-        total_expense = expense_result.scalar() or Decimal("0.00")
-
-        # Contagem de transações
-        count_result = await self.db.execute(
-            select(func.count(Transaction.id)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            )
-        )
-        transaction_count = count_result.scalar() or 0
+        # Totais e contagens por tipo no período
+        totals = await self.rollup_repo.get_totals_by_type(user_id, start_date, end_date)
+        total_income, income_count = totals[TransactionType.INCOME]
+        total_expense, expense_count = totals[TransactionType.EXPENSE]
+        transaction_count = income_count + expense_count
 
         # Renda por categoria
         income_by_cat = await self._get_totals_by_category(
@@ -165,6 +108,7 @@ class ReportService:
             "daily_totals": daily_totals
         }
 
+    @cached_report("category_breakdown")
     async def get_category_breakdown(
         self,
         user_id: int,
@@ -193,82 +137,56 @@ class ReportService:
             user_id, transaction_type, start_date, end_date
         )
 
+    @cached_report("trends")
     async def get_monthly_trends(
         self,
         user_id: int,
-        months: int = 6
+        months: int = 6,
+        granularity: TrendGranularity = TrendGranularity.MONTH
     ) -> dict:
         """
-        Obtém tendências mensais de renda e despesa
+        Obtém tendências de renda, despesa e saldo por período de calendário
+
+        Todos os períodos são lidos em uma única consulta agrupada; períodos
+        sem movimentação são preenchidos com zero.
 
         Args:
             user_id: ID do usuário
-            months: Número de meses anteriores a considerar
+            months: Número de períodos a considerar, terminando no período atual
+            granularity: Granularidade dos períodos (semana, mês, trimestre ou ano)
 
         Returns:
-            Dicionário com tendências mensais
+            Dicionário com tendências por período
         """
+        end_date = datetime.now().date()
+        starts = recent_periods(end_date, granularity, months)
+
+        rows = await self.rollup_repo.get_period_totals(
+            user_id, granularity.value, starts[0], end_date
+        )
+        totals = {(row.period_start, row.type): row.total for row in rows}
+
         trends = {
+            "granularity": granularity,
             "income": [],
             "expense": [],
             "balance": []
         }
-
-        end_date = datetime.now().date()
-
-        for i in range(months - 1, -1, -1):
-            # Calcula primeiro e último dia do mês
-            current_date = end_date - timedelta(days=i * 30)
-            month_start = current_date.replace(day=1)
-
-            if i == 0:
-                month_end = end_date
-            else:
-                next_month = current_date.replace(day=1) + timedelta(days=32)
-                month_end = next_month.replace(day=1) - timedelta(days=1)
-
-            # Renda do mês
-            income_result = await self.db.execute(
-                select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.type == TransactionType.INCOME,
-                        Transaction.date >= month_start,
-                        Transaction.date <= month_end
-                    )
-                )
-            )
-            income = income_result.scalar() or Decimal("0.00")
-
-            # Despesa do mês
-            expense_result = await self.db.execute(
-                select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.type == TransactionType.EXPENSE,
-                        Transaction.date >= month_start,
-                        Transaction.date <= month_end
-                    )
-                )
-            )
-            expense = expense_result.scalar() or Decimal("0.00")
-
-            month_label = month_start.strftime("%b/%Y")
-            trends["income"].append({
-                "month": month_label,
-                "value": float(income)
-            })
-            trends["expense"].append({
-                "month": month_label,
-                "value": float(expense)
-            })
-            trends["balance"].append({
-                "month": month_label,
-                "value": float(income - expense)
-            })
+        for start in starts:
+            income = totals.get((start, TransactionType.INCOME), Decimal("0.00"))
+            expense = totals.get((start, TransactionType.EXPENSE), Decimal("0.00"))
+            label = period_label(start, granularity)
+            for key, value in (("income", income), ("expense", expense), ("balance", income - expense)):
+                trends[key].append({
+                    "period": label,
+                    "period_start": start,
+                    "month": label,
+                    "value": float(value)
+                })
 
         return trends
 
+    @cached_report("patterns")
     async def get_spending_patterns(self, user_id: int) -> dict:
         """
         Obtém padrões de gastos
@@ -282,37 +200,18 @@ class ReportService:
         # Categorias com mais gastos (últimos 30 dias)
         thirty_days_ago = datetime.now().date() - timedelta(days=30)
 
-        top_categories = await self.db.execute(
-            select(
-                Category.name,
-                func.sum(Transaction.amount).label("total")
-            ).join(Transaction).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE,
-                    Transaction.date >= thirty_days_ago
-                )
-            ).group_by(Category.id, Category.name).order_by(
-                func.sum(Transaction.amount).desc()
-            ).limit(5)
+        top_categories = await self.rollup_repo.get_totals_by_category(
+            user_id, TransactionType.EXPENSE, start_date=thirty_days_ago, limit=5
         )
 
         top_cats = [
-            {"category": row[0], "total": float(row[1])}
-            for row in top_categories.all()
+            {"category": row.name, "total": float(row.total)}
+            for row in top_categories
         ]
 
         # Gasto médio diário
-        all_expense_result = await self.db.execute(
-            select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE,
-                    Transaction.date >= thirty_days_ago
-                )
-            )
-        )
-        total_expense = all_expense_result.scalar() or Decimal("0.00")
+        totals = await self.rollup_repo.get_totals_by_type(user_id, start_date=thirty_days_ago)
+        total_expense = totals[TransactionType.EXPENSE][0]
         avg_daily = float(total_expense) / 30
 
         return {
@@ -321,6 +220,50 @@ class ReportService:
             "period_days": 30
         }
 
+    @cached_report("forecast")
+    async def get_balance_forecast(self, user_id: int, days: int = 90, history_days: int = 180) -> dict:
+        """
+        Projeta o saldo diário dos próximos dias
+
+        Combina as ocorrências futuras das recorrências ativas com uma
+        estimativa dos gastos e receitas avulsos (médias por dia da semana e
+        categoria do histórico recente; veja app.services.forecast). Só lê
+        dados agregados: o saldo atual e o histórico vêm do rollup diário e
+        as transações geradas por recorrências são somadas no banco. O
+        modelo NumPy roda em uma thread para não bloquear o event loop.
+
+        Args:
+            user_id: ID do usuário
+            days: Número de dias projetados a partir de amanhã
+            history_days: Dias de histórico usados pelo modelo
+
+        Returns:
+            Dicionário com o resumo da previsão e a série diária
+        """
+        today = datetime.now().date()
+        history_start = today - timedelta(days=history_days - 1)
+
+        totals = await self.rollup_repo.get_totals_by_type(user_id, end_date=today)
+        opening_balance = totals[TransactionType.INCOME][0] - totals[TransactionType.EXPENSE][0]
+        history_rows = await self.rollup_repo.get_daily_category_totals(user_id, history_start, today)
+        recurring_history_rows = await self.transaction_repo.get_recurring_daily_totals(
+            user_id, history_start, today
+        )
+        templates = await RecurringTransactionRepository(self.db).get_projection_rows(
+            user_id, today + timedelta(days=1), today + timedelta(days=days)
+        )
+
+        return await asyncio.to_thread(
+            build_forecast,
+            today,
+            days,
+            history_days,
+            opening_balance,
+            history_rows,
+            recurring_history_rows,
+            templates,
+        )
+
     async def _get_totals_by_category(
         self,
         user_id: int,
@@ -340,26 +283,10 @@ class ReportService:
         Returns:
             Lista com totais por categoria
         """
-        result = await self.db.execute(
-            select(
-                Category.id,
-                Category.name,
-                func.sum(Transaction.amount).label("total"),
-                func.count(Transaction.id).label("count")
-            ).join(Transaction).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == transaction_type,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            ).group_by(Category.id, Category.name).order_by(
-                func.sum(Transaction.amount).desc()
-            )
+        rows = await self.rollup_repo.get_totals_by_category(
+            user_id, transaction_type, start_date, end_date
         )
 
-        rows = result.all()
-
         # Calculate total amount for percentage calculation
         grand_total = sum(float(row[2]) for row in rows)
 
@@ -391,45 +318,16 @@ class ReportService:
         Returns:
             Dicionário com totais por dia
         """
-        # Get income totals by day
-        income_result = await self.db.execute(
-            select(
-                Transaction.date,
-                func.sum(Transaction.amount).label("total")
-            ).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.INCOME,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            ).group_by(Transaction.date)
-        )
-        income_by_date = {row[0].isoformat(): float(row[1]) for row in income_result.all()}
-
-        # Get expense totals by day
-        expense_result = await self.db.execute(
-            select(
-                Transaction.date,
-                func.sum(Transaction.amount).label("total")
-            ).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == TransactionType.EXPENSE,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date
-                )
-            ).group_by(Transaction.date)
-        )
-        expense_by_date = {row[0].isoformat(): float(row[1]) for row in expense_result.all()}
-
-        # Combine income and expense into daily totals
-        all_dates = set(income_by_date.keys()) | set(expense_by_date.keys())
+        # Income and expense per day in a single pass over the rollup
+        daily_totals: Dict[str, Dict[str, Decimal]] = {}
+        for day, transaction_type, total in await self.rollup_repo.get_daily_totals(
+            user_id, start_date, end_date
+        ):
+            totals = daily_totals.setdefault(
+                day.isoformat(),
+                {"income": Decimal("0.0"), "expense": Decimal("0.0")}
+            )
+            key = "income" if transaction_type == TransactionType.INCOME else "expense"
+            totals[key] = Decimal(str(float(total)))
 
-        return {
-            date_str: {
-                "income": Decimal(str(income_by_date.get(date_str, 0.0))),
-                "expense": Decimal(str(expense_by_date.get(date_str, 0.0)))
-            }
-            for date_str in sorted(all_dates)
-        }
+        return daily_totals
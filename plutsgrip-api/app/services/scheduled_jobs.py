@@ -0,0 +1,116 @@
+"""
+Scheduled background jobs
+Registered on the application scheduler, which runs them in the elected leader worker only
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadOnlySessionLocal, engine
+from app.core.metrics import metrics
+from app.core.report_cache import report_cache
+from app.core.scheduler import AdvisoryLockElection, JobRun, Scheduler
+from app.repositories.scheduled_job_run_repository import ScheduledJobRunRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.transaction_rollup_repository import TransactionRollupRepository
+from app.services.recurring_transaction_service import materialize_due_recurring_transactions
+from app.services.report_service import ReportService
+from app.services.whitelist_service import WhitelistService
+
+
+async def run_recurring_transactions() -> str:
+    """Materialize due recurring transactions (including missed periods)"""
+    created = await materialize_due_recurring_transactions()
+    return f"{created} transactions created"
+
+
+async def expire_whitelist_entries() -> str:
+    """Deactivate whitelist entries past their expiry"""
+    async with AsyncSessionLocal() as session:
+        expired = await WhitelistService(session).deactivate_expired()
+    return f"{expired} entries deactivated"
+
+
+async def compact_rollups() -> str:
+    """Delete daily rollup rows left empty by deleted or moved transactions"""
+    async with AsyncSessionLocal() as session:
+        deleted = await TransactionRollupRepository(session).delete_empty()
+        await session.commit()
+    return f"{deleted} empty rollup rows deleted"
+
+
+async def warm_report_cache() -> str:
+    """
+    Precompute the dashboard summary of recently active users
+
+    Only useful with a shared cache backend: the leader fills the cache that
+    every worker reads. Users are warmed one by one so a slow report cannot
+    hold many connections.
+    """
+    since = date.today() - timedelta(days=30)
+    async with ReadOnlySessionLocal() as session:
+        user_ids = await TransactionRepository(session).get_recently_active_user_ids(
+            since, settings.SCHEDULER_CACHE_WARM_USERS
+        )
+        service = ReportService(session)
+        for user_id in user_ids:
+            await service.get_dashboard_summary(user_id)
+    return f"{len(user_ids)} users warmed"
+
+
+async def prune_job_history() -> str:
+    """Delete scheduler run history older than SCHEDULER_HISTORY_DAYS"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.SCHEDULER_HISTORY_DAYS)
+    async with AsyncSessionLocal() as session:
+        deleted = await ScheduledJobRunRepository(session).delete_older_than(cutoff)
+        await session.commit()
+    return f"{deleted} runs deleted"
+
+
+async def _record_run(run: JobRun) -> None:
+    async with AsyncSessionLocal() as session:
+        await ScheduledJobRunRepository(session).record(
+            run.job_name, run.instance, run.started_at, run.finished_at, run.status, run.result, run.error
+        )
+        await session.commit()
+
+
+async def _load_last_runs() -> Dict[str, datetime]:
+    async with AsyncSessionLocal() as session:
+        return await ScheduledJobRunRepository(session).get_last_started()
+
+
+def _lock_connect_args() -> Dict[str, Any]:
+    return engine.dialect.create_connect_args(engine.url)[1]
+
+
+def build_scheduler() -> Scheduler:
+    """Create the scheduler with every job enabled in settings"""
+    scheduler = Scheduler(
+        election=AdvisoryLockElection(_lock_connect_args, settings.SCHEDULER_LOCK_KEY),
+        record_run=_record_run,
+        load_last_runs=_load_last_runs,
+        election_seconds=settings.SCHEDULER_ELECTION_SECONDS,
+    )
+    jitter = settings.SCHEDULER_JITTER_SECONDS
+
+    jobs = [
+        ("recurring_transactions", settings.SCHEDULER_RECURRING_CRON, run_recurring_transactions),
+        ("whitelist_expiry", settings.SCHEDULER_WHITELIST_EXPIRY_CRON, expire_whitelist_entries),
+        ("rollup_compaction", settings.SCHEDULER_ROLLUP_COMPACTION_CRON, compact_rollups),
+        ("job_history_pruning", settings.SCHEDULER_HISTORY_PRUNE_CRON, prune_job_history),
+    ]
+    # Disabled with a per-worker backend, which would only warm the leader
+    if report_cache.enabled:
+        jobs.append(("report_cache_warming", settings.SCHEDULER_CACHE_WARM_CRON, warm_report_cache))
+
+    for name, cron, func in jobs:
+        if cron:
+            scheduler.register(name, cron, func, jitter_seconds=jitter)
+    return scheduler
+
+
+# Started and stopped by the application lifespan (leader election needs asyncpg)
+scheduler = build_scheduler()
+scheduler_supported = engine.dialect.driver == "asyncpg"
+metrics.register_gauge("scheduler", scheduler.stats)
@@ -0,0 +1,691 @@
+"""
+Streaming bank statement import (CSV and OFX)
+
+The import is a chain of async generators:
+
+    byte chunks -> text chunks -> raw records -> normalized rows
+                -> category mapping -> batches -> dedupe -> INSERT
+
+Only one batch of rows is held in memory at a time, so memory use does not
+depend on the size of the statement.
+"""
+import codecs
+import csv
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.data_version import bump_data_version
+from app.core.logging import log_info
+from app.core.metrics import metrics
+from app.models.category import TransactionType
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.transaction_repository import TransactionRepository
+
+
+SUPPORTED_FORMATS = ("csv", "ofx")
+
+# Maximum number of row errors kept in the summary (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+
+# CSV header aliases (compared after lowercasing and stripping accents)
+CSV_COLUMN_ALIASES = {
+    "date": ("date", "data", "posted", "transaction date", "data lancamento"),
+    "description": ("description", "descricao", "memo", "historico", "name", "lancamento"),
+    "amount": ("amount", "valor", "value", "quantia"),
+    "type": ("type", "tipo"),
+    "category": ("category", "categoria"),
+    "currency": ("currency", "moeda"),
+    "notes": ("notes", "observacao", "observacoes", "notas"),
+}
+
+TYPE_ALIASES = {
+    "income": TransactionType.INCOME,
+    "receita": TransactionType.INCOME,
+    "credit": TransactionType.INCOME,
+    "credito": TransactionType.INCOME,
+    "c": TransactionType.INCOME,
+    "expense": TransactionType.EXPENSE,
+    "despesa": TransactionType.EXPENSE,
+    "debit": TransactionType.EXPENSE,
+    "debito": TransactionType.EXPENSE,
+    "d": TransactionType.EXPENSE,
+}
+
+FALLBACK_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+DedupeKey = Tuple[date, Decimal, str]
+
+# Longest CSV record (line breaks in quoted fields included) before it is
+# reported as a row error instead of being buffered further
+MAX_CSV_RECORD_CHARS = 64 * 1024
+
+
+class StatementRowError(ValueError):
+    """Raised when a statement row cannot be normalized"""
+
+
+@dataclass
+class StatementImportOptions:
+    """
+    Parsing options for a statement import
+
+    Attributes:
+        format: "csv" or "ofx"
+        delimiter: CSV field delimiter
+        decimal_comma: Amounts use a comma as decimal separator (1.234,56)
+        date_format: strptime format for CSV dates; ISO and dd/mm/yyyy are tried when omitted
+        encoding: Text encoding of the file
+        dry_run: Parse, map and dedupe without inserting
+    """
+
+    format: str
+    delimiter: str = ","
+    decimal_comma: bool = False
+    date_format: Optional[str] = None
+    encoding: str = "utf-8"
+    dry_run: bool = False
+
+
+@dataclass
+class ImportProgress:
+    """
+    Running totals of an import, reported after every batch
+
+    Attributes:
+        rows_read: Records read from the file
+        inserted: Transactions inserted (or that would be, in dry-run mode)
+        duplicates: Records skipped because they already exist
+        failed: Records rejected by validation
+        batches: Batches processed
+        done: True on the final report
+        errors: First MAX_REPORTED_ERRORS error messages
+    """
+
+    rows_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    batches: int = 0
+    done: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    def add_error(self, record_number: int, message: str) -> None:
+        """Count a rejected record and keep its message if under the cap"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"record {record_number}: {message}")
+
+    def as_dict(self) -> dict:
+        """Serialize for JSON responses"""
+        return {
+            "rows_read": self.rows_read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "batches": self.batches,
+            "done": self.done,
+            "errors": list(self.errors),
+        }
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents for tolerant header/alias matching"""
+    decomposed = unicodedata.normalize("NFKD", text.strip().lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+async def decode_chunks(chunks: AsyncIterator[bytes], encoding: str) -> AsyncIterator[str]:
+    """
+    Decode byte chunks incrementally (multi-byte characters may span chunks)
+
+    Args:
+        chunks: Raw byte chunks
+        encoding: Text encoding
+
+    Yields:
+        Text chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    first = True
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if first and text:
+            text = text.lstrip("\ufeff")
+            first = False
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_lines(text_chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Split text chunks into lines without line terminators
+
+    Args:
+        text_chunks: Decoded text chunks
+
+    Yields:
+        Lines
+    """
+    pending = ""
+    async for chunk in text_chunks:
+        pending += chunk
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be an incomplete line; keep it for the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line.rstrip("\r\n")
+    if pending:
+        yield pending.rstrip("\r\n")
+
+
+def _scan_csv_line(line: str, delimiter: str, in_quotes: bool) -> bool:
+    """
+    Follow the csv dialect's quoting over one physical line
+
+    A quote only opens a quoted field at the start of a field; elsewhere it
+    is a literal character (``TV 55" screen``). Inside a quoted field a
+    doubled quote is an escaped quote and a single one closes the field.
+
+    Args:
+        line: Physical line without its terminator
+        delimiter: Field delimiter
+        in_quotes: Whether the line starts inside a quoted field
+
+    Returns:
+        Whether the line ends inside a quoted field (the record continues)
+    """
+    field_start = not in_quotes
+    index = 0
+    length = len(line)
+    while index < length:
+        char = line[index]
+        if in_quotes:
+            if char == '"':
+                if index + 1 < length and line[index + 1] == '"':
+                    index += 1
+                else:
+                    in_quotes = False
+        elif char == delimiter:
+            field_start = True
+            index += 1
+            continue
+        elif char == '"' and field_start:
+            in_quotes = True
+        field_start = False
+        index += 1
+    return in_quotes
+
+
+async def iter_csv_records(
+    text_chunks: AsyncIterator[str],
+    delimiter: str = ",",
+    max_record_chars: int = MAX_CSV_RECORD_CHARS,
+) -> AsyncIterator[Union[Dict[str, str], StatementRowError]]:
+    """
+    Parse CSV incrementally into dictionaries keyed by canonical column name
+
+    Quoted fields may contain line breaks: physical lines are joined while a
+    quoted field is open. A record longer than max_record_chars (usually an
+    unbalanced quote) is dropped and yielded as a StatementRowError, and
+    parsing resumes at the next line, so one bad row never buffers the rest
+    of the file.
+
+    Args:
+        text_chunks: Decoded text chunks
+        delimiter: Field delimiter
+        max_record_chars: Longest record accepted, line breaks included
+
+    Yields:
+        Records keyed by canonical column (date, description, amount, ...),
+        or the error of a record that could not be read
+
+    Raises:
+        StatementRowError: If the header lacks a required column
+    """
+    columns: Optional[List[Optional[str]]] = None
+    lines: List[str] = []
+    size = 0
+    in_quotes = False
+    async for line in iter_lines(text_chunks):
+        lines.append(line)
+        size += len(line) + 1
+        in_quotes = _scan_csv_line(line, delimiter, in_quotes)
+        if in_quotes:
+            if size > max_record_chars:
+                lines, size, in_quotes = [], 0, False
+                if columns is None:
+                    raise StatementRowError("CSV header is too long")
+                yield StatementRowError(f"record longer than {max_record_chars} characters")
+            continue
+
+        record = "\n".join(lines)
+        lines, size = [], 0
+        if not record.strip():
+            continue
+
+        fields = next(csv.reader([record], delimiter=delimiter))
+
+        if columns is None:
+            columns = [_canonical_column(name) for name in fields]
+            missing = {"date", "description", "amount"} - set(columns)
+            if missing:
+                raise StatementRowError(f"CSV header is missing column(s): {', '.join(sorted(missing))}")
+            continue
+
+        yield {
+            column: value.strip()
+            for column, value in zip(columns, fields)
+            if column is not None
+        }
+
+    if lines:
+        if columns is None:
+            raise StatementRowError("CSV header ends inside a quoted field")
+        yield StatementRowError("CSV ends inside a quoted field")
+
+
+def _canonical_column(name: str) -> Optional[str]:
+    folded = _fold(name)
+    for canonical, aliases in CSV_COLUMN_ALIASES.items():
+        if folded in aliases:
+            return canonical
+    return None
+
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+async def iter_ofx_records(text_chunks: AsyncIterator[str]) -> AsyncIterator[Dict[str, str]]:
+    """
+    Parse OFX (SGML 1.x or XML 2.x) statement transactions incrementally
+
+    Works on tag tokens rather than lines, so files written on a single line
+    are handled with the same bounded buffer.
+
+    Args:
+        text_chunks: Decoded text chunks
+
+    Yields:
+        One dictionary of tag -> value per <STMTTRN>, plus CURDEF when known
+    """
+    buffer = ""
+    currency: Optional[str] = None
+    current: Optional[Dict[str, str]] = None
+
+    def handle(closing: str, tag: str, value: str):
+        nonlocal currency, current
+        tag = tag.upper()
+        value = value.strip()
+        if tag == "CURDEF" and not closing:
+            currency = value or None
+        elif tag == "STMTTRN":
+            if closing:
+                finished, current = current, None
+                return finished
+            current = {}
+        elif current is not None and not closing and value:
+            current[tag] = value
+        return None
+
+    async for chunk in text_chunks:
+        buffer += chunk
+        # Only tokens followed by another "<" are complete
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        complete, buffer = buffer[:cut], buffer[cut:]
+        for closing, tag, value in _OFX_TOKEN.findall(complete):
+            finished = handle(closing, tag, value)
+            if finished is not None:
+                if currency and "CURDEF" not in finished:
+                    finished["CURDEF"] = currency
+                yield finished
+
+    for closing, tag, value in _OFX_TOKEN.findall(buffer):
+        finished = handle(closing, tag, value)
+        if finished is not None:
+            if currency and "CURDEF" not in finished:
+                finished["CURDEF"] = currency
+            yield finished
+
+
+def parse_amount(text: str, decimal_comma: bool = False) -> Decimal:
+    """
+    Parse a statement amount
+
+    Args:
+        text: Amount text, e.g. "-1,234.56", "1.234,56", "(12.00)" or "R$ 10,00"
+        decimal_comma: Whether the comma is the decimal separator
+
+    Returns:
+        Signed amount rounded to cents
+
+    Raises:
+        StatementRowError: If the amount is not a number
+    """
+    cleaned = re.sub(r"[^\d,.\-()+]", "", text or "")
+    negative = cleaned.startswith("-") or (cleaned.startswith("(") and cleaned.endswith(")"))
+    cleaned = cleaned.strip("()+-")
+    if decimal_comma:
+        cleaned = cleaned.replace(".", "").replace(",", ".")
+    else:
+        cleaned = cleaned.replace(",", "")
+    try:
+        amount = Decimal(cleaned).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise StatementRowError(f"invalid amount {text!r}")
+    return -amount if negative else amount
+
+
+def parse_statement_date(text: str, date_format: Optional[str] = None) -> date:
+    """
+    Parse a statement date
+
+    Args:
+        text: Date text
+        date_format: Optional strptime format; common formats are tried when omitted
+
+    Returns:
+        Parsed date
+
+    Raises:
+        StatementRowError: If no format matches
+    """
+    formats = (date_format,) if date_format else FALLBACK_DATE_FORMATS
+    for fmt in formats:
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise StatementRowError(f"invalid date {text!r}")
+
+
+def normalize_csv_record(record: Dict[str, str], options: StatementImportOptions) -> dict:
+    """
+    Convert a CSV record into transaction column values
+
+    The sign of the amount gives the type unless a type column is present.
+
+    Args:
+        record: Record from iter_csv_records
+        options: Import options
+
+    Returns:
+        Transaction values plus an optional "category" reference
+
+    Raises:
+        StatementRowError: If the record is invalid
+    """
+    amount = parse_amount(record.get("amount", ""), options.decimal_comma)
+    transaction_type = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+    if record.get("type"):
+        transaction_type = TYPE_ALIASES.get(_fold(record["type"]))
+        if transaction_type is None:
+            raise StatementRowError(f"invalid type {record['type']!r}")
+
+    return _build_row(
+        transaction_date=parse_statement_date(record.get("date", ""), options.date_format),
+        description=record.get("description", ""),
+        amount=amount,
+        transaction_type=transaction_type,
+        currency=record.get("currency"),
+        notes=record.get("notes"),
+        category=record.get("category"),
+        fitid=None,
+    )
+
+
+def normalize_ofx_record(record: Dict[str, str]) -> dict:
+    """
+    Convert an OFX <STMTTRN> into transaction column values
+
+    Args:
+        record: Record from iter_ofx_records
+
+    Returns:
+        Transaction values
+
+    Raises:
+        StatementRowError: If the record is invalid
+    """
+    posted = record.get("DTPOSTED", "")
+    if len(posted) < 8:
+        raise StatementRowError(f"invalid DTPOSTED {posted!r}")
+    amount = parse_amount(record.get("TRNAMT", ""))
+
+    name = record.get("NAME") or ""
+    memo = record.get("MEMO") or ""
+    description = name or memo
+    notes = memo if name and memo and memo != name else None
+    if record.get("FITID"):
+        notes = f"{notes} [FITID {record['FITID']}]" if notes else f"[FITID {record['FITID']}]"
+
+    return _build_row(
+        transaction_date=parse_statement_date(posted[:8], "%Y%m%d"),
+        description=description,
+        amount=amount,
+        transaction_type=TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME,
+        currency=record.get("CURDEF"),
+        notes=notes,
+        category=None,
+        fitid=record.get("FITID"),
+    )
+
+
+def _build_row(
+    transaction_date: date,
+    description: str,
+    amount: Decimal,
+    transaction_type: TransactionType,
+    currency: Optional[str],
+    notes: Optional[str],
+    category: Optional[str],
+    fitid: Optional[str],
+) -> dict:
+    description = " ".join(description.split())[:255]
+    if not description:
+        raise StatementRowError("missing description")
+    if amount == 0:
+        raise StatementRowError("amount must not be zero")
+
+    currency = (currency or "").strip().upper() or None
+    if currency is not None and len(currency) != 3:
+        raise StatementRowError(f"invalid currency {currency!r}")
+
+    return {
+        "description": description,
+        "amount": abs(amount),
+        "currency": currency,
+        "date": transaction_date,
+        "type": transaction_type,
+        "notes": notes or None,
+        "category": category or None,
+        "import_key": statement_import_key(transaction_date, abs(amount), transaction_type, description, fitid),
+    }
+
+
+def statement_import_key(
+    transaction_date: date,
+    amount: Decimal,
+    transaction_type: TransactionType,
+    description: str,
+    fitid: Optional[str] = None,
+) -> str:
+    """
+    Identity of a statement row, stored in transactions.import_key
+
+    Built from the values in the statement, before category mapping, so a
+    renamed or retyped category does not change it. OFX rows use their
+    FITID, the bank's own transaction identifier, when present. md5 keeps
+    the key short and matches PostgreSQL's md5() (used by the migration
+    that backfilled OFX rows).
+    """
+    if fitid:
+        source = f"fitid|{fitid.strip()}"
+    else:
+        source = f"row|{transaction_date.isoformat()}|{amount}|{transaction_type.value}|{description}"
+    return hashlib.md5(source.encode()).hexdigest()
+
+
+def dedupe_key(row: dict) -> DedupeKey:
+    """Key matching a statement row against transactions without an import key"""
+    return (row["date"], row["amount"], row["description"])
+
+
+class StatementImportService:
+    """
+    Service importing bank statements into transactions
+
+    Batches are committed as they are inserted, so a statement of any size
+    never holds one long transaction. Re-running an interrupted import is
+    safe: rows that existed before the run started are detected as
+    duplicates (multiset semantics, so N identical rows in the file match at
+    most N identical existing rows). Imported rows are matched by their
+    import key; transactions without one (entered by hand, or imported
+    before keys existed) by date, amount and description.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transaction_repo = TransactionRepository(db)
+        self.category_repo = CategoryRepository(db)
+
+    async def run(
+        self,
+        user_id: int,
+        chunks: AsyncIterator[bytes],
+        options: StatementImportOptions,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ImportProgress]:
+        """
+        Import a statement, yielding progress after each batch
+
+        Args:
+            user_id: Owner of the imported transactions
+            chunks: Raw file content as byte chunks
+            options: Parsing options
+            batch_size: Rows per INSERT batch (defaults to STATEMENT_IMPORT_BATCH_SIZE)
+
+        Yields:
+            Progress after each batch; the last one has done=True
+
+        Raises:
+            StatementRowError: If the file structure itself is invalid (e.g. CSV header)
+        """
+        batch_size = batch_size or settings.STATEMENT_IMPORT_BATCH_SIZE
+        # Rows inserted by this run get higher IDs and are never treated as duplicates
+        max_existing_id = await self.transaction_repo.get_max_id(user_id)
+        progress = ImportProgress()
+        categories = await self._load_category_map(user_id)
+        # Occurrences seen in this file of keys that already existed before the run
+        existing_seen: Dict[Union[str, DedupeKey], int] = {}
+
+        text_chunks = decode_chunks(chunks, options.encoding)
+        if options.format == "ofx":
+            records = iter_ofx_records(text_chunks)
+        else:
+            records = iter_csv_records(text_chunks, options.delimiter)
+
+        batch: List[dict] = []
+        try:
+            async for record in records:
+                progress.rows_read += 1
+                try:
+                    if isinstance(record, StatementRowError):
+                        raise record
+                    if options.format == "ofx":
+                        row = normalize_ofx_record(record)
+                    else:
+                        row = normalize_csv_record(record, options)
+                    self._map_category(row, categories)
+                except StatementRowError as exc:
+                    progress.add_error(progress.rows_read, str(exc))
+                    continue
+
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    await self._flush(user_id, batch, max_existing_id, existing_seen, options, progress)
+                    batch = []
+                    yield progress
+
+            if batch:
+                await self._flush(user_id, batch, max_existing_id, existing_seen, options, progress)
+        finally:
+            if progress.inserted and not options.dry_run:
+                bump_data_version(user_id)
+
+        progress.done = True
+        yield progress
+
+    async def _load_category_map(self, user_id: int) -> Dict[str, Tuple[int, TransactionType]]:
+        """Map folded category names and ids of the user's assignable categories"""
+        mapping: Dict[str, Tuple[int, TransactionType]] = {}
+        for category_id, name, category_type in await self.category_repo.get_assignable_for_user(user_id):
+            mapping[str(category_id)] = (category_id, category_type)
+            mapping.setdefault(_fold(name), (category_id, category_type))
+        return mapping
+
+    @staticmethod
+    def _map_category(row: dict, categories: Dict[str, Tuple[int, TransactionType]]) -> None:
+        """Resolve the category reference; the category's type wins, as in single creates"""
+        reference = row.pop("category")
+        row["category_id"] = None
+        if not reference:
+            return
+        match = categories.get(_fold(reference))
+        if match is None:
+            raise StatementRowError(f"unknown category {reference!r}")
+        row["category_id"], row["type"] = match
+
+    async def _flush(
+        self,
+        user_id: int,
+        batch: List[dict],
+        max_existing_id: int,
+        existing_seen: Dict[Union[str, DedupeKey], int],
+        options: StatementImportOptions,
+        progress: ImportProgress,
+    ) -> None:
+        """Drop duplicates of pre-existing rows and insert the rest of a batch"""
+        existing = await self.transaction_repo.count_existing_by_import_key(
+            user_id, {row["import_key"] for row in batch}, max_id=max_existing_id
+        )
+        existing.update(await self.transaction_repo.count_existing_by_key(
+            user_id, {dedupe_key(row) for row in batch}, max_id=max_existing_id
+        ))
+
+        rows = []
+        for row in batch:
+            for key in (row["import_key"], dedupe_key(row)):
+                seen = existing_seen.get(key, 0)
+                if seen < existing.get(key, 0):
+                    existing_seen[key] = seen + 1
+                    progress.duplicates += 1
+                    break
+            else:
+                rows.append({"user_id": user_id, "is_recurring": False, **row})
+
+        if options.dry_run:
+            progress.inserted += len(rows)
+        else:
+            ids = await self.transaction_repo.bulk_create(rows)
+            await self.db.commit()
+            progress.inserted += len(ids)
+            metrics.increment("statement_import.rows_inserted", len(ids))
+        progress.batches += 1
+        log_info(
+            f"Statement import user={user_id} batch={progress.batches} read={progress.rows_read} "
+            f"inserted={progress.inserted} duplicates={progress.duplicates} failed={progress.failed}"
+            f"{' (dry run)' if options.dry_run else ''}"
+        )
@@ -0,0 +1,136 @@
+"""
+Streaming transaction export (CSV / NDJSON)
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import metrics
+from app.models.category import TransactionType
+from app.repositories.transaction_repository import TransactionRepository
+
+
+# Format name -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "description",
+    "amount",
+    "currency",
+    "type",
+    "category_id",
+    "category",
+    "notes",
+    "tags",
+    "is_recurring",
+    "created_at",
+)
+
+
+def _export_values(row: Row) -> dict:
+    """Convert a database row into JSON/CSV friendly values (amounts stay exact strings)"""
+    values = row._asdict()
+    values["date"] = values["date"].isoformat()
+    values["amount"] = str(values["amount"])
+    values["type"] = values["type"].value
+    values["created_at"] = values["created_at"].isoformat()
+    return values
+
+
+def format_csv_batch(rows: Sequence[Row], include_header: bool = False) -> str:
+    """
+    Render a batch of rows as CSV
+
+    Args:
+        rows: Export rows
+        include_header: Prepend the header line
+
+    Returns:
+        CSV text for the batch
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    if include_header:
+        writer.writeheader()
+    writer.writerows(_export_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def format_ndjson_batch(rows: Sequence[Row]) -> str:
+    """
+    Render a batch of rows as newline-delimited JSON
+
+    Args:
+        rows: Export rows
+
+    Returns:
+        One JSON object per line
+    """
+    return "".join(
+        json.dumps(_export_values(row), ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+class TransactionExportService:
+    """Service streaming a user's full transaction history"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transaction_repo = TransactionRepository(db)
+
+    async def stream(
+        self,
+        user_id: int,
+        export_format: str,
+        transaction_type: Optional[TransactionType] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the export, one text chunk per fetched batch
+
+        Args:
+            user_id: User ID
+            export_format: "csv" or "ndjson"
+            transaction_type: Optional type filter
+            category_id: Optional category filter
+            start_date: Optional inclusive start date
+            end_date: Optional inclusive end date
+            batch_size: Rows per database round trip and per chunk
+
+        Yields:
+            Text chunks of the export
+        """
+        if export_format == "csv":
+            # The header is sent even when no row matches
+            yield format_csv_batch([], include_header=True)
+
+        exported = 0
+        async for rows in self.transaction_repo.stream_export_rows(
+            user_id,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+            batch_size=batch_size,
+        ):
+            exported += len(rows)
+            if export_format == "csv":
+                yield format_csv_batch(rows)
+            else:
+                yield format_ndjson_batch(rows)
+
+        metrics.increment("transaction_export.rows", exported)
@@ -2,13 +2,18 @@
 Transaction service for business logic
 """
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.category import Category
+from app.core.data_version import bump_data_version
+from app.core.report_cache import cached_report
+from app.models.category import Category, TransactionType
 from app.models.transaction import Transaction
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.transaction_rollup_repository import TransactionRollupRepository
 from app.schemas.transaction import TransactionCreateRequest, TransactionUpdateRequest
 
 
@@ -20,18 +25,19 @@ class TransactionService:
         self.transaction_repo = TransactionRepository(db)
         self.category_repo = CategoryRepository(db)
 
-    async def _resolve_category(self, user_id: int, category_id: Optional[int]) -> Optional[Category]:
+    async def _resolve_category_type(self, user_id: int, category_id: Optional[int]) -> Optional[TransactionType]:
+        """Validate a category the user assigns and return its type (column-only lookup)"""
         if category_id is None:
             return None
 
-        category = await self.category_repo.get_by_id(category_id)
-        if not category or category.user_id != user_id or category.deleted_at is not None or category.is_default:
+        category_types = await self.category_repo.get_assignable_types(user_id, [category_id])
+        if category_id not in category_types:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Selected category is invalid for this user",
             )
 
-        return category
+        return category_types[category_id]
 
     async def create_transaction(
         self,
@@ -50,11 +56,11 @@ class TransactionService:
 
         TODO: Implement full creation logic with validation
         """
-        category = await self._resolve_category(user_id, transaction_data.category_id)
+        category_type = await self._resolve_category_type(user_id, transaction_data.category_id)
         payload = transaction_data.model_dump()
 
-        if category is not None:
-            payload["type"] = category.type
+        if category_type is not None:
+            payload["type"] = category_type
 
         transaction_dict = {
             "user_id": user_id,
@@ -63,9 +69,86 @@ class TransactionService:
 
         transaction = await self.transaction_repo.create(transaction_dict)
         await self.db.commit()
+        bump_data_version(user_id)
 
         return transaction
 
+    async def create_transactions_bulk(
+        self,
+        user_id: int,
+        items: List[dict],
+        atomic: bool = False
+    ) -> dict:
+        """
+        Create many transactions in one database transaction
+
+        Each item is validated like a single POST /transactions body. All
+        referenced categories are resolved in one query, and the valid rows
+        are inserted with multi-row INSERT ... RETURNING.
+
+        Args:
+            user_id: ID of user creating the transactions
+            items: Raw transaction payloads
+            atomic: If True, nothing is inserted when any item is invalid
+
+        Returns:
+            Dictionary with created/failed counts, created ids and per-item errors
+
+        Raises:
+            HTTPException: 422 if atomic and at least one item is invalid
+        """
+        payloads = []
+        errors = []
+        for index, item in enumerate(items):
+            try:
+                payloads.append((index, TransactionCreateRequest.model_validate(item).model_dump()))
+            except ValidationError as exc:
+                errors.append({
+                    "index": index,
+                    "errors": [
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in exc.errors()
+                    ]
+                })
+
+        category_types = await self.category_repo.get_assignable_types(
+            user_id,
+            (payload["category_id"] for _, payload in payloads if payload["category_id"] is not None)
+        )
+
+        rows = []
+        for index, payload in payloads:
+            category_id = payload["category_id"]
+            if category_id is not None:
+                if category_id not in category_types:
+                    errors.append({
+                        "index": index,
+                        "errors": ["category_id: Selected category is invalid for this user"]
+                    })
+                    continue
+                payload["type"] = category_types[category_id]
+            rows.append({"user_id": user_id, **payload})
+
+        errors.sort(key=lambda error: error["index"])
+
+        if atomic and errors:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"message": "Bulk request rejected: invalid items", "errors": errors},
+            )
+
+        ids = await self.transaction_repo.bulk_create(rows)
+        await self.db.commit()
+        if ids:
+            bump_data_version(user_id)
+
+        return {
+            "created": len(ids),
+            "failed": len(errors),
+            "ids": ids,
+            "errors": errors
+        }
+
     async def get_user_transactions(
         self,
         user_id: int,
@@ -74,7 +157,8 @@ class TransactionService:
         transaction_type: Optional[str] = None,
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        after: Optional[Tuple[date, int]] = None
     ) -> List[Transaction]:
         """
         Get transactions for a user with filters
@@ -85,6 +169,7 @@ class TransactionService:
             limit: Page size
             transaction_type: Optional type filter
             category_id: Optional category filter
+            after: Optional (date, id) keyset cursor; replaces skip when given
 
         Returns:
             List of transactions
@@ -98,9 +183,11 @@ class TransactionService:
             transaction_type=transaction_type,
             category_id=category_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            after=after
         )
 
+    @cached_report("transaction_count")
     async def count_user_transactions(
         self,
         user_id: int,
@@ -119,6 +206,8 @@ class TransactionService:
 
         Returns:
             Total count of matching transactions
+
+        The count is cached until the user's data version changes.
         """
         return await self.transaction_repo.count_by_user(
             user_id=user_id,
@@ -145,27 +234,45 @@ class TransactionService:
         Returns:
             Updated transaction or None
 
-        TODO: Implement update logic with authorization check
-        """
-        # Check if transaction belongs to user
-        transaction = await self.transaction_repo.get_by_id(transaction_id)
-        if not transaction or transaction.user_id != user_id:
-            return None
+        Raises:
+            HTTPException: 422 if the new category, or the current one when
+                the category is not changed, is not assignable by the user
 
+        The ownership check, the write and the reload are a single
+        UPDATE ... RETURNING; a category change adds one column-only lookup.
+        """
         update_dict = transaction_data.model_dump(exclude_unset=True)
-
-        if "category_id" in update_dict and update_dict["category_id"] is None:
-            pass
-        else:
-            category = await self._resolve_category(
-                user_id,
-                update_dict.get("category_id", transaction.category_id),
+        category_id = update_dict.get("category_id")
+        conditions = []
+
+        if category_id is not None:
+            update_dict["type"] = await self._resolve_category_type(user_id, category_id)
+        elif "category_id" not in update_dict:
+            # The current category must still be assignable, and the type
+            # follows it; both in the same statement
+            conditions.append(or_(
+                Transaction.category_id.is_(None),
+                Transaction.category_id.in_(self.category_repo.assignable_ids(user_id)),
+            ))
+            update_dict["type"] = func.coalesce(
+                select(Category.type).where(Category.id == Transaction.category_id).scalar_subquery(),
+                update_dict.get("type", Transaction.type),
             )
-            if category is not None:
-                update_dict["type"] = category.type
 
-        updated_transaction = await self.transaction_repo.update(transaction_id, update_dict)
+        updated_transaction = await self.transaction_repo.update_owned(
+            transaction_id, user_id, update_dict, *conditions
+        )
+        if updated_transaction is None:
+            # Only a failed update tells a stale category apart from a missing transaction
+            if conditions and await self.transaction_repo.get_owned(transaction_id, user_id) is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Selected category is invalid for this user",
+                )
+            return None
+
         await self.db.commit()
+        bump_data_version(user_id)
 
         return updated_transaction
 
@@ -180,15 +287,15 @@ class TransactionService:
         Returns:
             True if deleted, False otherwise
 
-        Performs authorization check to ensure user owns the transaction
+        The ownership check is part of the DELETE statement itself
         """
-        transaction = await self.transaction_repo.get_by_id(transaction_id)
-        if not transaction or transaction.user_id != user_id:
+        deleted = await self.transaction_repo.delete_owned(transaction_id, user_id)
+        if not deleted:
             return False
 
-        deleted = await self.transaction_repo.delete(transaction_id)
         await self.db.commit()
-        return deleted
+        bump_data_version(user_id)
+        return True
 
     async def get_transaction_by_id(
         self,
@@ -247,17 +354,11 @@ class TransactionService:
         Returns:
             Dictionary with total_income, total_expense, and balance
         """
-        if start_date and end_date:
-            transactions = await self.get_transactions_by_date_range(user_id, start_date, end_date)
-        else:
-            transactions = await self.transaction_repo.get_by_user_id(user_id, skip=0, limit=10000)
-
-        total_income = sum(
-            float(t.amount) for t in transactions if t.type.value == "income"
-        )
-        total_expense = sum(
-            float(t.amount) for t in transactions if t.type.value == "expense"
+        totals = await TransactionRollupRepository(self.db).get_totals_by_type(
+            user_id, start_date, end_date
         )
+        total_income = float(totals[TransactionType.INCOME][0])
+        total_expense = float(totals[TransactionType.EXPENSE][0])
 
         return {
             "total_income": total_income,
@@ -1,59 +1,42 @@
 """
 Rate Limit Whitelist Service
-Manages whitelist entries and provides caching for performance
+Manages whitelist entries and keeps the in-memory trusted network index current
 """
-from typing import Optional, List, Set
+import os
+from typing import Any, Dict, Optional, List, Set, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from app.core.change_notifications import BackgroundRefresher, notify_change
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.metrics import metrics
+from app.core.trusted_networks import (
+    TrustedEntry,
+    TrustedNetworkIndex,
+    is_trusted_ip,
+    set_trusted_networks,
+)
 from app.models.rate_limit_whitelist import RateLimitWhitelist
+from app.models.trusted_ip import TrustedIP
 
-
-class WhitelistCache:
-    """Simple in-memory cache for whitelisted IPs"""
-    _instance = None
-    _ips: Set[str] = set()
-    _last_refresh: Optional[datetime] = None
-    _cache_ttl_seconds: int = 60  # Refresh every 60 seconds
-    
-    @classmethod
-    def get_instance(cls) -> "WhitelistCache":
-        if cls._instance is None:
-            cls._instance = WhitelistCache()
-        return cls._instance
-    
-    def is_cached(self, ip: str) -> bool:
-        return ip in self._ips
-    
-    def needs_refresh(self) -> bool:
-        if self._last_refresh is None:
-            return True
-        elapsed = (datetime.utcnow() - self._last_refresh).total_seconds()
-        return elapsed > self._cache_ttl_seconds
-    
-    def update(self, ips: Set[str]) -> None:
-        self._ips = ips
-        self._last_refresh = datetime.utcnow()
-    
-    def clear(self) -> None:
-        self._ips = set()
-        self._last_refresh = None
+# NOTIFY channel used to tell every worker to reload the trusted network index
+WHITELIST_CHANNEL = "plutusgrip_whitelist"
 
 
 class WhitelistService:
     """Service for managing rate limit whitelist"""
-    
+
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.cache = WhitelistCache.get_instance()
-    
+
     async def get_all_whitelisted_ips(self) -> List[RateLimitWhitelist]:
         """Get all whitelist entries"""
         result = await self.db.execute(
             select(RateLimitWhitelist).order_by(RateLimitWhitelist.created_at.desc())
         )
         return list(result.scalars().all())
-    
+
     async def get_active_ips(self) -> Set[str]:
         """Get set of active whitelisted IP addresses"""
         now = datetime.utcnow()
@@ -64,28 +47,102 @@ class WhitelistService:
             )
         )
         return {row[0] for row in result.all()}
-    
+
+    async def get_trusted_entries(self) -> List[TrustedEntry]:
+        """
+        Get every active trusted address or range from both tables
+
+        Whitelist entries keep their expiry so the index can stop matching
+        them on time between reloads; trusted IPs never expire.
+
+        Returns:
+            List of (ip_address or CIDR, expires_at) pairs
+        """
+        now = datetime.utcnow()
+        whitelist = await self.db.execute(
+            select(RateLimitWhitelist.ip_address, RateLimitWhitelist.expires_at).where(
+                RateLimitWhitelist.is_active == True,
+                (RateLimitWhitelist.expires_at == None) | (RateLimitWhitelist.expires_at > now)
+            )
+        )
+        trusted = await self.db.execute(
+            select(TrustedIP.ip_address).where(TrustedIP.is_active == True)
+        )
+        entries: List[TrustedEntry] = [(ip, expires_at) for ip, expires_at in whitelist.all()]
+        entries.extend((ip, None) for (ip,) in trusted.all())
+        return entries
+
+    async def reload_trusted_networks(self) -> TrustedNetworkIndex:
+        """
+        Rebuild the process-wide trusted network index from the database
+
+        Returns:
+            The new index
+        """
+        return set_trusted_networks(await self.get_trusted_entries())
+
+    async def get_change_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Get a cheap marker that changes whenever either table changes
+
+        Inserts and deletes change the row counts and updates bump
+        updated_at, so polling workers can skip reloads when nothing changed.
+
+        Returns:
+            (count, max updated_at) for rate_limit_whitelists and trusted_ips
+        """
+        result = await self.db.execute(
+            select(
+                select(func.count()).select_from(RateLimitWhitelist).scalar_subquery(),
+                select(func.max(RateLimitWhitelist.updated_at)).scalar_subquery(),
+                select(func.count()).select_from(TrustedIP).scalar_subquery(),
+                select(func.max(TrustedIP.updated_at)).scalar_subquery(),
+            )
+        )
+        return tuple(result.one())
+
+    async def deactivate_expired(self) -> int:
+        """
+        Deactivate whitelist entries whose expiry has passed
+
+        The in-memory index already stops matching them on time; this keeps
+        the table (and the admin listing) in line. Workers are notified
+        only when something changed.
+
+        Returns:
+            Number of entries deactivated
+        """
+        result = await self.db.execute(
+            update(RateLimitWhitelist)
+            .where(
+                RateLimitWhitelist.is_active == True,
+                RateLimitWhitelist.expires_at <= datetime.utcnow(),
+            )
+            .values(is_active=False, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        expired = result.rowcount or 0
+        if expired:
+            await self.notify_workers()
+        await self.db.commit()
+        return expired
+
+    async def notify_workers(self) -> None:
+        """Queue a reload notification for every worker (sent when the transaction commits)"""
+        await notify_change(self.db, WHITELIST_CHANNEL, str(os.getpid()))
+
     async def is_whitelisted(self, ip: str) -> bool:
-        """Check if IP is whitelisted (uses cache)"""
-        # Check cache first
-        if not self.cache.needs_refresh() and self.cache.is_cached(ip):
-            return True
-        
-        # Refresh cache if needed
-        if self.cache.needs_refresh():
-            active_ips = await self.get_active_ips()
-            self.cache.update(active_ips)
-        
-        return self.cache.is_cached(ip)
-    
+        """Check if IP is covered by a whitelisted address or range (in-memory index)"""
+        return is_trusted_ip(ip)
+
     async def add_ip(
-        self, 
-        ip_address: str, 
+        self,
+        ip_address: str,
         description: Optional[str] = None,
         created_by: Optional[int] = None,
         expires_at: Optional[datetime] = None
     ) -> RateLimitWhitelist:
-        """Add IP to whitelist"""
+        """Add IP or CIDR range to whitelist"""
         whitelist_entry = RateLimitWhitelist(
             ip_address=ip_address,
             description=description,
@@ -94,46 +151,73 @@ class WhitelistService:
             is_active=True
         )
         self.db.add(whitelist_entry)
+        await self.notify_workers()
         await self.db.commit()
         await self.db.refresh(whitelist_entry)
-        
-        # Clear cache to force refresh
-        self.cache.clear()
-        
+
+        await self.reload_trusted_networks()
+
         return whitelist_entry
-    
+
     async def remove_ip(self, whitelist_id: int) -> bool:
         """Remove IP from whitelist (soft delete by setting is_active=False)"""
         result = await self.db.execute(
             select(RateLimitWhitelist).where(RateLimitWhitelist.id == whitelist_id)
         )
         entry = result.scalars().first()
-        
+
         if not entry:
             return False
-        
+
         entry.is_active = False
+        await self.notify_workers()
         await self.db.commit()
-        
-        # Clear cache to force refresh
-        self.cache.clear()
-        
+
+        await self.reload_trusted_networks()
+
         return True
-    
+
     async def delete_ip(self, whitelist_id: int) -> bool:
         """Permanently delete whitelist entry"""
         result = await self.db.execute(
             select(RateLimitWhitelist).where(RateLimitWhitelist.id == whitelist_id)
         )
         entry = result.scalars().first()
-        
+
         if not entry:
             return False
-        
+
         await self.db.delete(entry)
+        await self.notify_workers()
         await self.db.commit()
-        
-        # Clear cache to force refresh
-        self.cache.clear()
-        
+
+        await self.reload_trusted_networks()
+
         return True
+
+
+async def _reload_trusted_networks() -> None:
+    async with AsyncSessionLocal() as session:
+        await WhitelistService(session).reload_trusted_networks()
+
+
+async def _whitelist_fingerprint() -> Tuple[Any, ...]:
+    async with AsyncSessionLocal() as session:
+        return await WhitelistService(session).get_change_fingerprint()
+
+
+def _listen_connect_args() -> Dict[str, Any]:
+    return engine.dialect.create_connect_args(engine.url)[1]
+
+
+# Started and stopped by the application lifespan
+whitelist_refresher = BackgroundRefresher(
+    name="trusted_networks",
+    channel=WHITELIST_CHANNEL,
+    reload=_reload_trusted_networks,
+    fingerprint=_whitelist_fingerprint,
+    connect_args=_listen_connect_args if settings.TRUSTED_NETWORKS_LISTEN and engine.dialect.driver == "asyncpg" else None,
+    poll_seconds=settings.TRUSTED_NETWORKS_POLL_SECONDS,
+    refresh_seconds=settings.TRUSTED_NETWORKS_REFRESH_SECONDS,
+)
+metrics.register_gauge("trusted_networks_refresher", whitelist_refresher.stats)
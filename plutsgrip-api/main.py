@@ -2,7 +2,7 @@
 PlutusGrip Finance Tracker API
 Main application entry point
 """
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -13,29 +13,24 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
-from app.core.logging import logger, log_info, log_error
-from app.core.database import init_db, close_db, remove_default_categories, AsyncSessionLocal
-from app.core.rate_limiter import limiter, update_whitelist_cache
+from app.core.logging import logger, log_info
+from app.core.metrics import metrics
+from app.core.database import init_db, close_db, remove_default_categories
+from app.core.rate_limiter import limiter
+from app.core.trusted_networks import get_trusted_networks
+from app.services.whitelist_service import whitelist_refresher
+from app.services.scheduled_jobs import scheduler, scheduler_supported
 from app.api.v1.router import api_router
+from app.api.dependencies import NotModified, require_trusted_network
+from app.core.password_hashing import PasswordHasherBusy, password_hasher
 from app.middlewares.error_handler import (
+    not_modified_handler,
+    password_hasher_busy_handler,
     validation_exception_handler,
     sqlalchemy_exception_handler,
     generic_exception_handler
 )
-
-
-async def sync_whitelist_cache() -> None:
-    """Sync whitelist from database to in-memory cache"""
-    from app.services.whitelist_service import WhitelistService
-    
-    async with AsyncSessionLocal() as session:
-        try:
-            service = WhitelistService(session)
-            active_ips = await service.get_active_ips()
-            update_whitelist_cache(active_ips)
-            log_info(f"Synced {len(active_ips)} IPs to whitelist cache")
-        except Exception as e:
-            log_error(f"Failed to sync whitelist cache: {e}")
+from app.middlewares.round_trips import RoundTripMiddleware
 
 
 @asynccontextmanager
@@ -57,9 +52,15 @@ async def lifespan(app: FastAPI):
     log_info("Removing legacy default categories...")
     await remove_default_categories()
     
-    # Sync whitelist cache from database
+    # Load trusted networks and keep every worker in sync with whitelist changes
     log_info("Syncing rate limit whitelist...")
-    await sync_whitelist_cache()
+    await whitelist_refresher.start()
+    log_info(f"Loaded {get_trusted_networks().size} trusted networks")
+
+    # Every worker runs the scheduler; only the elected leader runs the jobs
+    if settings.SCHEDULER_ENABLED and scheduler_supported:
+        await scheduler.start()
+        log_info(f"Scheduler started with {len(scheduler.jobs)} jobs")
 
     log_info("Application startup complete")
 
@@ -67,6 +68,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     log_info("Shutting down application...")
+    await scheduler.stop()
+    await whitelist_refresher.stop()
+    password_hasher.shutdown()
     await close_db()
     log_info("Application shutdown complete")
 
@@ -94,9 +98,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.allowed_methods_list,
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
+# Database round trips per request (metrics, optional X-DB-Round-Trips header)
+app.add_middleware(RoundTripMiddleware, header=settings.DB_ROUND_TRIP_HEADER)
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -109,17 +118,21 @@ async def log_requests(request: Request, call_next):
     # Calculate duration
     duration = (time.time() - start_time) * 1000  # Convert to milliseconds
 
-    # Log request
+    # Log request (conditional GET outcome when the ETag layer ran)
+    etag_result = getattr(request.state, "etag_result", None)
     logger.info(
         f"{request.method} {request.url.path} - "
         f"Status: {response.status_code} - "
         f"Duration: {duration:.2f}ms"
+        + (f" - ETag: {etag_result}" if etag_result else "")
     )
 
     return response
 
 
 # Exception handlers
+app.add_exception_handler(NotModified, not_modified_handler)
+app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
@@ -145,6 +158,19 @@ async def health_check():
     }
 
 
+# Metrics endpoint
+@app.get("/metrics", tags=["System"], dependencies=[Depends(require_trusted_network)])
+async def get_metrics():
+    """
+    Metrics endpoint for monitoring
+
+    Returns counters and cache statistics of the worker serving the request.
+    Only served to loopback and trusted networks (whitelist), since it
+    exposes internal counters.
+    """
+    return metrics.snapshot()
+
+
 # Root endpoint
 @app.get("/", tags=["System"])
 async def root():
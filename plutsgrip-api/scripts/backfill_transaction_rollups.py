@@ -0,0 +1,54 @@
+"""
+Backfill script for the daily transaction rollup used by reports
+Rebuilds transaction_daily_rollups from the transactions table. The Alembic
+migration already backfills on upgrade; run this to repair drift or after
+restoring transactions from a dump.
+
+Usage:
+    python scripts/backfill_transaction_rollups.py [--user-id 42]
+"""
+import argparse
+import asyncio
+from typing import Optional
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.database_url import normalize_async_database_url
+from app.repositories.transaction_rollup_repository import TransactionRollupRepository
+
+
+async def backfill_rollups(user_id: Optional[int] = None):
+    """Rebuild rollup rows for one user, or for every user when user_id is None"""
+    engine = create_async_engine(
+        normalize_async_database_url(settings.DATABASE_URL),
+        echo=False
+    )
+
+    async_session = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+    async with async_session() as session:
+        try:
+            written = await TransactionRollupRepository(session).rebuild(user_id)
+            await session.commit()
+            scope = f"user {user_id}" if user_id is not None else "all users"
+            print(f"✓ Rebuilt {written} rollup rows for {scope}")
+
+        except Exception as e:
+            await session.rollback()
+            print(f"✗ Error rebuilding rollups: {str(e)}")
+            raise
+
+        finally:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily transaction rollup")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    args = parser.parse_args()
+
+    asyncio.run(backfill_rollups(args.user_id))
+    print("✓ Backfill completed successfully!")
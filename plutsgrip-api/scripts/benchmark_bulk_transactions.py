@@ -0,0 +1,83 @@
+"""
+Benchmark for bulk transaction creation
+
+Creates a throwaway user and inserts N transactions through
+TransactionService.create_transactions_bulk (validation, batched category
+resolution and multi-row INSERT ... RETURNING), printing the elapsed time.
+
+Usage:
+    python scripts/benchmark_bulk_transactions.py [--items 10000] [--keep]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database_url import normalize_async_database_url
+from app.models.category import Category, TransactionType
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.transaction_service import TransactionService
+
+
+async def run_benchmark(item_count: int, keep: bool) -> None:
+    """Seed a user and time one bulk insert of item_count transactions"""
+    engine = create_async_engine(normalize_async_database_url(settings.DATABASE_URL), echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        user = User(
+            name="Bulk Benchmark",
+            email=f"bulk_{uuid.uuid4().hex}@example.com",
+            hashed_password="not-a-real-hash",
+        )
+        session.add(user)
+        await session.flush()
+        category = Category(
+            name="Bulk", type=TransactionType.EXPENSE, color="#000000", is_default=False, user_id=user.id
+        )
+        session.add(category)
+        await session.commit()
+        user_id, category_id = user.id, category.id
+
+    start = date.today() - timedelta(days=365)
+    items = [
+        {
+            "description": f"Bulk transaction {i}",
+            "amount": "12.34",
+            "date": (start + timedelta(days=i % 365)).isoformat(),
+            "type": "expense",
+            "category_id": category_id,
+        }
+        for i in range(item_count)
+    ]
+
+    try:
+        async with session_factory() as session:
+            started = time.perf_counter()
+            result = await TransactionService(session).create_transactions_bulk(user_id, items)
+            elapsed = time.perf_counter() - started
+        print(
+            f"created={result['created']} failed={result['failed']} "
+            f"elapsed={elapsed * 1000:.1f}ms rate={result['created'] / elapsed:,.0f} rows/s"
+        )
+    finally:
+        if not keep:
+            async with session_factory() as session:
+                await session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+                await session.execute(delete(Category).where(Category.user_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded user after the run")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.items, args.keep))
@@ -0,0 +1,145 @@
+"""
+Benchmark for the get_current_user principal resolution path
+
+Seeds a user with a large history and compares, per request:
+- legacy path: UserRepository.get_by_id (full ORM entity with selectin collections)
+- principal path, cold: UserRepository.get_principal (column-only select)
+- principal path, warm: per-worker principal cache hit
+
+Usage:
+    python scripts/benchmark_current_user.py [--transactions 50000] [--iterations 50] [--keep]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import delete, event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database_url import normalize_async_database_url
+from app.core.principal import cache_principal, get_cached_principal, principal_cache
+from app.models.category import Category, TransactionType
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+
+class QueryCounter:
+    """Counts statements sent through an engine"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+async def seed_large_user(session: AsyncSession, transaction_count: int) -> int:
+    """Create a user with one category and transaction_count transactions"""
+    user = User(
+        name="Benchmark User",
+        email=f"benchmark_{uuid.uuid4().hex}@example.com",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(user)
+    await session.flush()
+
+    category = Category(
+        name="Benchmark",
+        type=TransactionType.EXPENSE,
+        color="#000000",
+        is_default=False,
+        user_id=user.id,
+    )
+    session.add(category)
+    await session.flush()
+
+    start = date.today() - timedelta(days=3650)
+    rows = [
+        {
+            "user_id": user.id,
+            "description": f"Benchmark transaction {i}",
+            "amount": Decimal("10.00"),
+            "date": start + timedelta(days=i % 3650),
+            "type": TransactionType.EXPENSE,
+            "category_id": category.id,
+            "is_recurring": False,
+        }
+        for i in range(transaction_count)
+    ]
+    for offset in range(0, len(rows), 5000):
+        await session.execute(insert(Transaction), rows[offset:offset + 5000])
+
+    await session.commit()
+    return user.id
+
+
+async def measure(label: str, counter: QueryCounter, iterations: int, call) -> None:
+    """Run call() iterations times and print latency and query count per call"""
+    durations = []
+    counter.count = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        durations.append((time.perf_counter() - started) * 1000)
+
+    durations.sort()
+    p95 = durations[int(len(durations) * 0.95) - 1] if len(durations) > 1 else durations[0]
+    print(
+        f"{label:<28} queries/request={counter.count / iterations:>5.1f}  "
+        f"median={statistics.median(durations):>9.3f}ms  p95={p95:>9.3f}ms"
+    )
+
+
+async def run_benchmark(transaction_count: int, iterations: int, keep: bool) -> None:
+    """Seed data and compare both principal loading paths"""
+    engine = create_async_engine(normalize_async_database_url(settings.DATABASE_URL), echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    async with session_factory() as session:
+        print(f"Seeding user with {transaction_count} transactions...")
+        user_id = await seed_large_user(session, transaction_count)
+
+    async def legacy_path():
+        async with session_factory() as session:
+            await UserRepository(session).get_by_id(user_id)
+
+    async def principal_cold():
+        async with session_factory() as session:
+            await UserRepository(session).get_principal(user_id)
+
+    async def principal_warm():
+        principal = get_cached_principal(user_id)
+        if principal is None:
+            async with session_factory() as session:
+                principal = await UserRepository(session).get_principal(user_id)
+            cache_principal(principal)
+
+    try:
+        await measure("legacy get_by_id", counter, max(1, iterations // 10), legacy_path)
+        await measure("principal (cold)", counter, iterations, principal_cold)
+        principal_cache.clear()
+        await measure("principal (cached)", counter, iterations, principal_warm)
+    finally:
+        if not keep:
+            async with session_factory() as session:
+                await session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+                await session.execute(delete(Category).where(Category.user_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded user after the run")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.transactions, args.iterations, args.keep))
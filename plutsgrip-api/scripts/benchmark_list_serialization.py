@@ -0,0 +1,152 @@
+"""
+Microbenchmark for list endpoint JSON serialization
+
+Serializes pages of in-memory ORM transactions (half of them with a
+category) and reports rows/second for:
+- encode, legacy: model_validate per row, FastAPI-style dump + json.dumps
+- encode, fast: JSONListSerializer (one TypeAdapter validation + dump_json)
+- encode, orjson: model_validate per row + orjson.dumps (only if installed)
+- endpoint, legacy / fast: the same payload served through a FastAPI app
+  (response_model validation, dependency headers, ASGI), no database
+
+Usage:
+    python scripts/benchmark_list_serialization.py [--page-sizes 20,100,1000] [--seconds 1.0]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.core.fast_json import JSONListSerializer
+from app.models.category import Category, TransactionType
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionListResponse, TransactionResponse
+
+try:
+    import orjson
+except ImportError:  # optional, only used for comparison
+    orjson = None
+
+serializer = JSONListSerializer(TransactionListResponse, enabled=True)
+
+
+def make_page(size: int) -> list:
+    """Transient ORM transactions shaped like a list endpoint page"""
+    now = datetime.utcnow()
+    category = Category(
+        id=1, name="Groceries", type=TransactionType.EXPENSE, color="#00AA00", icon="cart",
+        is_default=False, user_id=1, created_at=now, updated_at=now,
+    )
+    page = []
+    for i in range(size):
+        transaction = Transaction(
+            id=i + 1, user_id=1, description=f"Supermarket purchase {i}", amount=Decimal("123.45"),
+            currency="BRL", date=date(2024, 1, 1), type=TransactionType.EXPENSE,
+            category_id=1 if i % 2 else None, notes="weekly shopping", tags="food,home",
+            is_recurring=False, recurring_transaction_id=None, created_at=now, updated_at=now,
+        )
+        transaction.category = category if i % 2 else None
+        page.append(transaction)
+    return page
+
+
+def legacy_model(page: list) -> TransactionListResponse:
+    return TransactionListResponse(
+        transactions=[TransactionResponse.model_validate(t) for t in page],
+        total=len(page), page=1, page_size=len(page),
+    )
+
+
+def encode_legacy(page: list) -> bytes:
+    # What FastAPI does with a returned model: dump, validate against
+    # response_model, serialize to JSON-able Python, then json.dumps
+    content = legacy_model(page).model_dump()
+    validated = TransactionListResponse.model_validate(content)
+    return json.dumps(validated.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode_fast(page: list) -> bytes:
+    return serializer.dump_json({"transactions": page, "total": len(page), "page": 1, "page_size": len(page)})
+
+
+def encode_orjson(page: list) -> bytes:
+    return orjson.dumps(legacy_model(page).model_dump(mode="json"))
+
+
+def rate(call, page: list, seconds: float) -> float:
+    """Rows per second over roughly ``seconds`` of repeated calls"""
+    call(page)
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        call(page)
+        calls += 1
+    return calls * len(page) / (time.perf_counter() - started)
+
+
+async def endpoint_rate(client: AsyncClient, path: str, rows: int, seconds: float) -> float:
+    await client.get(path)
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = await client.get(path)
+        response.raise_for_status()
+        calls += 1
+    return calls * rows / (time.perf_counter() - started)
+
+
+def build_app(page: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_model=TransactionListResponse)
+    async def legacy(response: Response):
+        response.headers["ETag"] = 'W/"bench"'
+        return legacy_model(page)
+
+    @app.get("/fast", response_model=TransactionListResponse)
+    async def fast(response: Response):
+        response.headers["ETag"] = 'W/"bench"'
+        return serializer.render({"transactions": page, "total": len(page), "page": 1, "page_size": len(page)}, response)
+
+    return app
+
+
+async def run_benchmark(page_sizes: list, seconds: float) -> None:
+    sample = make_page(10)
+    assert json.loads(encode_legacy(sample)) == json.loads(encode_fast(sample))
+
+    for size in page_sizes:
+        page = make_page(size)
+        results = [
+            ("encode, legacy", rate(encode_legacy, page, seconds)),
+            ("encode, fast", rate(encode_fast, page, seconds)),
+        ]
+        if orjson is not None:
+            results.append(("encode, orjson", rate(encode_orjson, page, seconds)))
+
+        transport = ASGITransport(app=build_app(page))
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            results.append(("endpoint, legacy", await endpoint_rate(client, "/legacy", size, seconds)))
+            results.append(("endpoint, fast", await endpoint_rate(client, "/fast", size, seconds)))
+
+        baseline = dict(results)
+        for label, rows_per_second in results:
+            reference = baseline["endpoint, legacy" if label.startswith("endpoint") else "encode, legacy"]
+            print(
+                f"page_size={size:<5} {label:<18} rows/s={rows_per_second:>12,.0f}  "
+                f"x{rows_per_second / reference:>5.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", default="20,100,1000")
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark([int(size) for size in args.page_sizes.split(",")], args.seconds))
@@ -0,0 +1,88 @@
+"""
+Benchmark of event-loop responsiveness during a login storm
+
+Runs --logins concurrent bcrypt verifications (what AuthService.authenticate_user
+does per login) while a probe coroutine simulates an unrelated cheap endpoint
+every few milliseconds, and reports the probe latency and login throughput for:
+- inline: verify_password called directly in the coroutine (the old behaviour)
+- pool: verification through the bounded password_hasher pool
+
+Usage:
+    python scripts/benchmark_login_storm.py [--logins 40] [--workers 2] [--executor thread]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.core.password_hashing import PasswordHasher, PasswordHasherBusy
+from app.core.security import get_password_hash, verify_password
+
+
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+async def probe(latencies: list, stop: asyncio.Event) -> None:
+    """Measure how late a coroutine that should wake every PROBE_INTERVAL_SECONDS actually wakes"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        latencies.append((time.perf_counter() - started - PROBE_INTERVAL_SECONDS) * 1000)
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_storm(label: str, logins: int, login) -> None:
+    """Run the storm with the given login coroutine and print probe latency"""
+    latencies: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+
+    rejected = sum(isinstance(result, PasswordHasherBusy) for result in results)
+    print(
+        f"{label:<8} logins/s={(logins - rejected) / elapsed:>7.1f}  rejected={rejected:<4} "
+        f"probe lag median={statistics.median(latencies):>8.2f}ms  "
+        f"p99={percentile(latencies, 0.99):>8.2f}ms  max={max(latencies):>8.2f}ms"
+    )
+
+
+async def run_benchmark(logins: int, workers: int, executor: str) -> None:
+    """Compare inline and pooled verification"""
+    hashed = get_password_hash("benchmark-password")
+    hasher = PasswordHasher(kind=executor, max_workers=workers, max_pending=logins)
+
+    async def inline_login():
+        return verify_password("benchmark-password", hashed)
+
+    async def pooled_login():
+        return await hasher.verify("benchmark-password", hashed)
+
+    try:
+        # Warm the pool so worker start-up is not measured
+        await hasher.verify("benchmark-password", hashed)
+        print(f"{logins} concurrent logins, {executor} pool with {workers} workers")
+        await run_storm("inline", logins, inline_login)
+        await run_storm("pool", logins, pooled_login)
+        print(f"pool stats: {hasher.stats()}")
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.logins, args.workers, args.executor))
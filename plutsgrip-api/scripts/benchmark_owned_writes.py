@@ -0,0 +1,169 @@
+"""
+Benchmark for owner-scoped writes
+
+Seeds a user with one category, transaction and goal and compares, per
+request (each in its own session and transaction, like an endpoint):
+- legacy path: get_by_id + ownership check in Python + update/delete + reload
+- owned path: update_owned / delete_owned (one UPDATE/DELETE ... WHERE id AND user_id)
+
+Usage:
+    python scripts/benchmark_owned_writes.py [--iterations 500] [--keep]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database_url import normalize_async_database_url
+from app.models.category import Category, TransactionType
+from app.models.goal import Goal
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.repositories.goal_repository import GoalRepository
+from app.repositories.transaction_repository import TransactionRepository
+
+
+class QueryCounter:
+    """Counts statements sent through an engine"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+async def seed_user(session: AsyncSession) -> dict:
+    """Create a user with one category, one transaction and one goal"""
+    user = User(
+        name="Benchmark User",
+        email=f"benchmark_{uuid.uuid4().hex}@example.com",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(user)
+    await session.flush()
+
+    category = Category(
+        name="Benchmark",
+        type=TransactionType.EXPENSE,
+        color="#000000",
+        is_default=False,
+        user_id=user.id,
+    )
+    session.add(category)
+    await session.flush()
+
+    transaction = Transaction(
+        user_id=user.id,
+        description="Benchmark transaction",
+        amount=Decimal("10.00"),
+        date=date.today(),
+        type=TransactionType.EXPENSE,
+        category_id=category.id,
+        is_recurring=False,
+    )
+    goal = Goal(user_id=user.id, name="Benchmark goal", target_amount=Decimal("1000000.00"))
+    session.add_all([transaction, goal])
+    await session.commit()
+    return {"user_id": user.id, "transaction_id": transaction.id, "goal_id": goal.id}
+
+
+async def measure(label: str, counter: QueryCounter, iterations: int, call) -> None:
+    """Run call() iterations times and print latency and statement count per call"""
+    durations = []
+    counter.count = 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        await call(i)
+        durations.append((time.perf_counter() - started) * 1000)
+
+    durations.sort()
+    p95 = durations[int(len(durations) * 0.95) - 1] if len(durations) > 1 else durations[0]
+    print(
+        f"{label:<34} statements/request={counter.count / iterations:>4.1f}  "
+        f"median={statistics.median(durations):>8.3f}ms  p95={p95:>8.3f}ms"
+    )
+
+
+async def run_benchmark(iterations: int, keep: bool) -> None:
+    """Seed data and compare both write paths"""
+    engine = create_async_engine(normalize_async_database_url(settings.DATABASE_URL), echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    async with session_factory() as session:
+        ids = await seed_user(session)
+    user_id = ids["user_id"]
+
+    async def legacy_transaction_update(i):
+        async with session_factory() as session:
+            repo = TransactionRepository(session)
+            transaction = await repo.get_by_id(ids["transaction_id"])
+            if transaction and transaction.user_id == user_id:
+                await repo.update(transaction.id, {"description": f"legacy {i}"})
+                await session.commit()
+
+    async def owned_transaction_update(i):
+        async with session_factory() as session:
+            repo = TransactionRepository(session)
+            if await repo.update_owned(ids["transaction_id"], user_id, {"description": f"owned {i}"}):
+                await session.commit()
+
+    async def legacy_goal_progress(i):
+        async with session_factory() as session:
+            repo = GoalRepository(session)
+            goal = await repo.get_by_id(ids["goal_id"])
+            if goal and goal.user_id == user_id:
+                await repo.update(goal.id, {"current_amount": goal.current_amount + 1})
+                await session.commit()
+
+    async def owned_goal_progress(i):
+        async with session_factory() as session:
+            repo = GoalRepository(session)
+            if await repo.update_owned(ids["goal_id"], user_id, {"current_amount": Goal.current_amount + 1}):
+                await session.commit()
+
+    async def legacy_missing_delete(i):
+        async with session_factory() as session:
+            repo = GoalRepository(session)
+            goal = await repo.get_by_id(-1)
+            if goal and goal.user_id == user_id:
+                await repo.delete(goal.id)
+                await session.commit()
+
+    async def owned_missing_delete(i):
+        async with session_factory() as session:
+            if await GoalRepository(session).delete_owned(-1, user_id):
+                await session.commit()
+
+    try:
+        await measure("transaction update (legacy)", counter, iterations, legacy_transaction_update)
+        await measure("transaction update (owned)", counter, iterations, owned_transaction_update)
+        await measure("goal progress (legacy)", counter, iterations, legacy_goal_progress)
+        await measure("goal progress (owned)", counter, iterations, owned_goal_progress)
+        await measure("delete of missing row (legacy)", counter, iterations, legacy_missing_delete)
+        await measure("delete of missing row (owned)", counter, iterations, owned_missing_delete)
+    finally:
+        if not keep:
+            async with session_factory() as session:
+                await session.execute(delete(Goal).where(Goal.user_id == user_id))
+                await session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+                await session.execute(delete(Category).where(Category.user_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded user after the run")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.iterations, args.keep))
@@ -0,0 +1,121 @@
+"""
+Benchmark for read-only sessions on GET requests
+
+Seeds a user with a page of transactions and runs the reads of a typical
+GET (user lookup + one page of transactions), each request in its own
+session like an endpoint, through:
+- write session: AsyncSessionLocal + commit (what get_db did for every method)
+- read session: ReadOnlySessionLocal (autocommit, read-only connections, no commit)
+
+Round trips are counted with the same instrumentation the
+X-DB-Round-Trips header and the db.round_trips.* metrics use.
+
+Usage:
+    python scripts/benchmark_read_sessions.py [--iterations 500] [--keep]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import DBAPIError
+from app.core.database import AsyncSessionLocal, ReadOnlySessionLocal, close_db
+from app.core.round_trips import count_round_trips
+from app.models.category import TransactionType
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.repositories.transaction_repository import TransactionRepository
+
+
+async def seed_user() -> int:
+    """Create a user with 20 transactions"""
+    async with AsyncSessionLocal() as session:
+        user = User(
+            name="Benchmark User",
+            email=f"benchmark_{uuid.uuid4().hex}@example.com",
+            hashed_password="not-a-real-hash",
+        )
+        session.add(user)
+        await session.flush()
+        session.add_all([
+            Transaction(
+                user_id=user.id,
+                description=f"Benchmark transaction {i}",
+                amount=Decimal("10.00"),
+                date=date.today(),
+                type=TransactionType.EXPENSE,
+                is_recurring=False,
+            )
+            for i in range(20)
+        ])
+        await session.commit()
+        return user.id
+
+
+async def read_page(session, user_id: int) -> None:
+    """The reads of a list endpoint: resolve the user, load one page"""
+    await session.execute(select(User.id, User.email).where(User.id == user_id))
+    await TransactionRepository(session).get_by_user_id(user_id, limit=20)
+
+
+async def measure(label: str, iterations: int, call) -> None:
+    """Run call() iterations times and print latency and round trips per call"""
+    durations = []
+    round_trips = 0
+    for _ in range(iterations):
+        with count_round_trips() as counter:
+            started = time.perf_counter()
+            await call()
+            durations.append((time.perf_counter() - started) * 1000)
+        round_trips += counter.count
+
+    durations.sort()
+    p95 = durations[int(len(durations) * 0.95) - 1] if len(durations) > 1 else durations[0]
+    print(
+        f"{label:<16} round_trips/request={round_trips / iterations:>4.1f}  "
+        f"median={statistics.median(durations):>8.3f}ms  p95={p95:>8.3f}ms"
+    )
+
+
+async def run_benchmark(iterations: int, keep: bool) -> None:
+    """Seed data and compare both session kinds"""
+    user_id = await seed_user()
+
+    async def write_session():
+        async with AsyncSessionLocal() as session:
+            await read_page(session, user_id)
+            await session.commit()
+
+    async def read_session():
+        async with ReadOnlySessionLocal() as session:
+            await read_page(session, user_id)
+
+    try:
+        await measure("write session", iterations, write_session)
+        await measure("read session", iterations, read_session)
+
+        async with ReadOnlySessionLocal() as session:
+            try:
+                await session.execute(update(User).where(User.id == user_id).values(name="changed"))
+                print("read session accepted a write")
+            except DBAPIError as exc:
+                print(f"read session refused a write: {exc.orig}")
+    finally:
+        if not keep:
+            async with AsyncSessionLocal() as session:
+                await session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded user after the run")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.iterations, args.keep))
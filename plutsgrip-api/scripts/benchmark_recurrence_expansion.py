@@ -0,0 +1,61 @@
+"""
+Benchmark for the vectorized recurrence expansion
+
+Generates random templates (all six frequencies, month-end start dates
+included) and expands them over a window two ways:
+- scalar: occurrence_date called once per occurrence (the previous approach)
+- vectorized: expand_occurrences, sorted by date and unsorted
+
+Usage:
+    python scripts/benchmark_recurrence_expansion.py [--templates 10000] [--years 5] [--no-daily]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from app.services.recurrence import FREQUENCY_STEPS, expand_occurrences, first_index_on_or_after, occurrence_date
+from app.models.recurring_transaction import RecurrenceFrequency
+
+
+def scalar_expand(starts, frequencies, window_start, window_end):
+    """Expand one occurrence at a time; returns the number of occurrences"""
+    count = 0
+    for start, frequency in zip(starts, frequencies):
+        index = first_index_on_or_after(start, frequency, window_start)
+        while occurrence_date(start, frequency, index) <= window_end:
+            count += 1
+            index += 1
+    return count
+
+
+def run_benchmark(args) -> None:
+    rng = random.Random(42)
+    frequencies = [f for f in FREQUENCY_STEPS if not (args.no_daily and f == RecurrenceFrequency.DAILY)]
+    window_start = date.today()
+    window_end = window_start + timedelta(days=365 * args.years)
+    starts = [window_start - timedelta(days=rng.randint(0, 730)) for _ in range(args.templates)]
+    freqs = [rng.choice(frequencies) for _ in range(args.templates)]
+    ends = [None] * args.templates
+
+    started = time.perf_counter()
+    expected = scalar_expand(starts, freqs, window_start, window_end)
+    print(f"scalar       occurrences={expected:,}  {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+    for sort in (True, False):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            positions, _ = expand_occurrences(starts, freqs, ends, window_start, window_end, sort=sort)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert len(positions) == expected
+        label = "vectorized" if sort else "unsorted"
+        print(f"{label:<12} occurrences={len(positions):,}  {min(timings):>9.1f} ms (best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--templates", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-daily", action="store_true", help="Leave daily templates out of the mix")
+    run_benchmark(parser.parse_args())
@@ -0,0 +1,158 @@
+"""
+Benchmark for the recurring transaction materializer
+
+Seeds users and active recurring templates in the database with
+INSERT ... SELECT generate_series. All six frequencies are used, and each
+template has been missed for 0 to --max-gap-days days, so most of them
+need catch-up. Two paths are then timed:
+- legacy path, on a sample: the previous per-row loop. It loads each ORM
+  template, adds one transaction and runs one UPDATE per template. Its
+  transaction is rolled back.
+- set-based path, on every template: materialize_due_recurring_transactions
+  with --workers concurrent workers
+
+The set-based run materializes every due template in the database, not
+only the seeded ones, so point DATABASE_URL at a benchmark database.
+
+Usage:
+    python scripts/benchmark_recurring_materializer.py [--templates 1000000] [--users 100000]
+        [--workers 4] [--batch-size 5000] [--max-gap-days 45] [--legacy-sample 5000] [--keep]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date
+from sqlalchemy import func, select, text
+from app.core.database import AsyncSessionLocal, close_db
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.recurring_transaction_service import materialize_due_recurring_transactions
+
+FREQUENCIES = "ARRAY['DAILY','WEEKLY','BIWEEKLY','MONTHLY','QUARTERLY','YEARLY']"
+
+
+async def seed(templates: int, users: int, max_gap_days: int, today: date) -> str:
+    """Create the benchmark users and templates, returning the email prefix that marks them"""
+    prefix = f"bench_recurring_{uuid.uuid4().hex[:8]}_"
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text(
+                "INSERT INTO users (name, email, hashed_password, currency, timezone, created_at, updated_at) "
+                "SELECT 'Benchmark User', CAST(:prefix AS text) || n || '@example.com', 'not-a-real-hash', 'BRL', 'UTC', now(), now() "
+                "FROM generate_series(1, CAST(:users AS integer)) AS n"
+            ),
+            {"prefix": prefix, "users": users},
+        )
+        await session.execute(
+            text(
+                "WITH seeded AS ("
+                "  SELECT id, row_number() OVER (ORDER BY id) - 1 AS position FROM users WHERE email LIKE :pattern"
+                ") "
+                "INSERT INTO recurring_transactions (user_id, description, amount, currency, type, frequency, "
+                "  start_date, next_execution_date, is_active, created_at, updated_at) "
+                f"SELECT seeded.id, 'Benchmark template ' || n, 10 + n % 90, 'BRL', 'EXPENSE', "
+                f"  ({FREQUENCIES})[1 + n % 6]::recurrencefrequency, "
+                "  CAST(:today AS date) - n % (CAST(:max_gap AS integer) + 1), "
+                "  CAST(:today AS date) - n % (CAST(:max_gap AS integer) + 1), true, now(), now() "
+                "FROM generate_series(0, CAST(:templates AS integer) - 1) AS n "
+                "JOIN seeded ON seeded.position = n % CAST(:users AS integer)"
+            ),
+            {
+                "pattern": f"{prefix}%", "today": today, "max_gap": max_gap_days,
+                "templates": templates, "users": users,
+            },
+        )
+        await session.commit()
+    return prefix
+
+
+async def legacy_sample(prefix: str, today: date, sample: int) -> float:
+    """Run the previous per-row materializer on a sample and roll it back; returns templates/second"""
+    async with AsyncSessionLocal() as session:
+        started = time.perf_counter()
+        result = await session.execute(
+            select(RecurringTransaction)
+            .join(User, User.id == RecurringTransaction.user_id)
+            .where(
+                User.email.like(f"{prefix}%"),
+                RecurringTransaction.is_active.is_(True),
+                RecurringTransaction.next_execution_date <= today,
+            )
+            .order_by(RecurringTransaction.user_id)
+            .limit(sample)
+        )
+        rows = list(result.scalars().all())
+        for recurring in rows:
+            session.add(Transaction(
+                user_id=recurring.user_id, description=recurring.description, amount=recurring.amount,
+                currency=recurring.currency, date=today, type=recurring.type,
+                category_id=recurring.category_id, notes="[Automática]", is_recurring=True,
+                recurring_transaction_id=recurring.id,
+            ))
+            recurring.next_execution_date = today
+            await session.flush()
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    return len(rows) / elapsed if elapsed else 0.0
+
+
+async def cleanup(prefix: str) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": f"{prefix}%"})
+        await session.commit()
+
+
+async def run_benchmark(args) -> None:
+    today = date.today()
+
+    started = time.perf_counter()
+    prefix = await seed(args.templates, args.users, args.max_gap_days, today)
+    print(f"seeded {args.templates:,} templates for {args.users:,} users in {time.perf_counter() - started:.1f}s")
+
+    try:
+        if args.legacy_sample:
+            rate = await legacy_sample(prefix, today, args.legacy_sample)
+            print(
+                f"legacy per-row loop    templates/s={rate:>10,.0f}  "
+                f"(one occurrence each; {args.templates / rate / 60 if rate else 0:.1f} min for all templates)"
+            )
+
+        started = time.perf_counter()
+        created = await materialize_due_recurring_transactions(
+            today=today, workers=args.workers, batch_size=args.batch_size,
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"set-based, {args.workers} workers  templates/s={args.templates / elapsed:>10,.0f}  "
+            f"transactions={created:,} ({created / elapsed:,.0f}/s)  total={elapsed:.1f}s"
+        )
+
+        async with AsyncSessionLocal() as session:
+            still_due = await session.scalar(
+                select(func.count(RecurringTransaction.id))
+                .join(User, User.id == RecurringTransaction.user_id)
+                .where(
+                    User.email.like(f"{prefix}%"),
+                    RecurringTransaction.is_active.is_(True),
+                    RecurringTransaction.next_execution_date <= today,
+                )
+            )
+        print(f"templates still due after the run: {still_due}")
+    finally:
+        if not args.keep:
+            await cleanup(prefix)
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--templates", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--max-gap-days", type=int, default=45, help="Longest missed period per template")
+    parser.add_argument("--legacy-sample", type=int, default=5000, help="Templates timed on the legacy path (0 skips it)")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded users after the run")
+    asyncio.run(run_benchmark(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Benchmark of the token revocation backends at scale
+
+Revokes --tokens token IDs (expiring over the next 30 minutes, like access
+tokens) in the memory and sqlite backends and reports:
+- memory footprint (traced allocations) or file size
+- revoke throughput
+- lookup latency for revoked and unknown IDs
+- purge time once every entry has expired
+
+Usage:
+    python scripts/benchmark_token_revocation.py [--tokens 1000000] [--lookups 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from app.core.token_revocation import MemoryRevocationBackend, SQLiteRevocationBackend
+
+
+def lookup_latency(backend, token_ids: list, lookups: int) -> float:
+    """Average is_revoked_sync latency in microseconds"""
+    sample = random.choices(token_ids, k=lookups)
+    started = time.perf_counter()
+    for token_id in sample:
+        backend.is_revoked_sync(token_id)
+    return (time.perf_counter() - started) / lookups * 1_000_000
+
+
+def run(label: str, backend, token_ids: list, lookups: int, footprint) -> None:
+    """Fill the backend, measure lookups, then expire and purge everything"""
+    now = time.time()
+    started = time.perf_counter()
+    for index, token_id in enumerate(token_ids):
+        backend.revoke_sync(token_id, now + 60 + (index % 1800))
+    revoke_seconds = time.perf_counter() - started
+
+    unknown = [uuid.uuid4().hex for _ in range(1000)]
+    hit_us = lookup_latency(backend, token_ids, lookups)
+    miss_us = lookup_latency(backend, unknown, lookups)
+
+    print(
+        f"{label:<7} tokens={len(token_ids):>9,}  footprint={footprint() / 1024 / 1024:>8.1f}MiB  "
+        f"revokes/s={len(token_ids) / revoke_seconds:>10,.0f}  "
+        f"lookup hit={hit_us:>6.2f}us miss={miss_us:>6.2f}us"
+    )
+
+    # Pretend the clock moved past every expiry
+    real_time = time.time
+    time.time = lambda: real_time() + 3600
+    try:
+        started = time.perf_counter()
+        if isinstance(backend, MemoryRevocationBackend):
+            with backend._lock:
+                backend._purge(time.time())
+        else:
+            with backend._lock:
+                backend._purge(backend._connect())
+        print(f"{'':<7} purge of all expired entries: {(time.perf_counter() - started) * 1000:,.0f}ms, "
+              f"remaining={backend.stats()['revoked']}")
+    finally:
+        time.time = real_time
+
+
+def main(tokens: int, lookups: int) -> None:
+    token_ids = [uuid.uuid4().hex for _ in range(tokens)]
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    memory_backend = MemoryRevocationBackend()
+    run(
+        "memory", memory_backend, token_ids, lookups,
+        lambda: tracemalloc.get_traced_memory()[0] - baseline,
+    )
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "revocations.sqlite3")
+        sqlite_backend = SQLiteRevocationBackend(path=path)
+        sqlite_backend.PURGE_INTERVAL = tokens + 1
+
+        def file_size():
+            return sum(
+                os.path.getsize(f"{path}{suffix}")
+                for suffix in ("", "-wal")
+                if os.path.exists(f"{path}{suffix}")
+            )
+
+        run("sqlite", sqlite_backend, token_ids, lookups, file_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    main(args.tokens, args.lookups)
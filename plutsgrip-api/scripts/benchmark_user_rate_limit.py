@@ -0,0 +1,93 @@
+"""
+Benchmark of the per-user token bucket limiter overhead
+
+Reports the cost of one rate limit check per request for the memory and
+sqlite backends, first from a single process and then from --workers
+processes hammering the same SQLite file (like gunicorn workers), and
+checks that the shared bucket never hands out more than its capacity.
+
+Usage:
+    python scripts/benchmark_user_rate_limit.py [--requests 50000] [--users 1000] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+from app.core.token_bucket import (
+    BucketLimit,
+    MemoryTokenBucketBackend,
+    SQLiteTokenBucketBackend,
+    UserRateLimiter,
+)
+
+LIMITS = {"read": BucketLimit.parse("300/minute"), "reports": BucketLimit.parse("60/minute")}
+
+
+def measure(limiter: UserRateLimiter, requests: int, users: int) -> list:
+    """Per-check latencies in microseconds"""
+    latencies = []
+    for _ in range(requests):
+        user_id = random.randrange(users)
+        route_class = "reports" if random.random() < 0.2 else "read"
+        started = time.perf_counter()
+        limiter.hit(user_id, route_class)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    print(
+        f"{label:<22} checks={len(latencies):>8,}  mean={statistics.mean(latencies):>7.2f}us  "
+        f"p50={ordered[len(ordered) // 2]:>7.2f}us  p99={ordered[int(len(ordered) * 0.99)]:>7.2f}us"
+    )
+
+
+def worker(path: str, requests: int, users: int, queue) -> None:
+    limiter = UserRateLimiter(SQLiteTokenBucketBackend(path=path, busy_timeout_ms=5000), LIMITS)
+    latencies = measure(limiter, requests, users)
+    # One shared bucket drained concurrently by every worker
+    hot = BucketLimit.parse("1000/hour")
+    allowed = sum(limiter.backend.take("read:hot", hot).allowed for _ in range(500))
+    queue.put((latencies, allowed))
+
+
+def main(requests: int, users: int, workers: int) -> None:
+    report("memory", measure(UserRateLimiter(MemoryTokenBucketBackend(), LIMITS), requests, users))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "buckets.sqlite3")
+        report("sqlite (1 process)", measure(UserRateLimiter(SQLiteTokenBucketBackend(path=path), LIMITS), requests, users))
+
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(path, requests // workers, users, queue))
+            for _ in range(workers)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for result, _ in results for latency in result]
+        report(f"sqlite ({workers} processes)", latencies)
+        allowed = sum(count for _, count in results)
+        print(f"{'':<22} aggregate checks/s={len(latencies) / elapsed:,.0f}  "
+              f"hot bucket allowed={allowed} of capacity 1000 ({workers * 500} attempts)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    main(args.requests, args.users, args.workers)
@@ -11,6 +11,9 @@ from sqlalchemy import text
 from app.core.database import Base, get_db
 from main import app
 from app.core.rate_limiter import limiter
+from app.core.token_bucket import user_rate_limiter
+from app.core.principal import principal_cache
+from app.core.cache_backends import shared_cache
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -23,12 +26,31 @@ def event_loop():
 def disable_rate_limit():
     """Disable rate limiting by default for tests"""
     limiter.enabled = False
+    user_rate_limiter.enabled = False
+    user_rate_limiter.backend.clear()
     # Clear storage to ensure fresh state if we do enable it
     # accessing the private storage attribute if necessary, or assuming in-memory
     if hasattr(limiter, '_storage'):
          limiter._storage.reset()
     yield
     limiter.enabled = True # Restore default (or Settings default)
+    user_rate_limiter.enabled = True
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """Drop cached principals so user ids reused across test databases stay isolated"""
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    """Drop cached reports and data versions between tests"""
+    shared_cache.clear()
+    yield
+    shared_cache.clear()
 
 
 # Test database URL (use a separate database for testing)
@@ -108,6 +130,21 @@ async def test_db(test_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+@pytest.fixture
+def query_budget(test_engine):
+    """
+    Assert the number of statements an endpoint sends to the test database
+
+    Usage in tests:
+        async def test_list(authenticated_client, query_budget):
+            with query_budget(3):
+                await authenticated_client.get("/api/transactions")
+    """
+    from tests.query_counter import assert_max_queries
+
+    return lambda budget: assert_max_queries(test_engine, budget)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(test_db: AsyncSession) -> AsyncClient:
     """
@@ -136,6 +173,37 @@ async def client(test_db: AsyncSession) -> AsyncClient:
         app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture(scope="function")
+async def live_client(test_engine, monkeypatch) -> AsyncClient:
+    """
+    Create a test client that keeps the real get_db dependency
+
+    The application session factories are pointed at the test database, so
+    requests go through the same read-only (GET/HEAD) and read-write
+    sessions as in production. Data must be committed to be visible.
+    """
+    from app.core import database
+
+    read_engine = database.create_read_engine(TEST_DATABASE_URL)
+    monkeypatch.setattr(
+        database, "AsyncSessionLocal",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False),
+    )
+    monkeypatch.setattr(
+        database, "ReadOnlySessionLocal",
+        async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False),
+    )
+
+    transport = ASGITransport(app=app)
+    test_client = AsyncClient(transport=transport, base_url="http://test")
+
+    try:
+        yield test_client
+    finally:
+        await test_client.aclose()
+        await read_engine.dispose()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def sample_user(test_db: AsyncSession) -> dict:
     """
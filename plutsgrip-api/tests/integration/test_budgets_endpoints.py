@@ -95,3 +95,79 @@ async def test_delete_budget(authenticated_client: AsyncClient):
     # Verify
     get_res = await authenticated_client.get(f"/api/budgets/{budget_id}")
     assert get_res.status_code == 404
+
+@pytest.mark.asyncio
+async def test_list_budgets_stays_within_query_budget(authenticated_client: AsyncClient, query_budget):
+    """Test listing budgets does not load their category or user"""
+    for i in range(5):
+        cat_res = await authenticated_client.post("/api/categories", json={
+            "name": f"Budget Cat {i}", "type": "expense", "color": "#000000"
+        })
+        await authenticated_client.post("/api/budgets", json={
+            "category_id": cat_res.json()["id"],
+            "amount": 100.00,
+            "period": "MONTHLY",
+            "start_date": str(date.today()),
+        })
+
+    with query_budget(2):
+        response = await authenticated_client.get("/api/budgets")
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+
+@pytest.mark.asyncio
+async def test_budgets_status_uses_period_windows(authenticated_client: AsyncClient):
+    """Test spend is counted per budget period, with previous periods in history"""
+    from app.services.recurrence import add_months
+
+    today = date.today()
+    start = add_months(today, -2)
+    cat_res = await authenticated_client.post("/api/categories", json={
+        "name": "Mercado", "type": "expense", "color": "#000000"
+    })
+    cat_id = cat_res.json()["id"]
+    budget_res = await authenticated_client.post("/api/budgets", json={
+        "category_id": cat_id, "amount": 100.00, "period": "monthly", "start_date": str(start),
+    })
+    budget_id = budget_res.json()["id"]
+    for amount, day in ((500.00, start - timedelta(days=1)), (80.00, add_months(start, 1)), (30.00, today)):
+        await authenticated_client.post("/api/transactions", json={
+            "description": "Compra", "amount": amount, "type": "expense",
+            "category_id": cat_id, "date": str(day),
+        })
+
+    response = await authenticated_client.get("/api/budgets/status?history=2")
+
+    assert response.status_code == 200
+    [status_data] = response.json()
+    assert status_data["budget_id"] == budget_id
+    assert status_data["period_start"] == str(add_months(start, 2))
+    assert status_data["spent_amount"] == 30.0
+    assert status_data["remaining_amount"] == 70.0
+    assert [period["spent_amount"] for period in status_data["history"]] == [0.0, 80.0]
+    assert status_data["history"][0]["period_start"] == str(start)
+
+    single = await authenticated_client.get(f"/api/budgets/{budget_id}/status")
+    assert single.json()["spent_amount"] == 30.0
+    assert single.json()["history"] == []
+
+
+@pytest.mark.asyncio
+async def test_budgets_status_is_one_query(authenticated_client: AsyncClient, query_budget):
+    """Test the overview of many budgets is computed in a single statement"""
+    for i in range(10):
+        cat_res = await authenticated_client.post("/api/categories", json={
+            "name": f"Status Cat {i}", "type": "expense", "color": "#000000"
+        })
+        await authenticated_client.post("/api/budgets", json={
+            "category_id": cat_res.json()["id"],
+            "amount": 100.00,
+            "period": ["MONTHLY", "QUARTERLY", "YEARLY"][i % 3],
+            "start_date": str(date.today() - timedelta(days=40 * i)),
+        })
+
+    with query_budget(2):
+        response = await authenticated_client.get("/api/budgets/status?history=3")
+    assert response.status_code == 200
+    assert len(response.json()) == 10
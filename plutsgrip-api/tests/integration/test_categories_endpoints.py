@@ -93,3 +93,22 @@ async def test_delete_category(authenticated_client: AsyncClient):
     # Verify gone
     get_res = await authenticated_client.get(f"/api/categories/{cat_id}")
     assert get_res.status_code == 404
+
+@pytest.mark.asyncio
+async def test_list_categories_does_not_load_transactions(authenticated_client: AsyncClient, query_budget):
+    """Test listing categories stays one query however many transactions they have"""
+    category_res = await authenticated_client.post("/api/categories", json={
+        "name": "Busy Category", "type": "expense", "color": "#00FF00"
+    })
+    category_id = category_res.json()["id"]
+    await authenticated_client.post("/api/transactions/bulk", json={
+        "items": [
+            {"description": f"Item {i}", "amount": "1.00", "date": "2024-01-01", "type": "expense", "category_id": category_id}
+            for i in range(20)
+        ]
+    })
+
+    with query_budget(2):
+        response = await authenticated_client.get("/api/categories")
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
@@ -79,3 +79,45 @@ async def test_delete_goal(authenticated_client: AsyncClient):
     # Verify
     get_res = await authenticated_client.get(f"/api/goals/{goal_id}")
     assert get_res.status_code == 404
+
+@pytest.mark.asyncio
+async def test_add_progress_accumulates(authenticated_client: AsyncClient):
+    """Test progress is added in the database and completes the goal at the target"""
+    create_res = await authenticated_client.post("/api/goals", json={
+        "name": "Progress Goal", "target_amount": 100.0, "priority": "LOW", "category": "Test"
+    })
+    goal_id = create_res.json()["id"]
+
+    first = await authenticated_client.post(f"/api/goals/{goal_id}/progress", json={"amount": 60.0})
+    assert first.status_code == 200
+    assert float(first.json()["current_amount"]) == 60.0
+    assert first.json()["is_completed"] is False
+
+    second = await authenticated_client.post(f"/api/goals/{goal_id}/progress", json={"amount": 40.0})
+    assert second.status_code == 200
+    assert float(second.json()["current_amount"]) == 100.0
+    assert second.json()["is_completed"] is True
+
+@pytest.mark.asyncio
+async def test_other_users_goal_cannot_be_changed(authenticated_client: AsyncClient, test_db):
+    """Test update, progress and delete of another user's goal answer 404"""
+    from app.core.security import create_access_token
+    from app.models.goal import Goal
+    from app.models.user import User
+
+    other = User(name="Other User", email="other@example.com", hashed_password="not-a-real-hash")
+    test_db.add(other)
+    await test_db.flush()
+    goal = Goal(user_id=other.id, name="Private Goal", target_amount=100)
+    test_db.add(goal)
+    await test_db.commit()
+
+    assert (await authenticated_client.put(f"/api/goals/{goal.id}", json={"name": "Hijacked"})).status_code == 404
+    assert (await authenticated_client.post(f"/api/goals/{goal.id}/progress", json={"amount": 10.0})).status_code == 404
+    assert (await authenticated_client.delete(f"/api/goals/{goal.id}")).status_code == 404
+
+    authenticated_client.headers["Authorization"] = f"Bearer {create_access_token(data={'sub': str(other.id)})}"
+    response = await authenticated_client.get(f"/api/goals/{goal.id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Private Goal"
+    assert float(response.json()["current_amount"]) == 0
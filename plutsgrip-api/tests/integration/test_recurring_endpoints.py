@@ -62,3 +62,102 @@ async def test_delete_recurring_transaction(authenticated_client: AsyncClient):
     # Verify
     get_res = await authenticated_client.get(f"/api/recurring-transactions/{rec_id}")
     assert get_res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_execute_due_catches_up_missed_periods(authenticated_client: AsyncClient, test_db):
+    """Test every missed occurrence is materialized once, on its own date"""
+    from app.services.recurring_transaction_service import RecurringTransactionService
+
+    res = await authenticated_client.post("/api/recurring-transactions", json={
+        "description": "Month-end rent",
+        "amount": "900.00",
+        "type": "expense",
+        "frequency": "MONTHLY",
+        "start_date": "2026-01-31",
+        "notes": "apartment",
+    })
+    rec_id = res.json()["id"]
+    assert res.json()["next_execution_date"] == "2026-02-28"
+
+    service = RecurringTransactionService(test_db)
+    assert await service.execute_due_recurring_transactions(today=date(2026, 4, 30)) == 3
+    assert await service.execute_due_recurring_transactions(today=date(2026, 4, 30)) == 0
+
+    transactions = (await authenticated_client.get("/api/transactions")).json()["transactions"]
+    generated = sorted(
+        (t for t in transactions if t["recurring_transaction_id"] == rec_id), key=lambda t: t["date"]
+    )
+    assert [t["date"] for t in generated] == ["2026-02-28", "2026-03-31", "2026-04-30"]
+    assert all(t["is_recurring"] and t["notes"] == "[Automática] apartment" for t in generated)
+
+    recurring = (await authenticated_client.get(f"/api/recurring-transactions/{rec_id}")).json()
+    assert recurring["next_execution_date"] == "2026-05-31"
+    assert recurring["is_active"] is True
+
+
+@pytest.mark.asyncio
+async def test_execute_due_deactivates_after_end_date(authenticated_client: AsyncClient, test_db):
+    """Test occurrences stop at end_date and the template is deactivated"""
+    from app.services.recurring_transaction_service import RecurringTransactionService
+
+    res = await authenticated_client.post("/api/recurring-transactions", json={
+        "description": "Short course",
+        "amount": "50.00",
+        "type": "expense",
+        "frequency": "WEEKLY",
+        "start_date": "2026-03-02",
+        "end_date": "2026-03-20",
+    })
+    rec_id = res.json()["id"]
+
+    created = await RecurringTransactionService(test_db).execute_due_recurring_transactions(today=date(2026, 4, 30))
+
+    assert created == 2  # 09/03 e 16/03
+    recurring = (await authenticated_client.get(f"/api/recurring-transactions/{rec_id}")).json()
+    assert recurring["is_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_cashflow_calendar_projects_pending_occurrences(authenticated_client: AsyncClient):
+    """Test the calendar lists future occurrences per day with running balance"""
+    await authenticated_client.post("/api/recurring-transactions", json={
+        "description": "Salary",
+        "amount": "3000.00",
+        "type": "income",
+        "frequency": "monthly",
+        "start_date": "2026-01-05",
+    })
+    await authenticated_client.post("/api/recurring-transactions", json={
+        "description": "Rent",
+        "amount": "1200.50",
+        "type": "expense",
+        "frequency": "MONTHLY",
+        "start_date": "2026-01-31",
+    })
+
+    response = await authenticated_client.get(
+        "/api/recurring-transactions/calendar", params={"start_date": "2026-02-01", "end_date": "2026-03-31"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [day["date"] for day in data["days"]] == ["2026-02-05", "2026-02-28", "2026-03-05", "2026-03-31"]
+    assert [day["balance"] for day in data["days"]] == [3000.0, 1799.5, 4799.5, 3599.0]
+    assert data["days"][1]["occurrences"][0]["description"] == "Rent"
+    assert (data["total_income"], data["total_expense"], data["net"]) == (6000.0, 2401.0, 3599.0)
+    assert data["occurrence_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cashflow_calendar_rejects_invalid_period(authenticated_client: AsyncClient):
+    """Test reversed and oversized periods are rejected"""
+    reversed_period = await authenticated_client.get(
+        "/api/recurring-transactions/calendar", params={"start_date": "2026-03-01", "end_date": "2026-02-01"}
+    )
+    oversized = await authenticated_client.get(
+        "/api/recurring-transactions/calendar", params={"start_date": "2026-01-01", "end_date": "2036-01-01"}
+    )
+
+    assert reversed_period.status_code == 422
+    assert oversized.status_code == 422
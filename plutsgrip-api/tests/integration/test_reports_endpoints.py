@@ -1,7 +1,7 @@
 """
 Integration tests for report endpoints
 """
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
@@ -132,3 +132,160 @@ async def test_get_financial_summary_returns_nested_daily_totals(
             "expense": 300.0,
         },
     }
+
+
+@pytest.mark.asyncio
+async def test_reports_follow_transaction_updates_and_deletes(
+    authenticated_client: AsyncClient,
+    test_db: AsyncSession,
+    sample_user: dict,
+):
+    await seed_report_data(test_db, sample_user["id"])
+
+    # Prime the report cache; the writes below must invalidate it
+    primed = await authenticated_client.get(
+        "/api/reports/summary?start_date=2026-03-01&end_date=2026-03-31"
+    )
+    assert primed.json()["total_expense"] == 300.0
+
+    list_response = await authenticated_client.get("/api/transactions")
+    transactions = {item["description"]: item for item in list_response.json()["transactions"]}
+
+    update_response = await authenticated_client.put(
+        f"/api/transactions/{transactions['Supermercado']['id']}",
+        json={"amount": 400.0},
+    )
+    assert update_response.status_code == 200
+
+    delete_response = await authenticated_client.delete(
+        f"/api/transactions/{transactions['Padaria']['id']}"
+    )
+    assert delete_response.status_code == 204
+
+    response = await authenticated_client.get(
+        "/api/reports/summary?start_date=2026-03-01&end_date=2026-03-31"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["total_expense"] == 400.0
+    assert data["transaction_count"] == 2
+    assert data["expense_by_category"][0]["count"] == 1
+    assert data["daily_totals"]["2026-03-05"] == {"income": 0.0, "expense": 400.0}
+
+
+@pytest.mark.asyncio
+async def test_get_trends_groups_by_calendar_month_and_fills_gaps(
+    authenticated_client: AsyncClient,
+    test_db: AsyncSession,
+    sample_user: dict,
+):
+    this_month = date.today().replace(day=1)
+    two_months_ago = (this_month - timedelta(days=1)).replace(day=1)
+    two_months_ago = (two_months_ago - timedelta(days=1)).replace(day=1)
+
+    test_db.add_all([
+        Transaction(
+            user_id=sample_user["id"],
+            description="Salario",
+            amount=Decimal("1000.00"),
+            date=two_months_ago,
+            type=TransactionType.INCOME,
+        ),
+        Transaction(
+            user_id=sample_user["id"],
+            description="Mercado",
+            amount=Decimal("200.00"),
+            date=this_month,
+            type=TransactionType.EXPENSE,
+        ),
+    ])
+    await test_db.commit()
+
+    response = await authenticated_client.get("/api/reports/trends?months=3")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["granularity"] == "month"
+    assert [point["period_start"] for point in data["income"]][0] == two_months_ago.isoformat()
+    assert [point["value"] for point in data["income"]] == [1000.0, 0.0, 0.0]
+    assert [point["value"] for point in data["expense"]] == [0.0, 0.0, 200.0]
+    assert [point["value"] for point in data["balance"]] == [1000.0, 0.0, -200.0]
+    assert data["income"][0]["month"] == two_months_ago.strftime("%b/%Y")
+
+
+@pytest.mark.asyncio
+async def test_get_trends_supports_yearly_granularity(
+    authenticated_client: AsyncClient,
+    test_db: AsyncSession,
+    sample_user: dict,
+):
+    await seed_report_data(test_db, sample_user["id"])
+
+    response = await authenticated_client.get("/api/reports/trends?granularity=year&periods=2")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [point["period"] for point in data["expense"]] == [
+        str(date.today().year - 1),
+        str(date.today().year),
+    ]
+    assert data["expense"][-1]["period_start"] == date(date.today().year, 1, 1).isoformat()
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_combines_history_and_recurring(
+    authenticated_client: AsyncClient,
+    test_db: AsyncSession,
+    sample_user: dict,
+):
+    today = date.today()
+    test_db.add_all([
+        Transaction(
+            user_id=sample_user["id"],
+            description="Saldo inicial",
+            amount=Decimal("1000.00"),
+            date=today - timedelta(days=30),
+            type=TransactionType.INCOME,
+        ),
+        *[
+            Transaction(
+                user_id=sample_user["id"],
+                description="Cafe",
+                amount=Decimal("7.00"),
+                date=today - timedelta(days=offset),
+                type=TransactionType.EXPENSE,
+            )
+            for offset in range(28)
+        ],
+    ])
+    await test_db.commit()
+    await authenticated_client.post("/api/recurring-transactions", json={
+        "description": "Aluguel",
+        "amount": "800.00",
+        "type": "expense",
+        "frequency": "monthly",
+        "start_date": (today - timedelta(days=20)).isoformat(),
+    })
+
+    response = await authenticated_client.get("/api/reports/forecast?days=30&history_days=28")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["opening_balance"] == 1000.0 - 28 * 7.0
+    assert len(data["daily"]) == 30
+    assert data["daily"][0]["date"] == (today + timedelta(days=1)).isoformat()
+    assert all(entry["estimated_expense"] == 7.0 for entry in data["daily"])
+    assert data["recurring_expense"] == 800.0
+    assert data["ending_balance"] == round(804.0 - 30 * 7.0 - 800.0, 2)
+    assert data["first_negative_date"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_validates_horizon(authenticated_client: AsyncClient):
+    response = await authenticated_client.get("/api/reports/forecast?days=0")
+
+    assert response.status_code == 422
@@ -124,6 +124,61 @@ async def test_delete_transaction(authenticated_client: AsyncClient):
     assert get_response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_other_users_transaction_cannot_be_changed(authenticated_client: AsyncClient, test_db):
+    """Test update and delete of another user's transaction answer 404 and change nothing"""
+    from app.models.category import TransactionType
+    from app.models.transaction import Transaction
+    from app.models.user import User
+
+    other = User(name="Other User", email="other@example.com", hashed_password="not-a-real-hash")
+    test_db.add(other)
+    await test_db.flush()
+    transaction = Transaction(
+        user_id=other.id,
+        description="Private transaction",
+        amount=100,
+        date=date.today(),
+        type=TransactionType.EXPENSE,
+    )
+    test_db.add(transaction)
+    await test_db.commit()
+
+    update_response = await authenticated_client.put(
+        f"/api/transactions/{transaction.id}", json={"description": "Hijacked"}
+    )
+    assert update_response.status_code == 404
+    assert (await authenticated_client.delete(f"/api/transactions/{transaction.id}")).status_code == 404
+
+    await test_db.refresh(transaction)
+    assert transaction.description == "Private transaction"
+
+
+@pytest.mark.asyncio
+async def test_update_with_deleted_category_is_rejected(authenticated_client: AsyncClient):
+    """Test updating a transaction whose current category was deleted answers 422 and changes nothing"""
+    category_res = await authenticated_client.post("/api/categories", json={
+        "name": "Soon Gone", "type": "expense", "color": "#222222", "icon": "g"
+    })
+    category_id = category_res.json()["id"]
+    create_response = await authenticated_client.post("/api/transactions", json={
+        "description": "Categorized", "amount": "30.00", "date": str(date.today()),
+        "type": "expense", "category_id": category_id,
+    })
+    transaction_id = create_response.json()["id"]
+    assert (await authenticated_client.delete(f"/api/categories/{category_id}")).status_code == 204
+
+    response = await authenticated_client.put(f"/api/transactions/{transaction_id}", json={"description": "Edited"})
+    assert response.status_code == 422
+
+    cleared = await authenticated_client.put(
+        f"/api/transactions/{transaction_id}", json={"description": "Edited", "category_id": None}
+    )
+    assert cleared.status_code == 200
+    assert cleared.json()["description"] == "Edited"
+    assert (await authenticated_client.put("/api/transactions/999999", json={"description": "x"})).status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_filter_transactions_by_type(authenticated_client: AsyncClient):
     """Test filtering transactions by type"""
@@ -223,3 +278,257 @@ async def test_pagination_respects_filtered_total_and_date_range(authenticated_c
 
     returned_dates = {transaction["date"] for transaction in data["transactions"]}
     assert returned_dates.issubset({"2026-03-10", "2026-03-11", "2026-03-12"})
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_conditional_get(authenticated_client: AsyncClient):
+    """Test ETag revalidation returns 304 until a transaction is written"""
+    first = await authenticated_client.get("/api/transactions")
+    etag = first.headers["etag"]
+
+    not_modified = await authenticated_client.get("/api/transactions", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    await authenticated_client.post("/api/transactions", json={
+        "description": "Invalidates the list",
+        "amount": "10.00",
+        "date": str(date.today()),
+        "type": "expense",
+    })
+
+    refreshed = await authenticated_client.get("/api/transactions", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()["transactions"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_cursor_pagination(authenticated_client: AsyncClient):
+    """Test cursor pages cover every row once, in (date, id) order, without totals"""
+    for index in range(5):
+        await authenticated_client.post("/api/transactions", json={
+            "description": f"Same day {index}",
+            "amount": "1.00",
+            "date": str(date.today()),
+            "type": "expense",
+        })
+
+    seen = []
+    response = await authenticated_client.get("/api/transactions?page_size=2&include_total=false")
+    while True:
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["transactions"])
+        if not data["next_cursor"]:
+            break
+        response = await authenticated_client.get(
+            f"/api/transactions?page_size=2&include_total=false&cursor={data['next_cursor']}"
+        )
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_list_and_detail_stay_within_query_budget(authenticated_client: AsyncClient, query_budget):
+    """Test list and detail reads embed the category without loading the user's data"""
+    category_res = await authenticated_client.post("/api/categories", json={
+        "name": "Budgeted", "type": "expense", "color": "#123456"
+    })
+    category_id = category_res.json()["id"]
+    today = str(date.today())
+    await authenticated_client.post("/api/transactions/bulk", json={
+        "items": [
+            {"description": f"Item {i}", "amount": "1.00", "date": today, "type": "expense", "category_id": category_id}
+            for i in range(20)
+        ]
+    })
+
+    # Principal lookup (when not cached), page query and total count
+    with query_budget(3):
+        response = await authenticated_client.get("/api/transactions?page_size=20")
+    assert response.status_code == 200
+    transactions = response.json()["transactions"]
+    assert len(transactions) == 20
+    assert all(item["category"]["name"] == "Budgeted" for item in transactions)
+
+    with query_budget(2):
+        detail = await authenticated_client.get(f"/api/transactions/{transactions[0]['id']}")
+    assert detail.status_code == 200
+    assert detail.json()["category"]["id"] == category_id
+
+    # The principal is cached by now: the update, the ownership and category
+    # checks and the reload with the category are a single statement
+    with query_budget(1):
+        updated = await authenticated_client.put(
+            f"/api/transactions/{transactions[0]['id']}", json={"description": "Renamed"}
+        )
+    assert updated.status_code == 200
+    assert updated.json()["description"] == "Renamed"
+    assert updated.json()["category"]["name"] == "Budgeted"
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_rejects_invalid_cursor(authenticated_client: AsyncClient):
+    """Test a malformed cursor returns 400"""
+    response = await authenticated_client.get("/api/transactions?cursor=garbage")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_transactions_reports_item_errors(authenticated_client: AsyncClient):
+    """Test valid items are inserted and invalid ones reported by index"""
+    today = str(date.today())
+    response = await authenticated_client.post("/api/transactions/bulk", json={
+        "items": [
+            {"description": "Coffee", "amount": "4.50", "date": today, "type": "expense"},
+            {"description": "Negative", "amount": "-1.00", "date": today, "type": "expense"},
+            {"description": "Salary", "amount": "3000.00", "date": today, "type": "income"},
+            {"description": "Bad category", "amount": "9.90", "date": today, "type": "expense", "category_id": 999999},
+        ]
+    })
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    assert len(data["ids"]) == 2
+    assert [error["index"] for error in data["errors"]] == [1, 3]
+
+    listed = await authenticated_client.get("/api/transactions")
+    assert listed.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_transactions_atomic_rejects_batch(authenticated_client: AsyncClient):
+    """Test atomic mode inserts nothing when any item is invalid"""
+    today = str(date.today())
+    response = await authenticated_client.post("/api/transactions/bulk", json={
+        "atomic": True,
+        "items": [
+            {"description": "Coffee", "amount": "4.50", "date": today, "type": "expense"},
+            {"description": "", "amount": "1.00", "date": today, "type": "expense"},
+        ]
+    })
+
+    assert response.status_code == 422
+
+    listed = await authenticated_client.get("/api/transactions")
+    assert listed.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_import_statement_skips_existing_rows(authenticated_client: AsyncClient):
+    """Test a CSV import inserts rows once and re-importing only finds duplicates"""
+    statement = (
+        "date,description,amount\n"
+        "2026-03-05,Bakery,-12.50\n"
+        "2026-03-05,Bakery,-12.50\n"
+        "2026-03-06,Salary,5000.00\n"
+        "2026-03-07,Broken,abc\n"
+    )
+    files = {"file": ("statement.csv", statement, "text/csv")}
+
+    dry_run = await authenticated_client.post("/api/transactions/import?dry_run=true", files=files)
+    assert dry_run.status_code == 200
+    assert dry_run.json()["inserted"] == 3
+    assert (await authenticated_client.get("/api/transactions")).json()["total"] == 0
+
+    first = await authenticated_client.post("/api/transactions/import", files=files)
+    assert first.status_code == 200
+    data = first.json()
+    assert (data["rows_read"], data["inserted"], data["duplicates"], data["failed"]) == (4, 3, 0, 1)
+
+    second = await authenticated_client.post("/api/transactions/import", files=files)
+    assert second.json()["inserted"] == 0
+    assert second.json()["duplicates"] == 3
+
+    listed = await authenticated_client.get("/api/transactions")
+    assert listed.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_import_statement_dedupe_survives_category_changes(authenticated_client: AsyncClient):
+    """Test re-importing after the mapped category was retyped, and an OFX file by FITID, finds only duplicates"""
+    category_res = await authenticated_client.post("/api/categories", json={
+        "name": "Gifts", "type": "expense", "color": "#333333", "icon": "g"
+    })
+    category_id = category_res.json()["id"]
+    files = {"file": ("statement.csv", "date,description,amount,category\n2026-03-05,Present,-40.00,Gifts\n", "text/csv")}
+    assert (await authenticated_client.post("/api/transactions/import", files=files)).json()["inserted"] == 1
+
+    await authenticated_client.put(f"/api/categories/{category_id}", json={"type": "income"})
+    again = await authenticated_client.post("/api/transactions/import", files=files)
+    assert (again.json()["inserted"], again.json()["duplicates"]) == (0, 1)
+
+    ofx = (
+        "<OFX><BANKTRANLIST>"
+        "<STMTTRN><DTPOSTED>20260306<TRNAMT>-9.90<FITID>X1<NAME>Streaming</STMTTRN>"
+        "<STMTTRN><DTPOSTED>20260306<TRNAMT>-9.90<FITID>X2<NAME>Streaming</STMTTRN>"
+        "</BANKTRANLIST></OFX>"
+    )
+    ofx_files = {"file": ("statement.ofx", ofx, "application/x-ofx")}
+    assert (await authenticated_client.post("/api/transactions/import?format=ofx", files=ofx_files)).json()["inserted"] == 2
+    renamed = ofx_files["file"][1].replace("Streaming</STMTTRN>", "Streaming Co</STMTTRN>")
+    again = await authenticated_client.post(
+        "/api/transactions/import?format=ofx", files={"file": ("statement.ofx", renamed, "application/x-ofx")}
+    )
+    assert (again.json()["inserted"], again.json()["duplicates"]) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_import_statement_rejects_unknown_format(authenticated_client: AsyncClient):
+    """Test files that are neither CSV nor OFX are rejected"""
+    response = await authenticated_client.post(
+        "/api/transactions/import",
+        files={"file": ("statement.pdf", b"%PDF", "application/pdf")},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_csv_and_ndjson(authenticated_client: AsyncClient):
+    """Test the export streams every matching row in both formats"""
+    items = [
+        {"description": f"Item {index}", "amount": "1.25", "date": str(date.today()), "type": "expense"}
+        for index in range(150)
+    ]
+    items.append({"description": "Salary", "amount": "3000.00", "date": str(date.today()), "type": "income"})
+    await authenticated_client.post("/api/transactions/bulk", json={"items": items})
+
+    csv_response = await authenticated_client.get("/api/transactions/export?type=expense")
+    assert csv_response.status_code == 200
+    assert csv_response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in csv_response.headers["content-disposition"]
+    lines = csv_response.text.strip().split("\n")
+    assert lines[0].startswith("id,date,description,amount")
+    assert len(lines) == 151
+
+    ndjson_response = await authenticated_client.get("/api/transactions/export?format=ndjson")
+    assert ndjson_response.status_code == 200
+    assert len(ndjson_response.text.strip().split("\n")) == 151
+
+    invalid = await authenticated_client.get("/api/transactions/export?format=xml")
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_streams_from_read_only_session(live_client: AsyncClient, sample_user: dict):
+    """Test the export cursor works behind the real autocommit read-only GET session"""
+    from app.core.security import create_access_token
+
+    live_client.headers["Authorization"] = f"Bearer {create_access_token(data={'sub': str(sample_user['id'])})}"
+    items = [
+        {"description": f"Item {index}", "amount": "2.50", "date": str(date.today()), "type": "expense"}
+        for index in range(120)
+    ]
+    created = await live_client.post("/api/transactions/bulk", json={"items": items})
+    assert created.status_code == 201
+
+    response = await live_client.get("/api/transactions/export?format=ndjson")
+    assert response.status_code == 200
+    assert len(response.text.strip().split("\n")) == 120
+
+    listed = await live_client.get("/api/transactions")
+    assert listed.status_code == 200
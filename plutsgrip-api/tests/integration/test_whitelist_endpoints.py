@@ -23,3 +23,32 @@ async def test_add_whitelist_entry(authenticated_client: AsyncClient):
     }
     response = await authenticated_client.post("/api/admin/whitelist", json=entry)
     assert response.status_code in [201, 200, 403]
+
+@pytest.mark.asyncio
+async def test_add_whitelist_range_is_applied_immediately(authenticated_client: AsyncClient):
+    """Test a CIDR range covers its addresses right after it is added and stops after removal"""
+    response = await authenticated_client.post(
+        "/api/admin/whitelist",
+        json={"ip_address": "198.18.4.0/24", "description": "Test range"}
+    )
+    assert response.status_code in [201, 403]
+    if response.status_code != 201:
+        return
+    entry = response.json()
+    assert entry["ip_address"] == "198.18.4.0/24"
+
+    check = await authenticated_client.get("/api/admin/whitelist/check/198.18.4.77")
+    assert check.json()["is_whitelisted"] is True
+
+    await authenticated_client.delete(f"/api/admin/whitelist/{entry['id']}")
+    check = await authenticated_client.get("/api/admin/whitelist/check/198.18.4.77")
+    assert check.json()["is_whitelisted"] is False
+
+@pytest.mark.asyncio
+async def test_add_whitelist_rejects_invalid_address(authenticated_client: AsyncClient):
+    """Test values that are not addresses or ranges are rejected"""
+    response = await authenticated_client.post(
+        "/api/admin/whitelist",
+        json={"ip_address": "not-an-ip"}
+    )
+    assert response.status_code in [422, 403]
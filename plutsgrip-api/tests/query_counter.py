@@ -0,0 +1,54 @@
+"""
+Query budget assertions for tests
+
+Usage:
+    with assert_max_queries(engine, 3):
+        response = await client.get("/api/transactions")
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Records the SQL statements sent through an engine while active"""
+
+    def __init__(self, engine):
+        self.engine: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+@contextmanager
+def assert_max_queries(engine, budget: int) -> Iterator[QueryCounter]:
+    """
+    Fail when the block sends more than ``budget`` statements to the database
+
+    The failure message lists every statement, which shows at a glance
+    which relationship was loaded eagerly or lazily (N+1).
+
+    Args:
+        engine: Engine (sync or async) the code under test uses
+        budget: Maximum number of statements allowed
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > budget:
+        listing = "\n".join(f"  {i}. {' '.join(sql.split())[:200]}" for i, sql in enumerate(counter.statements, 1))
+        raise AssertionError(f"Expected at most {budget} queries, got {counter.count}:\n{listing}")
@@ -0,0 +1,70 @@
+"""
+Unit tests for the period-aware budget status
+"""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.budget import BudgetPeriod
+from app.repositories.budget_repository import BudgetRepository
+from app.services.budget_service import BudgetService
+
+
+class RecordingSession:
+    """Collects the statements a repository executes"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(" ".join(str(statement.compile(dialect=postgresql.dialect())).split()))
+
+        class Result:
+            def all(self):
+                return []
+
+        return Result()
+
+
+async def test_period_spending_is_one_grouped_statement():
+    """Test every budget and period is computed by one statement over the rollup"""
+    session = RecordingSession()
+
+    await BudgetRepository(session).get_period_spending(1, date(2026, 10, 17), history_periods=6)
+
+    [statement] = session.statements
+    assert statement.startswith("WITH budget_periods AS")
+    assert "JOIN LATERAL generate_series(" in statement
+    assert "LEFT OUTER JOIN transaction_daily_rollups" in statement
+    assert "make_interval(" in statement
+    assert "GROUP BY current_periods.budget_id" in statement
+
+
+def row(budget_id, period_index, start, next_start, spent, amount="100.00"):
+    return SimpleNamespace(
+        budget_id=budget_id, category_id=budget_id * 10, amount=Decimal(amount), period=BudgetPeriod.MONTHLY,
+        period_index=period_index, period_start=start, next_period_start=next_start,
+        spent=None if spent is None else Decimal(spent),
+    )
+
+
+def test_statuses_group_history_and_current_period():
+    """Test rows become one status per budget with earlier periods in history"""
+    rows = [
+        row(1, 0, date(2026, 8, 31), date(2026, 9, 30), "120.00"),
+        row(1, 1, date(2026, 9, 30), date(2026, 10, 31), "25.50"),
+        row(2, 0, date(2026, 10, 1), date(2026, 11, 1), None),
+    ]
+
+    first, second = BudgetService.__new__(BudgetService)._build_statuses(rows)
+
+    assert first["budget_id"] == 1 and first["period"] == "MONTHLY"
+    assert (first["period_start"], first["period_end"]) == ("2026-09-30", "2026-10-30")
+    assert (first["spent_amount"], first["remaining_amount"], first["is_exceeded"]) == (25.5, 74.5, False)
+    assert first["history"] == [{
+        "period_start": "2026-08-31", "period_end": "2026-09-29", "spent_amount": 120.0,
+        "percentage_used": 100, "is_exceeded": True,
+    }]
+    assert second["spent_amount"] == 0.0 and second["history"] == []
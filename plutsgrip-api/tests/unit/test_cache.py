@@ -0,0 +1,71 @@
+"""
+Unit tests for in-process caches
+"""
+import time
+from datetime import datetime
+from app.core.cache import TTLCache
+from app.core.principal import (
+    AuthenticatedUser,
+    cache_principal,
+    get_cached_principal,
+    invalidate_principal,
+)
+
+
+def test_ttl_cache_get_and_set():
+    """Test storing and reading values"""
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test LRU eviction when maxsize is exceeded"""
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    """Test entries are dropped once their TTL elapses"""
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=-1)
+    cache.set("b", 2, ttl_seconds=0.0001)
+
+    assert cache.get("a") is None
+    time.sleep(0.001)
+    assert cache.get("b") is None
+    assert len(cache) == 0
+
+
+def test_principal_cache_invalidation():
+    """Test principals can be cached and invalidated by user id"""
+    now = datetime.utcnow()
+    principal = AuthenticatedUser(
+        id=42,
+        name="Test User",
+        email="test@example.com",
+        currency="BRL",
+        timezone="UTC",
+        created_at=now,
+        updated_at=now,
+    )
+
+    cache_principal(principal)
+    assert get_cached_principal(42) == principal
+
+    invalidate_principal(42)
+    assert get_cached_principal(42) is None
@@ -0,0 +1,184 @@
+"""
+Unit tests for the LISTEN/NOTIFY background refresher
+"""
+import asyncio
+import time
+
+import asyncpg
+import pytest
+
+from app.core.change_notifications import BackgroundRefresher
+
+
+class FakeConnection:
+    """Minimal stand-in for an asyncpg LISTEN connection"""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+    def terminate(self):
+        self.closed = True
+
+    def publish(self, channel, payload=""):
+        self.listeners[channel](self, 1, channel, payload)
+
+    def drop(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+class Source:
+    """Counts reloads and exposes a mutable fingerprint"""
+
+    def __init__(self):
+        self.version = 0
+        self.reloads = 0
+
+    async def reload(self):
+        self.reloads += 1
+
+    async def fingerprint(self):
+        return self.version
+
+
+async def wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    async def connect(**kwargs):
+        connection = FakeConnection()
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    return opened
+
+
+async def test_notification_triggers_reload_within_a_second(connections):
+    """Test a NOTIFY from another worker reloads the state promptly"""
+    source = Source()
+    refresher = BackgroundRefresher(
+        "test", "test_channel", source.reload, source.fingerprint,
+        connect_args=dict, refresh_seconds=60,
+    )
+    await refresher.start()
+    try:
+        await wait_for(lambda: refresher.listening)
+        # Initial load plus the catch-up reload after LISTEN
+        await wait_for(lambda: source.reloads == 2)
+
+        started = time.monotonic()
+        connections[0].publish("test_channel", "1234")
+        await wait_for(lambda: source.reloads == 3)
+
+        assert time.monotonic() - started < 1.0
+        assert refresher.stats()["mode"] == "listen"
+        assert refresher.notifications == 1
+    finally:
+        await refresher.stop()
+    assert connections[0].closed
+
+
+async def test_bursts_of_notifications_are_coalesced(connections):
+    """Test notifications arriving together cause a single reload"""
+    source = Source()
+    refresher = BackgroundRefresher(
+        "test", "test_channel", source.reload, connect_args=dict, debounce_seconds=0.1,
+    )
+    await refresher.start()
+    try:
+        await wait_for(lambda: source.reloads == 2)
+        for _ in range(10):
+            connections[0].publish("test_channel")
+        await asyncio.sleep(0.3)
+
+        assert source.reloads == 3
+    finally:
+        await refresher.stop()
+
+
+async def test_polling_fallback_reloads_only_on_change(monkeypatch):
+    """Test the fingerprint is polled when LISTEN is unavailable"""
+    async def refuse(**kwargs):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(asyncpg, "connect", refuse)
+    source = Source()
+    refresher = BackgroundRefresher(
+        "test", "test_channel", source.reload, source.fingerprint,
+        connect_args=dict, poll_seconds=0.05, refresh_seconds=60,
+    )
+    await refresher.start()
+    try:
+        await asyncio.sleep(0.2)
+        assert source.reloads == 1
+        assert refresher.stats()["mode"] == "poll"
+
+        source.version += 1
+        await wait_for(lambda: source.reloads == 2)
+        await asyncio.sleep(0.2)
+        assert source.reloads == 2
+    finally:
+        await refresher.stop()
+
+
+async def test_dropped_connection_falls_back_to_polling(connections):
+    """Test changes are still picked up after the LISTEN connection dies"""
+    source = Source()
+    refresher = BackgroundRefresher(
+        "test", "test_channel", source.reload, source.fingerprint,
+        connect_args=dict, poll_seconds=0.05, refresh_seconds=60,
+    )
+    await refresher.start()
+    try:
+        await wait_for(lambda: refresher.listening)
+        connections[0].drop()
+        await wait_for(lambda: not refresher.listening)
+
+        reloads = source.reloads
+        source.version += 1
+        await wait_for(lambda: source.reloads == reloads + 1)
+    finally:
+        await refresher.stop()
+
+
+async def test_failed_reload_is_counted_and_retried():
+    """Test reload errors do not stop the refresher"""
+    calls = []
+
+    async def flaky_reload():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+
+    refresher = BackgroundRefresher("test", "test_channel", flaky_reload, refresh_seconds=0.05, poll_seconds=0.05)
+    await refresher.start()
+    try:
+        await wait_for(lambda: len(calls) >= 2)
+        assert refresher.errors == 1
+        assert refresher.reloads >= 1
+    finally:
+        await refresher.stop()
@@ -0,0 +1,98 @@
+"""
+Unit tests for the ETag / If-None-Match conditional GET dependency
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.dependencies import NotModified, conditional_get, get_current_user
+from app.core.data_version import bump_data_version
+from app.core.principal import AuthenticatedUser
+from app.middlewares.error_handler import not_modified_handler
+
+
+def build_app(calls: list) -> FastAPI:
+    """Minimal app wiring the dependency the same way api_router does"""
+    router = APIRouter(prefix="/items")
+
+    @router.get("")
+    async def list_items():
+        calls.append("GET")
+        return {"items": [1, 2, 3]}
+
+    @router.post("")
+    async def create_item():
+        calls.append("POST")
+        return {"created": True}
+
+    async def fake_user() -> AuthenticatedUser:
+        now = datetime(2026, 1, 1)
+        return AuthenticatedUser(
+            id=42, name="Test", email="t@example.com", currency="BRL",
+            timezone="UTC", created_at=now, updated_at=now,
+        )
+
+    app = FastAPI()
+    app.include_router(router, dependencies=[Depends(conditional_get)])
+    app.add_exception_handler(NotModified, not_modified_handler)
+    app.dependency_overrides[get_current_user] = fake_user
+    return app
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_304_until_data_changes():
+    """Test matching If-None-Match skips the endpoint until the data version moves"""
+    calls = []
+    transport = ASGITransport(app=build_app(calls))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/items")
+        etag = first.headers["etag"]
+
+        assert first.status_code == 200
+        assert etag.startswith('"')
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        cached = await client.get("/items", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert calls == ["GET"]
+
+        weak = await client.get("/items", headers={"If-None-Match": f'"other", W/{etag}'})
+        assert weak.status_code == 304
+
+        bump_data_version(42)
+
+        changed = await client.get("/items", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert calls == ["GET", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_varies_by_query_and_ignores_writes():
+    """Test the ETag depends on the query string and non-GET requests pass through"""
+    calls = []
+    transport = ASGITransport(app=build_app(calls))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        page_1 = await client.get("/items?page=1&size=10")
+        reordered = await client.get("/items?size=10&page=1")
+        page_2 = await client.get("/items?page=2&size=10")
+
+        assert page_1.headers["etag"] == reordered.headers["etag"]
+        assert page_1.headers["etag"] != page_2.headers["etag"]
+
+        created = await client.post("/items", headers={"If-None-Match": "*"})
+        assert created.status_code == 200
+        assert "etag" not in created.headers
+
+
+def test_conditional_get_requires_a_shared_cache_backend():
+    """Test ETags are only wired into user-scoped routers when workers share the data version"""
+    from app.api.v1.router import user_scoped
+    from app.core.cache_backends import build_cache_backend, shared_cache
+
+    assert not build_cache_backend("memory", maxsize=10).shared
+    assert any(dep.dependency is conditional_get for dep in user_scoped) == shared_cache.shared
@@ -0,0 +1,135 @@
+"""
+Unit tests for fast-path JSON serialization of list endpoints
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.core.fast_json import JSONListSerializer
+from app.models.budget import Budget, BudgetPeriod
+from app.models.category import Category, TransactionType
+from app.models.goal import Goal
+from app.models.transaction import Transaction
+from app.schemas.budget import BudgetResponse
+from app.schemas.goal import GoalResponse
+from app.schemas.transaction import TransactionListResponse, TransactionResponse
+
+NOW = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def make_transactions(count: int) -> list:
+    """Transient ORM transactions, every other one with a category"""
+    category = Category(
+        id=7, name="Food", type=TransactionType.EXPENSE, color="#112233", icon=None,
+        is_default=False, user_id=1, created_at=NOW, updated_at=NOW,
+    )
+    transactions = []
+    for i in range(count):
+        transaction = Transaction(
+            id=i + 1, user_id=1, description=f"Café {i}", amount=Decimal("12.34"), currency="BRL",
+            date=date(2024, 5, 1), type=TransactionType.EXPENSE, category_id=7 if i % 2 else None,
+            notes=None, tags="a,b", is_recurring=False, recurring_transaction_id=None,
+            created_at=NOW, updated_at=NOW,
+        )
+        transaction.category = category if i % 2 else None
+        transactions.append(transaction)
+    return transactions
+
+
+def legacy_transaction_list(transactions: list) -> TransactionListResponse:
+    return TransactionListResponse(
+        transactions=[TransactionResponse.model_validate(t) for t in transactions],
+        total=len(transactions), page=1, page_size=20, next_cursor="abc",
+    )
+
+
+def build_app(schema, content, legacy) -> FastAPI:
+    """App serving the same payload through FastAPI's default path and the fast path"""
+    async def set_etag(response: Response):
+        response.headers["ETag"] = 'W/"v1"'
+        response.headers["RateLimit-Remaining"] = "9"
+
+    serializer = JSONListSerializer(schema, enabled=True)
+    router = APIRouter(dependencies=[Depends(set_etag)])
+
+    @router.get("/legacy", response_model=schema)
+    async def legacy_endpoint():
+        return legacy()
+
+    @router.get("/fast", response_model=schema)
+    async def fast_endpoint(response: Response):
+        return serializer.render(content(), response)
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def fetch_both(app: FastAPI):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get("/legacy"), await client.get("/fast")
+
+
+async def test_transaction_list_matches_default_serialization():
+    """Test the fast path returns the same document and headers as FastAPI"""
+    transactions = make_transactions(5)
+    app = build_app(
+        TransactionListResponse,
+        lambda: {"transactions": transactions, "total": 5, "page": 1, "page_size": 20, "next_cursor": "abc"},
+        lambda: legacy_transaction_list(transactions),
+    )
+
+    legacy, fast = await fetch_both(app)
+
+    assert fast.status_code == 200
+    assert fast.json() == legacy.json()
+    assert fast.json()["transactions"][1]["category"]["name"] == "Food"
+    assert fast.json()["transactions"][0]["amount"] == 12.34
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.headers["ETag"] == 'W/"v1"'
+    assert fast.headers["RateLimit-Remaining"] == "9"
+    assert int(fast.headers["content-length"]) == len(fast.content)
+
+
+@pytest.mark.parametrize("schema,rows", [
+    (list[BudgetResponse], lambda: [
+        Budget(id=1, user_id=1, category_id=2, amount=Decimal("500.00"), period=BudgetPeriod.MONTHLY,
+               start_date=datetime(2024, 5, 1), notifications_enabled=True, created_at=NOW, updated_at=NOW),
+    ]),
+    (list[GoalResponse], lambda: [
+        Goal(id=1, user_id=1, name="Trip", description=None, target_amount=Decimal("1000.00"),
+             current_amount=Decimal("250.00"), deadline=None, category="Travel", priority="high",
+             is_completed=False, created_at=NOW, updated_at=NOW),
+    ]),
+])
+async def test_plain_lists_match_default_serialization(schema, rows):
+    """Test enum, Decimal and computed fields serialize like the default path"""
+    data = rows()
+    app = build_app(schema, lambda: data, lambda: data)
+
+    legacy, fast = await fetch_both(app)
+
+    assert fast.json() == legacy.json()
+
+
+def test_disabled_serializer_returns_content_unchanged():
+    """Test FastAPI serializes the payload itself when the fast path is off"""
+    content = {"transactions": [], "total": 0}
+    serializer = JSONListSerializer(TransactionListResponse, enabled=False)
+
+    assert serializer.render(content, Response()) is content
+
+
+def test_dump_json_reads_plain_objects_and_dicts():
+    """Test nested models may be given as attribute objects or dicts"""
+    serializer = JSONListSerializer(TransactionListResponse)
+    transaction = make_transactions(2)[1]
+    as_dict = {column: getattr(transaction, column) for column in TransactionResponse.model_fields if column != "category"}
+
+    document = serializer.dump_json({"transactions": [transaction, as_dict]})
+
+    assert document.startswith(b'{"transactions":[{"id":2,')
+    assert b'"category":null' in document
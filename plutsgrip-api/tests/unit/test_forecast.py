@@ -0,0 +1,90 @@
+"""
+Unit tests for the balance forecast model
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.category import TransactionType
+from app.models.recurring_transaction import RecurrenceFrequency
+from app.schemas.report import ForecastResponse
+from app.services.forecast import build_forecast
+
+TODAY = date(2026, 3, 1)  # a Sunday
+
+
+def rollup_row(day, type, category_id, total, category_name=None):
+    return SimpleNamespace(day=day, type=type, category_id=category_id, category_name=category_name, total=Decimal(total))
+
+
+def template(amount, type, frequency, start_date, next_execution_date, end_date=None):
+    return SimpleNamespace(
+        amount=Decimal(amount), type=type, frequency=frequency,
+        start_date=start_date, end_date=end_date, next_execution_date=next_execution_date,
+    )
+
+
+def mondays(weeks):
+    return [TODAY - timedelta(days=6 + 7 * week) for week in range(weeks)]
+
+
+def test_weekday_averages_drive_estimates():
+    """Test a category spent every Monday is projected on Mondays only"""
+    history = [rollup_row(day, TransactionType.EXPENSE, 5, "40.00", "Groceries") for day in mondays(4)]
+
+    forecast = build_forecast(TODAY, 14, 28, Decimal("1000.00"), history, [], [])
+
+    by_day = {entry["date"]: entry for entry in forecast["daily"]}
+    assert by_day["2026-03-02"]["estimated_expense"] == 40.0
+    assert by_day["2026-03-03"]["estimated_expense"] == 0.0
+    assert forecast["ending_balance"] == 920.0
+    assert forecast["categories"] == [
+        {"category_id": 5, "category_name": "Groceries", "type": "EXPENSE", "projected_total": 80.0}
+    ]
+
+
+def test_recurring_history_is_not_double_counted():
+    """Test generated transactions are removed from the history and projected from the schedule"""
+    history = [rollup_row(day, TransactionType.EXPENSE, 0, "500.00") for day in mondays(4)]
+    recurring_history = [rollup_row(day, TransactionType.EXPENSE, 0, "500.00") for day in mondays(4)]
+    rent = template("500.00", TransactionType.EXPENSE, RecurrenceFrequency.WEEKLY, date(2026, 1, 5), date(2026, 3, 2))
+
+    forecast = build_forecast(TODAY, 7, 28, Decimal("2000.00"), history, recurring_history, [rent])
+
+    assert forecast["categories"] == []
+    assert forecast["recurring_expense"] == 500.0
+    assert forecast["projected_expense"] == 500.0
+    assert forecast["daily"][0]["recurring_expense"] == 500.0
+    assert forecast["ending_balance"] == 1500.0
+
+
+def test_balance_path_reports_first_negative_and_lowest_day():
+    """Test the running balance combines recurring income and expenses"""
+    salary = template("3000.00", TransactionType.INCOME, RecurrenceFrequency.MONTHLY, date(2026, 1, 5), date(2026, 3, 5))
+    rent = template("1200.00", TransactionType.EXPENSE, RecurrenceFrequency.MONTHLY, date(2026, 1, 3), date(2026, 3, 3))
+
+    forecast = build_forecast(TODAY, 10, 28, Decimal("100.00"), [], [], [salary, rent])
+
+    balances = {entry["date"]: entry["balance"] for entry in forecast["daily"]}
+    assert balances["2026-03-02"] == 100.0
+    assert balances["2026-03-03"] == -1100.0
+    assert balances["2026-03-05"] == 1900.0
+    assert forecast["first_negative_date"] == "2026-03-03"
+    assert (forecast["lowest_balance"], forecast["lowest_balance_date"]) == (-1100.0, "2026-03-03")
+    ForecastResponse(**forecast)
+
+
+def test_range_widens_with_volatile_history():
+    """Test the balance range grows over time and is empty without variation"""
+    steady = [rollup_row(TODAY - timedelta(days=offset), TransactionType.EXPENSE, 1, "10.00") for offset in range(28)]
+    volatile = [
+        rollup_row(TODAY - timedelta(days=offset), TransactionType.EXPENSE, 1, "40.00" if offset % 14 < 7 else "0.01")
+        for offset in range(28)
+    ]
+
+    flat = build_forecast(TODAY, 30, 28, Decimal("0"), steady, [], [])["daily"]
+    wide = build_forecast(TODAY, 30, 28, Decimal("0"), volatile, [], [])["daily"]
+
+    assert all(entry["balance_low"] == entry["balance"] == entry["balance_high"] for entry in flat)
+    spreads = [entry["balance_high"] - entry["balance_low"] for entry in wide]
+    assert spreads[0] > 0 and spreads == sorted(spreads)
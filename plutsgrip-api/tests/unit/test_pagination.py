@@ -0,0 +1,23 @@
+"""
+Unit tests for keyset pagination cursors
+"""
+from datetime import date
+
+import pytest
+
+from app.core.pagination import decode_date_id_cursor, encode_date_id_cursor
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes back to the encoded sort key"""
+    cursor = encode_date_id_cursor(date(2026, 3, 5), 12345)
+
+    assert "=" not in cursor
+    assert decode_date_id_cursor(cursor) == (date(2026, 3, 5), 12345)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "eyJ4IjoxfQ", "bnVsbA"])
+def test_invalid_cursor_raises_value_error(cursor):
+    """Test malformed cursors are rejected with ValueError"""
+    with pytest.raises(ValueError):
+        decode_date_id_cursor(cursor)
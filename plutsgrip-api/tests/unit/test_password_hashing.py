@@ -0,0 +1,75 @@
+"""
+Unit tests for the bounded password hashing pool
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.password_hashing import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    pool = PasswordHasher(kind="thread", max_workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+async def test_hash_and_verify_round_trip(hasher):
+    """Test hashing and verification through the pool"""
+    hashed = await hasher.hash("s3cret-password")
+
+    assert await hasher.verify("s3cret-password", hashed) is True
+    assert await hasher.verify("wrong-password", hashed) is False
+    assert hasher.stats()["active"] == 0
+    assert hasher.stats()["queued"] == 0
+
+
+async def test_hashing_does_not_block_event_loop(hasher):
+    """Test other coroutines keep running while a hash is computed"""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await hasher.hash("s3cret-password")
+    task.cancel()
+
+    assert ticks > 5
+
+
+async def test_calls_beyond_queue_capacity_are_rejected(hasher):
+    """Test one running plus one queued call fill the pool and the next fails fast"""
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return "done"
+
+    running = asyncio.create_task(hasher._run("test", blocking))
+    queued = asyncio.create_task(hasher._run("test", blocking))
+    for _ in range(100):
+        if hasher.stats()["active"] == 1:
+            break
+        await asyncio.sleep(0.01)
+
+    assert hasher.stats()["active"] == 1
+    assert hasher.stats()["queued"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.verify("password", "hash")
+
+    release.set()
+    assert await running == "done"
+    assert await queued == "done"
+    assert hasher.stats()["queued"] == 0
+
+
+def test_unknown_executor_kind_is_rejected():
+    """Test misconfigured executor kinds fail at construction"""
+    with pytest.raises(ValueError):
+        PasswordHasher(kind="fiber")
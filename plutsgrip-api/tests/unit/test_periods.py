@@ -0,0 +1,45 @@
+"""
+Unit tests for calendar period arithmetic used by report trends
+"""
+from datetime import date
+
+from app.schemas.report import TrendGranularity
+from app.services.periods import period_label, period_start, recent_periods, shift_period
+
+
+def test_period_start_per_granularity():
+    """Test periods start on ISO Monday, first of month, quarter and year"""
+    day = date(2026, 8, 20)  # Thursday
+
+    assert period_start(day, TrendGranularity.WEEK) == date(2026, 8, 17)
+    assert period_start(day, TrendGranularity.MONTH) == date(2026, 8, 1)
+    assert period_start(day, TrendGranularity.QUARTER) == date(2026, 7, 1)
+    assert period_start(day, TrendGranularity.YEAR) == date(2026, 1, 1)
+
+
+def test_shift_period_crosses_year_boundaries():
+    """Test shifting whole periods across year boundaries"""
+    assert shift_period(date(2026, 1, 1), TrendGranularity.MONTH, -1) == date(2025, 12, 1)
+    assert shift_period(date(2026, 1, 1), TrendGranularity.QUARTER, -1) == date(2025, 10, 1)
+    assert shift_period(date(2025, 12, 29), TrendGranularity.WEEK, 1) == date(2026, 1, 5)
+    assert shift_period(date(2026, 1, 1), TrendGranularity.YEAR, -2) == date(2024, 1, 1)
+
+
+def test_recent_periods_are_consecutive_calendar_months():
+    """Test month buckets never skip or repeat a month (31-day and February edges)"""
+    starts = recent_periods(date(2026, 3, 31), TrendGranularity.MONTH, 24)
+
+    assert len(starts) == 24
+    assert starts[0] == date(2024, 4, 1)
+    assert starts[-1] == date(2026, 3, 1)
+    assert len(set(starts)) == 24
+    for previous, current in zip(starts, starts[1:]):
+        assert shift_period(previous, TrendGranularity.MONTH, 1) == current
+
+
+def test_period_labels():
+    """Test labels for each granularity"""
+    assert period_label(date(2026, 1, 5), TrendGranularity.WEEK) == "2026-W02"
+    assert period_label(date(2026, 1, 1), TrendGranularity.MONTH) == "Jan/2026"
+    assert period_label(date(2026, 10, 1), TrendGranularity.QUARTER) == "Q4/2026"
+    assert period_label(date(2026, 1, 1), TrendGranularity.YEAR) == "2026"
@@ -0,0 +1,104 @@
+"""
+Unit tests for the whitelist-aware rate limiter and its bounded storage
+"""
+import gc
+import tracemalloc
+
+import pytest
+from fastapi import Request
+from slowapi.errors import RateLimitExceeded
+
+from app.core import trusted_networks
+from app.core.rate_limiter import BoundedMemoryStorage, WhitelistAwareLimiter, get_rate_limit_key
+
+
+def make_request(ip: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/limited", "headers": [], "client": (ip, 50000)})
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """A limiter with a small keyspace and a 3/minute limited endpoint"""
+    monkeypatch.setattr(
+        trusted_networks, "_index", trusted_networks.TrustedNetworkIndex([("10.0.0.1", None), ("172.16.0.0/12", None)])
+    )
+    test_limiter = WhitelistAwareLimiter(
+        key_func=get_rate_limit_key,
+        storage_uri="bounded-memory://",
+        storage_options={"max_keys": 50},
+    )
+
+    @test_limiter.limit("3/minute")
+    async def limited(request: Request):
+        return None
+
+    yield test_limiter, limited
+    test_limiter.reset()
+
+
+def test_regular_clients_are_limited(limiter):
+    """Test a non-whitelisted client is rejected after the limit"""
+    test_limiter, endpoint = limiter
+    for _ in range(3):
+        test_limiter._check_request_limit(make_request("192.0.2.7"), endpoint, False)
+
+    with pytest.raises(RateLimitExceeded):
+        test_limiter._check_request_limit(make_request("192.0.2.7"), endpoint, False)
+
+
+def test_whitelisted_clients_bypass_storage(limiter):
+    """Test whitelisted requests are never limited and create no counters"""
+    test_limiter, endpoint = limiter
+    for _ in range(100):
+        request = make_request("10.0.0.1")
+        test_limiter._check_request_limit(request, endpoint, False)
+        assert request.state.view_rate_limit is None
+
+    assert test_limiter.stats()["keys"] == 0
+
+
+def test_whitelisted_ranges_bypass_storage(limiter):
+    """Test clients inside a whitelisted CIDR range are never limited"""
+    test_limiter, endpoint = limiter
+    for index in range(10):
+        test_limiter._check_request_limit(make_request(f"172.20.{index}.9"), endpoint, False)
+
+    assert test_limiter.stats()["keys"] == 0
+
+
+def test_keyspace_stays_bounded_and_memory_flat(limiter):
+    """Soak: many distinct clients keep the counter count and memory flat"""
+    test_limiter, endpoint = limiter
+
+    def flood(start: int, count: int) -> None:
+        for index in range(start, start + count):
+            test_limiter._check_request_limit(make_request(f"198.51.{index // 256 % 256}.{index % 256}"), endpoint, False)
+            test_limiter._check_request_limit(make_request("10.0.0.1"), endpoint, False)
+
+    flood(0, 2000)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    flood(2000, 5000)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    stats = test_limiter.stats()
+    assert stats["keys"] <= 50
+    assert stats["evictions"] >= 6950
+    assert after - before < 256 * 1024
+
+
+def test_bounded_storage_evicts_oldest_window_first():
+    """Test the oldest counters are evicted when the cap is reached"""
+    storage = BoundedMemoryStorage(max_keys=2)
+    storage.incr("a", 60)
+    storage.incr("b", 60)
+    storage.incr("b", 60)
+    storage.incr("c", 60)
+
+    assert storage.get("a") == 0
+    assert storage.get("b") == 2
+    assert storage.get("c") == 1
+    assert storage.stats()["evictions"] == 1
@@ -0,0 +1,96 @@
+"""
+Unit tests for repository read projections and the query budget helper
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.goal import Goal
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
+from app.repositories.budget_repository import BudgetRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.goal_repository import GoalRepository
+from app.repositories.recurring_transaction_repository import RecurringTransactionRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.schemas.category import CategoryResponse
+from app.schemas.transaction import TransactionResponse
+from tests.query_counter import QueryCounter, assert_max_queries
+
+
+def compile_read(repository_class, model) -> str:
+    """SQL of the repository's entity read, without a database"""
+    repository = repository_class.__new__(repository_class)
+    repository.model = model
+    return " ".join(str(repository._select().compile(dialect=postgresql.dialect())).split())
+
+
+def selected_columns(sql: str, table: str) -> set:
+    select_list = sql.split(" FROM ")[0]
+    return {
+        part.strip().split(" AS ")[0].split(".", 1)[1]
+        for part in select_list[len("SELECT "):].split(",")
+        if part.strip().startswith(f"{table}.")
+    }
+
+
+def test_transaction_read_joins_category_and_skips_user():
+    """Test transactions and their category come from one SELECT with only response columns"""
+    sql = compile_read(TransactionRepository, Transaction)
+
+    assert "LEFT OUTER JOIN categories AS categories_1" in sql
+    assert "users" not in sql
+    assert selected_columns(sql, "transactions") == set(TransactionResponse.model_fields) - {"category"}
+    assert selected_columns(sql, "categories_1") == set(CategoryResponse.model_fields)
+
+
+def test_category_read_selects_response_columns_only():
+    """Test categories are read without their collections or soft delete marker"""
+    sql = compile_read(CategoryRepository, Category)
+
+    assert " JOIN " not in sql
+    assert selected_columns(sql, "categories") == set(CategoryResponse.model_fields)
+
+
+@pytest.mark.parametrize("repository_class,model", [
+    (BudgetRepository, Budget),
+    (GoalRepository, Goal),
+    (RecurringTransactionRepository, RecurringTransaction),
+])
+def test_reads_without_relationships_do_not_join(repository_class, model):
+    """Test budgets, goals and recurring transactions load no relationship"""
+    sql = compile_read(repository_class, model)
+
+    assert " JOIN " not in sql
+    assert "users" not in sql.split(" FROM ")[1]
+
+
+def test_query_counter_records_statements():
+    """Test statements are only counted inside the block"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        with QueryCounter(engine) as counter:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        connection.execute(text("SELECT 3"))
+
+    assert counter.count == 2
+
+
+def test_assert_max_queries_lists_statements_over_budget():
+    """Test exceeding the budget fails with every statement in the message"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        with assert_max_queries(engine, 2):
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+        with pytest.raises(AssertionError) as failure:
+            with assert_max_queries(engine, 1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 'second'"))
+
+    assert "Expected at most 1 queries, got 2" in str(failure.value)
+    assert "2. SELECT 'second'" in str(failure.value)
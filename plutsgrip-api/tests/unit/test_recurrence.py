@@ -0,0 +1,219 @@
+"""
+Unit tests for recurrence arithmetic and the set-based recurring materializer
+"""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.recurring_transaction import RecurrenceFrequency
+from app.repositories.recurring_transaction_repository import RecurringTransactionRepository
+from app.services.recurrence import (
+    FREQUENCY_STEPS,
+    add_months,
+    expand_occurrences,
+    first_index_on_or_after,
+    last_index_on_or_before,
+    occurrence_date,
+    plan_batch,
+    plan_catch_up,
+)
+from app.services.recurring_transaction_service import RecurringTransactionService
+
+
+def test_add_months_clamps_to_month_end():
+    """Test month arithmetic keeps the day when it exists and clamps otherwise"""
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert add_months(date(2023, 1, 31), 1) == date(2023, 2, 28)
+    assert add_months(date(2024, 11, 15), 3) == date(2025, 2, 15)
+    assert add_months(date(2024, 3, 31), -1) == date(2024, 2, 29)
+
+
+def test_monthly_occurrences_do_not_drift():
+    """Test each occurrence is computed from the start date, not the previous one"""
+    start = date(2024, 1, 31)
+
+    assert [occurrence_date(start, RecurrenceFrequency.MONTHLY, k) for k in range(1, 5)] == [
+        date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31),
+    ]
+
+
+@pytest.mark.parametrize("frequency,expected", [
+    ("DAILY", date(2024, 1, 2)),
+    ("weekly", date(2024, 1, 8)),
+    (RecurrenceFrequency.BIWEEKLY, date(2024, 1, 15)),
+    (RecurrenceFrequency.MONTHLY, date(2024, 2, 1)),
+    (RecurrenceFrequency.QUARTERLY, date(2024, 4, 1)),
+    (RecurrenceFrequency.YEARLY, date(2025, 1, 1)),
+])
+def test_next_execution_per_frequency(frequency, expected):
+    """Test the first execution after the start date for enums and strings"""
+    service = RecurringTransactionService.__new__(RecurringTransactionService)
+
+    assert service._calculate_next_execution(date(2024, 1, 1), frequency) == expected
+
+
+def test_next_execution_crosses_december():
+    """Test a monthly template started in December rolls into January"""
+    service = RecurringTransactionService.__new__(RecurringTransactionService)
+
+    assert service._calculate_next_execution(date(2024, 12, 31), RecurrenceFrequency.MONTHLY) == date(2025, 1, 31)
+
+
+def test_occurrence_index_bounds():
+    """Test the index helpers snap off-schedule dates to the surrounding occurrences"""
+    start = date(2024, 1, 10)
+
+    assert first_index_on_or_after(start, RecurrenceFrequency.WEEKLY, date(2024, 1, 17)) == 1
+    assert first_index_on_or_after(start, RecurrenceFrequency.WEEKLY, date(2024, 1, 18)) == 2
+    assert last_index_on_or_before(start, RecurrenceFrequency.WEEKLY, date(2024, 1, 23)) == 1
+    assert last_index_on_or_before(start, RecurrenceFrequency.WEEKLY, date(2024, 1, 9)) == -1
+    assert first_index_on_or_after(start, RecurrenceFrequency.MONTHLY, date(2024, 2, 11)) == 2
+    assert last_index_on_or_before(start, RecurrenceFrequency.MONTHLY, date(2024, 3, 9)) == 1
+
+
+def test_catch_up_generates_every_missed_occurrence():
+    """Test all due occurrences are returned and the schedule moves past today"""
+    plan = plan_catch_up(
+        date(2024, 1, 31), RecurrenceFrequency.MONTHLY, date(2024, 2, 29), None, date(2024, 5, 15), 100,
+    )
+
+    assert plan.occurrences == [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+    assert plan.next_execution_date == date(2024, 5, 31)
+    assert plan.is_active
+
+
+def test_catch_up_stops_at_end_date_and_deactivates():
+    """Test occurrences after end_date are not generated"""
+    plan = plan_catch_up(
+        date(2024, 1, 1), RecurrenceFrequency.WEEKLY, date(2024, 1, 8), date(2024, 1, 20), date(2024, 3, 1), 100,
+    )
+
+    assert plan.occurrences == [date(2024, 1, 8), date(2024, 1, 15)]
+    assert not plan.is_active
+
+
+def test_catch_up_past_end_date_only_deactivates():
+    """Test a template whose next execution is after end_date creates nothing"""
+    plan = plan_catch_up(
+        date(2024, 1, 1), RecurrenceFrequency.MONTHLY, date(2024, 3, 1), date(2024, 2, 15), date(2024, 3, 5), 100,
+    )
+
+    assert plan.occurrences == []
+    assert not plan.is_active
+
+
+def test_catch_up_is_capped_per_run():
+    """Test long gaps are split across runs and the template stays due"""
+    today = date(2024, 12, 31)
+    plan = plan_catch_up(date(2024, 1, 1), RecurrenceFrequency.DAILY, date(2024, 1, 2), None, today, 10)
+
+    assert len(plan.occurrences) == 10
+    assert plan.occurrences[-1] == date(2024, 1, 11)
+    assert plan.next_execution_date == date(2024, 1, 12) <= today
+
+
+def test_plan_batch_builds_parallel_arrays():
+    """Test occurrences of a batch are flattened into unnest-ready arrays"""
+    rows = [
+        (1, RecurrenceFrequency.WEEKLY, date(2024, 1, 1), None, date(2024, 1, 8)),
+        (2, RecurrenceFrequency.MONTHLY, date(2024, 1, 15), date(2024, 1, 31), date(2024, 2, 15)),
+    ]
+
+    templates, dates, ids, next_dates, active = plan_batch(rows, date(2024, 1, 20), 100)
+
+    assert templates == [1, 1]
+    assert dates == [date(2024, 1, 8), date(2024, 1, 15)]
+    assert ids == [1, 2]
+    assert next_dates == [date(2024, 1, 22), date(2024, 2, 15)]
+    assert active == [True, False]
+
+
+def test_expand_occurrences_matches_scalar_arithmetic():
+    """Test the vectorized expansion yields exactly the occurrences of occurrence_date"""
+    rng = random.Random(7)
+    frequencies = list(FREQUENCY_STEPS)
+    starts = [date(2023, 1, 28) + timedelta(days=rng.randint(0, 400)) for _ in range(300)]
+    starts[:4] = [date(2024, 1, 31), date(2024, 2, 29), date(2023, 8, 31), date(2024, 12, 31)]
+    freqs = [rng.choice(frequencies) for _ in starts]
+    ends = [None if rng.random() < 0.5 else start + timedelta(days=rng.randint(-5, 900)) for start in starts]
+    froms = [start + timedelta(days=rng.randint(0, 200)) for start in starts]
+    window_start, window_end = date(2024, 2, 10), date(2025, 8, 31)
+
+    positions, dates = expand_occurrences(starts, freqs, ends, window_start, window_end, from_dates=froms)
+
+    expected = []
+    for position, (start, frequency, end, first) in enumerate(zip(starts, freqs, ends, froms)):
+        index = 0
+        while (day := occurrence_date(start, frequency, index)) <= min(window_end, end or window_end):
+            if day >= max(window_start, first):
+                expected.append((day, position))
+            index += 1
+    assert list(zip(dates.astype(object).tolist(), positions.tolist())) == sorted(expected)
+
+
+def test_expand_occurrences_clamps_month_end():
+    """Test month-end templates clamp per month without drifting"""
+    positions, dates = expand_occurrences(
+        [date(2024, 1, 31), date(2024, 1, 1)], ["MONTHLY", "QUARTERLY"], [None, date(2024, 8, 1)],
+        date(2024, 2, 1), date(2024, 12, 31),
+    )
+
+    assert dates.astype(object).tolist() == [
+        date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 1), date(2024, 4, 30), date(2024, 5, 31),
+        date(2024, 6, 30), date(2024, 7, 1), date(2024, 7, 31), date(2024, 8, 31), date(2024, 9, 30),
+        date(2024, 10, 31), date(2024, 11, 30), date(2024, 12, 31),
+    ]
+    assert positions.tolist() == [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0]
+
+
+def test_expand_occurrences_handles_empty_and_unsorted_output():
+    """Test no templates yield empty arrays and sort=False keeps template order"""
+    positions, dates = expand_occurrences([], [], [], date(2024, 1, 1), date(2024, 12, 31))
+    assert len(positions) == len(dates) == 0
+
+    positions, dates = expand_occurrences(
+        [date(2024, 1, 1), date(2024, 1, 1)], ["WEEKLY", "DAILY"], [None, None],
+        date(2024, 1, 1), date(2024, 1, 8), sort=False,
+    )
+    assert positions.tolist() == [0, 0] + [1] * 8
+    assert dates[:2].astype(object).tolist() == [date(2024, 1, 1), date(2024, 1, 8)]
+
+
+class RecordingSession:
+    """Collects the statements a repository executes"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(" ".join(str(statement.compile(dialect=postgresql.dialect())).split()))
+
+        class Result:
+            rowcount = 0
+
+            def all(self):
+                return []
+
+        return Result()
+
+
+async def test_materializer_statements_are_set_based():
+    """Test a batch is locked with SKIP LOCKED and written with one INSERT and one UPDATE"""
+    session = RecordingSession()
+    repo = RecurringTransactionRepository(session)
+
+    await repo.lock_due_batch(date(2024, 1, 1), 500, worker_index=1, worker_count=4)
+    await repo.insert_occurrences([1, 1, 2], [date(2024, 1, 1)] * 3, datetime(2024, 1, 1))
+    await repo.advance_schedules([1, 2], [date(2024, 2, 1)] * 2, [True, True], datetime(2024, 1, 1))
+    await repo.insert_occurrences([], [], datetime(2024, 1, 1))
+
+    lock, insert, update = session.statements
+    assert lock.endswith("FOR UPDATE SKIP LOCKED")
+    assert "recurring_transactions.user_id %% %(user_id_1)s = %(param_1)s" in lock
+    assert insert.startswith("INSERT INTO transactions")
+    assert "FROM unnest(" in insert
+    assert "AS occurrences(template_id, occurrence_date) JOIN recurring_transactions" in insert
+    assert update.startswith("UPDATE recurring_transactions SET next_execution_date=schedules.next_date")
+    assert "AS schedules(id, next_date, is_active)" in update
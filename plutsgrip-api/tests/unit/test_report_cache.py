@@ -0,0 +1,151 @@
+"""
+Unit tests for cache backends, data versions and the report cache
+"""
+import pytest
+
+from app.core.cache_backends import MemoryCacheBackend, SQLiteCacheBackend, build_cache_backend
+from app.core.data_version import bump_data_version, get_data_version
+from app.core.metrics import MetricsRegistry
+from app.core.report_cache import ReportCache, cached_report
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Each backend must honour the same contract"""
+    if request.param == "memory":
+        return MemoryCacheBackend(maxsize=3)
+    return SQLiteCacheBackend(path=str(tmp_path / "cache.sqlite3"), maxsize=3)
+
+
+def test_backend_get_set_delete(backend):
+    """Test values round-trip and can be deleted"""
+    backend.set("a", {"total": 1.5}, ttl_seconds=60)
+
+    assert backend.get("a") == {"total": 1.5}
+    assert backend.get("missing") is None
+
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_backend_expired_entries_are_misses(backend):
+    """Test entries with a non-positive TTL are never stored"""
+    backend.set("a", 1, ttl_seconds=0)
+
+    assert backend.get("a") is None
+
+
+def test_backend_counters_are_monotonic(backend):
+    """Test counters start from a seed and increase by one"""
+    first = backend.get_counter("version:1")
+
+    assert backend.get_counter("version:1") == first
+    assert backend.incr("version:1") == first + 1
+    assert backend.get_counter("version:1") == first + 1
+
+
+def test_backend_lost_counter_never_reuses_a_value(backend):
+    """Test a counter recreated after a clear does not go back to an old value"""
+    old = backend.incr("version:1")
+    backend.clear()
+
+    assert backend.get_counter("version:1") > old
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """Test two workers opening the same file see each other's writes"""
+    path = str(tmp_path / "shared.sqlite3")
+    worker_a = SQLiteCacheBackend(path=path, maxsize=10)
+    worker_b = SQLiteCacheBackend(path=path, maxsize=10)
+
+    worker_a.set("report", [1, 2, 3], ttl_seconds=60)
+    version = worker_a.incr("version:7")
+
+    assert worker_b.get("report") == [1, 2, 3]
+    assert worker_b.get_counter("version:7") == version
+
+
+def test_sqlite_backend_prunes_least_recently_used(tmp_path):
+    """Test the table is trimmed back to maxsize"""
+    backend = SQLiteCacheBackend(path=str(tmp_path / "lru.sqlite3"), maxsize=2)
+    backend.PRUNE_INTERVAL = 1
+
+    for index in range(5):
+        backend.set(f"key-{index}", index, ttl_seconds=60)
+
+    assert backend.stats()["size"] == 2
+    assert backend.get("key-4") == 4
+    assert backend.get("key-0") is None
+
+
+def test_build_cache_backend_rejects_unknown_names():
+    """Test unknown backend names fail fast"""
+    with pytest.raises(ValueError):
+        build_cache_backend("redis", maxsize=10)
+
+
+def test_data_version_bump_changes_version():
+    """Test bumping the data version of one user leaves others untouched"""
+    user_1 = get_data_version(1)
+    user_2 = get_data_version(2)
+
+    assert bump_data_version(1) == user_1 + 1
+    assert get_data_version(1) == user_1 + 1
+    assert get_data_version(2) == user_2
+
+
+@pytest.mark.asyncio
+async def test_report_cache_serves_hits_until_data_version_changes():
+    """Test a report is computed once per data version"""
+    cache = ReportCache(MemoryCacheBackend(maxsize=10), ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"total": len(calls)}
+
+    assert await cache.get_or_compute(1, "dashboard", {}, compute) == {"total": 1}
+    assert await cache.get_or_compute(1, "dashboard", {}, compute) == {"total": 1}
+    assert await cache.get_or_compute(1, "dashboard", {"months": 3}, compute) == {"total": 2}
+
+    bump_data_version(1)
+
+    assert await cache.get_or_compute(1, "dashboard", {}, compute) == {"total": 3}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_report_decorator_keys_on_bound_arguments():
+    """Test the decorator separates users and argument values"""
+
+    class FakeReportService:
+        def __init__(self):
+            self.calls = 0
+
+        @cached_report("fake")
+        async def get_report(self, user_id: int, months: int = 6) -> dict:
+            self.calls += 1
+            return {"user_id": user_id, "months": months}
+
+    service = FakeReportService()
+
+    assert await service.get_report(1) == {"user_id": 1, "months": 6}
+    assert await service.get_report(1, months=6) == {"user_id": 1, "months": 6}
+    assert await service.get_report(user_id=2) == {"user_id": 2, "months": 6}
+    assert await service.get_report(1, 12) == {"user_id": 1, "months": 12}
+    assert service.calls == 3
+
+
+def test_metrics_registry_snapshot():
+    """Test counters and gauges appear in snapshots"""
+    registry = MetricsRegistry()
+    registry.increment("requests")
+    registry.increment("requests", 2)
+    registry.register_gauge("cache", lambda: {"size": 1})
+    registry.register_gauge("broken", lambda: 1 / 0)
+
+    snapshot = registry.snapshot()
+
+    assert snapshot["counters"] == {"requests": 3}
+    assert snapshot["gauges"]["cache"] == {"size": 1}
+    assert "error" in snapshot["gauges"]["broken"]
@@ -0,0 +1,131 @@
+"""
+Unit tests for read-only sessions and per-request round trip counting
+"""
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import _read_server_settings, engine, get_db, read_engine
+from app.core.metrics import metrics
+from app.core.round_trips import count_round_trips, instrument_round_trips
+from app.middlewares.round_trips import RoundTripMiddleware
+
+
+def make_engine(**options):
+    sqlite_engine = create_engine("sqlite://", **options)
+    instrument_round_trips(sqlite_engine)
+    return sqlite_engine
+
+
+def test_transaction_costs_begin_and_commit():
+    """Test a committed read counts BEGIN, the statement and COMMIT"""
+    sqlite_engine = make_engine()
+
+    with count_round_trips() as counter:
+        with Session(sqlite_engine) as session:
+            session.execute(text("SELECT 1"))
+            session.commit()
+
+    assert counter.count == 3
+
+
+def test_autocommit_costs_statements_only():
+    """Test sessions in AUTOCOMMIT count only their statements"""
+    sqlite_engine = make_engine(execution_options={"isolation_level": "AUTOCOMMIT"})
+
+    with count_round_trips() as counter:
+        with Session(sqlite_engine) as session:
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT 2"))
+
+    assert counter.count == 2
+
+
+def test_round_trips_outside_the_block_are_not_counted():
+    """Test nested blocks count separately and nothing leaks out"""
+    sqlite_engine = make_engine(execution_options={"isolation_level": "AUTOCOMMIT"})
+
+    with sqlite_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with count_round_trips() as outer:
+            connection.execute(text("SELECT 2"))
+            with count_round_trips() as inner:
+                connection.execute(text("SELECT 3"))
+            connection.execute(text("SELECT 4"))
+
+    assert inner.count == 1
+    assert outer.count == 2
+
+
+def build_app(sqlite_engine, header: bool = True) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        with sqlite_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    @app.get("/session")
+    async def session_kind(db: AsyncSession = Depends(get_db)):
+        return {"read_only": db.bind is read_engine}
+
+    @app.post("/session")
+    async def write_session_kind(db: AsyncSession = Depends(get_db)):
+        return {"read_only": db.bind is read_engine, "write": db.bind is engine}
+
+    app.add_middleware(RoundTripMiddleware, header=header)
+    return app
+
+
+async def test_middleware_reports_round_trips():
+    """Test the header and metrics carry the request's round trips"""
+    sqlite_engine = make_engine(execution_options={"isolation_level": "AUTOCOMMIT"})
+    requests_before = metrics.get_counter("db.requests.read")
+    round_trips_before = metrics.get_counter("db.round_trips.read")
+
+    async with AsyncClient(transport=ASGITransport(app=build_app(sqlite_engine)), base_url="http://test") as client:
+        response = await client.get("/items")
+
+    assert response.headers["X-DB-Round-Trips"] == "2"
+    assert metrics.get_counter("db.requests.read") == requests_before + 1
+    assert metrics.get_counter("db.round_trips.read") == round_trips_before + 2
+
+
+async def test_middleware_header_is_optional():
+    """Test the header is only sent when enabled"""
+    sqlite_engine = make_engine()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=build_app(sqlite_engine, header=False)), base_url="http://test"
+    ) as client:
+        response = await client.get("/items")
+
+    assert "X-DB-Round-Trips" not in response.headers
+
+
+async def test_get_db_uses_read_only_session_for_reads():
+    """Test GET requests get the read-only engine and writes the default one"""
+    sqlite_engine = make_engine()
+
+    async with AsyncClient(transport=ASGITransport(app=build_app(sqlite_engine)), base_url="http://test") as client:
+        read = await client.get("/session")
+        write = await client.post("/session")
+
+    assert read.json() == {"read_only": True}
+    assert write.json() == {"read_only": False, "write": True}
+
+
+def test_read_engine_is_autocommit_and_read_only(monkeypatch):
+    """Test read connections skip transactions, refuse writes and carry the timeout"""
+    assert read_engine.sync_engine.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    assert read_engine.sync_engine.pool._max_overflow == settings.DB_READ_MAX_OVERFLOW
+    assert _read_server_settings() == {"default_transaction_read_only": "on"}
+
+    monkeypatch.setattr(settings, "DB_READ_STATEMENT_TIMEOUT_MS", 1500)
+
+    assert _read_server_settings() == {"default_transaction_read_only": "on", "statement_timeout": "1500"}
@@ -0,0 +1,268 @@
+"""
+Unit tests for cron schedules and the leader-elected job scheduler
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cron import CronSchedule
+from app.core.scheduler import Scheduler
+
+
+def test_cron_steps_ranges_and_lists():
+    """Test field syntax expands to the expected values"""
+    schedule = CronSchedule("*/15 9-17 1,15 * 1-5")
+
+    assert schedule.minutes == {0, 15, 30, 45}
+    assert schedule.hours == set(range(9, 18))
+    assert schedule.days == {1, 15}
+    assert schedule.weekdays == {1, 2, 3, 4, 5}
+
+
+def test_cron_next_after_is_strictly_later():
+    """Test the next run is the first matching minute after the reference"""
+    schedule = CronSchedule("10 * * * *")
+
+    assert schedule.next_after(datetime(2024, 1, 1, 8, 9, 59)) == datetime(2024, 1, 1, 8, 10)
+    assert schedule.next_after(datetime(2024, 1, 1, 8, 10)) == datetime(2024, 1, 1, 9, 10)
+
+
+def test_cron_rolls_over_month_and_year():
+    """Test day and month restrictions carry into the next month and year"""
+    assert CronSchedule("@monthly").next_after(datetime(2024, 12, 15, 12, 0)) == datetime(2025, 1, 1)
+    assert CronSchedule("0 0 31 * *").next_after(datetime(2024, 4, 1)) == datetime(2024, 5, 31)
+    assert CronSchedule("0 0 29 2 *").next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+
+def test_cron_day_fields_match_either_when_both_restricted():
+    """Test day of month OR day of week, as in cron"""
+    schedule = CronSchedule("0 0 1 * 1")  # 1st of the month or any Monday
+
+    assert schedule.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 8)
+    assert schedule.next_after(datetime(2024, 1, 29)) == datetime(2024, 2, 1)
+    assert CronSchedule("0 0 * * 7").next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *", "x * * * *"])
+def test_cron_rejects_invalid_expressions(expression):
+    """Test malformed expressions raise ValueError"""
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_cron_without_match_raises():
+    """Test an impossible date is reported instead of looping forever"""
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 30 2 *").next_after(datetime(2024, 1, 1))
+
+
+class FakeElection:
+    """Election whose outcome the test controls"""
+
+    def __init__(self, wins=True):
+        self.wins = wins
+        self.alive = True
+        self.held = False
+
+    async def acquire(self):
+        self.held = self.wins
+        return self.held
+
+    async def check(self):
+        if not self.alive:
+            self.held = False
+        return self.held
+
+    async def release(self):
+        self.held = False
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(election, clock, **kwargs):
+    runs = []
+
+    async def record_run(run):
+        runs.append(run)
+
+    scheduler = Scheduler(election, record_run=record_run, election_seconds=15, clock=clock, **kwargs)
+    return scheduler, runs
+
+
+async def test_leader_runs_due_jobs_and_records_history():
+    """Test the leader runs a job at its slot and records the outcome"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0, 30))
+    scheduler, runs = make_scheduler(FakeElection(), clock)
+    calls = []
+
+    async def job():
+        calls.append(clock())
+        return 3
+
+    scheduler.register("sample", "* * * * *", job)
+
+    assert await scheduler.tick() == 15  # elected, nothing due until 08:01
+    assert scheduler.is_leader and scheduler.jobs["sample"].next_run_at == datetime(2024, 1, 1, 8, 1)
+
+    clock.now = datetime(2024, 1, 1, 8, 1, 0)
+    await scheduler.tick()
+    await asyncio.sleep(0)
+    await scheduler.jobs["sample"].task
+
+    assert calls == [datetime(2024, 1, 1, 8, 1)]
+    assert [(run.job_name, run.status, run.result) for run in runs] == [("sample", "success", "3")]
+    assert scheduler.jobs["sample"].next_run_at == datetime(2024, 1, 1, 8, 2)
+    assert scheduler.stats()["jobs"]["sample"]["runs"] == 1
+
+
+async def test_follower_does_not_run_jobs():
+    """Test a worker that lost the election only retries it"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0))
+    scheduler, runs = make_scheduler(FakeElection(wins=False), clock)
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    scheduler.register("sample", "* * * * *", job)
+
+    clock.now = datetime(2024, 1, 1, 9, 0)
+    assert await scheduler.tick() == 15
+    assert not scheduler.is_leader
+    assert calls == [] and runs == []
+    assert scheduler.stats()["role"] == "follower"
+
+
+async def test_failed_job_is_recorded():
+    """Test exceptions are recorded as failed runs without stopping the scheduler"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0, 30))
+    scheduler, runs = make_scheduler(FakeElection(), clock)
+
+    async def job():
+        raise RuntimeError("boom")
+
+    scheduler.register("broken", "* * * * *", job)
+    await scheduler.tick()
+    clock.now = datetime(2024, 1, 1, 8, 1)
+    await scheduler.tick()
+    await scheduler.jobs["broken"].task
+
+    assert runs[0].status == "failed" and "boom" in runs[0].error
+    assert scheduler.jobs["broken"].failures == 1
+
+
+async def test_losing_leadership_cancels_running_jobs():
+    """Test a leader whose lock session died stops its jobs"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0, 30))
+    election = FakeElection()
+    scheduler, _ = make_scheduler(election, clock)
+    started = asyncio.Event()
+
+    async def job():
+        started.set()
+        await asyncio.sleep(3600)
+
+    scheduler.register("slow", "* * * * *", job)
+    await scheduler.tick()
+    clock.now = datetime(2024, 1, 1, 8, 1)
+    await scheduler.tick()
+    await started.wait()
+    task = scheduler.jobs["slow"].task
+
+    election.alive = False
+    await scheduler.tick()
+
+    assert task.cancelled()
+    assert not scheduler.is_leader
+    assert scheduler.jobs["slow"].next_run_at is None
+
+
+async def test_job_does_not_overlap_itself():
+    """Test a slot reached while the previous run is still going is skipped"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0, 30))
+    scheduler, _ = make_scheduler(FakeElection(), clock)
+    release = asyncio.Event()
+    calls = []
+
+    async def job():
+        calls.append(clock())
+        await release.wait()
+
+    scheduler.register("slow", "* * * * *", job)
+    await scheduler.tick()
+    clock.now = datetime(2024, 1, 1, 8, 1)
+    await scheduler.tick()
+    await asyncio.sleep(0)
+    first = scheduler.jobs["slow"].task
+
+    clock.now = datetime(2024, 1, 1, 8, 2)
+    await scheduler.tick()
+    await asyncio.sleep(0)
+
+    assert scheduler.jobs["slow"].task is first
+    assert len(calls) == 1
+    release.set()
+    await first
+
+
+async def test_new_leader_resumes_missed_slot_from_history():
+    """Test a failover runs the slot the previous leader missed right away"""
+    clock = Clock(datetime(2024, 1, 1, 9, 3))
+
+    async def load_last_runs():
+        return {"hourly": datetime(2024, 1, 1, 7, 10, 4)}
+
+    scheduler, _ = make_scheduler(FakeElection(), clock, load_last_runs=load_last_runs)
+    scheduler.register("hourly", "10 * * * *", lambda: asyncio.sleep(0))
+    scheduler.register("fresh", "10 * * * *", lambda: asyncio.sleep(0))
+
+    assert await scheduler.tick() == 15
+    assert scheduler.jobs["hourly"].task is not None  # the 08:10 slot was missed
+    assert scheduler.jobs["hourly"].next_run_at == datetime(2024, 1, 1, 9, 10)
+    assert scheduler.jobs["fresh"].task is None
+    assert scheduler.jobs["fresh"].next_run_at == datetime(2024, 1, 1, 9, 10)
+    await scheduler.jobs["hourly"].task
+
+
+async def test_jitter_delays_runs_within_bounds():
+    """Test jittered runs land between the slot and slot + jitter"""
+    clock = Clock(datetime(2024, 1, 1, 8, 0, 30))
+    scheduler, _ = make_scheduler(FakeElection(), clock)
+    job = scheduler.register("spread", "* * * * *", lambda: asyncio.sleep(0), jitter_seconds=30)
+
+    slot = datetime(2024, 1, 1, 8, 1)
+    for _ in range(20):
+        next_run = scheduler._next_run(job, clock())
+        assert slot <= next_run <= slot + timedelta(seconds=30)
+
+
+async def test_register_rejects_duplicates_and_bad_cron():
+    """Test registration validates names and schedules"""
+    scheduler, _ = make_scheduler(FakeElection(), Clock(datetime(2024, 1, 1)))
+    scheduler.register("once", "@daily", lambda: asyncio.sleep(0))
+
+    with pytest.raises(ValueError):
+        scheduler.register("once", "@daily", lambda: asyncio.sleep(0))
+    with pytest.raises(ValueError):
+        scheduler.register("bad", "every day", lambda: asyncio.sleep(0))
+
+
+async def test_stop_releases_leadership():
+    """Test stopping a running scheduler cancels its loop and releases the lock"""
+    election = FakeElection()
+    scheduler, _ = make_scheduler(election, Clock(datetime(2024, 1, 1)))
+    scheduler.register("daily", "@daily", lambda: asyncio.sleep(0))
+
+    await scheduler.start()
+    await asyncio.sleep(0.01)
+    assert scheduler.is_leader
+
+    await scheduler.stop()
+    assert not election.held and scheduler.leader_since is None
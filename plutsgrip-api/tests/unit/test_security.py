@@ -1,13 +1,18 @@
 """
 Unit tests for security utilities
 """
+from datetime import timedelta
+
 import pytest
 from app.core.security import (
     verify_password,
     get_password_hash,
     create_access_token,
     decode_token,
-    get_user_id_from_token
+    decode_token_cached,
+    forget_decoded_token,
+    get_user_id_from_token,
+    token_decode_cache
 )
 
 
@@ -62,3 +67,32 @@ def test_invalid_token():
 
     user_id = get_user_id_from_token(invalid_token)
     assert user_id is None
+
+
+def test_decode_token_cached_reuses_verified_claims():
+    """Test a verified token is decoded once and served from the cache"""
+    token_decode_cache.clear()
+    token = create_access_token(data={"sub": "789"})
+
+    first = decode_token_cached(token)
+    first["sub"] = "tampered"
+    second = decode_token_cached(token)
+
+    assert second["sub"] == "789"
+    assert token_decode_cache.hits == 1
+    assert token_decode_cache.misses == 1
+
+    forget_decoded_token(token)
+    assert len(token_decode_cache) == 0
+
+
+def test_decode_token_cached_skips_invalid_and_expiring_tokens():
+    """Test invalid tokens are never cached and entries never outlive exp"""
+    token_decode_cache.clear()
+
+    assert decode_token_cached("invalid.token.here") is None
+    assert len(token_decode_cache) == 0
+
+    expired = create_access_token(data={"sub": "1"}, expires_delta=timedelta(seconds=-5))
+    assert decode_token_cached(expired) is None
+    assert len(token_decode_cache) == 0
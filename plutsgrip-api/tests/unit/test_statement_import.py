@@ -0,0 +1,207 @@
+"""
+Unit tests for the streaming statement parsers
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.category import TransactionType
+from app.services.statement_import import (
+    ImportProgress,
+    StatementImportOptions,
+    StatementImportService,
+    StatementRowError,
+    decode_chunks,
+    dedupe_key,
+    iter_csv_records,
+    iter_ofx_records,
+    normalize_csv_record,
+    normalize_ofx_record,
+    parse_amount,
+    statement_import_key,
+)
+
+
+async def chunked(data: bytes, size: int):
+    """Yield data in fixed-size chunks, like an upload read in steps"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+CSV_STATEMENT = (
+    "\ufeffData;Descrição;Valor;Categoria\r\n"
+    "05/03/2026;\"Padaria\nPão de Açúcar\";-12,50;Mercado\r\n"
+    "06/03/2026;Salário;5.000,00;\r\n"
+    "\r\n"
+).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+async def test_csv_records_do_not_depend_on_chunk_boundaries(chunk_size):
+    """Test multi-byte characters and quoted line breaks survive any chunking"""
+    records = await collect(
+        iter_csv_records(decode_chunks(chunked(CSV_STATEMENT, chunk_size), "utf-8"), delimiter=";")
+    )
+
+    assert records == [
+        {"date": "05/03/2026", "description": "Padaria\nPão de Açúcar", "amount": "-12,50", "category": "Mercado"},
+        {"date": "06/03/2026", "description": "Salário", "amount": "5.000,00", "category": ""},
+    ]
+
+
+async def test_csv_header_without_required_columns_is_rejected():
+    """Test a CSV without an amount column fails before any row is read"""
+    with pytest.raises(StatementRowError, match="amount"):
+        await collect(iter_csv_records(decode_chunks(chunked(b"date,description\n", 4), "utf-8")))
+
+
+async def test_csv_unquoted_inch_mark_does_not_swallow_later_rows():
+    """Test a literal quote inside an unquoted field is read like csv.reader does"""
+    statement = (
+        'date,description,amount\n'
+        '2026-03-05,TV 55" screen,-2500.00\n'
+        '2026-03-06,"Quoted, with comma",-10.00\n'
+        '2026-03-07,"Multi\nline ""memo""",-5.00\n'
+        '2026-03-08,Coffee,-4.50\n'
+    ).encode()
+
+    records = await collect(iter_csv_records(decode_chunks(chunked(statement, 5), "utf-8")))
+
+    assert [record["description"] for record in records] == [
+        'TV 55" screen', "Quoted, with comma", 'Multi\nline "memo"', "Coffee",
+    ]
+
+
+async def test_csv_oversized_record_is_a_row_error():
+    """Test an unbalanced quote costs one row error and parsing resumes afterwards"""
+    statement = (
+        'date,description,amount\n'
+        '2026-03-05,"Never closed,-1.00\n'
+        + "filler line\n" * 20
+        + '2026-03-06,Coffee,-4.50\n'
+    ).encode()
+
+    records = await collect(
+        iter_csv_records(decode_chunks(chunked(statement, 64), "utf-8"), max_record_chars=100)
+    )
+
+    assert isinstance(records[0], StatementRowError)
+    assert records[-1] == {"date": "2026-03-06", "description": "Coffee", "amount": "-4.50"}
+
+
+def test_normalize_csv_record_uses_sign_and_type_column():
+    """Test negative amounts become expenses unless a type column says otherwise"""
+    options = StatementImportOptions(format="csv", decimal_comma=True)
+
+    expense = normalize_csv_record(
+        {"date": "05/03/2026", "description": "  Padaria \n centro ", "amount": "-12,50"}, options
+    )
+    assert expense["type"] == TransactionType.EXPENSE
+    assert expense["amount"] == Decimal("12.50")
+    assert expense["description"] == "Padaria centro"
+    assert expense["date"] == date(2026, 3, 5)
+
+    typed = normalize_csv_record(
+        {"date": "2026-03-05", "description": "Refund", "amount": "-3,00", "type": "Receita"}, options
+    )
+    assert typed["type"] == TransactionType.INCOME
+
+    with pytest.raises(StatementRowError):
+        normalize_csv_record({"date": "2026-03-05", "description": "Zero", "amount": "0"}, options)
+
+
+@pytest.mark.parametrize("text,decimal_comma,expected", [
+    ("1,234.56", False, Decimal("1234.56")),
+    ("-1.234,56", True, Decimal("-1234.56")),
+    ("(12.00)", False, Decimal("-12.00")),
+    ("R$ 10,5", True, Decimal("10.50")),
+])
+def test_parse_amount(text, decimal_comma, expected):
+    """Test amount parsing with both decimal separators"""
+    assert parse_amount(text, decimal_comma) == expected
+
+
+OFX_STATEMENT = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>BRL
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260305120000[-3:BRT]<TRNAMT>-45.90<FITID>A1<NAME>Posto Shell<MEMO>Combustivel
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260306<TRNAMT>1500.00<FITID>A2<MEMO>Pix recebido</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [2, 16, 4096])
+async def test_ofx_records_are_parsed_incrementally(chunk_size):
+    """Test SGML OFX transactions are extracted regardless of chunking"""
+    records = await collect(iter_ofx_records(decode_chunks(chunked(OFX_STATEMENT, chunk_size), "utf-8")))
+    rows = [normalize_ofx_record(record) for record in records]
+
+    assert [row["date"] for row in rows] == [date(2026, 3, 5), date(2026, 3, 6)]
+    assert rows[0]["type"] == TransactionType.EXPENSE
+    assert rows[0]["amount"] == Decimal("45.90")
+    assert rows[0]["description"] == "Posto Shell"
+    assert rows[0]["currency"] == "BRL"
+    assert "FITID A1" in rows[0]["notes"]
+    assert rows[1]["type"] == TransactionType.INCOME
+    assert rows[1]["description"] == "Pix recebido"
+
+
+def test_import_key_comes_from_statement_values():
+    """Test the key ignores category mapping and OFX rows are identified by FITID"""
+    options = StatementImportOptions(format="csv")
+    row = normalize_csv_record(
+        {"date": "2026-03-05", "description": "Refund", "amount": "-3.00", "category": "Gifts"}, options
+    )
+    key = row["import_key"]
+
+    StatementImportService._map_category(row, {"gifts": (7, TransactionType.INCOME)})
+
+    assert row["type"] == TransactionType.INCOME
+    assert row["import_key"] == key == statement_import_key(
+        date(2026, 3, 5), Decimal("3.00"), TransactionType.EXPENSE, "Refund"
+    )
+
+    ofx = normalize_ofx_record({"DTPOSTED": "20260305", "TRNAMT": "-45.90", "FITID": "A1", "NAME": "Posto"})
+    renamed = normalize_ofx_record({"DTPOSTED": "20260305", "TRNAMT": "-45.90", "FITID": "A1", "NAME": "Posto Shell"})
+    other = normalize_ofx_record({"DTPOSTED": "20260305", "TRNAMT": "-45.90", "FITID": "A2", "NAME": "Posto"})
+    assert ofx["import_key"] == renamed["import_key"] != other["import_key"]
+
+
+class FakeTransactionRepository:
+    """Existing rows by import key and by (date, amount, description)"""
+
+    def __init__(self, by_import_key, by_key):
+        self.by_import_key = by_import_key
+        self.by_key = by_key
+
+    async def count_existing_by_import_key(self, user_id, import_keys, max_id):
+        return {key: self.by_import_key[key] for key in import_keys if key in self.by_import_key}
+
+    async def count_existing_by_key(self, user_id, keys, max_id):
+        return {key: self.by_key[key] for key in keys if key in self.by_key}
+
+
+async def test_flush_matches_import_keys_then_unkeyed_rows():
+    """Test imported rows match by import key and hand-entered ones by date, amount and description"""
+    options = StatementImportOptions(format="csv", dry_run=True)
+    imported, manual, new = (
+        normalize_csv_record({"date": "2026-03-05", "description": description, "amount": "-10.00"}, options)
+        for description in ("Imported", "Manual", "New")
+    )
+    for row in (imported, manual, new):
+        row.pop("category")
+    service = StatementImportService.__new__(StatementImportService)
+    service.transaction_repo = FakeTransactionRepository({imported["import_key"]: 1}, {dedupe_key(manual): 1})
+    progress = ImportProgress()
+
+    await service._flush(1, [imported, dict(imported), manual, new], 100, {}, options, progress)
+
+    assert (progress.duplicates, progress.inserted) == (2, 2)
@@ -0,0 +1,220 @@
+"""
+Unit tests for per-user token bucket rate limiting
+"""
+import multiprocessing
+import os
+import types
+from datetime import datetime
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.dependencies import get_current_user, rate_limit_user
+from app.core import token_bucket
+from app.core.principal import AuthenticatedUser
+from app.core.token_bucket import (
+    BucketLimit,
+    MemoryTokenBucketBackend,
+    SQLiteTokenBucketBackend,
+    UserRateLimiter,
+    classify_route,
+)
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(token_bucket, "time", types.SimpleNamespace(time=fake.time))
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryTokenBucketBackend(max_keys=100)
+    return SQLiteTokenBucketBackend(path=str(tmp_path / "buckets.sqlite3"))
+
+
+@pytest.mark.parametrize("spec,capacity,period", [
+    ("60/minute", 60, 60.0),
+    ("10/15minutes", 10, 900.0),
+    (" 5 / hour ", 5, 3600.0),
+    ("1/second", 1, 1.0),
+])
+def test_parse_limits(spec, capacity, period):
+    """Test "<burst>/<period>" specs"""
+    limit = BucketLimit.parse(spec)
+    assert (limit.capacity, limit.period_seconds) == (capacity, period)
+
+
+@pytest.mark.parametrize("spec", ["", "0/minute", "ten/minute", "5/fortnight"])
+def test_parse_rejects_invalid_limits(spec):
+    """Test malformed specs are rejected at startup"""
+    with pytest.raises(ValueError):
+        BucketLimit.parse(spec)
+
+
+def test_burst_then_reject(backend, clock):
+    """Test a full bucket allows its capacity, then rejects with a retry delay"""
+    limit = BucketLimit.parse("3/minute")
+    results = [backend.take("read:1", limit) for _ in range(4)]
+
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    rejected = results[3]
+    assert rejected.remaining == 0
+    assert rejected.headers()["Retry-After"] == "20"
+    assert rejected.headers()["RateLimit-Reset"] == "60"
+    assert rejected.headers()["RateLimit-Policy"] == "3;w=60"
+
+
+def test_tokens_refill_over_time(backend, clock):
+    """Test one token comes back every period / capacity seconds"""
+    limit = BucketLimit.parse("3/minute")
+    for _ in range(3):
+        backend.take("read:1", limit)
+
+    clock.now += 19
+    assert not backend.take("read:1", limit).allowed
+    clock.now += 1
+    assert backend.take("read:1", limit).allowed
+    clock.now += 60
+    assert backend.take("read:1", limit).remaining == 2
+
+
+def test_buckets_are_independent(backend, clock):
+    """Test users and route classes have separate buckets"""
+    limit = BucketLimit.parse("1/minute")
+
+    assert backend.take("read:1", limit).allowed
+    assert backend.take("read:2", limit).allowed
+    assert backend.take("reports:1", limit).allowed
+    assert not backend.take("read:1", limit).allowed
+
+
+def test_memory_backend_drops_full_and_excess_buckets(clock):
+    """Test refilled buckets are forgotten and the key count is capped"""
+    backend = MemoryTokenBucketBackend(max_keys=10)
+    limit = BucketLimit.parse("5/minute")
+    for user_id in range(50):
+        backend.take(f"read:{user_id}", limit)
+
+    assert backend.stats()["buckets"] == 10
+    assert backend.evictions == 40
+
+    clock.now += 60
+    backend.take("read:new", limit)
+    assert backend.stats()["buckets"] == 1
+
+
+def test_sqlite_buckets_are_shared_between_instances(tmp_path, clock):
+    """Test two workers opening the same file share each bucket"""
+    path = str(tmp_path / "buckets.sqlite3")
+    worker_a = SQLiteTokenBucketBackend(path=path)
+    worker_b = SQLiteTokenBucketBackend(path=path)
+    limit = BucketLimit.parse("2/minute")
+
+    assert worker_a.take("read:1", limit).allowed
+    assert worker_b.take("read:1", limit).allowed
+    assert not worker_a.take("read:1", limit).allowed
+
+
+def _spend_tokens(path: str, attempts: int, allowed) -> None:
+    backend = SQLiteTokenBucketBackend(path=path, busy_timeout_ms=5000)
+    limit = BucketLimit.parse("100/hour")
+    count = sum(backend.take("read:1", limit).allowed for _ in range(attempts))
+    with allowed.get_lock():
+        allowed.value += count
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_sqlite_buckets_never_double_spend_across_processes(tmp_path):
+    """Test concurrent processes together get exactly the bucket capacity"""
+    path = str(tmp_path / "buckets.sqlite3")
+    context = multiprocessing.get_context("fork")
+    allowed = context.Value("i", 0)
+    processes = [context.Process(target=_spend_tokens, args=(path, 60, allowed)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert allowed.value == 100
+
+
+def test_sqlite_errors_fail_open(tmp_path):
+    """Test a broken store lets requests through instead of failing them"""
+    backend = SQLiteTokenBucketBackend(path=str(tmp_path / "missing-dir" / "buckets.sqlite3"))
+    backend._connect().execute("DROP TABLE token_buckets")
+
+    result = backend.take("read:1", BucketLimit.parse("1/minute"))
+
+    assert result.allowed
+    assert backend.errors == 1
+
+
+@pytest.mark.parametrize("method,path,expected", [
+    ("GET", "/api/transactions/export", "export"),
+    ("POST", "/api/transactions/import", "bulk"),
+    ("POST", "/api/transactions/bulk", "bulk"),
+    ("GET", "/api/reports/trends", "reports"),
+    ("POST", "/api/budgets", "write"),
+    ("DELETE", "/api/goals/{goal_id}", "write"),
+    ("GET", "/api/transactions/{transaction_id}", "read"),
+])
+def test_classify_route(method, path, expected):
+    """Test requests map to the configured route classes"""
+    assert classify_route(method, path) == expected
+
+
+async def test_dependency_sets_headers_and_rejects(monkeypatch):
+    """Test the router dependency adds RateLimit-* headers and answers 429 when empty"""
+    limiter = UserRateLimiter(
+        MemoryTokenBucketBackend(),
+        {"read": BucketLimit.parse("2/minute"), "reports": BucketLimit.parse("1/minute")},
+    )
+    monkeypatch.setattr("app.api.dependencies.user_rate_limiter", limiter)
+
+    router = APIRouter()
+
+    @router.get("/items")
+    async def items():
+        return {"ok": True}
+
+    @router.get("/reports/trends")
+    async def trends():
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router, dependencies=[Depends(rate_limit_user)])
+    now = datetime.utcnow()
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        id=7, name="User", email="user@example.com", currency="BRL",
+        timezone="UTC", created_at=now, updated_at=now,
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/items")
+        assert first.status_code == 200
+        assert first.headers["RateLimit-Limit"] == "2"
+        assert first.headers["RateLimit-Remaining"] == "1"
+        assert first.headers["RateLimit-Policy"] == "2;w=60"
+
+        assert (await client.get("/items")).status_code == 200
+        rejected = await client.get("/items")
+        assert rejected.status_code == 429
+        assert rejected.headers["RateLimit-Remaining"] == "0"
+        assert int(rejected.headers["Retry-After"]) >= 1
+
+        # Reports have their own bucket
+        assert (await client.get("/reports/trends")).status_code == 200
+        assert (await client.get("/reports/trends")).status_code == 429
@@ -0,0 +1,93 @@
+"""
+Unit tests for the token revocation store
+"""
+import time
+
+import pytest
+
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.core.token_revocation import (
+    MemoryRevocationBackend,
+    SQLiteRevocationBackend,
+    build_revocation_backend,
+    get_token_id,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Each local backend must honour the same contract"""
+    if request.param == "memory":
+        return MemoryRevocationBackend()
+    return SQLiteRevocationBackend(path=str(tmp_path / "revocations.sqlite3"))
+
+
+async def test_revoked_token_is_reported_until_expiry(backend):
+    """Test a revocation applies only to its token and only until expiry"""
+    await backend.revoke("live", time.time() + 60)
+    await backend.revoke("expired", time.time() - 1)
+
+    assert await backend.is_revoked("live") is True
+    assert await backend.is_revoked("expired") is False
+    assert await backend.is_revoked("other") is False
+
+
+async def test_purge_drops_only_expired_entries(backend):
+    """Test expired revocations are removed and live ones kept"""
+    if isinstance(backend, MemoryRevocationBackend):
+        backend.BUCKET_SECONDS = 1
+    now = time.time()
+    await backend.revoke("old-1", now - 120)
+    await backend.revoke("old-2", now - 60)
+    await backend.revoke("live", now + 600)
+
+    await backend.purge_expired()
+
+    assert backend.stats()["purged"] == 2
+    assert backend.stats()["revoked"] == 1
+    assert await backend.is_revoked("live") is True
+
+
+async def test_revoking_again_keeps_latest_expiry(backend):
+    """Test a repeated revoke never shortens the revocation"""
+    await backend.revoke("token", time.time() + 600)
+    await backend.revoke("token", time.time() - 1)
+
+    assert await backend.is_revoked("token") is True
+
+
+async def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """Test two workers opening the same file see each other's revocations"""
+    path = str(tmp_path / "revocations.sqlite3")
+    first = SQLiteRevocationBackend(path=path)
+    second = SQLiteRevocationBackend(path=path)
+
+    await first.revoke("token", time.time() + 60)
+
+    assert await second.is_revoked("token") is True
+
+
+def test_tokens_carry_unique_ids():
+    """Test every issued token gets its own jti used as revocation key"""
+    first = create_access_token({"sub": "1"})
+    second = create_access_token({"sub": "1"})
+    refresh = create_refresh_token({"sub": "1"})
+
+    ids = {get_token_id(token, decode_token(token)) for token in (first, second, refresh)}
+
+    assert len(ids) == 3
+    assert get_token_id(first, decode_token(first)) == decode_token(first)["jti"]
+
+
+def test_tokens_without_jti_fall_back_to_digest():
+    """Test legacy tokens are keyed by a digest of the token"""
+    token_id = get_token_id("header.payload.signature", {"sub": "1"})
+
+    assert len(token_id) == 64
+    assert token_id == get_token_id("header.payload.signature", {"sub": "1", "jti": ""})
+
+
+def test_unknown_backend_is_rejected():
+    """Test misconfigured backends fail at startup"""
+    with pytest.raises(ValueError):
+        build_revocation_backend("redis")
@@ -0,0 +1,51 @@
+"""
+Unit tests for transaction export formatting
+"""
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.category import TransactionType
+from app.services.transaction_export import EXPORT_COLUMNS, format_csv_batch, format_ndjson_batch
+
+ExportRow = namedtuple("ExportRow", EXPORT_COLUMNS)
+
+ROWS = [
+    ExportRow(
+        2, date(2026, 3, 6), 'Dinner, "downtown"', Decimal("80.10"), "BRL", TransactionType.EXPENSE,
+        7, "Food", "line one\nline two", None, False, datetime(2026, 3, 6, 21, 0),
+    ),
+    ExportRow(
+        1, date(2026, 3, 5), "Salary", Decimal("5000.00"), None, TransactionType.INCOME,
+        None, None, None, "work", True, datetime(2026, 3, 5, 9, 30),
+    ),
+]
+
+
+def test_csv_batches_round_trip_through_csv_reader():
+    """Test header plus batches parse back into the exported values"""
+    text = format_csv_batch([], include_header=True) + format_csv_batch(ROWS[:1]) + format_csv_batch(ROWS[1:])
+
+    records = list(csv.DictReader(io.StringIO(text)))
+
+    assert [record["id"] for record in records] == ["2", "1"]
+    assert records[0]["description"] == 'Dinner, "downtown"'
+    assert records[0]["notes"] == "line one\nline two"
+    assert records[0]["amount"] == "80.10"
+    assert records[1]["type"] == "INCOME"
+    assert records[1]["category"] == ""
+
+
+def test_ndjson_batch_keeps_exact_amounts():
+    """Test one JSON object per row with amounts as exact decimal strings"""
+    lines = format_ndjson_batch(ROWS).splitlines()
+
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["amount"] == "80.10"
+    assert first["date"] == "2026-03-06"
+    assert first["created_at"] == "2026-03-06T21:00:00"
+    assert json.loads(lines[1])["category_id"] is None
@@ -0,0 +1,148 @@
+"""
+Unit tests for the trusted network index
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import trusted_networks
+from app.core.trusted_networks import TrustedNetworkIndex, parse_network, set_trusted_networks
+from app.schemas.whitelist import WhitelistCreateRequest
+
+
+def test_exact_addresses_match_only_themselves():
+    """Test plain IPv4/IPv6 entries behave like exact matches"""
+    index = TrustedNetworkIndex([("10.0.0.1", None), ("2001:db8::1", None)])
+
+    assert index.contains("10.0.0.1")
+    assert index.contains("2001:db8::1")
+    assert index.contains("2001:0db8:0000::0001")
+    assert not index.contains("10.0.0.2")
+    assert not index.contains("2001:db8::2")
+
+
+def test_cidr_ranges_match_covered_addresses():
+    """Test IPv4 and IPv6 ranges of different prefix lengths"""
+    index = TrustedNetworkIndex([
+        ("10.0.0.0/8", None),
+        ("192.168.1.0/24", None),
+        ("2001:db8:abcd::/48", None),
+        ("203.0.113.128/25", None),
+    ])
+
+    assert index.contains("10.255.3.4")
+    assert index.contains("192.168.1.200")
+    assert not index.contains("192.168.2.1")
+    assert index.contains("2001:db8:abcd:12::7")
+    assert not index.contains("2001:db8:abce::1")
+    assert index.contains("203.0.113.200")
+    assert not index.contains("203.0.113.100")
+    assert index.stats()["prefix_lengths"] == {"ipv4": [25, 24, 8], "ipv6": [48]}
+
+
+def test_host_bits_and_mapped_addresses_are_normalized():
+    """Test host bits are ignored and IPv4-mapped IPv6 addresses match IPv4 entries"""
+    assert str(parse_network("10.1.2.3/8")) == "10.0.0.0/8"
+    assert str(parse_network("::ffff:192.0.2.0/120")) == "192.0.2.0/24"
+
+    index = TrustedNetworkIndex([("10.1.2.3/16", None)])
+    assert index.contains("10.1.200.1")
+    assert index.contains("::ffff:10.1.9.9")
+
+
+def test_invalid_entries_and_addresses_are_untrusted():
+    """Test bad rows are skipped and unparseable client hosts never match"""
+    index = TrustedNetworkIndex([("not-an-ip", None), ("10.0.0.0/33", None), ("10.0.0.1", None)])
+
+    assert index.size == 1
+    assert index.skipped == 2
+    assert not index.contains("testclient")
+    assert not index.contains("unknown")
+    assert index.contains("10.0.0.1")
+
+
+def test_expired_entries_stop_matching():
+    """Test entries stop matching at their (naive UTC) expiry without a reload"""
+    now = datetime.utcnow()
+    index = TrustedNetworkIndex([
+        ("198.51.100.0/24", now - timedelta(seconds=1)),
+        ("198.51.100.7", now + timedelta(hours=1)),
+    ])
+
+    assert not index.contains("198.51.100.1")
+    assert index.contains("198.51.100.7")
+
+
+def test_duplicate_networks_keep_longest_lived_entry():
+    """Test the same range listed in both tables keeps the later expiry"""
+    now = datetime.utcnow()
+    index = TrustedNetworkIndex([
+        ("192.0.2.0/24", now - timedelta(seconds=1)),
+        ("192.0.2.0/24", None),
+    ])
+
+    assert index.size == 1
+    assert index.contains("192.0.2.1")
+
+
+def test_set_trusted_networks_swaps_current_index(monkeypatch):
+    """Test reloading replaces the process-wide index"""
+    monkeypatch.setattr(trusted_networks, "_index", TrustedNetworkIndex())
+    assert not trusted_networks.is_trusted_ip("10.0.0.1")
+
+    set_trusted_networks([("10.0.0.0/24", None)])
+
+    assert trusted_networks.is_trusted_ip("10.0.0.1")
+    assert trusted_networks.get_trusted_networks().size == 1
+
+
+def test_lookup_is_fast_with_many_networks():
+    """Test lookups stay in the microsecond range with thousands of entries"""
+    entries = [(f"10.{i // 256}.{i % 256}.0/24", None) for i in range(5000)]
+    entries += [(f"2001:db8:{i:x}::/48", None) for i in range(5000)]
+    index = TrustedNetworkIndex(entries)
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        index.contains("10.7.3.9")
+        index.contains("192.0.2.1")
+    per_lookup = (time.perf_counter() - started) / 20000
+
+    assert index.size == 10000
+    assert per_lookup < 50e-6
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("10.0.0.1", "10.0.0.1"),
+    (" 10.0.0.0/8 ", "10.0.0.0/8"),
+    ("10.1.2.3/8", "10.0.0.0/8"),
+    ("2001:0db8::0001", "2001:db8::1"),
+])
+def test_whitelist_request_normalizes_addresses(value, expected):
+    """Test the admin schema accepts and normalizes addresses and ranges"""
+    assert WhitelistCreateRequest(ip_address=value).ip_address == expected
+
+
+def test_whitelist_request_rejects_invalid_addresses():
+    """Test the admin schema rejects values that are not addresses or ranges"""
+    with pytest.raises(ValueError):
+        WhitelistCreateRequest(ip_address="10.0.0.300")
+
+
+async def test_metrics_are_served_to_trusted_networks_only(monkeypatch):
+    """Test /metrics answers loopback and whitelisted clients and refuses the rest"""
+    from httpx import ASGITransport, AsyncClient
+
+    from main import app
+
+    monkeypatch.setattr(trusted_networks, "_index", TrustedNetworkIndex([("10.1.0.0/16", None)]))
+
+    async def get_metrics(client_ip):
+        transport = ASGITransport(app=app, client=(client_ip, 50000))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/metrics", headers={"X-Forwarded-For": "10.1.2.3"})
+
+    assert (await get_metrics("127.0.0.1")).status_code == 200
+    assert (await get_metrics("10.1.2.3")).status_code == 200
+    assert (await get_metrics("203.0.113.5")).status_code == 403